@@ -0,0 +1,61 @@
+"""Add incident status history
+
+Revision ID: 3b8d1f0a6c21
+Revises: cf9e7e59981f
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3b8d1f0a6c21"
+down_revision: str | Sequence[str] | None = "cf9e7e59981f"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "incident_status_history",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("incident_id", sa.Integer(), nullable=False),
+        sa.Column("from_status", sa.String(), nullable=True),
+        sa.Column("to_status", sa.String(), nullable=False),
+        sa.Column("changed_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["incident_id"],
+            ["incidents.id"],
+            name=op.f("incident_status_history_incident_id_fkey"),
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint(
+            "id", name=op.f("incident_status_history_pkey")
+        ),
+    )
+    op.create_index(
+        "ix_incident_status_history_incident_id_changed_at",
+        "incident_status_history",
+        ["incident_id", "changed_at"],
+        unique=False,
+    )
+    # Backfill creation entries for existing incidents
+    op.execute(
+        "INSERT INTO incident_status_history "
+        "(incident_id, from_status, to_status, changed_at) "
+        "SELECT id, NULL, status, created_at FROM incidents"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_incident_status_history_incident_id_changed_at",
+        table_name="incident_status_history",
+    )
+    op.drop_table("incident_status_history")
@@ -0,0 +1,40 @@
+"""Add incident MTTR aggregates
+
+Revision ID: 7e2c94d5a0b3
+Revises: 3b8d1f0a6c21
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7e2c94d5a0b3"
+down_revision: str | Sequence[str] | None = "3b8d1f0a6c21"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "incident_mttr_stats",
+        sa.Column("period", sa.String(length=10), nullable=False),
+        sa.Column("source", sa.String(), nullable=False),
+        sa.Column("count", sa.BigInteger(), nullable=False),
+        sa.Column("total_seconds", sa.Float(), nullable=False),
+        sa.Column("total_squared_seconds", sa.Float(), nullable=False),
+        sa.Column("sketch", sa.JSON(), nullable=False),
+        sa.PrimaryKeyConstraint(
+            "period", "source", name=op.f("incident_mttr_stats_pkey")
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("incident_mttr_stats")
@@ -0,0 +1,51 @@
+"""Add idempotency keys
+
+Revision ID: 9a4f6b2e8d17
+Revises: 7e2c94d5a0b3
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9a4f6b2e8d17"
+down_revision: str | Sequence[str] | None = "7e2c94d5a0b3"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "idempotency_keys",
+        sa.Column("key", sa.String(length=255), nullable=False),
+        sa.Column("fingerprint", sa.String(length=64), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("incident_id", sa.Integer(), nullable=True),
+        sa.Column("description", sa.String(), nullable=True),
+        sa.Column("status", sa.String(), nullable=True),
+        sa.Column("source", sa.String(), nullable=True),
+        sa.Column(
+            "incident_created_at", sa.DateTime(timezone=True), nullable=True
+        ),
+        sa.PrimaryKeyConstraint("key", name=op.f("idempotency_keys_pkey")),
+    )
+    op.create_index(
+        op.f("ix_idempotency_keys_created_at"),
+        "idempotency_keys",
+        ["created_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        op.f("ix_idempotency_keys_created_at"), table_name="idempotency_keys"
+    )
+    op.drop_table("idempotency_keys")
@@ -0,0 +1,54 @@
+"""Widen incident IDs to 64 bits
+
+Revision ID: 4c1d7e9b2a58
+Revises: 9a4f6b2e8d17
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "4c1d7e9b2a58"
+down_revision: str | Sequence[str] | None = "9a4f6b2e8d17"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+COLUMNS = [
+    ("incidents", "id"),
+    ("incident_status_history", "incident_id"),
+    ("idempotency_keys", "incident_id"),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # SQLite INTEGER is already 64-bit
+    if op.get_bind().dialect.name == "sqlite":
+        return
+    for table, column in COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            existing_type=sa.Integer(),
+            type_=sa.BigInteger(),
+        )
+    op.execute("ALTER SEQUENCE IF EXISTS incidents_id_seq AS bigint")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == "sqlite":
+        return
+    op.execute("ALTER SEQUENCE IF EXISTS incidents_id_seq AS integer")
+    for table, column in reversed(COLUMNS):
+        op.alter_column(
+            table,
+            column,
+            existing_type=sa.BigInteger(),
+            type_=sa.Integer(),
+        )
@@ -0,0 +1,69 @@
+"""Add webhook outbox and dead letters
+
+Revision ID: 8f3a2d6c1e94
+Revises: 4c1d7e9b2a58
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8f3a2d6c1e94"
+down_revision: str | Sequence[str] | None = "4c1d7e9b2a58"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "webhook_outbox",
+        sa.Column(
+            "id",
+            sa.BigInteger().with_variant(sa.Integer(), "sqlite"),
+            autoincrement=True,
+            nullable=False,
+        ),
+        sa.Column("endpoint", sa.String(), nullable=False),
+        sa.Column("payload", sa.JSON(), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column(
+            "next_attempt_at", sa.DateTime(timezone=True), nullable=False
+        ),
+        sa.Column("last_error", sa.String(), nullable=True),
+        sa.PrimaryKeyConstraint("id", name=op.f("webhook_outbox_pkey")),
+    )
+    op.create_index(
+        op.f("ix_webhook_outbox_next_attempt_at"),
+        "webhook_outbox",
+        ["next_attempt_at"],
+        unique=False,
+    )
+    op.create_table(
+        "webhook_dead_letters",
+        sa.Column(
+            "id",
+            sa.BigInteger().with_variant(sa.Integer(), "sqlite"),
+            nullable=False,
+        ),
+        sa.Column("endpoint", sa.String(), nullable=False),
+        sa.Column("payload", sa.JSON(), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("error", sa.String(), nullable=False),
+        sa.Column("failed_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("id", name=op.f("webhook_dead_letters_pkey")),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("webhook_dead_letters")
+    op.drop_index(
+        op.f("ix_webhook_outbox_next_attempt_at"), table_name="webhook_outbox"
+    )
+    op.drop_table("webhook_outbox")
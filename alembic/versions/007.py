@@ -0,0 +1,53 @@
+"""Add SLA breaches and status index of incidents
+
+Revision ID: 2b7e5c9a4d31
+Revises: 8f3a2d6c1e94
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "2b7e5c9a4d31"
+down_revision: str | Sequence[str] | None = "8f3a2d6c1e94"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        op.f("ix_incidents_status_created_at"),
+        "incidents",
+        ["status", "created_at"],
+        unique=False,
+    )
+    op.create_table(
+        "incident_sla_breaches",
+        sa.Column(
+            "incident_id",
+            sa.BigInteger().with_variant(sa.Integer(), "sqlite"),
+            nullable=False,
+        ),
+        sa.Column("opened_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("deadline", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("detected_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint(
+            "incident_id",
+            "opened_at",
+            name=op.f("incident_sla_breaches_pkey"),
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("incident_sla_breaches")
+    op.drop_index(
+        op.f("ix_incidents_status_created_at"), table_name="incidents"
+    )
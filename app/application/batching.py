@@ -0,0 +1,74 @@
+"""Coalescing of concurrent single-key loads into batches (DataLoader)."""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable, Sequence
+from typing import Generic, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class BatchLoader(Generic[K, V]):  # noqa: UP046 - keep Python 3.11 support
+    """Load values by key, batching the keys requested in one loop tick.
+
+    The first ``load`` of a tick schedules a dispatch for the end of the
+    tick; keys requested until then are passed to ``load_many`` at once,
+    each key once. ``load_many`` returns values aligned with the keys.
+    Nothing is cached once the batch finishes.
+    """
+
+    def __init__(
+        self,
+        load_many: Callable[[Sequence[K]], Awaitable[Sequence[V]]],
+        max_batch_size: int = 1000,
+    ):
+        self._load_many = load_many
+        self._max_batch_size = max_batch_size
+        self._pending: dict[K, asyncio.Future[V]] = {}
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    async def load(self, key: K) -> V:
+        """Load the value of the key within the batch of this tick."""
+        future = self._pending.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            if not self._pending:
+                loop.call_soon(self._dispatch)
+            future = self._pending[key] = loop.create_future()
+        # Shield so a cancelled caller does not fail the others
+        return await asyncio.shield(future)
+
+    def _dispatch(self) -> None:
+        """Start loading the keys collected during the tick."""
+        pending, self._pending = self._pending, {}
+        keys = list(pending)
+        for start in range(0, len(keys), self._max_batch_size):
+            batch = {
+                key: pending[key]
+                for key in keys[start : start + self._max_batch_size]
+            }
+            task = asyncio.create_task(self._run(batch))
+            # Keep a reference until the task is done
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: dict[K, asyncio.Future[V]]) -> None:
+        """Load one batch and resolve its futures."""
+        try:
+            values = await self._load_many(list(batch))
+            if len(values) != len(batch):
+                raise ValueError("Batch load must return a value per key")
+        except asyncio.CancelledError:
+            for future in batch.values():
+                future.cancel()
+            raise
+        except Exception as e:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+                    # Mark exception as retrieved when nobody is waiting
+                    future.exception()
+        else:
+            for future, value in zip(batch.values(), values, strict=True):
+                if not future.done():
+                    future.set_result(value)
@@ -0,0 +1,68 @@
+"""In-process cache of exact incident counts."""
+
+import time
+from collections.abc import Awaitable, Callable
+
+from app.application.single_flight import SingleFlight
+from app.domain.enums import IncidentStatus
+
+
+class CountCache:
+    """Exact incident counts per status filter, kept for a short TTL.
+
+    Writes of the process invalidate it, writes of other workers become
+    visible once the TTL expires. Concurrent misses for the same filter
+    share one count query.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: dict[IncidentStatus | None, tuple[float, int]] = {}
+        # Bumped on invalidation, so counts started before a write are not
+        # stored after it
+        self._generation = 0
+        self._flights: SingleFlight[int] = SingleFlight()
+
+    def get(self, status: IncidentStatus | None) -> int | None:
+        """Get cached count of the filter if it has not expired."""
+        entry = self._entries.get(status)
+        if entry is None:
+            return None
+
+        expires_at, count = entry
+        if expires_at <= self._clock():
+            del self._entries[status]
+            return None
+        return count
+
+    def invalidate(self) -> None:
+        """Drop all counts after incidents were created or changed."""
+        self._entries.clear()
+        self._generation += 1
+
+    async def get_or_count(
+        self,
+        status: IncidentStatus | None,
+        func: Callable[[], Awaitable[int]],
+    ) -> int:
+        """Get cached count of the filter or count it with func."""
+        cached = self.get(status)
+        if cached is not None:
+            return cached
+
+        async def count_and_store() -> int:
+            generation = self._generation
+            count = await func()
+            if generation == self._generation and self.ttl_seconds > 0:
+                self._entries[status] = (
+                    self._clock() + self.ttl_seconds,
+                    count,
+                )
+            return count
+
+        return await self._flights.do(status, count_and_store)
@@ -0,0 +1,78 @@
+"""In-process cache of idempotent request outcomes."""
+
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+
+from app.application.single_flight import SingleFlight
+from app.domain.entities import IdempotencyRecord
+
+
+class IdempotencyCache:
+    """Bounded LRU cache with TTL in front of the idempotency key table.
+
+    Also collapses concurrent requests with the same key inside the process
+    into a single call, so only one of them reaches the database.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, IdempotencyRecord]] = (
+            OrderedDict()
+        )
+        self._flights: SingleFlight[IdempotencyRecord] = SingleFlight()
+
+    def get(self, key: str) -> IdempotencyRecord | None:
+        """Get completed record by key if it has not expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, record = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return record
+
+    def put(self, record: IdempotencyRecord) -> None:
+        """Store completed record, evicting the least recently used."""
+        if self.max_size <= 0 or record.incident is None:
+            return
+
+        self._entries[record.key] = (
+            self._clock() + self.ttl_seconds,
+            record,
+        )
+        self._entries.move_to_end(record.key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached records."""
+        self._entries.clear()
+
+    async def run_once(
+        self,
+        key: str,
+        func: Callable[[], Awaitable[IdempotencyRecord]],
+    ) -> IdempotencyRecord:
+        """Run func for the key unless a call for it is already running.
+
+        Concurrent callers with the same key share the result of the first.
+        """
+
+        async def call_and_store() -> IdempotencyRecord:
+            record = await func()
+            self.put(record)
+            return record
+
+        return await self._flights.do(key, call_and_store)
@@ -0,0 +1,51 @@
+"""Coalescing of concurrent identical calls (single-flight)."""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight(Generic[T]):  # noqa: UP046 - keep Python 3.11 support
+    """Run at most one call per key at a time.
+
+    Callers arriving while a call for the same key is in flight wait for
+    it and share its result or exception instead of starting their own.
+    When the caller running the call is cancelled, a waiting caller runs
+    it again instead. Nothing is cached once the call finishes.
+    """
+
+    def __init__(self) -> None:
+        self._in_flight: dict[Hashable, asyncio.Future[T]] = {}
+
+    def in_flight(self, key: Hashable) -> bool:
+        """Check whether a call for the key is running."""
+        return key in self._in_flight
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        """Run func for the key or join the call already running."""
+        while (in_flight := self._in_flight.get(key)) is not None:
+            # Waiting does not cancel the leader when a follower is cancelled
+            await asyncio.wait([in_flight])
+            if not in_flight.cancelled():
+                return in_flight.result()
+            # The leader was cancelled, the first follower to wake leads
+
+        future: asyncio.Future[T] = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            result = await func()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark exception as retrieved when nobody else is waiting
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._in_flight[key]
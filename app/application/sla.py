@@ -0,0 +1,206 @@
+"""Detection of incidents left unresolved past their SLA."""
+
+import logging
+import math
+import time
+from collections.abc import Callable, Mapping, Sequence
+from datetime import UTC, datetime, timedelta
+
+from app.application.timing_wheel import TimingWheel
+from app.domain.entities import Incident, IncidentEvent, SlaBreach
+from app.domain.enums import IncidentSource, IncidentStatus
+from app.domain.interfaces import UnitOfWorkFactory
+
+logger = logging.getLogger(__name__)
+
+# Statuses an incident is still breaching its SLA in
+UNRESOLVED_STATUSES = (IncidentStatus.OPEN, IncidentStatus.IN_PROGRESS)
+
+# Incidents checked per unit of work when deadlines pass
+CHECK_BATCH_SIZE = 1000
+
+
+class SlaScheduler:
+    """Report incidents left open or in progress past their SLA deadline.
+
+    The deadline is the last opening of the incident, its creation or
+    reopening, plus the SLA of the source. Deadlines of unresolved
+    incidents are loaded once and then kept up to date by the use cases
+    that create and change incidents, in a hierarchical timing wheel, so a
+    tick costs O(1) plus the deadlines that passed. A passed deadline is
+    checked against the database and recorded as a breach with an
+    ``incident.sla_breached`` webhook event. Every worker keeps its own
+    wheel; the breach record makes each open period reported once.
+    """
+
+    def __init__(
+        self,
+        uow_factory: UnitOfWorkFactory,
+        sla_seconds: float,
+        source_sla_seconds: Mapping[IncidentSource, float] | None = None,
+        tick_seconds: float = 1.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.uow_factory = uow_factory
+        self.sla = timedelta(seconds=sla_seconds)
+        self.source_sla = {
+            source: timedelta(seconds=seconds)
+            for source, seconds in (source_sla_seconds or {}).items()
+        }
+        self.tick_seconds = tick_seconds
+        self._clock = clock
+        self.wheel = TimingWheel(math.floor(clock() / tick_seconds))
+
+    def deadline_of(
+        self, source: IncidentSource, opened_at: datetime
+    ) -> datetime:
+        """Get the moment an incident of the source opened then breaches."""
+        return _utc(opened_at) + self.source_sla.get(source, self.sla)
+
+    def track(
+        self,
+        incidents: Sequence[Incident],
+        opened_at: Mapping[int, datetime] | None = None,
+    ) -> None:
+        """Schedule deadlines of unresolved incidents, drop resolved ones.
+
+        Incidents missing from ``opened_at`` were opened at their creation.
+        """
+        opened_at = opened_at or {}
+        for incident in incidents:
+            if incident.id is None:
+                continue
+            if incident.status in UNRESOLVED_STATUSES:
+                self._schedule(
+                    incident.id,
+                    self.deadline_of(
+                        incident.source,
+                        opened_at.get(incident.id, incident.created_at),
+                    ),
+                )
+            else:
+                self.wheel.cancel(incident.id)
+
+    async def load(self) -> int:
+        """Schedule all unresolved incidents, return their count.
+
+        Only the columns of the deadline are read, from the index on status
+        and creation time, and opening times are read from status history
+        a batch of incidents at a time.
+        """
+        async with self.uow_factory() as uow:
+            for status in UNRESOLVED_STATUSES:
+                columns = await uow.incidents.get_columns(
+                    ["id", "source", "created_at"], status
+                )
+                rows = list(
+                    zip(
+                        columns["id"],
+                        columns["source"],
+                        columns["created_at"],
+                        strict=True,
+                    )
+                )
+                for start in range(0, len(rows), CHECK_BATCH_SIZE):
+                    batch = rows[start : start + CHECK_BATCH_SIZE]
+                    opened_at = await uow.incidents.get_opened_at(
+                        [incident_id for incident_id, _, _ in batch]
+                    )
+                    for incident_id, source, created_at in batch:
+                        self._schedule(
+                            incident_id,
+                            self.deadline_of(
+                                IncidentSource(source),
+                                opened_at.get(incident_id, created_at),
+                            ),
+                        )
+        return len(self.wheel)
+
+    async def tick(self) -> int:
+        """Report incidents whose deadline passed, return the new breaches.
+
+        Incidents resolved meanwhile, also by other workers, are skipped.
+        Deadlines that could not be checked are retried on the next tick.
+        """
+        now = self._clock()
+        due = self.wheel.advance(math.floor(now / self.tick_seconds))
+        reported = 0
+        for start in range(0, len(due), CHECK_BATCH_SIZE):
+            batch = due[start : start + CHECK_BATCH_SIZE]
+            try:
+                reported += await self._report(batch)
+            except Exception:
+                for incident_id in due[start:]:
+                    self.wheel.schedule(incident_id, self.wheel.now)
+                raise
+        return reported
+
+    async def _report(self, ids: Sequence[int]) -> int:
+        """Record breaches of the incidents still unresolved, by deadline.
+
+        Incidents reopened since they were scheduled get the deadline of
+        their new open period instead.
+        """
+        async with self.uow_factory() as uow:
+            incidents = [
+                incident
+                for incident in await uow.incidents.get_many(ids)
+                if incident is not None
+                and incident.status in UNRESOLVED_STATUSES
+            ]
+            opened_at = await uow.incidents.get_opened_at(
+                [incident.id or 0 for incident in incidents]
+            )
+            unresolved: list[SlaBreach] = []
+            pending: list[SlaBreach] = []
+            for incident in incidents:
+                opened = _utc(
+                    opened_at.get(incident.id or 0, incident.created_at)
+                )
+                breach = SlaBreach(
+                    incident=incident,
+                    opened_at=opened,
+                    deadline=self.deadline_of(incident.source, opened),
+                )
+                if self._tick_of(breach.deadline) > self.wheel.now:
+                    pending.append(breach)
+                else:
+                    unresolved.append(breach)
+            unresolved.sort(key=lambda breach: breach.deadline)
+            breaches = await uow.sla_breaches.record(unresolved)
+            await uow.webhooks.add(
+                [
+                    IncidentEvent(
+                        type="incident.sla_breached",
+                        incident=breach.incident,
+                        occurred_at=breach.deadline,
+                    )
+                    for breach in breaches
+                ]
+            )
+
+        for breach in pending:
+            self._schedule(breach.incident.id or 0, breach.deadline)
+        for breach in breaches:
+            logger.warning(
+                "Incident %s breached its SLA at %s",
+                breach.incident.id,
+                breach.deadline.isoformat(),
+            )
+        return len(breaches)
+
+    def _schedule(self, incident_id: int, deadline: datetime) -> None:
+        """Put the deadline in the wheel."""
+        self.wheel.schedule(incident_id, self._tick_of(deadline))
+
+    def _tick_of(self, deadline: datetime) -> int:
+        """Get the tick of the deadline, rounded up."""
+        return math.ceil(deadline.timestamp() / self.tick_seconds)
+
+
+def _utc(moment: datetime) -> datetime:
+    """Attach UTC to a moment read without timezone."""
+    if moment.tzinfo is None:
+        # SQLite does not keep timezone, values are stored in UTC
+        return moment.replace(tzinfo=UTC)
+    return moment
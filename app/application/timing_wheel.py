@@ -0,0 +1,104 @@
+"""Hierarchical timing wheel of integer deadlines."""
+
+# Slots per level, a power of two so slots are taken from bits of a tick
+SLOT_BITS = 6
+SLOTS = 1 << SLOT_BITS
+SLOT_MASK = SLOTS - 1
+
+
+class TimingWheel:
+    """Keys due at integer ticks, with O(1) schedule, cancel and tick.
+
+    Level ``i`` has ``SLOTS`` slots of ``SLOTS**i`` ticks each. A key is
+    placed in the level of the highest slot digit its deadline does not
+    share with the current tick, and moves a level down each time the
+    wheel reaches its slot, so it is touched at most once per level. Keys
+    due beyond the top level wait in an overflow until it wraps around.
+    """
+
+    def __init__(self, now: int, levels: int = 4):
+        self.now = now
+        self.levels = levels
+        self._slots: list[list[dict[int, int]]] = [
+            [{} for _ in range(SLOTS)] for _ in range(levels)
+        ]
+        self._overflow: dict[int, int] = {}
+        # Keys already due, fired on the next advance
+        self._due: dict[int, int] = {}
+        # Bucket holding each key, for O(1) cancellation
+        self._buckets: dict[int, dict[int, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def __contains__(self, key: int) -> bool:
+        return key in self._buckets
+
+    def schedule(self, key: int, deadline: int) -> None:
+        """Fire the key at the deadline tick, replacing its previous one."""
+        self.cancel(key)
+        self._place(key, deadline)
+
+    def cancel(self, key: int) -> bool:
+        """Forget the key, return whether it was scheduled."""
+        bucket = self._buckets.pop(key, None)
+        if bucket is None:
+            return False
+        del bucket[key]
+        return True
+
+    def advance(self, now: int) -> list[int]:
+        """Move to the tick and return the keys due up to it."""
+        expired: list[int] = []
+        while self.now < now:
+            self.now += 1
+            self._cascade()
+            slot = self._slots[0][self.now & SLOT_MASK]
+            expired.extend(slot)
+            slot.clear()
+        expired.extend(self._due)
+        self._due.clear()
+        for key in expired:
+            del self._buckets[key]
+        return expired
+
+    def _place(self, key: int, deadline: int) -> None:
+        """Put the key in the bucket of its deadline."""
+        if deadline <= self.now:
+            bucket = self._due
+        else:
+            level = ((deadline ^ self.now).bit_length() - 1) // SLOT_BITS
+            if level >= self.levels:
+                bucket = self._overflow
+            else:
+                bucket = self._slots[level][
+                    (deadline >> (level * SLOT_BITS)) & SLOT_MASK
+                ]
+        bucket[key] = deadline
+        self._buckets[key] = bucket
+
+    def _cascade(self) -> None:
+        """Move keys of the slots reached at the current tick a level down.
+
+        A slot of level ``i`` is reached when the ``i`` lowest digits of the
+        tick turn zero. Its keys share the higher digits with the tick, so
+        none of them lands in a slot reached at the same tick.
+        """
+        zero_digits = 0
+        while zero_digits < self.levels and not (
+            self.now >> (zero_digits * SLOT_BITS) & SLOT_MASK
+        ):
+            zero_digits += 1
+
+        entries: list[tuple[int, int]] = []
+        if zero_digits == self.levels:
+            entries.extend(self._overflow.items())
+            self._overflow.clear()
+        for level in range(1, min(zero_digits + 1, self.levels)):
+            slot = self._slots[level][
+                (self.now >> (level * SLOT_BITS)) & SLOT_MASK
+            ]
+            entries.extend(slot.items())
+            slot.clear()
+        for key, deadline in entries:
+            self._place(key, deadline)
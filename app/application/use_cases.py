@@ -1,26 +1,67 @@
 """Use cases for incident management."""
 
-from datetime import UTC, datetime
+import hashlib
+from collections.abc import AsyncIterator, Mapping, Sequence
+from datetime import UTC, date, datetime, timedelta
 
-from app.domain.entities import Incident
+from app.application.batching import BatchLoader
+from app.application.counting import CountCache
+from app.application.idempotency import IdempotencyCache
+from app.application.sla import SlaScheduler
+from app.domain.analytics import DurationStats, MttrReport, Resolution
+from app.domain.entities import (
+    BulkStatusUpdateResult,
+    CountMode,
+    IdempotencyRecord,
+    Incident,
+    IncidentColumns,
+    IncidentEvent,
+    IncidentField,
+    IncidentFilter,
+    IncidentLookupResult,
+    IncidentProjection,
+    StatusChange,
+)
 from app.domain.enums import IncidentSource, IncidentStatus
-from app.domain.exceptions import IncidentNotFoundError
-from app.domain.interfaces import IUnitOfWork
+from app.domain.exceptions import (
+    IdempotencyKeyConflictError,
+    IdempotencyKeyInProgressError,
+    IncidentNotFoundError,
+)
+from app.domain.interfaces import IIncidentArchive, UnitOfWorkFactory
+
+# Page size of keyset pagination without an explicit limit
+KEYSET_PAGE_SIZE = 100
 
 
 class CreateIncidentUseCase:
     """Use case for creating a new incident."""
 
-    def __init__(self, uow: IUnitOfWork):
-        self.uow = uow
+    def __init__(
+        self,
+        uow_factory: UnitOfWorkFactory,
+        idempotency_cache: IdempotencyCache | None = None,
+        count_cache: CountCache | None = None,
+        sla_scheduler: SlaScheduler | None = None,
+    ):
+        self.uow_factory = uow_factory
+        self.idempotency_cache = idempotency_cache
+        self.count_cache = count_cache
+        self.sla_scheduler = sla_scheduler
 
     async def execute(
         self,
         description: str,
         status: IncidentStatus,
         source: IncidentSource,
+        idempotency_key: str | None = None,
     ) -> Incident:
-        """Create a new incident."""
+        """Create a new incident.
+
+        With an idempotency key, a repeated request returns the incident
+        created by the first one instead of creating a duplicate. Webhooks
+        are notified once the incident is committed.
+        """
         incident = Incident(
             id=None,
             description=description,
@@ -29,50 +70,492 @@ class CreateIncidentUseCase:
             created_at=datetime.now(UTC),
         )
 
-        async with self.uow:
-            return await self.uow.incidents.create(incident)
+        if idempotency_key is None:
+            async with self.uow_factory() as uow:
+                created = await uow.incidents.create(incident)
+                await uow.webhooks.add([_created_event(created)])
+            _invalidate_counts(self.count_cache)
+            _track_sla(self.sla_scheduler, [created])
+            return created
+
+        fingerprint = hashlib.sha256(
+            "\x1f".join((description, status.value, source.value)).encode()
+        ).hexdigest()
+
+        if self.idempotency_cache is None:
+            record = await self._create_once(
+                idempotency_key, fingerprint, incident
+            )
+        else:
+            cached = self.idempotency_cache.get(idempotency_key)
+            record = cached or await self.idempotency_cache.run_once(
+                idempotency_key,
+                lambda: self._create_once(
+                    idempotency_key, fingerprint, incident
+                ),
+            )
+
+        if record.fingerprint != fingerprint:
+            raise IdempotencyKeyConflictError(idempotency_key)
+        if record.incident is None:
+            raise IdempotencyKeyInProgressError(idempotency_key)
+
+        return record.incident
+
+    async def _create_once(
+        self, key: str, fingerprint: str, incident: Incident
+    ) -> IdempotencyRecord:
+        """Create incident unless the key was already used."""
+        async with self.uow_factory() as uow:
+            existing = await uow.idempotency_keys.reserve(
+                key, fingerprint, incident.created_at
+            )
+            if existing is not None:
+                return existing
+
+            created = await uow.incidents.create(incident)
+            await uow.webhooks.add([_created_event(created)])
+            record = await uow.idempotency_keys.complete(key, created)
+        _invalidate_counts(self.count_cache)
+        _track_sla(self.sla_scheduler, [created])
+        return record
 
 
 class GetIncidentsUseCase:
     """Use case for getting list of incidents."""
 
-    def __init__(self, uow: IUnitOfWork):
-        self.uow = uow
+    def __init__(
+        self,
+        uow_factory: UnitOfWorkFactory,
+        count_cache: CountCache | None = None,
+        count_mode: CountMode = "none",
+    ):
+        self.uow_factory = uow_factory
+        self.count_cache = count_cache
+        self.count_mode = count_mode
 
     async def execute(
-        self, status: IncidentStatus | None = None
+        self,
+        status: IncidentStatus | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+        before_id: int | None = None,
     ) -> list[Incident]:
-        """Get all incidents, optionally filtered by status."""
-        async with self.uow:
-            return await self.uow.incidents.get_all(status)
+        """Get a page of incidents, optionally filtered by status.
+
+        With ``before_id`` the page holds incidents with lower IDs, highest
+        first, instead of skipping ``offset`` incidents.
+        """
+        async with self.uow_factory() as uow:
+            if before_id is not None:
+                return await uow.incidents.get_before(
+                    before_id, limit or KEYSET_PAGE_SIZE, status
+                )
+            return await uow.incidents.get_all(status, limit, offset)
+
+    async def execute_projection(
+        self,
+        fields: Sequence[IncidentField],
+        status: IncidentStatus | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+        before_id: int | None = None,
+    ) -> list[IncidentProjection]:
+        """Get a page of incidents with the given attributes only."""
+        if before_id is not None:
+            limit = limit or KEYSET_PAGE_SIZE
+        async with self.uow_factory() as uow:
+            return await uow.incidents.get_projection(
+                fields, status, limit, offset, before_id
+            )
+
+    async def execute_columns(
+        self,
+        fields: Sequence[IncidentField],
+        status: IncidentStatus | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+        before_id: int | None = None,
+    ) -> IncidentColumns:
+        """Get a page of incidents as one list per attribute."""
+        if before_id is not None:
+            limit = limit or KEYSET_PAGE_SIZE
+        async with self.uow_factory() as uow:
+            return await uow.incidents.get_columns(
+                fields, status, limit, offset, before_id
+            )
+
+    async def count(
+        self,
+        status: IncidentStatus | None = None,
+        mode: CountMode | None = None,
+    ) -> int | None:
+        """Count incidents of the list filter, None in the ``none`` mode.
+
+        Without a mode the default of the use case applies. Exact counts
+        come from the count cache when one is set.
+        """
+        mode = mode or self.count_mode
+        if mode == "none":
+            return None
+        if mode == "estimate":
+            async with self.uow_factory() as uow:
+                return await uow.incidents.estimate_count(status)
+        if self.count_cache is None:
+            return await self._count(status)
+        return await self.count_cache.get_or_count(
+            status, lambda: self._count(status)
+        )
+
+    async def _count(self, status: IncidentStatus | None) -> int:
+        """Count incidents exactly."""
+        async with self.uow_factory() as uow:
+            return await uow.incidents.count(status)
 
 
 class GetIncidentByIdUseCase:
-    """Use case for getting incident by ID."""
+    """Use case for getting incident by ID.
 
-    def __init__(self, uow: IUnitOfWork):
-        self.uow = uow
+    Lookups of different IDs made in the same event loop tick are batched
+    into one query.
+    """
+
+    def __init__(self, uow_factory: UnitOfWorkFactory):
+        self.uow_factory = uow_factory
+        self._loader: BatchLoader[int, Incident | None] = BatchLoader(
+            self._load_many
+        )
 
     async def execute(self, incident_id: int) -> Incident:
         """Get incident by ID."""
-        async with self.uow:
-            incident = await self.uow.incidents.get_by_id(incident_id)
+        incident = await self._loader.load(incident_id)
 
-            if incident is None:
-                raise IncidentNotFoundError(incident_id)
+        if incident is None:
+            raise IncidentNotFoundError(incident_id)
+
+        return incident
+
+    async def _load_many(self, ids: Sequence[int]) -> list[Incident | None]:
+        """Load a batch of incidents in one unit of work."""
+        async with self.uow_factory() as uow:
+            return await uow.incidents.get_many(ids)
+
+
+class GetIncidentsByIdsUseCase:
+    """Use case for getting many incidents by IDs with one query."""
+
+    def __init__(self, uow_factory: UnitOfWorkFactory):
+        self.uow_factory = uow_factory
 
-            return incident
+    async def execute(self, ids: Sequence[int]) -> IncidentLookupResult:
+        """Get incidents in the order of the IDs, reporting missing ones.
+
+        Repeated IDs are looked up and returned once.
+        """
+        unique_ids = list(dict.fromkeys(ids))
+        async with self.uow_factory() as uow:
+            incidents = await uow.incidents.get_many(unique_ids)
+
+        result = IncidentLookupResult()
+        for incident_id, incident in zip(unique_ids, incidents, strict=True):
+            if incident is None:
+                result.not_found.append(incident_id)
+            else:
+                result.found.append(incident)
+        return result
 
 
 class UpdateIncidentStatusUseCase:
     """Use case for updating incident status."""
 
-    def __init__(self, uow: IUnitOfWork):
-        self.uow = uow
+    def __init__(
+        self,
+        uow_factory: UnitOfWorkFactory,
+        count_cache: CountCache | None = None,
+        sla_scheduler: SlaScheduler | None = None,
+    ):
+        self.uow_factory = uow_factory
+        self.count_cache = count_cache
+        self.sla_scheduler = sla_scheduler
 
     async def execute(
         self, incident_id: int, status: IncidentStatus
     ) -> Incident:
-        """Update incident status."""
-        async with self.uow:
-            return await self.uow.incidents.update_status(incident_id, status)
+        """Update incident status following the status state machine.
+
+        Closing an incident also updates resolution time aggregates.
+        """
+        async with self.uow_factory() as uow:
+            incident = await uow.incidents.update_status(incident_id, status)
+            changed_at = datetime.now(UTC)
+
+            opened_at: dict[int, datetime] = {}
+            if (
+                incident.status == IncidentStatus.CLOSED
+                or self.sla_scheduler is not None
+            ):
+                opened_at = await uow.incidents.get_opened_at([incident_id])
+            if incident.status == IncidentStatus.CLOSED:
+                await uow.analytics.record_resolutions(
+                    [
+                        _resolution_of(
+                            incident, opened_at.get(incident_id), changed_at
+                        )
+                    ]
+                )
+            await uow.webhooks.add(
+                [_status_changed_event(incident, changed_at)]
+            )
+
+        _invalidate_counts(self.count_cache)
+        _track_sla(self.sla_scheduler, [incident], opened_at)
+        return incident
+
+
+class GetIncidentHistoryUseCase:
+    """Use case for getting status history of incident."""
+
+    def __init__(self, uow_factory: UnitOfWorkFactory):
+        self.uow_factory = uow_factory
+
+    async def execute(self, incident_id: int) -> list[StatusChange]:
+        """Get status history of incident."""
+        async with self.uow_factory() as uow:
+            history = await uow.incidents.get_history(incident_id)
+
+            if not history:
+                incident = await uow.incidents.get_by_id(incident_id)
+                if incident is None:
+                    raise IncidentNotFoundError(incident_id)
+
+            return history
+
+
+class BulkUpdateIncidentStatusUseCase:
+    """Use case for updating status of many incidents at once."""
+
+    def __init__(
+        self,
+        uow_factory: UnitOfWorkFactory,
+        count_cache: CountCache | None = None,
+        sla_scheduler: SlaScheduler | None = None,
+    ):
+        self.uow_factory = uow_factory
+        self.count_cache = count_cache
+        self.sla_scheduler = sla_scheduler
+
+    async def execute(
+        self,
+        status: IncidentStatus,
+        ids: Sequence[int] | None = None,
+        criteria: IncidentFilter | None = None,
+    ) -> BulkStatusUpdateResult:
+        """Update status of incidents selected by ids and/or criteria.
+
+        Requested IDs that exist but cannot move to the new status, are
+        archived or do not match the criteria are reported as rejected.
+        """
+        result = BulkStatusUpdateResult()
+
+        async with self.uow_factory() as uow:
+            result.updated = await uow.incidents.update_status_many(
+                status, ids=ids, criteria=criteria
+            )
+
+            changed_at = datetime.now(UTC)
+            opened_at: dict[int, datetime] = {}
+            if result.updated and (
+                status == IncidentStatus.CLOSED
+                or self.sla_scheduler is not None
+            ):
+                opened_at = await uow.incidents.get_opened_at(
+                    [incident.id or 0 for incident in result.updated]
+                )
+            if status == IncidentStatus.CLOSED and result.updated:
+                await uow.analytics.record_resolutions(
+                    [
+                        _resolution_of(
+                            incident,
+                            opened_at.get(incident.id or 0),
+                            changed_at,
+                        )
+                        for incident in result.updated
+                    ]
+                )
+            await uow.webhooks.add(
+                [
+                    _status_changed_event(incident, changed_at)
+                    for incident in result.updated
+                ]
+            )
+
+            if ids is not None:
+                updated_ids = {incident.id for incident in result.updated}
+                missing = sorted(set(ids) - updated_ids)
+                existing = await uow.incidents.get_existing_ids(missing)
+                result.rejected = [i for i in missing if i in existing]
+                result.not_found = [i for i in missing if i not in existing]
+
+        if result.updated:
+            _invalidate_counts(self.count_cache)
+            _track_sla(self.sla_scheduler, result.updated, opened_at)
+        return result
+
+
+class GetMttrUseCase:
+    """Use case for getting mean time to resolve analytics."""
+
+    def __init__(self, uow_factory: UnitOfWorkFactory):
+        self.uow_factory = uow_factory
+
+    async def execute(self, day: date | None = None) -> MttrReport:
+        """Get MTTR per source and overall, for all time or a single day."""
+        async with self.uow_factory() as uow:
+            by_source = await uow.analytics.get_mttr_by_source(day)
+
+        overall = DurationStats()
+        for stats in by_source.values():
+            overall.merge(stats)
+
+        return MttrReport(day=day, overall=overall, by_source=by_source)
+
+
+class PurgeExpiredIdempotencyKeysUseCase:
+    """Use case for deleting expired idempotency keys."""
+
+    def __init__(self, uow_factory: UnitOfWorkFactory):
+        self.uow_factory = uow_factory
+
+    async def execute(self, ttl: timedelta) -> int:
+        """Delete keys older than ttl, return number of deleted keys."""
+        async with self.uow_factory() as uow:
+            return await uow.idempotency_keys.delete_expired(
+                datetime.now(UTC) - ttl
+            )
+
+
+class ExportIncidentsUseCase:
+    """Use case for exporting all incidents, archived ones included."""
+
+    def __init__(self, uow_factory: UnitOfWorkFactory):
+        self.uow_factory = uow_factory
+
+    async def execute(self) -> AsyncIterator[Incident]:
+        """Iterate over all incidents without loading them at once."""
+        async with self.uow_factory() as uow:
+            async for incident in uow.incidents.stream_all():
+                yield incident
+
+    async def execute_columns(
+        self, chunk_size: int
+    ) -> AsyncIterator[IncidentColumns]:
+        """Iterate over all incidents in chunks stored as columns."""
+        chunk: list[Incident] = []
+        async for incident in self.execute():
+            chunk.append(incident)
+            if len(chunk) >= chunk_size:
+                yield _to_columns(chunk)
+                chunk.clear()
+        if chunk:
+            yield _to_columns(chunk)
+
+
+class ArchiveClosedIncidentsUseCase:
+    """Use case for moving old closed incidents to the archive."""
+
+    def __init__(
+        self, uow_factory: UnitOfWorkFactory, archive: IIncidentArchive
+    ):
+        self.uow_factory = uow_factory
+        self.archive = archive
+
+    async def execute(self, older_than: timedelta, batch_size: int) -> int:
+        """Archive incidents closed before older_than, return their number.
+
+        Each batch is written to the archive before it is deleted from the
+        hot table in the same transaction, so a failure never loses an
+        incident; at worst a batch is archived again by the next run.
+        """
+        closed_before = datetime.now(UTC) - older_than
+        archived = 0
+        while True:
+            async with self.uow_factory() as uow:
+                records = await uow.incidents.get_archivable(
+                    closed_before, batch_size
+                )
+                if not records:
+                    return archived
+
+                await self.archive.append(records)
+                await uow.incidents.delete_many(
+                    [record.incident.id or 0 for record in records]
+                )
+            archived += len(records)
+
+
+def _resolution_of(
+    incident: Incident, opened_at: datetime | None, resolved_at: datetime
+) -> Resolution:
+    """Build resolution fact measured from the last opening of incident.
+
+    Incidents without an opening in their history, such as ones created
+    closed, are measured from their creation.
+    """
+    if opened_at is None:
+        opened_at = incident.created_at
+    if opened_at.tzinfo is None:
+        # SQLite does not keep timezone, values are stored in UTC
+        opened_at = opened_at.replace(tzinfo=UTC)
+
+    return Resolution(
+        source=incident.source,
+        resolved_at=resolved_at,
+        duration_seconds=max((resolved_at - opened_at).total_seconds(), 0.0),
+    )
+
+
+def _invalidate_counts(count_cache: CountCache | None) -> None:
+    """Drop cached counts once a change is committed."""
+    if count_cache is not None:
+        count_cache.invalidate()
+
+
+def _track_sla(
+    sla_scheduler: SlaScheduler | None,
+    incidents: Sequence[Incident],
+    opened_at: Mapping[int, datetime] | None = None,
+) -> None:
+    """Update SLA deadlines once a change is committed."""
+    if sla_scheduler is not None:
+        sla_scheduler.track(incidents, opened_at)
+
+
+def _created_event(incident: Incident) -> IncidentEvent:
+    """Build event of a created incident."""
+    return IncidentEvent(
+        type="incident.created",
+        incident=incident,
+        occurred_at=incident.created_at,
+    )
+
+
+def _status_changed_event(
+    incident: Incident, changed_at: datetime
+) -> IncidentEvent:
+    """Build event of an incident moved to its current status."""
+    return IncidentEvent(
+        type="incident.status_changed",
+        incident=incident,
+        occurred_at=changed_at,
+    )
+
+
+def _to_columns(incidents: Sequence[Incident]) -> IncidentColumns:
+    """Store incidents column by column."""
+    return {
+        "id": [incident.id for incident in incidents],
+        "description": [incident.description for incident in incidents],
+        "status": [incident.status.value for incident in incidents],
+        "source": [incident.source.value for incident in incidents],
+        "created_at": [incident.created_at for incident in incidents],
+    }
@@ -1,56 +1,358 @@
 """Dependency injection container."""
 
-from typing import Annotated
+import os
+from collections.abc import Callable, Hashable
+from functools import partial
+from typing import Annotated, Any, TypeVar, cast
 
 from fastapi import Depends
-from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.application.counting import CountCache
+from app.application.idempotency import IdempotencyCache
+from app.application.single_flight import SingleFlight
+from app.application.sla import SlaScheduler
 from app.application.use_cases import (
+    BulkUpdateIncidentStatusUseCase,
     CreateIncidentUseCase,
+    ExportIncidentsUseCase,
     GetIncidentByIdUseCase,
+    GetIncidentHistoryUseCase,
+    GetIncidentsByIdsUseCase,
     GetIncidentsUseCase,
+    GetMttrUseCase,
     UpdateIncidentStatusUseCase,
 )
-from app.domain.interfaces import IUnitOfWork
-from app.infrastructure.database import get_db
+from app.config import WORKER_ID_ENV, settings
+from app.domain.ids import SnowflakeIdGenerator
+from app.domain.interfaces import (
+    IIncidentArchive,
+    IUnitOfWork,
+    UnitOfWorkFactory,
+)
+from app.infrastructure.archive import FileIncidentArchive
+from app.infrastructure.database import (
+    async_session_maker,
+    pool_saturation,
+    read_session_maker,
+    shard_read_session_makers,
+    shard_session_makers,
+)
+from app.infrastructure.load_shedding import EventLoopLagMonitor, LoadShedder
+from app.infrastructure.memory import InMemoryDatabase, InMemoryUnitOfWork
+from app.infrastructure.rate_limit import (
+    InMemoryRateLimiterBackend,
+    RateLimiter,
+    RateLimiterBackend,
+    RedisRateLimiterBackend,
+    TokenBucketLimit,
+)
+from app.infrastructure.sharding import ShardedUnitOfWork, ShardRouter
 from app.infrastructure.unit_of_work import SQLAlchemyUnitOfWork
 
+# Shared across requests of the process
+idempotency_cache = IdempotencyCache(
+    max_size=settings.IDEMPOTENCY_CACHE_SIZE,
+    ttl_seconds=settings.IDEMPOTENCY_KEY_TTL_SECONDS,
+)
+count_cache = CountCache(ttl_seconds=settings.COUNT_CACHE_TTL_SECONDS)
+# Coalesces concurrent identical reads into one query and one response body
+read_flights: SingleFlight[bytes] = SingleFlight()
+
+
+def get_read_flights() -> SingleFlight[bytes]:
+    """Dependency for single-flight group of read endpoints."""
+    return read_flights
+
+
+def _create_rate_limiter() -> RateLimiter | None:
+    """Build ingestion rate limiter from settings."""
+    if not settings.RATE_LIMIT_ENABLED:
+        return None
+
+    backend: RateLimiterBackend
+    if settings.RATE_LIMIT_BACKEND == "redis":
+        backend = RedisRateLimiterBackend(settings.RATE_LIMIT_REDIS_URL)
+    else:
+        backend = InMemoryRateLimiterBackend()
+
+    return RateLimiter(
+        backend,
+        source_limits={
+            source: TokenBucketLimit(
+                rate=rate,
+                burst=settings.RATE_LIMIT_SOURCE_BURSTS.get(
+                    source, max(int(rate), 1)
+                ),
+            )
+            for source, rate in settings.RATE_LIMIT_SOURCE_RATES.items()
+        },
+        client_limit=TokenBucketLimit(
+            rate=settings.RATE_LIMIT_CLIENT_RATE,
+            burst=settings.RATE_LIMIT_CLIENT_BURST,
+        ),
+        trusted_proxies=settings.RATE_LIMIT_TRUSTED_PROXIES,
+    )
+
+
+rate_limiter = _create_rate_limiter()
+loop_lag_monitor = EventLoopLagMonitor(
+    settings.LOOP_LAG_SAMPLE_INTERVAL_SECONDS
+)
+load_shedder = (
+    LoadShedder(
+        pool_saturation=pool_saturation,
+        loop_lag=lambda: loop_lag_monitor.lag_seconds,
+        max_pool_saturation=settings.LOAD_SHED_POOL_SATURATION,
+        max_loop_lag_seconds=settings.LOAD_SHED_LOOP_LAG_SECONDS,
+        retry_after_seconds=settings.LOAD_SHED_RETRY_AFTER_SECONDS,
+    )
+    if settings.LOAD_SHED_ENABLED
+    else None
+)
+
+
+async def get_rate_limiter() -> RateLimiter | None:
+    """Dependency for ingestion rate limiter."""
+    return rate_limiter
+
+
+async def get_load_shedder() -> LoadShedder | None:
+    """Dependency for load shedder."""
+    return load_shedder
+
+
+def _create_archive() -> IIncidentArchive | None:
+    """Build archive of closed incidents from settings."""
+    if not settings.ARCHIVE_ENABLED:
+        return None
+    return FileIncidentArchive(
+        settings.ARCHIVE_DIRECTORY, settings.ARCHIVE_COMPRESSION
+    )
+
+
+incident_archive = _create_archive()
+memory_database = (
+    InMemoryDatabase(settings.MEMORY_LOG_PATH, settings.MEMORY_LOG_FSYNC)
+    if settings.STORAGE_BACKEND == "memory"
+    else None
+)
+shard_router = ShardRouter(len(shard_session_makers), settings.SHARD_KEY)
+_id_generators: dict[int, SnowflakeIdGenerator] = {}
+
+
+def get_id_generator() -> SnowflakeIdGenerator:
+    """Get incident ID generator of the current worker process.
+
+    Created on first use, because workers are forked after import and
+    learn their index only then.
+    """
+    pid = os.getpid()
+    generator = _id_generators.get(pid)
+    if generator is None:
+        worker_id = settings.ID_WORKER_ID_BASE + int(
+            os.environ.get(WORKER_ID_ENV, "0")
+        )
+        generator = _id_generators[pid] = SnowflakeIdGenerator(worker_id)
+    return generator
+
+
+def _create_uow() -> IUnitOfWork:
+    """Create Unit of Work that opens a session on first repository use."""
+    if memory_database is not None:
+        return InMemoryUnitOfWork(
+            memory_database,
+            incident_archive,
+            get_id_generator(),
+            webhook_endpoints=settings.WEBHOOK_ENDPOINTS,
+        )
+    if len(shard_session_makers) > 1:
+        return ShardedUnitOfWork(
+            shard_session_makers,
+            shard_router,
+            get_id_generator(),
+            incident_archive,
+            webhook_endpoints=settings.WEBHOOK_ENDPOINTS,
+        )
+    return SQLAlchemyUnitOfWork(
+        async_session_maker,
+        incident_archive,
+        get_id_generator(),
+        webhook_endpoints=settings.WEBHOOK_ENDPOINTS,
+    )
+
+
+def _create_read_uow() -> IUnitOfWork:
+    """Create read-only Unit of Work that never commits."""
+    if memory_database is not None:
+        return InMemoryUnitOfWork(
+            memory_database, incident_archive, read_only=True
+        )
+    if len(shard_read_session_makers) > 1:
+        return ShardedUnitOfWork(
+            shard_read_session_makers,
+            shard_router,
+            get_id_generator(),
+            incident_archive,
+            read_only=True,
+        )
+    return SQLAlchemyUnitOfWork(
+        read_session_maker, incident_archive, read_only=True
+    )
+
+
+# Read-only counterparts of Unit of Work factories
+_read_uow_factories: dict[UnitOfWorkFactory, UnitOfWorkFactory] = (
+    {}
+    if settings.DB_READ_ONLY_MODE == "off"
+    else {_create_uow: _create_read_uow}
+)
+
+# Deadlines of unresolved incidents, loaded and ticked by the lifespan
+sla_scheduler = (
+    SlaScheduler(
+        _create_uow,
+        settings.SLA_SECONDS,
+        settings.SLA_SOURCE_SECONDS,
+        settings.SLA_TICK_SECONDS,
+    )
+    if settings.SLA_ENABLED
+    else None
+)
+
 
-async def get_uow(db: AsyncSession = Depends(get_db)) -> IUnitOfWork:
-    """Dependency for getting Unit of Work implementation."""
-    return SQLAlchemyUnitOfWork(db)
+async def get_uow_factory() -> UnitOfWorkFactory:
+    """Dependency for getting Unit of Work factory."""
+    return _create_uow
 
 
-def get_create_incident_use_case(
-    uow: IUnitOfWork = Depends(get_uow),
+UnitOfWorkFactoryDep = Annotated[UnitOfWorkFactory, Depends(get_uow_factory)]
+
+
+async def get_read_uow_factory(
+    uow_factory: UnitOfWorkFactoryDep,
+) -> UnitOfWorkFactory:
+    """Dependency for Unit of Work factory of read-only use cases.
+
+    Factories without a read-only counterpart, such as overridden ones,
+    serve reads as well.
+    """
+    return _read_uow_factories.get(uow_factory, uow_factory)
+
+
+ReadUnitOfWorkFactoryDep = Annotated[
+    UnitOfWorkFactory, Depends(get_read_uow_factory)
+]
+
+UseCaseT = TypeVar("UseCaseT")
+
+# Use cases keep no per-request state, one instance per factory is enough
+_use_cases: dict[tuple[Hashable, UnitOfWorkFactory], Any] = {}
+
+
+def _use_case(  # noqa: UP047 - keep Python 3.11 support
+    build: Callable[[UnitOfWorkFactory], UseCaseT],
+    uow_factory: UnitOfWorkFactory,
+) -> UseCaseT:
+    """Get cached use case instance bound to the Unit of Work factory."""
+    key = (build, uow_factory)
+    use_case = _use_cases.get(key)
+    if use_case is None:
+        use_case = _use_cases[key] = build(uow_factory)
+    return cast("UseCaseT", use_case)
+
+
+_create_incident = partial(
+    CreateIncidentUseCase,
+    idempotency_cache=idempotency_cache,
+    count_cache=count_cache,
+    sla_scheduler=sla_scheduler,
+)
+_get_incidents = partial(
+    GetIncidentsUseCase,
+    count_cache=count_cache,
+    count_mode=settings.LIST_COUNT_MODE,
+)
+_update_incident_status = partial(
+    UpdateIncidentStatusUseCase,
+    count_cache=count_cache,
+    sla_scheduler=sla_scheduler,
+)
+_bulk_update_incident_status = partial(
+    BulkUpdateIncidentStatusUseCase,
+    count_cache=count_cache,
+    sla_scheduler=sla_scheduler,
+)
+
+
+async def get_create_incident_use_case(
+    uow_factory: UnitOfWorkFactoryDep,
 ) -> CreateIncidentUseCase:
     """Dependency for CreateIncidentUseCase."""
-    return CreateIncidentUseCase(uow)
+    return _use_case(_create_incident, uow_factory)
 
 
-def get_get_incidents_use_case(
-    uow: IUnitOfWork = Depends(get_uow),
+async def get_get_incidents_use_case(
+    uow_factory: ReadUnitOfWorkFactoryDep,
 ) -> GetIncidentsUseCase:
     """Dependency for GetIncidentsUseCase."""
-    return GetIncidentsUseCase(uow)
+    return _use_case(_get_incidents, uow_factory)
 
 
-def get_get_incident_by_id_use_case(
-    uow: IUnitOfWork = Depends(get_uow),
+async def get_get_incident_by_id_use_case(
+    uow_factory: ReadUnitOfWorkFactoryDep,
 ) -> GetIncidentByIdUseCase:
     """Dependency for GetIncidentByIdUseCase."""
-    return GetIncidentByIdUseCase(uow)
+    return _use_case(GetIncidentByIdUseCase, uow_factory)
+
+
+async def get_get_incidents_by_ids_use_case(
+    uow_factory: ReadUnitOfWorkFactoryDep,
+) -> GetIncidentsByIdsUseCase:
+    """Dependency for GetIncidentsByIdsUseCase."""
+    return _use_case(GetIncidentsByIdsUseCase, uow_factory)
 
 
-def get_update_incident_status_use_case(
-    uow: IUnitOfWork = Depends(get_uow),
+async def get_update_incident_status_use_case(
+    uow_factory: UnitOfWorkFactoryDep,
 ) -> UpdateIncidentStatusUseCase:
     """Dependency for UpdateIncidentStatusUseCase."""
-    return UpdateIncidentStatusUseCase(uow)
+    return _use_case(_update_incident_status, uow_factory)
+
+
+async def get_get_incident_history_use_case(
+    uow_factory: ReadUnitOfWorkFactoryDep,
+) -> GetIncidentHistoryUseCase:
+    """Dependency for GetIncidentHistoryUseCase."""
+    return _use_case(GetIncidentHistoryUseCase, uow_factory)
+
+
+async def get_get_mttr_use_case(
+    uow_factory: ReadUnitOfWorkFactoryDep,
+) -> GetMttrUseCase:
+    """Dependency for GetMttrUseCase."""
+    return _use_case(GetMttrUseCase, uow_factory)
+
+
+async def get_bulk_update_incident_status_use_case(
+    uow_factory: UnitOfWorkFactoryDep,
+) -> BulkUpdateIncidentStatusUseCase:
+    """Dependency for BulkUpdateIncidentStatusUseCase."""
+    return _use_case(_bulk_update_incident_status, uow_factory)
+
+
+# Export streams rows through a server-side cursor, which needs a
+# transaction, so it keeps the regular Unit of Work
+async def get_export_incidents_use_case(
+    uow_factory: UnitOfWorkFactoryDep,
+) -> ExportIncidentsUseCase:
+    """Dependency for ExportIncidentsUseCase."""
+    return _use_case(ExportIncidentsUseCase, uow_factory)
 
 
 # Type aliases for dependency injection
-UnitOfWorkDep = Annotated[IUnitOfWork, Depends(get_uow)]
+RateLimiterDep = Annotated[RateLimiter | None, Depends(get_rate_limiter)]
+LoadShedderDep = Annotated[LoadShedder | None, Depends(get_load_shedder)]
+ReadFlightsDep = Annotated[SingleFlight[bytes], Depends(get_read_flights)]
 CreateIncidentUseCaseDep = Annotated[
     CreateIncidentUseCase, Depends(get_create_incident_use_case)
 ]
@@ -60,6 +362,20 @@ GetIncidentsUseCaseDep = Annotated[
 GetIncidentByIdUseCaseDep = Annotated[
     GetIncidentByIdUseCase, Depends(get_get_incident_by_id_use_case)
 ]
+GetIncidentsByIdsUseCaseDep = Annotated[
+    GetIncidentsByIdsUseCase, Depends(get_get_incidents_by_ids_use_case)
+]
 UpdateIncidentStatusUseCaseDep = Annotated[
     UpdateIncidentStatusUseCase, Depends(get_update_incident_status_use_case)
 ]
+GetIncidentHistoryUseCaseDep = Annotated[
+    GetIncidentHistoryUseCase, Depends(get_get_incident_history_use_case)
+]
+GetMttrUseCaseDep = Annotated[GetMttrUseCase, Depends(get_get_mttr_use_case)]
+BulkUpdateIncidentStatusUseCaseDep = Annotated[
+    BulkUpdateIncidentStatusUseCase,
+    Depends(get_bulk_update_incident_status_use_case),
+]
+ExportIncidentsUseCaseDep = Annotated[
+    ExportIncidentsUseCase, Depends(get_export_incidents_use_case)
+]
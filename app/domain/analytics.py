@@ -0,0 +1,156 @@
+"""Running aggregates for incident resolution time analytics."""
+
+import math
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Any
+
+from app.domain.enums import IncidentSource
+
+# Relative error of quantiles estimated by DurationSketch
+SKETCH_RELATIVE_ACCURACY = 0.01
+# Durations below this value (seconds) are counted in the zero bucket
+SKETCH_MIN_VALUE = 1e-3
+# Upper bound on sketch size; lowest buckets are collapsed beyond it
+SKETCH_MAX_BINS = 2048
+
+
+@dataclass
+class DurationSketch:
+    """Mergeable quantile sketch with relative accuracy (DDSketch).
+
+    Values are counted in logarithmically sized buckets, so the sketch size
+    depends on the value range, not on the number of values.
+    """
+
+    bins: dict[int, int] = field(default_factory=dict)
+    zero_count: int = 0
+
+    _gamma = (1 + SKETCH_RELATIVE_ACCURACY) / (1 - SKETCH_RELATIVE_ACCURACY)
+    _log_gamma = math.log(_gamma)
+
+    @property
+    def count(self) -> int:
+        """Number of values in the sketch."""
+        return self.zero_count + sum(self.bins.values())
+
+    def add(self, value: float, count: int = 1) -> None:
+        """Add value to the sketch."""
+        if value <= SKETCH_MIN_VALUE:
+            self.zero_count += count
+            return
+
+        index = math.ceil(math.log(value) / self._log_gamma)
+        self.bins[index] = self.bins.get(index, 0) + count
+        self._collapse()
+
+    def merge(self, other: "DurationSketch") -> None:
+        """Merge another sketch into this one."""
+        self.zero_count += other.zero_count
+        for index, count in other.bins.items():
+            self.bins[index] = self.bins.get(index, 0) + count
+        self._collapse()
+
+    def quantile(self, q: float) -> float | None:
+        """Estimate the value at quantile q (0 <= q <= 1)."""
+        total = self.count
+        if total == 0:
+            return None
+
+        rank = q * (total - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+
+        for index in sorted(self.bins):
+            seen += self.bins[index]
+            if rank < seen:
+                return 2 * self._gamma**index / (self._gamma + 1)
+
+        return 2 * self._gamma ** max(self.bins) / (self._gamma + 1)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize sketch to JSON-compatible dict."""
+        return {
+            "zero_count": self.zero_count,
+            "bins": {str(index): count for index, count in self.bins.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "DurationSketch":
+        """Deserialize sketch from dict."""
+        return cls(
+            bins={
+                int(index): int(count)
+                for index, count in data.get("bins", {}).items()
+            },
+            zero_count=int(data.get("zero_count", 0)),
+        )
+
+    def _collapse(self) -> None:
+        """Fold the lowest buckets together to bound sketch size."""
+        while len(self.bins) > SKETCH_MAX_BINS:
+            lowest, second = sorted(self.bins)[:2]
+            self.bins[second] += self.bins.pop(lowest)
+
+
+@dataclass
+class DurationStats:
+    """Running count, sum and sum of squares of durations in seconds."""
+
+    count: int = 0
+    total_seconds: float = 0.0
+    total_squared_seconds: float = 0.0
+    sketch: DurationSketch = field(default_factory=DurationSketch)
+
+    @property
+    def mean_seconds(self) -> float | None:
+        """Mean duration."""
+        if self.count == 0:
+            return None
+        return self.total_seconds / self.count
+
+    @property
+    def stddev_seconds(self) -> float | None:
+        """Population standard deviation of durations."""
+        mean = self.mean_seconds
+        if mean is None:
+            return None
+        variance = self.total_squared_seconds / self.count - mean**2
+        return math.sqrt(max(variance, 0.0))
+
+    def add(self, seconds: float) -> None:
+        """Account one duration."""
+        self.count += 1
+        self.total_seconds += seconds
+        self.total_squared_seconds += seconds**2
+        self.sketch.add(seconds)
+
+    def merge(self, other: "DurationStats") -> None:
+        """Merge another aggregate into this one."""
+        self.count += other.count
+        self.total_seconds += other.total_seconds
+        self.total_squared_seconds += other.total_squared_seconds
+        self.sketch.merge(other.sketch)
+
+    def quantile(self, q: float) -> float | None:
+        """Estimate duration at quantile q."""
+        return self.sketch.quantile(q)
+
+
+@dataclass(frozen=True)
+class Resolution:
+    """Fact of incident being closed, used to update MTTR aggregates."""
+
+    source: IncidentSource
+    resolved_at: datetime
+    duration_seconds: float
+
+
+@dataclass
+class MttrReport:
+    """Mean time to resolve, overall and per incident source."""
+
+    day: date | None
+    overall: DurationStats
+    by_source: dict[IncidentSource, DurationStats]
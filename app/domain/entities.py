@@ -1,10 +1,30 @@
 """Domain entities."""
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
+from typing import Any, Literal, get_args
 
 from app.domain.enums import IncidentSource, IncidentStatus
 
+# Incident attributes a projection may select
+IncidentField = Literal["id", "description", "status", "source", "created_at"]
+INCIDENT_FIELDS: tuple[IncidentField, ...] = get_args(IncidentField)
+
+# Incident reduced to the selected attributes
+IncidentProjection = dict[IncidentField, Any]
+
+# Incidents stored column by column, status and source as enum values
+IncidentColumns = dict[IncidentField, list[Any]]
+
+# How the incident list counts matching incidents: exact (cached for a
+# short time), estimate (planner statistics) or none
+CountMode = Literal["exact", "estimate", "none"]
+
+# Incident changes webhook endpoints are notified about
+IncidentEventType = Literal[
+    "incident.created", "incident.status_changed", "incident.sla_breached"
+]
+
 
 @dataclass
 class Incident:
@@ -20,3 +40,93 @@ class Incident:
         """Validate incident data."""
         if not self.description or not self.description.strip():
             raise ValueError("Description cannot be empty")
+
+
+@dataclass(frozen=True)
+class StatusChange:
+    """Entry of incident status history."""
+
+    incident_id: int
+    from_status: IncidentStatus | None
+    to_status: IncidentStatus
+    changed_at: datetime
+
+
+@dataclass(frozen=True)
+class ArchivedIncident:
+    """Incident moved to the archive together with its status history."""
+
+    incident: Incident
+    history: list[StatusChange]
+
+
+@dataclass(frozen=True)
+class IncidentFilter:
+    """Criteria for selecting a set of incidents."""
+
+    status: IncidentStatus | None = None
+    source: IncidentSource | None = None
+    created_from: datetime | None = None
+    created_to: datetime | None = None
+
+
+@dataclass
+class BulkStatusUpdateResult:
+    """Result of a bulk status update."""
+
+    updated: list[Incident] = field(default_factory=list)
+    not_found: list[int] = field(default_factory=list)
+    rejected: list[int] = field(default_factory=list)
+
+
+@dataclass
+class IncidentLookupResult:
+    """Incidents found by IDs, in the requested order."""
+
+    found: list[Incident] = field(default_factory=list)
+    not_found: list[int] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class IdempotencyRecord:
+    """Stored outcome of a request made with an idempotency key.
+
+    ``incident`` is None while the original request is still in progress.
+    """
+
+    key: str
+    fingerprint: str
+    incident: Incident | None
+    created_at: datetime
+
+
+@dataclass(frozen=True)
+class IncidentEvent:
+    """Committed change of an incident."""
+
+    type: IncidentEventType
+    incident: Incident
+    occurred_at: datetime
+
+
+@dataclass(frozen=True)
+class SlaBreach:
+    """Incident left unresolved past its SLA deadline.
+
+    An incident breaches at most once per open period, the one starting
+    at ``opened_at``.
+    """
+
+    incident: Incident
+    opened_at: datetime
+    deadline: datetime
+
+
+@dataclass(frozen=True)
+class WebhookDelivery:
+    """Event payload queued for delivery to one webhook endpoint."""
+
+    id: int
+    endpoint: str
+    payload: dict[str, Any]
+    attempts: int
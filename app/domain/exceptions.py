@@ -1,5 +1,7 @@
 """Domain exceptions."""
 
+from app.domain.enums import IncidentStatus
+
 
 class DomainException(Exception):
     """Base domain exception."""
@@ -11,3 +13,51 @@ class IncidentNotFoundError(DomainException):
     def __init__(self, incident_id: int):
         self.incident_id = incident_id
         super().__init__(f"Incident with id {incident_id} not found")
+
+
+class IncidentArchivedError(DomainException):
+    """Raised when an archived incident is changed."""
+
+    def __init__(self, incident_id: int):
+        self.incident_id = incident_id
+        super().__init__(
+            f"Incident with id {incident_id} is archived and read-only"
+        )
+
+
+class InvalidStatusTransitionError(DomainException):
+    """Raised when incident status change is not allowed."""
+
+    def __init__(
+        self,
+        incident_id: int,
+        current: IncidentStatus,
+        target: IncidentStatus,
+    ):
+        self.incident_id = incident_id
+        self.current = current
+        self.target = target
+        super().__init__(
+            f"Incident with id {incident_id} cannot change status "
+            f"from '{current.value}' to '{target.value}'"
+        )
+
+
+class IdempotencyKeyConflictError(DomainException):
+    """Raised when idempotency key is reused with a different request."""
+
+    def __init__(self, key: str):
+        self.key = key
+        super().__init__(
+            f"Idempotency key '{key}' was already used with another request"
+        )
+
+
+class IdempotencyKeyInProgressError(DomainException):
+    """Raised when request with the same idempotency key is in progress."""
+
+    def __init__(self, key: str):
+        self.key = key
+        super().__init__(
+            f"Request with idempotency key '{key}' is still in progress"
+        )
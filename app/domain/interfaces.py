@@ -1,10 +1,25 @@
 """Repository interfaces (ports)."""
 
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator, Callable, Sequence
+from datetime import date, datetime
 from types import TracebackType
 
-from app.domain.entities import Incident
-from app.domain.enums import IncidentStatus
+from app.domain.analytics import DurationStats, Resolution
+from app.domain.entities import (
+    ArchivedIncident,
+    IdempotencyRecord,
+    Incident,
+    IncidentColumns,
+    IncidentEvent,
+    IncidentField,
+    IncidentFilter,
+    IncidentProjection,
+    SlaBreach,
+    StatusChange,
+    WebhookDelivery,
+)
+from app.domain.enums import IncidentSource, IncidentStatus
 
 
 class IIncidentRepository(ABC):
@@ -14,27 +29,273 @@ class IIncidentRepository(ABC):
     async def create(self, incident: Incident) -> Incident:
         """Create a new incident."""
 
+    @abstractmethod
+    async def create_many(
+        self, incidents: Sequence[Incident]
+    ) -> list[Incident]:
+        """Create incidents with bulk statements, in the given order."""
+
     @abstractmethod
     async def get_all(
-        self, status: IncidentStatus | None = None
+        self,
+        status: IncidentStatus | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+    ) -> list[Incident]:
+        """Get a page of incidents, newest first, optionally by status."""
+
+    @abstractmethod
+    async def get_projection(
+        self,
+        fields: Sequence[IncidentField],
+        status: IncidentStatus | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+        before_id: int | None = None,
+    ) -> list[IncidentProjection]:
+        """Get a page of incidents reading only the given attributes.
+
+        Ordered and paginated as ``get_all``, or as ``get_before`` when
+        ``before_id`` is given.
+        """
+
+    @abstractmethod
+    async def get_columns(
+        self,
+        fields: Sequence[IncidentField],
+        status: IncidentStatus | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+        before_id: int | None = None,
+    ) -> IncidentColumns:
+        """Get the page of ``get_projection`` as one list per attribute."""
+
+    @abstractmethod
+    async def get_before(
+        self,
+        before_id: int | None,
+        limit: int,
+        status: IncidentStatus | None = None,
     ) -> list[Incident]:
-        """Get all incidents, optionally filtered by status."""
+        """Get incidents with IDs below before_id, highest ID first.
+
+        IDs grow with creation time, so this is a page of older incidents
+        found by an index range scan, whatever the page depth.
+        """
+
+    @abstractmethod
+    async def count(self, status: IncidentStatus | None = None) -> int:
+        """Count incidents, optionally by status."""
+
+    @abstractmethod
+    async def estimate_count(
+        self, status: IncidentStatus | None = None
+    ) -> int:
+        """Estimate the count of incidents without reading them.
+
+        Storages without planner statistics count exactly.
+        """
 
     @abstractmethod
     async def get_by_id(self, incident_id: int) -> Incident | None:
         """Get incident by ID."""
 
+    @abstractmethod
+    async def get_many(self, ids: Sequence[int]) -> list[Incident | None]:
+        """Get incidents by IDs, aligned with the IDs, None when missing."""
+
+    @abstractmethod
+    async def get_existing_ids(self, ids: Sequence[int]) -> set[int]:
+        """Get the subset of given IDs that exist, archived ones included."""
+
     @abstractmethod
     async def update_status(
         self, incident_id: int, status: IncidentStatus
     ) -> Incident:
-        """Update incident status."""
+        """Update incident status and record it in status history.
+
+        Raises InvalidStatusTransitionError if the move is not allowed and
+        IncidentArchivedError for an archived incident.
+        """
+
+    @abstractmethod
+    async def update_status_many(
+        self,
+        status: IncidentStatus,
+        ids: Sequence[int] | None = None,
+        criteria: IncidentFilter | None = None,
+    ) -> list[Incident]:
+        """Update status of all matching incidents with set-based statements.
+
+        Only incidents allowed to move to ``status`` are updated, and each
+        update is recorded in status history. Returns the updated incidents;
+        ``ids`` and ``criteria`` are combined.
+        """
+
+    @abstractmethod
+    async def get_history(self, incident_id: int) -> list[StatusChange]:
+        """Get status history of incident ordered by change time."""
+
+    @abstractmethod
+    async def get_opened_at(self, ids: Sequence[int]) -> dict[int, datetime]:
+        """Get when incidents were last opened, from status history.
+
+        An incident is opened by its creation in an unresolved status or by
+        a move out of a resolved one. Changes of the current transaction
+        count; incidents never opened are left out.
+        """
+
+    @abstractmethod
+    def stream_all(self) -> AsyncIterator[Incident]:
+        """Iterate over all incidents, archived ones included."""
+
+    @abstractmethod
+    async def get_archivable(
+        self, closed_before: datetime, limit: int
+    ) -> list[ArchivedIncident]:
+        """Get closed incidents without status changes since the moment.
+
+        Returned incidents are locked until the end of the transaction.
+        """
+
+    @abstractmethod
+    async def delete_many(self, ids: Sequence[int]) -> int:
+        """Delete incidents and their status history."""
+
+
+class IIncidentArchive(ABC):
+    """Interface for cold storage of closed incidents."""
+
+    @abstractmethod
+    async def append(self, records: Sequence[ArchivedIncident]) -> None:
+        """Store incidents durably."""
+
+    @abstractmethod
+    async def get(self, incident_id: int) -> ArchivedIncident | None:
+        """Get archived incident with its status history."""
+
+    @abstractmethod
+    def stream_all(self) -> AsyncIterator[Incident]:
+        """Iterate over archived incidents."""
+
+
+class IIncidentAnalyticsRepository(ABC):
+    """Interface for incremental incident analytics aggregates."""
+
+    @abstractmethod
+    async def record_resolutions(
+        self, resolutions: Sequence[Resolution]
+    ) -> None:
+        """Add resolution times to per-source and per-day aggregates."""
+
+    @abstractmethod
+    async def get_mttr_by_source(
+        self, day: date | None = None
+    ) -> dict[IncidentSource, DurationStats]:
+        """Get resolution time aggregates per source for all time or a day."""
+
+
+class IIdempotencyKeyRepository(ABC):
+    """Interface for idempotency key storage."""
+
+    @abstractmethod
+    async def reserve(
+        self, key: str, fingerprint: str, created_at: datetime
+    ) -> IdempotencyRecord | None:
+        """Claim the key for the current transaction.
+
+        Returns None if the key was claimed, or the existing record if the
+        key is already taken. Waits for a concurrent claim to finish.
+        """
+
+    @abstractmethod
+    async def complete(
+        self, key: str, incident: Incident
+    ) -> IdempotencyRecord:
+        """Store the outcome of request for a claimed key."""
+
+    @abstractmethod
+    async def delete_expired(self, before: datetime) -> int:
+        """Delete keys created before the given moment."""
+
+
+class IWebhookOutboxRepository(ABC):
+    """Interface for the outbox of webhook deliveries.
+
+    Events are queued in the transaction of the change they describe, so
+    only committed changes are delivered.
+    """
+
+    @abstractmethod
+    async def add(self, events: Sequence[IncidentEvent]) -> None:
+        """Queue events for every webhook endpoint."""
+
+    @abstractmethod
+    async def claim(
+        self, now: datetime, lease_until: datetime, limit: int
+    ) -> list[WebhookDelivery]:
+        """Take due deliveries, oldest first, hiding them until the lease.
+
+        A delivery that is neither deleted nor retried before the lease
+        ends is due again, so a crashed dispatcher loses nothing.
+        """
+
+    @abstractmethod
+    async def delete(self, ids: Sequence[int]) -> None:
+        """Delete delivered deliveries."""
+
+    @abstractmethod
+    async def retry(
+        self, ids: Sequence[int], next_attempt_at: datetime, error: str
+    ) -> None:
+        """Count a failed attempt and schedule the next one."""
+
+    @abstractmethod
+    async def dead_letter(
+        self, deliveries: Sequence[WebhookDelivery], error: str
+    ) -> None:
+        """Move deliveries out of attempts to the dead letters."""
+
+
+class ISlaBreachRepository(ABC):
+    """Interface for the record of SLA breaches."""
+
+    @abstractmethod
+    async def record(self, breaches: Sequence[SlaBreach]) -> list[SlaBreach]:
+        """Record breaches, returning those not recorded before.
+
+        Schedulers of several workers detecting the same breach report it
+        once.
+        """
 
 
 class IUnitOfWork(ABC):
     """Interface for Unit of Work pattern."""
 
-    incidents: IIncidentRepository
+    @property
+    @abstractmethod
+    def incidents(self) -> IIncidentRepository:
+        """Incident repository."""
+
+    @property
+    @abstractmethod
+    def analytics(self) -> IIncidentAnalyticsRepository:
+        """Incident analytics repository."""
+
+    @property
+    @abstractmethod
+    def idempotency_keys(self) -> IIdempotencyKeyRepository:
+        """Idempotency key repository."""
+
+    @property
+    @abstractmethod
+    def webhooks(self) -> IWebhookOutboxRepository:
+        """Webhook outbox repository."""
+
+    @property
+    @abstractmethod
+    def sla_breaches(self) -> ISlaBreachRepository:
+        """SLA breach repository."""
 
     @abstractmethod
     async def __aenter__(self) -> "IUnitOfWork":
@@ -56,3 +317,7 @@ class IUnitOfWork(ABC):
     @abstractmethod
     async def rollback(self) -> None:
         """Rollback the transaction."""
+
+
+# Creates a new unit of work for each business transaction
+UnitOfWorkFactory = Callable[[], IUnitOfWork]
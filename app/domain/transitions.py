@@ -0,0 +1,47 @@
+"""Incident status state machine."""
+
+from collections.abc import Mapping
+
+from app.domain.enums import IncidentStatus
+
+# Allowed moves: current status -> statuses it may change to
+ALLOWED_TRANSITIONS: Mapping[IncidentStatus, frozenset[IncidentStatus]] = {
+    IncidentStatus.OPEN: frozenset(
+        {IncidentStatus.IN_PROGRESS, IncidentStatus.CLOSED}
+    ),
+    IncidentStatus.IN_PROGRESS: frozenset(
+        {IncidentStatus.OPEN, IncidentStatus.CLOSED}
+    ),
+    IncidentStatus.CLOSED: frozenset({IncidentStatus.OPEN}),
+}
+
+
+# Statuses of a resolved incident; moving out of them reopens it
+RESOLVED_STATUSES = frozenset({IncidentStatus.CLOSED})
+
+
+def is_transition_allowed(
+    current: IncidentStatus, target: IncidentStatus
+) -> bool:
+    """Check whether status may change from current to target."""
+    return target in ALLOWED_TRANSITIONS[current]
+
+
+def is_opening(
+    previous: IncidentStatus | None, status: IncidentStatus
+) -> bool:
+    """Check whether a move opens the incident: creates or reopens it."""
+    return (
+        previous is None or previous in RESOLVED_STATUSES
+    ) and status not in RESOLVED_STATUSES
+
+
+def allowed_previous_statuses(
+    target: IncidentStatus,
+) -> list[IncidentStatus]:
+    """Get statuses from which the target status is reachable."""
+    return [
+        current
+        for current, targets in ALLOWED_TRANSITIONS.items()
+        if target in targets
+    ]
@@ -0,0 +1,297 @@
+"""File archive of closed incidents in compressed NDJSON segments."""
+
+import asyncio
+import contextlib
+import gzip
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Iterator, Sequence
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import IO, Any, Literal, cast
+
+from app.domain.entities import ArchivedIncident, Incident, StatusChange
+from app.domain.enums import IncidentSource, IncidentStatus
+from app.domain.interfaces import IIncidentArchive
+
+ArchiveCompression = Literal["auto", "zstd", "gzip"]
+
+INDEX_FILE = "index.json"
+LOCK_FILE = ".lock"
+
+
+@dataclass(frozen=True)
+class ArchiveSegment:
+    """Segment file with the range of incident IDs it holds."""
+
+    file: str
+    min_id: int
+    max_id: int
+    count: int
+
+
+def _zstandard() -> Any:
+    """Import the optional zstandard package."""
+    try:
+        import zstandard
+    except ImportError as e:
+        raise RuntimeError(
+            "zstd archive compression requires the 'zstandard' package, "
+            "install it with the 'archive' extra"
+        ) from e
+    return zstandard
+
+
+def _resolve_compression(compression: ArchiveCompression) -> str:
+    """Pick zstd when available for automatic compression."""
+    if compression != "auto":
+        return compression
+    try:
+        _zstandard()
+    except RuntimeError:
+        return "gzip"
+    return "zstd"
+
+
+@contextlib.contextmanager
+def _open_compressed(
+    path: Path, mode: Literal["rb", "wb"]
+) -> Iterator[IO[bytes]]:
+    """Open segment for binary reading or writing by its extension."""
+    if path.suffix == ".gz":
+        with gzip.open(path, mode) as file:
+            yield cast("IO[bytes]", file)
+        return
+
+    zstandard = _zstandard()
+    with open(path, mode) as raw:
+        if mode == "wb":
+            with zstandard.ZstdCompressor(level=9).stream_writer(raw) as file:
+                yield file
+        else:
+            with zstandard.ZstdDecompressor().stream_reader(raw) as file:
+                yield file
+
+
+def _dump_record(record: ArchivedIncident) -> dict[str, Any]:
+    """Convert archived incident to a JSON object."""
+    incident = record.incident
+    return {
+        "id": incident.id,
+        "description": incident.description,
+        "status": incident.status.value,
+        "source": incident.source.value,
+        "created_at": incident.created_at.isoformat(),
+        "history": [
+            [
+                change.from_status.value if change.from_status else None,
+                change.to_status.value,
+                change.changed_at.isoformat(),
+            ]
+            for change in record.history
+        ],
+    }
+
+
+def _load_record(data: dict[str, Any]) -> ArchivedIncident:
+    """Convert JSON object to archived incident."""
+    incident_id = int(data["id"])
+    return ArchivedIncident(
+        incident=Incident(
+            id=incident_id,
+            description=data["description"],
+            status=IncidentStatus(data["status"]),
+            source=IncidentSource(data["source"]),
+            created_at=datetime.fromisoformat(data["created_at"]),
+        ),
+        history=[
+            StatusChange(
+                incident_id=incident_id,
+                from_status=(
+                    IncidentStatus(from_status) if from_status else None
+                ),
+                to_status=IncidentStatus(to_status),
+                changed_at=datetime.fromisoformat(changed_at),
+            )
+            for from_status, to_status, changed_at in data["history"]
+        ],
+    )
+
+
+class FileIncidentArchive(IIncidentArchive):
+    """Closed incidents in compressed NDJSON segments on local disk.
+
+    Every append writes one segment sorted by ID and registers its ID range
+    in ``index.json``, so a lookup decompresses only the segments whose
+    range contains the ID. Segments use zstd when the optional
+    ``zstandard`` package is installed and gzip otherwise.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        compression: ArchiveCompression = "auto",
+        cached_segments: int = 4,
+    ):
+        self.directory = Path(directory)
+        self.compression = _resolve_compression(compression)
+        self.cached_segments = cached_segments
+        self._lock = threading.Lock()
+        self._index: list[ArchiveSegment] = []
+        self._index_version: tuple[int, int] | None = None
+        self._segments: OrderedDict[str, dict[int, ArchivedIncident]] = (
+            OrderedDict()
+        )
+
+    async def append(self, records: Sequence[ArchivedIncident]) -> None:
+        """Store incidents durably in a new segment."""
+        if records:
+            await asyncio.to_thread(self._append, records)
+
+    async def get(self, incident_id: int) -> ArchivedIncident | None:
+        """Get archived incident with its status history."""
+        return await asyncio.to_thread(self._get, incident_id)
+
+    async def stream_all(self) -> AsyncIterator[Incident]:
+        """Iterate over archived incidents ordered by segment ID range."""
+        index = await asyncio.to_thread(self._current_index)
+        for segment in sorted(index, key=lambda s: (s.min_id, s.file)):
+            records = await asyncio.to_thread(self._read_segment, segment)
+            for record in records:
+                yield record.incident
+
+    def segments(self) -> list[ArchiveSegment]:
+        """Get segments registered in the index."""
+        return list(self._current_index())
+
+    def _append(self, records: Sequence[ArchivedIncident]) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        ordered = sorted(records, key=lambda r: r.incident.id or 0)
+        min_id = ordered[0].incident.id or 0
+        max_id = ordered[-1].incident.id or 0
+        extension = "zst" if self.compression == "zstd" else "gz"
+        name = (
+            f"segment-{min_id:020d}-{max_id:020d}-{time.time_ns()}"
+            f".ndjson.{extension}"
+        )
+
+        path = self.directory / name
+        partial = path.with_name(f".tmp-{name}")
+        with _open_compressed(partial, "wb") as file:
+            for record in ordered:
+                file.write(
+                    json.dumps(
+                        _dump_record(record), separators=(",", ":")
+                    ).encode()
+                    + b"\n"
+                )
+        self._fsync(partial)
+        os.replace(partial, path)
+        self._fsync_directory()
+
+        segment = ArchiveSegment(
+            file=name, min_id=min_id, max_id=max_id, count=len(ordered)
+        )
+        # One writer at a time may update the index across processes
+        with open(self.directory / LOCK_FILE, "a") as lock:
+            _lock_file(lock)
+            index = self._read_index()
+            index.append(segment)
+            self._write_index(index)
+
+    def _get(self, incident_id: int) -> ArchivedIncident | None:
+        candidates = [
+            segment
+            for segment in self._current_index()
+            if segment.min_id <= incident_id <= segment.max_id
+        ]
+        for segment in reversed(candidates):
+            record = self._cached_segment(segment).get(incident_id)
+            if record is not None:
+                return record
+        return None
+
+    def _cached_segment(
+        self, segment: ArchiveSegment
+    ) -> dict[int, ArchivedIncident]:
+        with self._lock:
+            records = self._segments.get(segment.file)
+            if records is not None:
+                self._segments.move_to_end(segment.file)
+                return records
+
+        records = {
+            record.incident.id or 0: record
+            for record in self._read_segment(segment)
+        }
+        with self._lock:
+            self._segments[segment.file] = records
+            while len(self._segments) > self.cached_segments:
+                self._segments.popitem(last=False)
+        return records
+
+    def _read_segment(self, segment: ArchiveSegment) -> list[ArchivedIncident]:
+        with _open_compressed(self.directory / segment.file, "rb") as file:
+            data = file.read()
+        return [_load_record(json.loads(line)) for line in data.splitlines()]
+
+    def _current_index(self) -> list[ArchiveSegment]:
+        """Get the index, re-reading it after another process changed it."""
+        try:
+            stat = (self.directory / INDEX_FILE).stat()
+        except FileNotFoundError:
+            return []
+
+        # The index is replaced on every write, so a new inode means changes
+        version = (stat.st_ino, stat.st_mtime_ns)
+        with self._lock:
+            if version != self._index_version:
+                self._index = self._read_index()
+                self._index_version = version
+            return self._index
+
+    def _read_index(self) -> list[ArchiveSegment]:
+        try:
+            data = json.loads((self.directory / INDEX_FILE).read_bytes())
+        except FileNotFoundError:
+            return []
+        return [ArchiveSegment(**segment) for segment in data["segments"]]
+
+    def _write_index(self, index: list[ArchiveSegment]) -> None:
+        with tempfile.NamedTemporaryFile(
+            "w", dir=self.directory, prefix=".index-", delete=False
+        ) as file:
+            json.dump({"segments": [asdict(s) for s in index]}, file)
+        self._fsync(Path(file.name))
+        os.replace(file.name, self.directory / INDEX_FILE)
+        self._fsync_directory()
+
+    @staticmethod
+    def _fsync(path: Path) -> None:
+        with open(path, "rb") as file:
+            os.fsync(file.fileno())
+
+    def _fsync_directory(self) -> None:
+        """Persist renames in the archive directory across a power loss."""
+        # Windows cannot open a directory, and commits renames itself
+        if os.name == "nt":
+            return
+        descriptor = os.open(self.directory, os.O_RDONLY)
+        try:
+            os.fsync(descriptor)
+        finally:
+            os.close(descriptor)
+
+
+def _lock_file(file: IO[str]) -> None:
+    """Hold an exclusive lock on the file until it is closed."""
+    try:
+        import fcntl
+    except ImportError:
+        return
+    fcntl.flock(file.fileno(), fcntl.LOCK_EX)
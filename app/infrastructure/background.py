@@ -0,0 +1,20 @@
+"""Background tasks running alongside the application."""
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+
+async def run_periodically(
+    interval_seconds: float,
+    func: Callable[[], Awaitable[object]],
+) -> None:
+    """Call func every interval until cancelled, surviving its failures."""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await func()
+        except Exception:
+            logger.exception("Periodic task %r failed", func)
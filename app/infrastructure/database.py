@@ -1,7 +1,8 @@
 """Database configuration and setup."""
 
-from collections.abc import AsyncGenerator
+from typing import Any
 
+from sqlalchemy import URL, make_url
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
@@ -12,21 +13,111 @@ from sqlalchemy.orm import DeclarativeBase
 
 from app.config import settings
 
+
+def _pool_options(database_url: str) -> dict[str, Any]:
+    """Get connection pool options supported by the database driver."""
+    if make_url(database_url).get_backend_name() == "sqlite":
+        return {}
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+    }
+
+
+def _engine_url(database_url: str) -> URL:
+    """Add statement cache options supported by the database driver."""
+    url = make_url(database_url)
+    # Prepared statements cached per connection by the asyncpg dialect;
+    # an explicit value in DATABASE_URL wins (0 behind pgbouncer)
+    if (
+        url.get_driver_name() != "asyncpg"
+        or "prepared_statement_cache_size" in url.query
+    ):
+        return url
+    return url.update_query_dict(
+        {
+            "prepared_statement_cache_size": str(
+                settings.DB_PREPARED_STATEMENT_CACHE_SIZE
+            )
+        }
+    )
+
+
+def _create_engine(database_url: str) -> AsyncEngine:
+    """Create async engine with pool and cache settings."""
+    return create_async_engine(
+        _engine_url(database_url),
+        echo=settings.DEBUG,
+        future=True,
+        query_cache_size=settings.DB_QUERY_CACHE_SIZE,
+        **_pool_options(database_url),
+    )
+
+
+def _create_session_maker(
+    db_engine: AsyncEngine,
+) -> async_sessionmaker[AsyncSession]:
+    """Create session factory bound to the engine."""
+    return async_sessionmaker(
+        db_engine,
+        class_=AsyncSession,
+        expire_on_commit=False,
+        autocommit=False,
+        autoflush=False,
+    )
+
+
+def _read_only_options(db_engine: AsyncEngine) -> dict[str, Any]:
+    """Get execution options of read-only sessions."""
+    if settings.DB_READ_ONLY_MODE == "autocommit":
+        # The driver sends statements without BEGIN and COMMIT around them
+        return {"isolation_level": "AUTOCOMMIT"}
+    if (
+        settings.DB_READ_ONLY_MODE == "transaction"
+        and db_engine.dialect.name == "postgresql"
+    ):
+        # Sent with BEGIN; a deferrable snapshot never aborts or blocks
+        # writers once taken
+        return {
+            "isolation_level": "SERIALIZABLE",
+            "postgresql_readonly": True,
+            "postgresql_deferrable": True,
+        }
+    return {}
+
+
+def _create_read_session_maker(
+    db_engine: AsyncEngine,
+) -> async_sessionmaker[AsyncSession]:
+    """Create session factory of read-only use cases.
+
+    The engine shares the connection pool of ``db_engine``.
+    """
+    return _create_session_maker(
+        db_engine.execution_options(**_read_only_options(db_engine))
+    )
+
+
 # Create async engine
-engine: AsyncEngine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=settings.DEBUG,
-    future=True,
-)
+engine: AsyncEngine = _create_engine(settings.DATABASE_URL)
+
+# Create async session factories
+async_session_maker = _create_session_maker(engine)
+read_session_maker = _create_read_session_maker(engine)
 
-# Create async session factory
-async_session_maker = async_sessionmaker(
+# Incident shards, the main database first
+shard_engines: list[AsyncEngine] = [
     engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-    autocommit=False,
-    autoflush=False,
-)
+    *(_create_engine(url) for url in settings.DATABASE_SHARD_URLS),
+]
+shard_session_makers = [
+    async_session_maker,
+    *(_create_session_maker(e) for e in shard_engines[1:]),
+]
+shard_read_session_makers = [
+    read_session_maker,
+    *(_create_read_session_maker(e) for e in shard_engines[1:]),
+]
 
 
 # Base class for models
@@ -34,18 +125,32 @@ class Base(DeclarativeBase):
     """Base class for all database models."""
 
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    """Get database session dependency."""
-    async with async_session_maker() as session:
-        yield session
+async def init_db() -> None:
+    """Initialize database tables on every shard."""
+    for db_engine in shard_engines:
+        async with db_engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
 
 
-async def init_db() -> None:
-    """Initialize database tables."""
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+def pool_saturation() -> float:
+    """Share of connection pool capacity checked out, busiest shard."""
+    capacity = settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+    if capacity <= 0:
+        return 0.0
+
+    saturation = 0.0
+    for db_engine in shard_engines:
+        checkedout = getattr(db_engine.pool, "checkedout", None)
+        if checkedout is not None:
+            saturation = max(saturation, float(checkedout()) / capacity)
+    return saturation
+
 
+async def dispose_db(close: bool = True) -> None:
+    """Dispose database engines of all shards.
 
-async def dispose_db() -> None:
-    """Dispose database engine."""
-    await engine.dispose()
+    With ``close=False`` pooled connections are dropped without closing
+    them, which a forked worker does with connections of its parent.
+    """
+    for db_engine in shard_engines:
+        await db_engine.dispose(close=close)
@@ -0,0 +1,49 @@
+"""Adaptive load shedding based on pool saturation and event loop lag."""
+
+import asyncio
+from collections.abc import Callable
+
+
+class EventLoopLagMonitor:
+    """Measure how late the event loop wakes up a sleeping task."""
+
+    def __init__(self, interval_seconds: float):
+        self.interval_seconds = interval_seconds
+        self.lag_seconds = 0.0
+
+    async def run(self) -> None:
+        """Sample loop lag until cancelled."""
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval_seconds)
+            self.lag_seconds = max(
+                loop.time() - started - self.interval_seconds, 0.0
+            )
+
+
+class LoadShedder:
+    """Decide whether to reject a request before it takes a connection."""
+
+    def __init__(
+        self,
+        pool_saturation: Callable[[], float],
+        loop_lag: Callable[[], float],
+        max_pool_saturation: float,
+        max_loop_lag_seconds: float,
+        retry_after_seconds: int,
+    ):
+        self.pool_saturation = pool_saturation
+        self.loop_lag = loop_lag
+        self.max_pool_saturation = max_pool_saturation
+        self.max_loop_lag_seconds = max_loop_lag_seconds
+        self.retry_after_seconds = retry_after_seconds
+
+    def check(self) -> int:
+        """Return 0 to accept the request, or seconds to retry after."""
+        if (
+            self.pool_saturation() >= self.max_pool_saturation
+            or self.loop_lag() >= self.max_loop_lag_seconds
+        ):
+            return self.retry_after_seconds
+        return 0
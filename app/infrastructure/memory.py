@@ -0,0 +1,1258 @@
+"""In-memory storage engine with indexes, snapshots and an append-only log."""
+
+import asyncio
+import copy
+import json
+import os
+from collections.abc import AsyncIterator, Iterator, Sequence
+from dataclasses import dataclass, replace
+from datetime import UTC, date, datetime
+from itertools import islice
+from pathlib import Path
+from types import TracebackType
+from typing import IO, Any
+
+from app.domain.analytics import DurationSketch, DurationStats, Resolution
+from app.domain.entities import (
+    ArchivedIncident,
+    IdempotencyRecord,
+    Incident,
+    IncidentColumns,
+    IncidentEvent,
+    IncidentField,
+    IncidentFilter,
+    IncidentProjection,
+    SlaBreach,
+    StatusChange,
+    WebhookDelivery,
+)
+from app.domain.enums import IncidentSource, IncidentStatus
+from app.domain.exceptions import (
+    IncidentArchivedError,
+    IncidentNotFoundError,
+    InvalidStatusTransitionError,
+)
+from app.domain.ids import SnowflakeIdGenerator
+from app.domain.interfaces import (
+    IIdempotencyKeyRepository,
+    IIncidentAnalyticsRepository,
+    IIncidentArchive,
+    IIncidentRepository,
+    ISlaBreachRepository,
+    IUnitOfWork,
+    IWebhookOutboxRepository,
+)
+from app.domain.transitions import (
+    allowed_previous_statuses,
+    is_opening,
+    is_transition_allowed,
+)
+from app.infrastructure.repository import (
+    MAX_INCIDENT_ID,
+    MTTR_TOTAL_PERIOD,
+    event_payload,
+    get_archived_ids,
+    stream_archived,
+)
+from app.infrastructure.sorted_map import SortedMap
+
+
+def _utc(moment: datetime) -> datetime:
+    """Make a moment comparable, naive ones are taken as UTC."""
+    if moment.tzinfo is None:
+        return moment.replace(tzinfo=UTC)
+    return moment
+
+
+@dataclass(frozen=True)
+class _OutboxEntry:
+    """Webhook delivery waiting in the outbox."""
+
+    delivery: WebhookDelivery
+    next_attempt_at: datetime
+    last_error: str | None = None
+
+
+@dataclass(frozen=True)
+class _DeadLetter:
+    """Webhook delivery that ran out of attempts."""
+
+    delivery: WebhookDelivery
+    error: str
+    failed_at: datetime
+
+
+class _State:
+    """Tables and indexes of the in-memory database.
+
+    Incidents are ordered by ID, with the IDs of each status and
+    (created_at, id) indexes of all incidents and of each status for
+    ordered pages. Tables and indexes are
+    persistent sorted maps, so a change costs O(log n) and leaves the maps
+    of other states intact. A transaction works on a fork holding the same
+    maps, so forking, committing and discarding it take O(1) and the
+    committed state is never modified. Each state owns the nodes it builds
+    and changes them in place, so a batch of changes copies each path once.
+    Changes of a fork are recorded as log operations.
+    """
+
+    def __init__(self) -> None:
+        self.incidents: SortedMap[int, Incident] = SortedMap()
+        self.by_status: dict[IncidentStatus, SortedMap[int, None]] = {
+            status: SortedMap() for status in IncidentStatus
+        }
+        self.by_created: SortedMap[tuple[datetime, int], None] = SortedMap()
+        self.by_status_created: dict[
+            IncidentStatus, SortedMap[tuple[datetime, int], None]
+        ] = {status: SortedMap() for status in IncidentStatus}
+        self.history: SortedMap[int, tuple[StatusChange, ...]] = SortedMap()
+        self.mttr: SortedMap[tuple[str, IncidentSource], DurationStats] = (
+            SortedMap()
+        )
+        self.idempotency_keys: SortedMap[str, IdempotencyRecord] = SortedMap()
+        self.webhook_outbox: SortedMap[int, _OutboxEntry] = SortedMap()
+        self.webhook_dead_letters: SortedMap[int, _DeadLetter] = SortedMap()
+        # Deadline of each incident detected past its SLA
+        # Deadlines by incident ID and start of the open period
+        self.sla_breaches: SortedMap[tuple[int, datetime], datetime] = (
+            SortedMap()
+        )
+        self.last_id = 0
+        self.last_webhook_id = 0
+        self.log: list[list[Any]] | None = None
+        self._owner = object()
+
+    def fork(self) -> "_State":
+        """Get a copy to change, sharing the maps with this state."""
+        state = copy.copy(self)
+        state.by_status = dict(self.by_status)
+        state.by_status_created = dict(self.by_status_created)
+        state.log = []
+        state._owner = object()
+        return state
+
+    def put_incident(self, incident: Incident) -> None:
+        """Insert or replace an incident, keeping the indexes."""
+        incident_id = incident.id
+        if incident_id is None:
+            raise ValueError("Stored incidents must have an ID")
+
+        old = self.incidents.get(incident_id)
+        self.incidents = self.incidents.set(incident_id, incident, self._owner)
+        if old is None:
+            self.by_created = self.by_created.set(
+                (_utc(incident.created_at), incident_id), None, self._owner
+            )
+            self.last_id = max(self.last_id, incident_id)
+        elif old.status != incident.status:
+            self._index_status(old, add=False)
+        if old is None or old.status != incident.status:
+            self._index_status(incident, add=True)
+        self._record("incident", _dump_incident(incident))
+
+    def delete_incident(self, incident_id: int) -> bool:
+        """Delete an incident with its status history."""
+        incident = self.incidents.get(incident_id)
+        if incident is None:
+            return False
+
+        self.incidents = self.incidents.delete(incident_id, self._owner)
+        self._index_status(incident, add=False)
+        self.by_created = self.by_created.delete(
+            (_utc(incident.created_at), incident_id), self._owner
+        )
+        if incident_id in self.history:
+            self.history = self.history.delete(incident_id, self._owner)
+        self._record("delete", incident_id)
+        return True
+
+    def add_history(self, change: StatusChange) -> None:
+        """Append an entry to the status history of an incident."""
+        self.history = self.history.set(
+            change.incident_id,
+            (*self.history.get(change.incident_id, ()), change),
+            self._owner,
+        )
+        self._record("history", _dump_change(change))
+
+    def put_mttr(
+        self, period: str, source: IncidentSource, stats: DurationStats
+    ) -> None:
+        """Store resolution time aggregate of a period and source."""
+        self.mttr = self.mttr.set((period, source), stats, self._owner)
+        self._record("mttr", _dump_mttr(period, source, stats))
+
+    def put_idempotency_key(self, record: IdempotencyRecord) -> None:
+        """Store an idempotency key record."""
+        self.idempotency_keys = self.idempotency_keys.set(
+            record.key, record, self._owner
+        )
+        self._record("idempotency_key", _dump_idempotency_record(record))
+
+    def delete_idempotency_key(self, key: str) -> None:
+        """Delete an idempotency key record."""
+        self.idempotency_keys = self.idempotency_keys.delete(key, self._owner)
+        self._record("idempotency_key_delete", key)
+
+    def put_webhook(self, entry: _OutboxEntry) -> None:
+        """Insert or replace a delivery of the webhook outbox."""
+        delivery = entry.delivery
+        self.webhook_outbox = self.webhook_outbox.set(
+            delivery.id, entry, self._owner
+        )
+        self.last_webhook_id = max(self.last_webhook_id, delivery.id)
+        self._record("webhook", _dump_outbox_entry(entry))
+
+    def delete_webhook(self, delivery_id: int) -> None:
+        """Delete a delivery of the webhook outbox."""
+        self.webhook_outbox = self.webhook_outbox.delete(
+            delivery_id, self._owner
+        )
+        self._record("webhook_delete", delivery_id)
+
+    def put_dead_letter(self, dead_letter: _DeadLetter) -> None:
+        """Store a webhook delivery that ran out of attempts."""
+        self.webhook_dead_letters = self.webhook_dead_letters.set(
+            dead_letter.delivery.id, dead_letter, self._owner
+        )
+        self._record("dead_letter", _dump_dead_letter(dead_letter))
+
+    def put_sla_breach(
+        self, key: tuple[int, datetime], deadline: datetime
+    ) -> None:
+        """Store an open period of incident detected past its deadline."""
+        self.sla_breaches = self.sla_breaches.set(key, deadline, self._owner)
+        self._record("sla_breach", _dump_sla_breach(key, deadline))
+
+    def apply(self, op: str, payload: Any) -> None:
+        """Apply an operation read from the log."""
+        if op == "incident":
+            self.put_incident(_load_incident(payload))
+        elif op == "delete":
+            self.delete_incident(payload)
+        elif op == "history":
+            self.add_history(_load_change(payload))
+        elif op == "mttr":
+            self.put_mttr(
+                payload["period"],
+                IncidentSource(payload["source"]),
+                DurationStats(
+                    count=payload["count"],
+                    total_seconds=payload["total_seconds"],
+                    total_squared_seconds=payload["total_squared_seconds"],
+                    sketch=DurationSketch.from_dict(payload["sketch"]),
+                ),
+            )
+        elif op == "idempotency_key":
+            self.put_idempotency_key(
+                IdempotencyRecord(
+                    key=payload["key"],
+                    fingerprint=payload["fingerprint"],
+                    incident=(
+                        None
+                        if payload["incident"] is None
+                        else _load_incident(payload["incident"])
+                    ),
+                    created_at=datetime.fromisoformat(payload["created_at"]),
+                )
+            )
+        elif op == "idempotency_key_delete":
+            self.delete_idempotency_key(payload)
+        elif op == "webhook":
+            self.put_webhook(
+                _OutboxEntry(
+                    delivery=_load_delivery(payload),
+                    next_attempt_at=datetime.fromisoformat(
+                        payload["next_attempt_at"]
+                    ),
+                    last_error=payload["last_error"],
+                )
+            )
+        elif op == "webhook_delete":
+            self.delete_webhook(payload)
+        elif op == "dead_letter":
+            self.put_dead_letter(
+                _DeadLetter(
+                    delivery=_load_delivery(payload),
+                    error=payload["error"],
+                    failed_at=datetime.fromisoformat(payload["failed_at"]),
+                )
+            )
+        elif op == "sla_breach":
+            self.put_sla_breach(
+                (
+                    payload["incident_id"],
+                    datetime.fromisoformat(payload["opened_at"]),
+                ),
+                datetime.fromisoformat(payload["deadline"]),
+            )
+        else:
+            raise ValueError(f"Unknown log operation: {op}")
+
+    def dump(self) -> Iterator[list[Any]]:
+        """Get operations that rebuild the state from scratch."""
+        for incident_id, incident in self.incidents.items():
+            yield ["incident", _dump_incident(incident)]
+            for change in self.history.get(incident_id, ()):
+                yield ["history", _dump_change(change)]
+        for (period, source), stats in self.mttr.items():
+            yield ["mttr", _dump_mttr(period, source, stats)]
+        for record in self.idempotency_keys.values():
+            yield ["idempotency_key", _dump_idempotency_record(record)]
+        for entry in self.webhook_outbox.values():
+            yield ["webhook", _dump_outbox_entry(entry)]
+        for dead_letter in self.webhook_dead_letters.values():
+            yield ["dead_letter", _dump_dead_letter(dead_letter)]
+        for key, deadline in self.sla_breaches.items():
+            yield ["sla_breach", _dump_sla_breach(key, deadline)]
+
+    def newest_first(
+        self, status: IncidentStatus | None, skip: int = 0
+    ) -> Iterator[int]:
+        """Iterate over incident IDs by creation time, newest first.
+
+        The first ``skip`` incidents are passed over in O(log n).
+        """
+        index = (
+            self.by_created
+            if status is None
+            else self.by_status_created[status]
+        )
+        for _, incident_id in index.keys(reverse=True, skip=skip):
+            yield incident_id
+
+    def below_id(
+        self, before_id: int, status: IncidentStatus | None
+    ) -> Iterator[int]:
+        """Iterate over incident IDs below before_id, highest first."""
+        index = self.incidents if status is None else self.by_status[status]
+        yield from index.keys(below=before_id, reverse=True)
+
+    def _index_status(self, incident: Incident, add: bool) -> None:
+        """Add an incident to the indexes of its status or remove it."""
+        assert incident.id is not None
+        status = incident.status
+        bucket = self.by_status[status]
+        created = self.by_status_created[status]
+        key = (_utc(incident.created_at), incident.id)
+        if add:
+            self.by_status[status] = bucket.set(incident.id, None, self._owner)
+            self.by_status_created[status] = created.set(
+                key, None, self._owner
+            )
+        else:
+            self.by_status[status] = bucket.delete(incident.id, self._owner)
+            self.by_status_created[status] = created.delete(key, self._owner)
+
+    def _record(self, op: str, payload: Any) -> None:
+        """Record an operation for the log."""
+        if self.log is not None:
+            self.log.append([op, payload])
+
+
+def _dump_incident(incident: Incident) -> dict[str, Any]:
+    """Convert incident to a JSON object."""
+    return {
+        "id": incident.id,
+        "description": incident.description,
+        "status": incident.status.value,
+        "source": incident.source.value,
+        "created_at": incident.created_at.isoformat(),
+    }
+
+
+def _load_incident(data: dict[str, Any]) -> Incident:
+    """Convert JSON object to incident."""
+    return Incident(
+        id=int(data["id"]),
+        description=data["description"],
+        status=IncidentStatus(data["status"]),
+        source=IncidentSource(data["source"]),
+        created_at=datetime.fromisoformat(data["created_at"]),
+    )
+
+
+def _dump_change(change: StatusChange) -> list[Any]:
+    """Convert status change to a JSON array."""
+    return [
+        change.incident_id,
+        change.from_status.value if change.from_status else None,
+        change.to_status.value,
+        change.changed_at.isoformat(),
+    ]
+
+
+def _load_change(data: list[Any]) -> StatusChange:
+    """Convert JSON array to status change."""
+    incident_id, from_status, to_status, changed_at = data
+    return StatusChange(
+        incident_id=int(incident_id),
+        from_status=IncidentStatus(from_status) if from_status else None,
+        to_status=IncidentStatus(to_status),
+        changed_at=datetime.fromisoformat(changed_at),
+    )
+
+
+def _dump_mttr(
+    period: str, source: IncidentSource, stats: DurationStats
+) -> dict[str, Any]:
+    """Convert resolution time aggregate to a JSON object."""
+    return {
+        "period": period,
+        "source": source.value,
+        "count": stats.count,
+        "total_seconds": stats.total_seconds,
+        "total_squared_seconds": stats.total_squared_seconds,
+        "sketch": stats.sketch.to_dict(),
+    }
+
+
+def _dump_idempotency_record(record: IdempotencyRecord) -> dict[str, Any]:
+    """Convert idempotency key record to a JSON object."""
+    return {
+        "key": record.key,
+        "fingerprint": record.fingerprint,
+        "created_at": record.created_at.isoformat(),
+        "incident": (
+            None
+            if record.incident is None
+            else _dump_incident(record.incident)
+        ),
+    }
+
+
+def _dump_outbox_entry(entry: _OutboxEntry) -> dict[str, Any]:
+    """Convert webhook outbox entry to a JSON object."""
+    return {
+        **_dump_delivery(entry.delivery),
+        "next_attempt_at": entry.next_attempt_at.isoformat(),
+        "last_error": entry.last_error,
+    }
+
+
+def _dump_dead_letter(dead_letter: _DeadLetter) -> dict[str, Any]:
+    """Convert webhook dead letter to a JSON object."""
+    return {
+        **_dump_delivery(dead_letter.delivery),
+        "error": dead_letter.error,
+        "failed_at": dead_letter.failed_at.isoformat(),
+    }
+
+
+def _dump_sla_breach(
+    key: tuple[int, datetime], deadline: datetime
+) -> dict[str, Any]:
+    """Convert SLA breach to a JSON object."""
+    incident_id, opened_at = key
+    return {
+        "incident_id": incident_id,
+        "opened_at": opened_at.isoformat(),
+        "deadline": deadline.isoformat(),
+    }
+
+
+def _dump_delivery(delivery: WebhookDelivery) -> dict[str, Any]:
+    """Convert webhook delivery to a JSON object."""
+    return {
+        "id": delivery.id,
+        "endpoint": delivery.endpoint,
+        "payload": delivery.payload,
+        "attempts": delivery.attempts,
+    }
+
+
+def _load_delivery(data: dict[str, Any]) -> WebhookDelivery:
+    """Convert JSON object to webhook delivery."""
+    return WebhookDelivery(
+        id=int(data["id"]),
+        endpoint=data["endpoint"],
+        payload=data["payload"],
+        attempts=int(data["attempts"]),
+    )
+
+
+class InMemoryDatabase:
+    """Committed state of the in-memory engine, shared by units of work.
+
+    One transaction writes at a time, readers see the state committed
+    when they started and never wait. With a log path, each commit appends
+    its changes as one JSON line before it becomes visible. Opening replays
+    the log and compacts it to the current state; a last line torn by a
+    crash is cut off instead, and a broken line before it fails the start.
+    The state lives in one process: serve it with a single worker.
+    """
+
+    def __init__(
+        self, log_path: str | Path | None = None, fsync: bool = False
+    ):
+        self.state = _State()
+        self.lock = asyncio.Lock()
+        self.log_path = None if log_path is None else Path(log_path)
+        self.fsync = fsync
+        self._log_file: IO[bytes] | None = None
+        if self.log_path is not None and self.log_path.exists():
+            torn_at = self._replay(self.log_path)
+            if torn_at is None:
+                self._compact(self.log_path)
+            else:
+                os.truncate(self.log_path, torn_at)
+
+    async def commit(self, state: "_State") -> None:
+        """Make a changed state the committed one, logging it first."""
+        if self.log_path is not None and state.log:
+            line = json.dumps(
+                state.log, ensure_ascii=False, separators=(",", ":")
+            )
+            await asyncio.to_thread(self._append, line.encode() + b"\n")
+        state.log = None
+        self.state = state
+
+    def close(self) -> None:
+        """Close the log file."""
+        if self._log_file is not None:
+            self._log_file.close()
+            self._log_file = None
+
+    def _append(self, line: bytes) -> None:
+        """Write a line to the end of the log."""
+        if self._log_file is None:
+            assert self.log_path is not None
+            self._log_file = open(self.log_path, "ab")  # noqa: SIM115
+        self._log_file.write(line)
+        self._log_file.flush()
+        if self.fsync:
+            os.fsync(self._log_file.fileno())
+
+    def _replay(self, path: Path) -> int | None:
+        """Rebuild the state from the log.
+
+        Returns the offset of a torn last line, which only an interrupted
+        commit leaves and which was never acknowledged. A broken line with
+        committed lines after it is corruption and raises ValueError.
+        """
+        offset = 0
+        with open(path, "rb") as file:
+            for number, line in enumerate(file, start=1):
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("Line is not terminated")
+                    operations = json.loads(line)
+                except ValueError as e:
+                    if file.read(1):
+                        raise ValueError(
+                            f"Broken line {number} of log {path}"
+                        ) from e
+                    return offset
+                for op, payload in operations:
+                    self.state.apply(op, payload)
+                offset += len(line)
+        return None
+
+    def _compact(self, path: Path) -> None:
+        """Rewrite the log as one transaction holding the current state."""
+        partial = path.with_name(path.name + ".partial")
+        with open(partial, "wb") as file:
+            operations = list(self.state.dump())
+            if operations:
+                file.write(
+                    json.dumps(
+                        operations, ensure_ascii=False, separators=(",", ":")
+                    ).encode()
+                    + b"\n"
+                )
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(partial, path)
+
+
+class InMemoryIncidentRepository(IIncidentRepository):
+    """In-memory implementation of incident repository.
+
+    Reads and ordering mirror the SQL repository; the archive and the ID
+    generator are used the same way, and without a generator IDs continue
+    from the highest one stored.
+    """
+
+    def __init__(
+        self,
+        uow: "InMemoryUnitOfWork",
+        archive: IIncidentArchive | None = None,
+        ids: SnowflakeIdGenerator | None = None,
+    ):
+        self.uow = uow
+        self.archive = archive
+        self.ids = ids
+
+    async def create(self, incident: Incident) -> Incident:
+        """Create a new incident, keeping its ID when already assigned."""
+        state = await self.uow.write_state()
+        return self._insert(state, incident)
+
+    async def create_many(
+        self, incidents: Sequence[Incident]
+    ) -> list[Incident]:
+        """Create incidents in the given order."""
+        if not incidents:
+            return []
+
+        state = await self.uow.write_state()
+        return [self._insert(state, incident) for incident in incidents]
+
+    async def get_all(
+        self,
+        status: IncidentStatus | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+    ) -> list[Incident]:
+        """Get a page of incidents, newest first, optionally by status."""
+        state = self.uow.read_state()
+        return [
+            state.incidents[incident_id]
+            for incident_id in self._page(state, status, limit, offset, None)
+        ]
+
+    async def get_projection(
+        self,
+        fields: Sequence[IncidentField],
+        status: IncidentStatus | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+        before_id: int | None = None,
+    ) -> list[IncidentProjection]:
+        """Get a page of incidents reading only the given attributes."""
+        state = self.uow.read_state()
+        return [
+            {
+                name: getattr(state.incidents[incident_id], name)
+                for name in fields
+            }
+            for incident_id in self._page(
+                state, status, limit, offset, before_id
+            )
+        ]
+
+    async def get_columns(
+        self,
+        fields: Sequence[IncidentField],
+        status: IncidentStatus | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+        before_id: int | None = None,
+    ) -> IncidentColumns:
+        """Get a page of incidents as columns, enums as their values."""
+        state = self.uow.read_state()
+        columns: IncidentColumns = {name: [] for name in fields}
+        for incident_id in self._page(state, status, limit, offset, before_id):
+            incident = state.incidents[incident_id]
+            for name, column in columns.items():
+                value = getattr(incident, name)
+                column.append(
+                    value.value
+                    if isinstance(value, IncidentStatus | IncidentSource)
+                    else value
+                )
+        return columns
+
+    async def get_before(
+        self,
+        before_id: int | None,
+        limit: int,
+        status: IncidentStatus | None = None,
+    ) -> list[Incident]:
+        """Get incidents with IDs below before_id, highest ID first."""
+        state = self.uow.read_state()
+        return [
+            state.incidents[incident_id]
+            for incident_id in self._page(
+                state,
+                status,
+                limit,
+                0,
+                MAX_INCIDENT_ID if before_id is None else before_id,
+            )
+        ]
+
+    async def count(self, status: IncidentStatus | None = None) -> int:
+        """Count incidents from the size of the table or status index."""
+        state = self.uow.read_state()
+        if status is None:
+            return len(state.incidents)
+        return len(state.by_status[status])
+
+    async def estimate_count(
+        self, status: IncidentStatus | None = None
+    ) -> int:
+        """Count exactly, counting costs no more than estimating."""
+        return await self.count(status)
+
+    async def get_by_id(self, incident_id: int) -> Incident | None:
+        """Get incident by ID."""
+        incident = self.uow.read_state().incidents.get(incident_id)
+        if incident is None and self.archive is not None:
+            archived = await self.archive.get(incident_id)
+            if archived is not None:
+                return archived.incident
+        return incident
+
+    async def get_many(self, ids: Sequence[int]) -> list[Incident | None]:
+        """Get incidents by IDs, archive for the rest."""
+        incidents = self.uow.read_state().incidents
+        found = {
+            incident_id: incidents[incident_id]
+            for incident_id in set(ids)
+            if incident_id in incidents
+        }
+
+        if self.archive is not None:
+            for incident_id in set(ids) - found.keys():
+                archived = await self.archive.get(incident_id)
+                if archived is not None:
+                    found[incident_id] = archived.incident
+
+        return [found.get(incident_id) for incident_id in ids]
+
+    async def get_existing_ids(self, ids: Sequence[int]) -> set[int]:
+        """Get the subset of given IDs that exist, archived ones included."""
+        existing = await self._get_hot_ids(ids)
+        return existing | await get_archived_ids(
+            self.archive, [i for i in ids if i not in existing]
+        )
+
+    async def update_status(
+        self, incident_id: int, status: IncidentStatus
+    ) -> Incident:
+        """Update incident status."""
+        state = await self.uow.write_state()
+        incident = state.incidents.get(incident_id)
+        if incident is None:
+            if await get_archived_ids(self.archive, [incident_id]):
+                raise IncidentArchivedError(incident_id)
+            raise IncidentNotFoundError(incident_id)
+
+        if not is_transition_allowed(incident.status, status):
+            raise InvalidStatusTransitionError(
+                incident_id, incident.status, status
+            )
+
+        return self._move(state, incident, status, datetime.now(UTC))
+
+    async def update_status_many(
+        self,
+        status: IncidentStatus,
+        ids: Sequence[int] | None = None,
+        criteria: IncidentFilter | None = None,
+    ) -> list[Incident]:
+        """Update status of all matching incidents.
+
+        Candidates come from the buckets of the allowed previous statuses,
+        in the order of the SQL repository: by previous status, then by ID.
+        """
+        if ids is not None and not ids:
+            return []
+
+        previous_statuses = allowed_previous_statuses(status)
+        if criteria is not None and criteria.status is not None:
+            previous_statuses = [
+                previous
+                for previous in previous_statuses
+                if previous == criteria.status
+            ]
+
+        state = await self.uow.write_state()
+        changed_at = datetime.now(UTC)
+        updated: list[Incident] = []
+        for previous in previous_statuses:
+            bucket = state.by_status[previous]
+            candidates = (
+                bucket.keys()
+                if ids is None
+                else sorted(
+                    incident_id
+                    for incident_id in set(ids)
+                    if incident_id in bucket
+                )
+            )
+            # Listed first, moving incidents changes the index in place
+            for incident_id in list(candidates):
+                incident = state.incidents[incident_id]
+                if self._matches(incident, criteria):
+                    updated.append(
+                        self._move(state, incident, status, changed_at)
+                    )
+        return updated
+
+    async def get_history(self, incident_id: int) -> list[StatusChange]:
+        """Get status history of incident ordered by change time."""
+        history = list(self.uow.read_state().history.get(incident_id, ()))
+        if not history and self.archive is not None:
+            archived = await self.archive.get(incident_id)
+            if archived is not None:
+                return archived.history
+        return history
+
+    async def get_opened_at(self, ids: Sequence[int]) -> dict[int, datetime]:
+        """Get when incidents were last opened, from the latest change."""
+        history = self.uow.read_state().history
+        opened_at: dict[int, datetime] = {}
+        for incident_id in ids:
+            for change in reversed(history.get(incident_id, ())):
+                if is_opening(change.from_status, change.to_status):
+                    opened_at[incident_id] = change.changed_at
+                    break
+        return opened_at
+
+    async def stream_all(self) -> AsyncIterator[Incident]:
+        """Iterate over archived incidents, then over hot ones by ID."""
+        async for incident in stream_archived(self.archive, self._get_hot_ids):
+            yield incident
+
+        for incident in self.uow.read_state().incidents.values():
+            yield incident
+
+    async def get_archivable(
+        self, closed_before: datetime, limit: int
+    ) -> list[ArchivedIncident]:
+        """Get closed incidents without status changes since the moment.
+
+        Taking the write lock stands for the row locks of the SQL
+        repository.
+        """
+        state = await self.uow.write_state()
+        cutoff = _utc(closed_before)
+        archivable: list[ArchivedIncident] = []
+        for incident_id in state.by_status[IncidentStatus.CLOSED]:
+            if len(archivable) >= limit:
+                break
+            history = state.history.get(incident_id, ())
+            if any(_utc(change.changed_at) >= cutoff for change in history):
+                continue
+            archivable.append(
+                ArchivedIncident(
+                    incident=state.incidents[incident_id],
+                    history=list(history),
+                )
+            )
+        return archivable
+
+    async def delete_many(self, ids: Sequence[int]) -> int:
+        """Delete incidents and their status history."""
+        if not ids:
+            return 0
+
+        state = await self.uow.write_state()
+        return sum(state.delete_incident(incident_id) for incident_id in ids)
+
+    async def _get_hot_ids(self, ids: Sequence[int]) -> set[int]:
+        """Get the subset of given IDs stored in the database."""
+        incidents = self.uow.read_state().incidents
+        return {incident_id for incident_id in ids if incident_id in incidents}
+
+    def _insert(self, state: _State, incident: Incident) -> Incident:
+        """Store a new incident with the first entry of its history."""
+        if incident.id is None:
+            incident = replace(
+                incident,
+                id=(
+                    self.ids.next_id()
+                    if self.ids is not None
+                    else state.last_id + 1
+                ),
+            )
+        assert incident.id is not None
+        state.put_incident(incident)
+        state.add_history(
+            StatusChange(
+                incident_id=incident.id,
+                from_status=None,
+                to_status=incident.status,
+                changed_at=incident.created_at,
+            )
+        )
+        return incident
+
+    @staticmethod
+    def _move(
+        state: _State,
+        incident: Incident,
+        status: IncidentStatus,
+        changed_at: datetime,
+    ) -> Incident:
+        """Change status of a stored incident and record it in history."""
+        assert incident.id is not None
+        updated = replace(incident, status=status)
+        state.put_incident(updated)
+        state.add_history(
+            StatusChange(
+                incident_id=incident.id,
+                from_status=incident.status,
+                to_status=status,
+                changed_at=changed_at,
+            )
+        )
+        return updated
+
+    @staticmethod
+    def _page(
+        state: _State,
+        status: IncidentStatus | None,
+        limit: int | None,
+        offset: int,
+        before_id: int | None,
+    ) -> Iterator[int]:
+        """Get IDs of a page ordered as in the SQL repository."""
+        if before_id is None:
+            return islice(state.newest_first(status, offset), limit)
+        return islice(
+            state.below_id(before_id, status),
+            offset,
+            None if limit is None else offset + limit,
+        )
+
+    @staticmethod
+    def _matches(incident: Incident, criteria: IncidentFilter | None) -> bool:
+        """Check incident against source and creation time criteria."""
+        if criteria is None:
+            return True
+        created_at = _utc(incident.created_at)
+        return (
+            (criteria.source is None or incident.source == criteria.source)
+            and (
+                criteria.created_from is None
+                or created_at >= _utc(criteria.created_from)
+            )
+            and (
+                criteria.created_to is None
+                or created_at < _utc(criteria.created_to)
+            )
+        )
+
+
+class InMemoryIncidentAnalyticsRepository(IIncidentAnalyticsRepository):
+    """In-memory implementation of incident analytics aggregates."""
+
+    def __init__(self, uow: "InMemoryUnitOfWork"):
+        self.uow = uow
+
+    async def record_resolutions(
+        self, resolutions: Sequence[Resolution]
+    ) -> None:
+        """Add resolution times to per-source and per-day aggregates."""
+        deltas: dict[tuple[str, IncidentSource], DurationStats] = {}
+        for resolution in resolutions:
+            day = resolution.resolved_at.astimezone(UTC).date().isoformat()
+            for period in (MTTR_TOTAL_PERIOD, day):
+                deltas.setdefault(
+                    (period, resolution.source), DurationStats()
+                ).add(resolution.duration_seconds)
+
+        if not deltas:
+            return
+
+        state = await self.uow.write_state()
+        for (period, source), delta in deltas.items():
+            # Stored aggregates are shared with snapshots, merge into a copy
+            stats = self._copy(state.mttr.get((period, source)))
+            stats.merge(delta)
+            state.put_mttr(period, source, stats)
+
+    async def get_mttr_by_source(
+        self, day: date | None = None
+    ) -> dict[IncidentSource, DurationStats]:
+        """Get resolution time aggregates per source for all time or a day."""
+        period = MTTR_TOTAL_PERIOD if day is None else day.isoformat()
+        return {
+            source: self._copy(stats)
+            for (stats_period, source), stats in (
+                self.uow.read_state().mttr.items()
+            )
+            if stats_period == period
+        }
+
+    @staticmethod
+    def _copy(stats: DurationStats | None) -> DurationStats:
+        """Copy an aggregate, so that changes do not reach the stored one."""
+        copied = DurationStats()
+        if stats is not None:
+            copied.merge(stats)
+        return copied
+
+
+class InMemoryIdempotencyKeyRepository(IIdempotencyKeyRepository):
+    """In-memory implementation of idempotency key storage."""
+
+    def __init__(self, uow: "InMemoryUnitOfWork"):
+        self.uow = uow
+
+    async def reserve(
+        self, key: str, fingerprint: str, created_at: datetime
+    ) -> IdempotencyRecord | None:
+        """Claim the key for the current transaction.
+
+        The write lock makes a concurrent claim wait until the first
+        transaction ends.
+        """
+        state = await self.uow.write_state()
+        existing = state.idempotency_keys.get(key)
+        if existing is not None:
+            return existing
+
+        state.put_idempotency_key(
+            IdempotencyRecord(
+                key=key,
+                fingerprint=fingerprint,
+                incident=None,
+                created_at=created_at,
+            )
+        )
+        return None
+
+    async def complete(
+        self, key: str, incident: Incident
+    ) -> IdempotencyRecord:
+        """Store the outcome of request for a claimed key."""
+        state = await self.uow.write_state()
+        record = replace(state.idempotency_keys[key], incident=incident)
+        state.put_idempotency_key(record)
+        return record
+
+    async def delete_expired(self, before: datetime) -> int:
+        """Delete keys created before the given moment."""
+        cutoff = _utc(before)
+        state = await self.uow.write_state()
+        expired = [
+            key
+            for key, record in state.idempotency_keys.items()
+            if _utc(record.created_at) < cutoff
+        ]
+        for key in expired:
+            state.delete_idempotency_key(key)
+        return len(expired)
+
+
+class InMemoryWebhookOutboxRepository(IWebhookOutboxRepository):
+    """In-memory implementation of the webhook outbox."""
+
+    def __init__(
+        self, uow: "InMemoryUnitOfWork", endpoints: Sequence[str] = ()
+    ):
+        self.uow = uow
+        self.endpoints = endpoints
+
+    async def add(self, events: Sequence[IncidentEvent]) -> None:
+        """Queue events for every webhook endpoint."""
+        if not events or not self.endpoints:
+            return
+
+        state = await self.uow.write_state()
+        for endpoint in self.endpoints:
+            for event in events:
+                state.put_webhook(
+                    _OutboxEntry(
+                        delivery=WebhookDelivery(
+                            id=state.last_webhook_id + 1,
+                            endpoint=endpoint,
+                            payload=event_payload(event),
+                            attempts=0,
+                        ),
+                        next_attempt_at=event.occurred_at,
+                    )
+                )
+
+    async def claim(
+        self, now: datetime, lease_until: datetime, limit: int
+    ) -> list[WebhookDelivery]:
+        """Take due deliveries, oldest first, hiding them until the lease."""
+        state = await self.uow.write_state()
+        due = list(
+            islice(
+                (
+                    entry
+                    for entry in state.webhook_outbox.values()
+                    if _utc(entry.next_attempt_at) <= _utc(now)
+                ),
+                limit,
+            )
+        )
+        for entry in due:
+            state.put_webhook(replace(entry, next_attempt_at=lease_until))
+        return [entry.delivery for entry in due]
+
+    async def delete(self, ids: Sequence[int]) -> None:
+        """Delete delivered deliveries."""
+        if not ids:
+            return
+
+        state = await self.uow.write_state()
+        for delivery_id in ids:
+            if delivery_id in state.webhook_outbox:
+                state.delete_webhook(delivery_id)
+
+    async def retry(
+        self, ids: Sequence[int], next_attempt_at: datetime, error: str
+    ) -> None:
+        """Count a failed attempt and schedule the next one."""
+        if not ids:
+            return
+
+        state = await self.uow.write_state()
+        for delivery_id in ids:
+            entry = state.webhook_outbox.get(delivery_id)
+            if entry is not None:
+                state.put_webhook(
+                    _OutboxEntry(
+                        delivery=replace(
+                            entry.delivery,
+                            attempts=entry.delivery.attempts + 1,
+                        ),
+                        next_attempt_at=next_attempt_at,
+                        last_error=error,
+                    )
+                )
+
+    async def dead_letter(
+        self, deliveries: Sequence[WebhookDelivery], error: str
+    ) -> None:
+        """Move deliveries out of attempts to the dead letters."""
+        if not deliveries:
+            return
+
+        state = await self.uow.write_state()
+        failed_at = datetime.now(UTC)
+        for delivery in deliveries:
+            state.put_dead_letter(
+                _DeadLetter(
+                    delivery=replace(delivery, attempts=delivery.attempts + 1),
+                    error=error,
+                    failed_at=failed_at,
+                )
+            )
+            if delivery.id in state.webhook_outbox:
+                state.delete_webhook(delivery.id)
+
+
+class InMemorySlaBreachRepository(ISlaBreachRepository):
+    """In-memory implementation of the SLA breach record."""
+
+    def __init__(self, uow: "InMemoryUnitOfWork"):
+        self.uow = uow
+
+    async def record(self, breaches: Sequence[SlaBreach]) -> list[SlaBreach]:
+        """Store breaches, skipping open periods recorded before."""
+        if not breaches:
+            return []
+
+        state = await self.uow.write_state()
+        recorded = []
+        for breach in breaches:
+            if breach.incident.id is None:
+                continue
+            key = (breach.incident.id, breach.opened_at)
+            if key not in state.sla_breaches:
+                state.put_sla_breach(key, breach.deadline)
+                recorded.append(breach)
+        return recorded
+
+
+class InMemoryUnitOfWork(IUnitOfWork):
+    """Unit of Work over the in-memory database.
+
+    Reads see the snapshot committed when the unit of work first read,
+    or its own changes once it writes. The first write waits for the
+    database lock and forks the committed state; commit makes the fork
+    the committed state, rollback discards it.
+    """
+
+    def __init__(
+        self,
+        database: InMemoryDatabase,
+        archive: IIncidentArchive | None = None,
+        ids: SnowflakeIdGenerator | None = None,
+        read_only: bool = False,
+        *,
+        webhook_endpoints: Sequence[str] = (),
+    ):
+        self.database = database
+        self.read_only = read_only
+        self._snapshot: _State | None = None
+        self._working: _State | None = None
+        self._incidents = InMemoryIncidentRepository(self, archive, ids)
+        self._analytics = InMemoryIncidentAnalyticsRepository(self)
+        self._idempotency_keys = InMemoryIdempotencyKeyRepository(self)
+        self._webhooks = InMemoryWebhookOutboxRepository(
+            self, webhook_endpoints
+        )
+        self._sla_breaches = InMemorySlaBreachRepository(self)
+
+    @property
+    def incidents(self) -> IIncidentRepository:
+        """Incident repository."""
+        return self._incidents
+
+    @property
+    def analytics(self) -> IIncidentAnalyticsRepository:
+        """Incident analytics repository."""
+        return self._analytics
+
+    @property
+    def idempotency_keys(self) -> IIdempotencyKeyRepository:
+        """Idempotency key repository."""
+        return self._idempotency_keys
+
+    @property
+    def webhooks(self) -> IWebhookOutboxRepository:
+        """Webhook outbox repository."""
+        return self._webhooks
+
+    @property
+    def sla_breaches(self) -> ISlaBreachRepository:
+        """SLA breach repository."""
+        return self._sla_breaches
+
+    def read_state(self) -> _State:
+        """Get the state the unit of work reads from."""
+        if self._working is not None:
+            return self._working
+        if self._snapshot is None:
+            self._snapshot = self.database.state
+        return self._snapshot
+
+    async def write_state(self) -> _State:
+        """Get the state the unit of work changes, locking the database."""
+        if self._working is None:
+            await self.database.lock.acquire()
+            self._working = self.database.state.fork()
+        return self._working
+
+    async def __aenter__(self) -> "InMemoryUnitOfWork":
+        """Enter async context manager."""
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        """Exit async context manager."""
+        if exc_type is not None or self.read_only:
+            await self.rollback()
+        else:
+            await self.commit()
+
+    async def commit(self) -> None:
+        """Commit the transaction."""
+        working, self._working = self._working, None
+        self._snapshot = None
+        if working is None:
+            return
+        try:
+            await self.database.commit(working)
+        finally:
+            self.database.lock.release()
+
+    async def rollback(self) -> None:
+        """Rollback the transaction."""
+        working, self._working = self._working, None
+        self._snapshot = None
+        if working is not None:
+            self.database.lock.release()
@@ -1,20 +1,44 @@
 """SQLAlchemy models."""
 
 from datetime import UTC, datetime
+from typing import Any
 
-from sqlalchemy import DateTime, String
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import (
+    JSON,
+    BigInteger,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+)
+from sqlalchemy.orm import (
+    Mapped,
+    WriteOnlyMapped,
+    mapped_column,
+    relationship,
+)
 
 from app.infrastructure.database import Base
 
+IncidentId = BigInteger().with_variant(Integer(), "sqlite")
+
 
 class IncidentModel(Base):
     """SQLAlchemy model for Incident."""
 
     __tablename__ = "incidents"
+    # Incidents of a status by age: list pages by status and the open
+    # incidents loaded by the SLA scheduler
+    __table_args__ = (
+        Index("ix_incidents_status_created_at", "status", "created_at"),
+    )
 
+    # 64-bit for generated IDs; SQLite INTEGER is 64-bit and only an
+    # INTEGER primary key is auto-incremented there
     id: Mapped[int] = mapped_column(
-        primary_key=True, index=True, autoincrement=True
+        IncidentId, primary_key=True, index=True, autoincrement=True
     )
     description: Mapped[str] = mapped_column(String, nullable=False)
     status: Mapped[str] = mapped_column(String, nullable=False)
@@ -24,3 +48,127 @@ class IncidentModel(Base):
         default=datetime.now(UTC),
         nullable=False,
     )
+
+    history: WriteOnlyMapped["IncidentStatusHistoryModel"] = relationship(
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+
+
+class IncidentStatusHistoryModel(Base):
+    """SQLAlchemy model for append-only incident status history."""
+
+    __tablename__ = "incident_status_history"
+    __table_args__ = (
+        Index(
+            "ix_incident_status_history_incident_id_changed_at",
+            "incident_id",
+            "changed_at",
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    incident_id: Mapped[int] = mapped_column(
+        IncidentId,
+        ForeignKey("incidents.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    from_status: Mapped[str | None] = mapped_column(String, nullable=True)
+    to_status: Mapped[str] = mapped_column(String, nullable=False)
+    changed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+
+
+class IncidentMttrStatsModel(Base):
+    """SQLAlchemy model for running resolution time aggregates.
+
+    ``period`` is either ``"total"`` or an ISO date of resolution.
+    """
+
+    __tablename__ = "incident_mttr_stats"
+
+    period: Mapped[str] = mapped_column(String(10), primary_key=True)
+    source: Mapped[str] = mapped_column(String, primary_key=True)
+    count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    total_seconds: Mapped[float] = mapped_column(
+        Float, nullable=False, default=0.0
+    )
+    total_squared_seconds: Mapped[float] = mapped_column(
+        Float, nullable=False, default=0.0
+    )
+    sketch: Mapped[dict[str, Any]] = mapped_column(
+        JSON, nullable=False, default=dict
+    )
+
+
+class IdempotencyKeyModel(Base):
+    """SQLAlchemy model for idempotency keys of incident creation."""
+
+    __tablename__ = "idempotency_keys"
+
+    key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    fingerprint: Mapped[str] = mapped_column(String(64), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, index=True
+    )
+    incident_id: Mapped[int | None] = mapped_column(IncidentId, nullable=True)
+    description: Mapped[str | None] = mapped_column(String, nullable=True)
+    status: Mapped[str | None] = mapped_column(String, nullable=True)
+    source: Mapped[str | None] = mapped_column(String, nullable=True)
+    incident_created_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+
+
+class WebhookOutboxModel(Base):
+    """SQLAlchemy model for webhook deliveries waiting to be sent."""
+
+    __tablename__ = "webhook_outbox"
+
+    id: Mapped[int] = mapped_column(
+        BigInteger().with_variant(Integer(), "sqlite"),
+        primary_key=True,
+        autoincrement=True,
+    )
+    endpoint: Mapped[str] = mapped_column(String, nullable=False)
+    payload: Mapped[dict[str, Any]] = mapped_column(JSON, nullable=False)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    next_attempt_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, index=True
+    )
+    last_error: Mapped[str | None] = mapped_column(String, nullable=True)
+
+
+class WebhookDeadLetterModel(Base):
+    """SQLAlchemy model for webhook deliveries that ran out of attempts."""
+
+    __tablename__ = "webhook_dead_letters"
+
+    id: Mapped[int] = mapped_column(
+        BigInteger().with_variant(Integer(), "sqlite"), primary_key=True
+    )
+    endpoint: Mapped[str] = mapped_column(String, nullable=False)
+    payload: Mapped[dict[str, Any]] = mapped_column(JSON, nullable=False)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False)
+    error: Mapped[str] = mapped_column(String, nullable=False)
+    failed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+
+
+class IncidentSlaBreachModel(Base):
+    """SQLAlchemy model for incidents detected past their SLA deadline."""
+
+    __tablename__ = "incident_sla_breaches"
+
+    incident_id: Mapped[int] = mapped_column(IncidentId, primary_key=True)
+    opened_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), primary_key=True
+    )
+    deadline: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+    detected_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
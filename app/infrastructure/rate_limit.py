@@ -0,0 +1,215 @@
+"""Token bucket rate limiting with in-memory and Redis backends."""
+
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Callable, Mapping, Sequence
+from dataclasses import dataclass
+from ipaddress import IPv4Network, IPv6Network, ip_address
+from typing import Any
+
+from app.domain.enums import IncidentSource
+
+
+@dataclass(frozen=True)
+class TokenBucketLimit:
+    """Refill rate (tokens per second) and capacity of a token bucket."""
+
+    rate: float
+    burst: int
+
+
+class RateLimiterBackend(ABC):
+    """Storage of token buckets."""
+
+    @abstractmethod
+    async def acquire(self, buckets: Mapping[str, TokenBucketLimit]) -> float:
+        """Take one token from each bucket, or none if any is empty.
+
+        Returns 0 if the tokens were taken, otherwise seconds until every
+        bucket has a token.
+        """
+
+
+@dataclass
+class _Bucket:
+    tokens: float
+    updated_at: float
+
+
+class InMemoryRateLimiterBackend(RateLimiterBackend):
+    """Token buckets kept in process memory.
+
+    Limits apply per worker process. The least recently used buckets are
+    dropped beyond ``max_keys``, which resets them to full.
+    """
+
+    def __init__(
+        self,
+        max_keys: int = 100_000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_keys = max_keys
+        self._clock = clock
+        self._buckets: OrderedDict[str, _Bucket] = OrderedDict()
+
+    async def acquire(self, buckets: Mapping[str, TokenBucketLimit]) -> float:
+        """Take one token from each bucket, or none if any is empty."""
+        now = self._clock()
+        refilled = [
+            self._refill(key, limit, now) for key, limit in buckets.items()
+        ]
+        retry_after = max(
+            (
+                (1 - bucket.tokens) / limit.rate
+                for bucket, limit in zip(
+                    refilled, buckets.values(), strict=True
+                )
+                if bucket.tokens < 1
+            ),
+            default=0.0,
+        )
+        if retry_after == 0:
+            for bucket in refilled:
+                bucket.tokens -= 1
+        return retry_after
+
+    def _refill(
+        self, key: str, limit: TokenBucketLimit, now: float
+    ) -> _Bucket:
+        """Get the bucket with tokens added for the time passed."""
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = _Bucket(tokens=float(limit.burst), updated_at=now)
+            self._buckets[key] = bucket
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+            elapsed = max(now - bucket.updated_at, 0.0)
+            bucket.tokens = min(
+                float(limit.burst), bucket.tokens + elapsed * limit.rate
+            )
+            bucket.updated_at = now
+        return bucket
+
+
+# Refill the buckets and take a token from each atomically, only when all
+# of them have one. ARGV holds the rate and burst of each key in turn. Time
+# comes from the Redis server so all workers share one clock.
+_TOKEN_BUCKET_SCRIPT = """
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local tokens = {}
+local retry_after = 0
+for i, key in ipairs(KEYS) do
+    local rate = tonumber(ARGV[2 * i - 1])
+    local burst = tonumber(ARGV[2 * i])
+    local state = redis.call('HMGET', key, 'tokens', 'updated_at')
+    local available = tonumber(state[1]) or burst
+    local updated_at = tonumber(state[2]) or now
+    available = math.min(
+        burst, available + math.max(0, now - updated_at) * rate
+    )
+    if available < 1 then
+        retry_after = math.max(retry_after, (1 - available) / rate)
+    end
+    tokens[i] = available
+end
+for i, key in ipairs(KEYS) do
+    local rate = tonumber(ARGV[2 * i - 1])
+    local burst = tonumber(ARGV[2 * i])
+    if retry_after == 0 then
+        tokens[i] = tokens[i] - 1
+    end
+    redis.call('HSET', key, 'tokens', tokens[i], 'updated_at', now)
+    redis.call('EXPIRE', key, math.ceil(burst / rate) + 1)
+end
+return tostring(retry_after)
+"""
+
+
+class RedisRateLimiterBackend(RateLimiterBackend):
+    """Token buckets shared by all workers through Redis.
+
+    Requires the optional ``redis`` package.
+    """
+
+    def __init__(self, url: str, key_prefix: str = "incidents:rate:"):
+        try:
+            from redis.asyncio import Redis
+        except ImportError as e:
+            raise RuntimeError(
+                "Redis rate limiter backend requires the 'redis' package, "
+                "install it with the 'redis' extra"
+            ) from e
+
+        self.key_prefix = key_prefix
+        self._client: Any = Redis.from_url(url)
+        self._script: Any = self._client.register_script(_TOKEN_BUCKET_SCRIPT)
+
+    async def acquire(self, buckets: Mapping[str, TokenBucketLimit]) -> float:
+        """Take one token from each bucket, or none if any is empty."""
+        retry_after = await self._script(
+            keys=[self.key_prefix + key for key in buckets],
+            args=[
+                value
+                for limit in buckets.values()
+                for value in (limit.rate, limit.burst)
+            ],
+        )
+        return float(retry_after)
+
+
+class RateLimiter:
+    """Per-client and per-source limits of incident ingestion.
+
+    Clients are told apart by their peer address. Client IDs sent by the
+    peer are used instead only when the peer is one of
+    ``trusted_proxies``, since any other client could pick a new ID for
+    every request.
+    """
+
+    def __init__(
+        self,
+        backend: RateLimiterBackend,
+        source_limits: Mapping[IncidentSource, TokenBucketLimit],
+        client_limit: TokenBucketLimit | None = None,
+        trusted_proxies: Sequence[IPv4Network | IPv6Network] = (),
+    ):
+        self.backend = backend
+        self.source_limits = source_limits
+        self.client_limit = client_limit
+        self.trusted_proxies = trusted_proxies
+
+    def client_key(self, peer: str | None, client_id: str | None) -> str:
+        """Get the key of the client bucket for a request."""
+        if client_id and peer is not None and self._is_trusted(peer):
+            return f"id:{client_id}"
+        return f"peer:{peer or 'unknown'}"
+
+    async def check(
+        self, client_key: str, source: IncidentSource | None
+    ) -> float:
+        """Take tokens for the request from its client and source buckets.
+
+        Returns 0 if the request is allowed, otherwise seconds to wait.
+        A rejected request takes no tokens.
+        """
+        buckets: dict[str, TokenBucketLimit] = {}
+        if self.client_limit is not None:
+            buckets[f"client:{client_key}"] = self.client_limit
+        if source is not None and source in self.source_limits:
+            buckets[f"source:{source.value}"] = self.source_limits[source]
+        if not buckets:
+            return 0.0
+
+        return await self.backend.acquire(buckets)
+
+    def _is_trusted(self, peer: str) -> bool:
+        """Check whether the peer address belongs to a trusted proxy."""
+        try:
+            address = ip_address(peer)
+        except ValueError:
+            return False
+        return any(address in network for network in self.trusted_proxies)
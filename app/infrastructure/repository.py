@@ -1,78 +1,761 @@
 """Incident repository implementation."""
 
-from sqlalchemy import select
+import json
+from collections.abc import AsyncIterator, Awaitable, Callable, Sequence
+from dataclasses import replace
+from datetime import UTC, date, datetime
+from typing import Any
+
+from sqlalchemy import (
+    ARRAY,
+    BigInteger,
+    ColumnElement,
+    Insert,
+    Select,
+    any_,
+    bindparam,
+    delete,
+    exists,
+    func,
+    insert,
+    or_,
+    select,
+    text,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.domain.entities import Incident
+from app.domain.analytics import DurationSketch, DurationStats, Resolution
+from app.domain.entities import (
+    ArchivedIncident,
+    IdempotencyRecord,
+    Incident,
+    IncidentColumns,
+    IncidentEvent,
+    IncidentField,
+    IncidentFilter,
+    IncidentProjection,
+    SlaBreach,
+    StatusChange,
+    WebhookDelivery,
+)
 from app.domain.enums import IncidentSource, IncidentStatus
-from app.domain.exceptions import IncidentNotFoundError
-from app.domain.interfaces import IIncidentRepository
-from app.infrastructure.models import IncidentModel
+from app.domain.exceptions import (
+    IncidentArchivedError,
+    IncidentNotFoundError,
+    InvalidStatusTransitionError,
+)
+from app.domain.ids import SnowflakeIdGenerator
+from app.domain.interfaces import (
+    IIdempotencyKeyRepository,
+    IIncidentAnalyticsRepository,
+    IIncidentArchive,
+    IIncidentRepository,
+    ISlaBreachRepository,
+    IWebhookOutboxRepository,
+)
+from app.domain.transitions import (
+    RESOLVED_STATUSES,
+    allowed_previous_statuses,
+    is_transition_allowed,
+)
+from app.infrastructure.models import (
+    IdempotencyKeyModel,
+    IncidentModel,
+    IncidentMttrStatsModel,
+    IncidentSlaBreachModel,
+    IncidentStatusHistoryModel,
+    WebhookDeadLetterModel,
+    WebhookOutboxModel,
+)
+
+# Period key of all-time aggregates in incident_mttr_stats
+MTTR_TOTAL_PERIOD = "total"
+
+# Statements of the hot path are built once and executed with bound
+# values, so each call skips construction and reuses the memoized cache key
+# of the compiled statement (and the prepared statement on asyncpg).
+SELECT_INCIDENTS = select(IncidentModel).order_by(
+    IncidentModel.created_at.desc()
+)
+SELECT_INCIDENTS_BY_STATUS = SELECT_INCIDENTS.where(
+    IncidentModel.status == bindparam("status")
+)
+# Pages by whether they filter on status and have a size. Limit and offset
+# are bound, so all pages share one compiled and prepared statement.
+SELECT_INCIDENT_PAGES = {
+    (by_status, limited): (
+        stmt.limit(bindparam("limit")) if limited else stmt
+    ).offset(bindparam("offset"))
+    for by_status, stmt in (
+        (False, SELECT_INCIDENTS),
+        (True, SELECT_INCIDENTS_BY_STATUS),
+    )
+    for limited in (False, True)
+}
+SELECT_INCIDENTS_BEFORE_ID = (
+    select(IncidentModel)
+    .where(IncidentModel.id < bindparam("before_id"))
+    .order_by(IncidentModel.id.desc())
+    .limit(bindparam("limit"))
+)
+SELECT_INCIDENTS_BEFORE_ID_BY_STATUS = SELECT_INCIDENTS_BEFORE_ID.where(
+    IncidentModel.status == bindparam("status")
+)
+SELECT_INCIDENT_BY_ID = select(IncidentModel).where(
+    IncidentModel.id == bindparam("incident_id")
+)
+SELECT_INCIDENT_BY_ID_FOR_UPDATE = SELECT_INCIDENT_BY_ID.with_for_update()
+SELECT_INCIDENTS_BY_IDS = select(IncidentModel).where(
+    IncidentModel.id.in_(bindparam("ids", expanding=True))
+)
+# One array parameter on PostgreSQL, so lists of any length share one
+# prepared statement
+SELECT_INCIDENTS_BY_ID_ARRAY = select(IncidentModel).where(
+    IncidentModel.id == any_(bindparam("ids", type_=ARRAY(BigInteger)))
+)
+SELECT_EXISTING_INCIDENT_IDS = select(IncidentModel.id).where(
+    IncidentModel.id.in_(bindparam("ids", expanding=True))
+)
+SELECT_INCIDENT_HISTORY = (
+    select(IncidentStatusHistoryModel)
+    .where(IncidentStatusHistoryModel.incident_id == bindparam("incident_id"))
+    .order_by(
+        IncidentStatusHistoryModel.changed_at, IncidentStatusHistoryModel.id
+    )
+)
+# Last change of each incident that opened it: its creation or a move out
+# of a resolved status
+SELECT_OPENED_AT = (
+    select(
+        IncidentStatusHistoryModel.incident_id,
+        func.max(IncidentStatusHistoryModel.changed_at),
+    )
+    .where(
+        IncidentStatusHistoryModel.incident_id.in_(
+            bindparam("ids", expanding=True)
+        ),
+        or_(
+            IncidentStatusHistoryModel.from_status.is_(None),
+            IncidentStatusHistoryModel.from_status.in_(RESOLVED_STATUSES),
+        ),
+        IncidentStatusHistoryModel.to_status.not_in(RESOLVED_STATUSES),
+    )
+    .group_by(IncidentStatusHistoryModel.incident_id)
+)
+
+COUNT_INCIDENTS = select(func.count()).select_from(IncidentModel)
+COUNT_INCIDENTS_BY_STATUS = COUNT_INCIDENTS.where(
+    IncidentModel.status == bindparam("status")
+)
+# Planner estimates of PostgreSQL. Statuses are inlined, so the estimate
+# comes from the column statistics of that value rather than from a
+# generic plan of a prepared statement.
+EXPLAIN_COUNT = {
+    status: text(
+        "EXPLAIN (FORMAT JSON) SELECT 1 FROM incidents"
+        + ("" if status is None else f" WHERE status = '{status.value}'")
+    )
+    for status in (None, *IncidentStatus)
+}
+
+# Above any incident ID, the cursor of the first keyset page
+MAX_INCIDENT_ID = 2**63 - 1
+
+# Rows fetched per round trip when streaming all incidents
+STREAM_BATCH_SIZE = 1000
+
+
+def event_payload(event: IncidentEvent) -> dict[str, Any]:
+    """Convert incident event to the JSON body sent to webhooks."""
+    incident = event.incident
+    return {
+        "type": event.type,
+        "occurred_at": event.occurred_at.isoformat(),
+        "incident": {
+            "id": str(incident.id),
+            "description": incident.description,
+            "status": incident.status.value,
+            "source": incident.source.value,
+            "created_at": incident.created_at.isoformat(),
+        },
+    }
+
+
+async def get_archived_ids(
+    archive: IIncidentArchive | None, ids: Sequence[int]
+) -> set[int]:
+    """Get the subset of given IDs found in the archive."""
+    if archive is None:
+        return set()
+    return {
+        incident_id
+        for incident_id in ids
+        if await archive.get(incident_id) is not None
+    }
+
+
+async def stream_archived(
+    archive: IIncidentArchive | None,
+    get_hot_ids: Callable[[Sequence[int]], Awaitable[set[int]]],
+) -> AsyncIterator[Incident]:
+    """Iterate over archived incidents missing from the hot table.
+
+    An archiver run that failed after writing its segment leaves incidents
+    in both places. The hot row is the one updates still reach, so the
+    archived copy is skipped. Hot IDs are looked up per batch, keeping
+    memory bounded.
+    """
+    if archive is None:
+        return
+
+    batch: list[Incident] = []
+    async for incident in archive.stream_all():
+        batch.append(incident)
+        if len(batch) >= STREAM_BATCH_SIZE:
+            for archived in await _without_hot(batch, get_hot_ids):
+                yield archived
+            batch = []
+    for archived in await _without_hot(batch, get_hot_ids):
+        yield archived
+
+
+async def _without_hot(
+    incidents: list[Incident],
+    get_hot_ids: Callable[[Sequence[int]], Awaitable[set[int]]],
+) -> list[Incident]:
+    """Drop incidents found in the hot table."""
+    hot_ids = await get_hot_ids([incident.id or 0 for incident in incidents])
+    return [incident for incident in incidents if incident.id not in hot_ids]
+
+
+def insert_ignoring_conflicts(
+    db: AsyncSession, model: type[Any], index_elements: Sequence[str]
+) -> Insert:
+    """Build INSERT ... ON CONFLICT DO NOTHING for the session dialect."""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert(model).on_conflict_do_nothing(
+            index_elements=index_elements
+        )
+    if dialect == "sqlite":
+        return sqlite.insert(model).on_conflict_do_nothing(
+            index_elements=index_elements
+        )
+    raise NotImplementedError(f"Unsupported database dialect: {dialect}")
 
 
 class IncidentRepository(IIncidentRepository):
-    """SQLAlchemy implementation of incident repository."""
+    """SQLAlchemy implementation of incident repository.
 
-    def __init__(self, db: AsyncSession):
+    With an archive, incidents missing from the hot table are looked up in
+    it, so archived incidents stay readable by ID. With an ID generator,
+    new incidents get their IDs in-process, so inserts wait for the commit
+    and need no RETURNING; otherwise the database assigns serial IDs.
+    """
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        archive: IIncidentArchive | None = None,
+        ids: SnowflakeIdGenerator | None = None,
+    ):
         self.db = db
+        self.archive = archive
+        self.ids = ids
 
     async def create(self, incident: Incident) -> Incident:
-        """Create a new incident."""
+        """Create a new incident, keeping its ID when already assigned."""
+        if incident.id is None and self.ids is not None:
+            incident = replace(incident, id=self.ids.next_id())
+
         db_incident = IncidentModel(
+            id=incident.id,
             description=incident.description,
             status=incident.status.value,
             source=incident.source.value,
             created_at=incident.created_at,
         )
+        db_incident.history.add(
+            IncidentStatusHistoryModel(
+                from_status=None,
+                to_status=incident.status.value,
+                changed_at=incident.created_at,
+            )
+        )
         self.db.add(db_incident)
-        await self.db.flush()
+        if incident.id is not None:
+            # Inserted by the flush of commit, the ID is already known
+            return incident
 
+        await self.db.flush()
         return self._to_entity(db_incident)
 
-    async def get_all(
-        self, status: IncidentStatus | None = None
+    async def create_many(
+        self, incidents: Sequence[Incident]
     ) -> list[Incident]:
-        """Get all incidents, optionally filtered by status."""
-        stmt = select(IncidentModel).order_by(IncidentModel.created_at.desc())
+        """Create incidents with one executemany INSERT per table."""
+        if not incidents:
+            return []
 
-        if status is not None:
-            stmt = stmt.filter(IncidentModel.status == status.value)
+        if self.ids is not None:
+            incidents = [
+                incident
+                if incident.id is not None
+                else replace(incident, id=self.ids.next_id())
+                for incident in incidents
+            ]
+        rows: list[dict[str, Any]] = [
+            {
+                "description": incident.description,
+                "status": incident.status.value,
+                "source": incident.source.value,
+                "created_at": incident.created_at,
+            }
+            for incident in incidents
+        ]
 
-        result = await self.db.execute(stmt)
+        if all(incident.id is not None for incident in incidents):
+            for row, incident in zip(rows, incidents, strict=True):
+                row["id"] = incident.id
+            await self.db.execute(insert(IncidentModel), rows)
+            created = list(incidents)
+        else:
+            result = await self.db.scalars(
+                insert(IncidentModel).returning(
+                    IncidentModel.id, sort_by_parameter_order=True
+                ),
+                rows,
+            )
+            created = [
+                replace(incident, id=incident_id)
+                for incident, incident_id in zip(
+                    incidents, result.all(), strict=True
+                )
+            ]
+
+        await self.db.execute(
+            insert(IncidentStatusHistoryModel),
+            [
+                {
+                    "incident_id": incident.id,
+                    "from_status": None,
+                    "to_status": incident.status.value,
+                    "changed_at": incident.created_at,
+                }
+                for incident in created
+            ],
+        )
+        return created
+
+    async def get_all(
+        self,
+        status: IncidentStatus | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+    ) -> list[Incident]:
+        """Get a page of incidents, newest first, optionally by status."""
+        params: dict[str, Any] = {}
+        if status is not None:
+            params["status"] = status.value
+        if limit is None and not offset:
+            stmt = (
+                SELECT_INCIDENTS
+                if status is None
+                else SELECT_INCIDENTS_BY_STATUS
+            )
+        else:
+            stmt = SELECT_INCIDENT_PAGES[status is not None, limit is not None]
+            params["offset"] = offset
+            if limit is not None:
+                params["limit"] = limit
+        result = await self.db.execute(stmt, params)
         db_incidents = result.scalars().all()
         return [self._to_entity(db_incident) for db_incident in db_incidents]
 
+    async def get_projection(
+        self,
+        fields: Sequence[IncidentField],
+        status: IncidentStatus | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+        before_id: int | None = None,
+    ) -> list[IncidentProjection]:
+        """Get a page of incidents selecting only the given columns."""
+        result = await self.db.execute(
+            self._projection_statement(
+                fields, status, limit, offset, before_id
+            )
+        )
+        return [
+            self._to_projection(fields, tuple(row)) for row in result.all()
+        ]
+
+    async def get_columns(
+        self,
+        fields: Sequence[IncidentField],
+        status: IncidentStatus | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+        before_id: int | None = None,
+    ) -> IncidentColumns:
+        """Get a page of incidents as columns, without per-row objects."""
+        result = await self.db.execute(
+            self._projection_statement(
+                fields, status, limit, offset, before_id
+            )
+        )
+        rows = result.all()
+        if not rows:
+            return {name: [] for name in fields}
+        return {
+            name: list(column)
+            for name, column in zip(
+                fields, zip(*rows, strict=True), strict=True
+            )
+        }
+
+    async def get_before(
+        self,
+        before_id: int | None,
+        limit: int,
+        status: IncidentStatus | None = None,
+    ) -> list[Incident]:
+        """Get incidents with IDs below before_id, highest ID first."""
+        params: dict[str, Any] = {
+            "before_id": MAX_INCIDENT_ID if before_id is None else before_id,
+            "limit": limit,
+        }
+        if status is None:
+            stmt = SELECT_INCIDENTS_BEFORE_ID
+        else:
+            stmt = SELECT_INCIDENTS_BEFORE_ID_BY_STATUS
+            params["status"] = status.value
+        result = await self.db.scalars(stmt, params)
+        return [self._to_entity(db_incident) for db_incident in result.all()]
+
+    async def count(self, status: IncidentStatus | None = None) -> int:
+        """Count incidents, optionally by status."""
+        if status is None:
+            return await self.db.scalar(COUNT_INCIDENTS) or 0
+        return (
+            await self.db.scalar(
+                COUNT_INCIDENTS_BY_STATUS, {"status": status.value}
+            )
+            or 0
+        )
+
+    async def estimate_count(
+        self, status: IncidentStatus | None = None
+    ) -> int:
+        """Estimate the count from the row estimate of the query plan.
+
+        The planner scales ``pg_class.reltuples`` to the current table size
+        and applies the statistics of the status column. Other databases
+        count exactly.
+        """
+        if self.db.get_bind().dialect.name != "postgresql":
+            return await self.count(status)
+
+        plan = await self.db.scalar(EXPLAIN_COUNT[status])
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
     async def get_by_id(self, incident_id: int) -> Incident | None:
         """Get incident by ID."""
-        stmt = select(IncidentModel).filter(IncidentModel.id == incident_id)
-        result = await self.db.execute(stmt)
+        result = await self.db.execute(
+            SELECT_INCIDENT_BY_ID, {"incident_id": incident_id}
+        )
         db_incident = result.scalar_one_or_none()
 
-        if db_incident is None:
-            return None
+        if db_incident is not None:
+            return self._to_entity(db_incident)
 
-        return self._to_entity(db_incident)
+        if self.archive is not None:
+            archived = await self.archive.get(incident_id)
+            if archived is not None:
+                return archived.incident
+
+        return None
+
+    async def get_many(self, ids: Sequence[int]) -> list[Incident | None]:
+        """Get incidents by IDs with one query, archive for the rest."""
+        if not ids:
+            return []
+
+        stmt = (
+            SELECT_INCIDENTS_BY_ID_ARRAY
+            if self.db.get_bind().dialect.name == "postgresql"
+            else SELECT_INCIDENTS_BY_IDS
+        )
+        result = await self.db.execute(stmt, {"ids": list(set(ids))})
+        found = {
+            db_incident.id: self._to_entity(db_incident)
+            for db_incident in result.scalars()
+        }
+
+        if self.archive is not None:
+            for incident_id in set(ids) - found.keys():
+                archived = await self.archive.get(incident_id)
+                if archived is not None:
+                    found[incident_id] = archived.incident
+
+        return [found.get(incident_id) for incident_id in ids]
+
+    async def get_existing_ids(self, ids: Sequence[int]) -> set[int]:
+        """Get the subset of given IDs that exist, archived ones included."""
+        existing = await self._get_hot_ids(ids)
+        return existing | await get_archived_ids(
+            self.archive, [i for i in ids if i not in existing]
+        )
 
     async def update_status(
         self, incident_id: int, status: IncidentStatus
     ) -> Incident:
         """Update incident status."""
-        stmt = (
-            select(IncidentModel)
-            .filter(IncidentModel.id == incident_id)
-            .with_for_update()
+        result = await self.db.execute(
+            SELECT_INCIDENT_BY_ID_FOR_UPDATE, {"incident_id": incident_id}
         )
-        result = await self.db.execute(stmt)
         db_incident = result.scalar_one_or_none()
 
         if db_incident is None:
+            if await get_archived_ids(self.archive, [incident_id]):
+                raise IncidentArchivedError(incident_id)
             raise IncidentNotFoundError(incident_id)
 
+        current = IncidentStatus(db_incident.status)
+        if not is_transition_allowed(current, status):
+            raise InvalidStatusTransitionError(incident_id, current, status)
+
         db_incident.status = status.value
+        db_incident.history.add(
+            IncidentStatusHistoryModel(
+                from_status=current.value,
+                to_status=status.value,
+                changed_at=datetime.now(UTC),
+            )
+        )
         await self.db.flush()
 
         return self._to_entity(db_incident)
 
+    async def update_status_many(
+        self,
+        status: IncidentStatus,
+        ids: Sequence[int] | None = None,
+        criteria: IncidentFilter | None = None,
+    ) -> list[Incident]:
+        """Update status of all matching incidents with set-based statements.
+
+        One UPDATE ... RETURNING is issued per allowed previous status, so
+        the history rows know where each incident moved from.
+        """
+        if ids is not None and not ids:
+            return []
+
+        previous_statuses = allowed_previous_statuses(status)
+        if criteria is not None and criteria.status is not None:
+            previous_statuses = [
+                previous
+                for previous in previous_statuses
+                if previous == criteria.status
+            ]
+
+        conditions = self._filter_conditions(criteria)
+        if ids is not None:
+            conditions.append(IncidentModel.id.in_(ids))
+
+        changed_at = datetime.now(UTC)
+        updated: list[Incident] = []
+        history: list[dict[str, object]] = []
+        for previous in previous_statuses:
+            stmt = (
+                update(IncidentModel)
+                .where(IncidentModel.status == previous.value, *conditions)
+                .values(status=status.value)
+                .returning(IncidentModel)
+                .execution_options(
+                    synchronize_session=False, populate_existing=True
+                )
+            )
+            result = await self.db.scalars(stmt)
+            for db_incident in result.all():
+                updated.append(self._to_entity(db_incident))
+                history.append(
+                    {
+                        "incident_id": db_incident.id,
+                        "from_status": previous.value,
+                        "to_status": status.value,
+                        "changed_at": changed_at,
+                    }
+                )
+
+        if history:
+            await self.db.execute(insert(IncidentStatusHistoryModel), history)
+
+        return updated
+
+    async def get_history(self, incident_id: int) -> list[StatusChange]:
+        """Get status history of incident ordered by change time."""
+        result = await self.db.scalars(
+            SELECT_INCIDENT_HISTORY, {"incident_id": incident_id}
+        )
+        history = [self._to_status_change(entry) for entry in result.all()]
+
+        if not history and self.archive is not None:
+            archived = await self.archive.get(incident_id)
+            if archived is not None:
+                return archived.history
+
+        return history
+
+    async def get_opened_at(self, ids: Sequence[int]) -> dict[int, datetime]:
+        """Get when incidents were last opened, from status history."""
+        if not ids:
+            return {}
+
+        result = await self.db.execute(SELECT_OPENED_AT, {"ids": list(ids)})
+        return dict(result.all())
+
+    async def stream_all(self) -> AsyncIterator[Incident]:
+        """Iterate over archived incidents, then over hot ones by ID."""
+        async for incident in stream_archived(self.archive, self._get_hot_ids):
+            yield incident
+
+        result = await self.db.stream_scalars(
+            select(IncidentModel)
+            .order_by(IncidentModel.id)
+            .execution_options(yield_per=STREAM_BATCH_SIZE)
+        )
+        async for db_incident in result:
+            yield self._to_entity(db_incident)
+
+    async def get_archivable(
+        self, closed_before: datetime, limit: int
+    ) -> list[ArchivedIncident]:
+        """Get closed incidents without status changes since the moment.
+
+        Rows already locked by another archiver are skipped, so concurrent
+        runs take disjoint batches.
+        """
+        changed_since = exists().where(
+            IncidentStatusHistoryModel.incident_id == IncidentModel.id,
+            IncidentStatusHistoryModel.changed_at >= closed_before,
+        )
+        stmt = (
+            select(IncidentModel)
+            .where(
+                IncidentModel.status == IncidentStatus.CLOSED.value,
+                ~changed_since,
+            )
+            .order_by(IncidentModel.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        incidents = [
+            self._to_entity(db_incident)
+            for db_incident in (await self.db.scalars(stmt)).all()
+        ]
+        if not incidents:
+            return []
+
+        history: dict[int, list[StatusChange]] = {
+            incident.id: [] for incident in incidents if incident.id
+        }
+        result = await self.db.scalars(
+            select(IncidentStatusHistoryModel)
+            .where(IncidentStatusHistoryModel.incident_id.in_(list(history)))
+            .order_by(
+                IncidentStatusHistoryModel.incident_id,
+                IncidentStatusHistoryModel.changed_at,
+                IncidentStatusHistoryModel.id,
+            )
+        )
+        for entry in result.all():
+            history[entry.incident_id].append(self._to_status_change(entry))
+
+        return [
+            ArchivedIncident(
+                incident=incident, history=history[incident.id or 0]
+            )
+            for incident in incidents
+        ]
+
+    async def delete_many(self, ids: Sequence[int]) -> int:
+        """Delete incidents and their status history."""
+        if not ids:
+            return 0
+
+        # History is deleted explicitly, SQLite does not enforce cascades
+        await self.db.execute(
+            delete(IncidentStatusHistoryModel).where(
+                IncidentStatusHistoryModel.incident_id.in_(ids)
+            ),
+            execution_options={"synchronize_session": False},
+        )
+        result = await self.db.execute(
+            delete(IncidentModel).where(IncidentModel.id.in_(ids)),
+            execution_options={"synchronize_session": False},
+        )
+        return int(getattr(result, "rowcount", 0))
+
+    async def _get_hot_ids(self, ids: Sequence[int]) -> set[int]:
+        """Get the subset of given IDs in the incidents table."""
+        if not ids:
+            return set()
+
+        result = await self.db.scalars(
+            SELECT_EXISTING_INCIDENT_IDS, {"ids": list(ids)}
+        )
+        return set(result.all())
+
+    @staticmethod
+    def _filter_conditions(
+        criteria: IncidentFilter | None,
+    ) -> list[ColumnElement[bool]]:
+        """Build WHERE conditions for incident filter criteria."""
+        conditions: list[ColumnElement[bool]] = []
+        if criteria is None:
+            return conditions
+
+        if criteria.status is not None:
+            conditions.append(IncidentModel.status == criteria.status.value)
+        if criteria.source is not None:
+            conditions.append(IncidentModel.source == criteria.source.value)
+        if criteria.created_from is not None:
+            conditions.append(
+                IncidentModel.created_at >= criteria.created_from
+            )
+        if criteria.created_to is not None:
+            conditions.append(IncidentModel.created_at < criteria.created_to)
+
+        return conditions
+
+    @staticmethod
+    def _projection_statement(
+        fields: Sequence[IncidentField],
+        status: IncidentStatus | None,
+        limit: int | None,
+        offset: int,
+        before_id: int | None,
+    ) -> Select[Any]:
+        """Build a query selecting only the given incident columns."""
+        stmt = select(*(getattr(IncidentModel, name) for name in fields))
+        if status is not None:
+            stmt = stmt.where(IncidentModel.status == status.value)
+        if before_id is not None:
+            stmt = stmt.where(IncidentModel.id < before_id).order_by(
+                IncidentModel.id.desc()
+            )
+        else:
+            stmt = stmt.order_by(IncidentModel.created_at.desc())
+        if limit is not None or offset:
+            stmt = stmt.limit(limit).offset(offset)
+        return stmt
+
     @staticmethod
     def _to_entity(db_incident: IncidentModel) -> Incident:
         """Convert database model to domain entity."""
@@ -83,3 +766,358 @@ class IncidentRepository(IIncidentRepository):
             source=IncidentSource(db_incident.source),
             created_at=db_incident.created_at,
         )
+
+    @staticmethod
+    def _to_projection(
+        fields: Sequence[IncidentField], row: Sequence[Any]
+    ) -> IncidentProjection:
+        """Convert selected columns to incident attributes."""
+        projection: IncidentProjection = dict(zip(fields, row, strict=True))
+        if "status" in projection:
+            projection["status"] = IncidentStatus(projection["status"])
+        if "source" in projection:
+            projection["source"] = IncidentSource(projection["source"])
+        return projection
+
+    @staticmethod
+    def _to_status_change(entry: IncidentStatusHistoryModel) -> StatusChange:
+        """Convert history row to domain status change."""
+        return StatusChange(
+            incident_id=entry.incident_id,
+            from_status=(
+                IncidentStatus(entry.from_status)
+                if entry.from_status is not None
+                else None
+            ),
+            to_status=IncidentStatus(entry.to_status),
+            changed_at=entry.changed_at,
+        )
+
+
+class IncidentAnalyticsRepository(IIncidentAnalyticsRepository):
+    """SQLAlchemy implementation of incident analytics aggregates."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def record_resolutions(
+        self, resolutions: Sequence[Resolution]
+    ) -> None:
+        """Add resolution times to per-source and per-day aggregates.
+
+        Deltas are combined in memory first, so a batch touches each
+        (period, source) row once regardless of its size.
+        """
+        deltas: dict[tuple[str, str], DurationStats] = {}
+        for resolution in resolutions:
+            day = resolution.resolved_at.astimezone(UTC).date().isoformat()
+            for period in (MTTR_TOTAL_PERIOD, day):
+                key = (period, resolution.source.value)
+                deltas.setdefault(key, DurationStats()).add(
+                    resolution.duration_seconds
+                )
+
+        if not deltas:
+            return
+
+        await self.db.execute(
+            insert_ignoring_conflicts(
+                self.db, IncidentMttrStatsModel, ["period", "source"]
+            ),
+            [
+                {
+                    "period": period,
+                    "source": source,
+                    "count": 0,
+                    "total_seconds": 0.0,
+                    "total_squared_seconds": 0.0,
+                    "sketch": {},
+                }
+                for period, source in deltas
+            ],
+        )
+
+        stmt = (
+            select(IncidentMttrStatsModel)
+            .filter(
+                tuple_(
+                    IncidentMttrStatsModel.period,
+                    IncidentMttrStatsModel.source,
+                ).in_(list(deltas))
+            )
+            .order_by(
+                IncidentMttrStatsModel.period, IncidentMttrStatsModel.source
+            )
+            .with_for_update()
+        )
+        result = await self.db.scalars(stmt)
+        for row in result.all():
+            stats = self._to_stats(row)
+            stats.merge(deltas[(row.period, row.source)])
+            row.count = stats.count
+            row.total_seconds = stats.total_seconds
+            row.total_squared_seconds = stats.total_squared_seconds
+            row.sketch = stats.sketch.to_dict()
+
+        await self.db.flush()
+
+    async def get_mttr_by_source(
+        self, day: date | None = None
+    ) -> dict[IncidentSource, DurationStats]:
+        """Get resolution time aggregates per source for all time or a day."""
+        period = MTTR_TOTAL_PERIOD if day is None else day.isoformat()
+        stmt = select(IncidentMttrStatsModel).filter(
+            IncidentMttrStatsModel.period == period
+        )
+        result = await self.db.scalars(stmt)
+        return {
+            IncidentSource(row.source): self._to_stats(row)
+            for row in result.all()
+        }
+
+    @staticmethod
+    def _to_stats(row: IncidentMttrStatsModel) -> DurationStats:
+        """Convert database row to domain aggregate."""
+        return DurationStats(
+            count=row.count,
+            total_seconds=row.total_seconds,
+            total_squared_seconds=row.total_squared_seconds,
+            sketch=DurationSketch.from_dict(row.sketch),
+        )
+
+
+class IdempotencyKeyRepository(IIdempotencyKeyRepository):
+    """SQLAlchemy implementation of idempotency key storage."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def reserve(
+        self, key: str, fingerprint: str, created_at: datetime
+    ) -> IdempotencyRecord | None:
+        """Claim the key for the current transaction.
+
+        The unique key makes a concurrent INSERT wait until the first
+        transaction ends, so only one of them creates the incident.
+        """
+        stmt = (
+            insert_ignoring_conflicts(self.db, IdempotencyKeyModel, ["key"])
+            .values(key=key, fingerprint=fingerprint, created_at=created_at)
+            .returning(IdempotencyKeyModel.key)
+        )
+        while True:
+            result = await self.db.execute(stmt)
+            if result.scalar_one_or_none() is not None:
+                return None
+
+            existing = await self.db.get(
+                IdempotencyKeyModel, key, populate_existing=True
+            )
+            # None means the concurrent claim was rolled back, retry
+            if existing is not None:
+                return self._to_record(existing)
+
+    async def complete(
+        self, key: str, incident: Incident
+    ) -> IdempotencyRecord:
+        """Store the outcome of request for a claimed key."""
+        stmt = (
+            update(IdempotencyKeyModel)
+            .where(IdempotencyKeyModel.key == key)
+            .values(
+                incident_id=incident.id,
+                description=incident.description,
+                status=incident.status.value,
+                source=incident.source.value,
+                incident_created_at=incident.created_at,
+            )
+            .returning(IdempotencyKeyModel)
+            .execution_options(
+                synchronize_session=False, populate_existing=True
+            )
+        )
+        result = await self.db.scalars(stmt)
+        return self._to_record(result.one())
+
+    async def delete_expired(self, before: datetime) -> int:
+        """Delete keys created before the given moment."""
+        stmt = delete(IdempotencyKeyModel).where(
+            IdempotencyKeyModel.created_at < before
+        )
+        result = await self.db.execute(
+            stmt, execution_options={"synchronize_session": False}
+        )
+        return int(getattr(result, "rowcount", 0))
+
+    @staticmethod
+    def _to_record(row: IdempotencyKeyModel) -> IdempotencyRecord:
+        """Convert database row to domain record."""
+        incident = None
+        if (
+            row.incident_id is not None
+            and row.description is not None
+            and row.status is not None
+            and row.source is not None
+            and row.incident_created_at is not None
+        ):
+            incident = Incident(
+                id=row.incident_id,
+                description=row.description,
+                status=IncidentStatus(row.status),
+                source=IncidentSource(row.source),
+                created_at=row.incident_created_at,
+            )
+
+        return IdempotencyRecord(
+            key=row.key,
+            fingerprint=row.fingerprint,
+            incident=incident,
+            created_at=row.created_at,
+        )
+
+
+class WebhookOutboxRepository(IWebhookOutboxRepository):
+    """SQLAlchemy implementation of the webhook outbox.
+
+    Each event is queued once per endpoint, so endpoints are retried
+    independently. Without endpoints nothing is queued.
+    """
+
+    def __init__(self, db: AsyncSession, endpoints: Sequence[str] = ()):
+        self.db = db
+        self.endpoints = endpoints
+
+    async def add(self, events: Sequence[IncidentEvent]) -> None:
+        """Queue events for every webhook endpoint."""
+        if not events or not self.endpoints:
+            return
+
+        payloads = [event_payload(event) for event in events]
+        await self.db.execute(
+            insert(WebhookOutboxModel),
+            [
+                {
+                    "endpoint": endpoint,
+                    "payload": payload,
+                    "attempts": 0,
+                    "next_attempt_at": event.occurred_at,
+                }
+                for endpoint in self.endpoints
+                for event, payload in zip(events, payloads, strict=True)
+            ],
+        )
+
+    async def claim(
+        self, now: datetime, lease_until: datetime, limit: int
+    ) -> list[WebhookDelivery]:
+        """Take due deliveries, skipping rows other dispatchers lock."""
+        stmt = (
+            select(WebhookOutboxModel)
+            .where(WebhookOutboxModel.next_attempt_at <= now)
+            .order_by(WebhookOutboxModel.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        rows = (await self.db.scalars(stmt)).all()
+        if not rows:
+            return []
+
+        await self.db.execute(
+            update(WebhookOutboxModel)
+            .where(WebhookOutboxModel.id.in_([row.id for row in rows]))
+            .values(next_attempt_at=lease_until),
+            execution_options={"synchronize_session": False},
+        )
+        return [
+            WebhookDelivery(
+                id=row.id,
+                endpoint=row.endpoint,
+                payload=row.payload,
+                attempts=row.attempts,
+            )
+            for row in rows
+        ]
+
+    async def delete(self, ids: Sequence[int]) -> None:
+        """Delete delivered deliveries."""
+        if not ids:
+            return
+
+        await self.db.execute(
+            delete(WebhookOutboxModel).where(WebhookOutboxModel.id.in_(ids)),
+            execution_options={"synchronize_session": False},
+        )
+
+    async def retry(
+        self, ids: Sequence[int], next_attempt_at: datetime, error: str
+    ) -> None:
+        """Count a failed attempt and schedule the next one."""
+        if not ids:
+            return
+
+        await self.db.execute(
+            update(WebhookOutboxModel)
+            .where(WebhookOutboxModel.id.in_(ids))
+            .values(
+                attempts=WebhookOutboxModel.attempts + 1,
+                next_attempt_at=next_attempt_at,
+                last_error=error,
+            ),
+            execution_options={"synchronize_session": False},
+        )
+
+    async def dead_letter(
+        self, deliveries: Sequence[WebhookDelivery], error: str
+    ) -> None:
+        """Move deliveries out of attempts to the dead letters."""
+        if not deliveries:
+            return
+
+        failed_at = datetime.now(UTC)
+        await self.db.execute(
+            insert(WebhookDeadLetterModel),
+            [
+                {
+                    "id": delivery.id,
+                    "endpoint": delivery.endpoint,
+                    "payload": delivery.payload,
+                    "attempts": delivery.attempts + 1,
+                    "error": error,
+                    "failed_at": failed_at,
+                }
+                for delivery in deliveries
+            ],
+        )
+        await self.delete([delivery.id for delivery in deliveries])
+
+
+class SlaBreachRepository(ISlaBreachRepository):
+    """SQLAlchemy implementation of the SLA breach record."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def record(self, breaches: Sequence[SlaBreach]) -> list[SlaBreach]:
+        """Insert breaches, skipping open periods recorded before."""
+        if not breaches:
+            return []
+
+        detected_at = datetime.now(UTC)
+        result = await self.db.execute(
+            insert_ignoring_conflicts(
+                self.db, IncidentSlaBreachModel, ["incident_id", "opened_at"]
+            ).returning(IncidentSlaBreachModel.incident_id),
+            [
+                {
+                    "incident_id": breach.incident.id,
+                    "opened_at": breach.opened_at,
+                    "deadline": breach.deadline,
+                    "detected_at": detected_at,
+                }
+                for breach in breaches
+            ],
+        )
+        recorded = set(result.scalars())
+        return [
+            breach for breach in breaches if breach.incident.id in recorded
+        ]
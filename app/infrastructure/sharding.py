@@ -0,0 +1,537 @@
+"""Incidents sharded across several databases."""
+
+import asyncio
+import heapq
+import zlib
+from collections.abc import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+    Sequence,
+)
+from dataclasses import replace
+from datetime import datetime
+from enum import Enum
+from itertools import chain, islice
+from types import TracebackType
+from typing import Any, Literal, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.entities import (
+    ArchivedIncident,
+    Incident,
+    IncidentColumns,
+    IncidentField,
+    IncidentFilter,
+    IncidentProjection,
+    StatusChange,
+)
+from app.domain.enums import IncidentSource, IncidentStatus
+from app.domain.exceptions import (
+    IncidentArchivedError,
+    IncidentNotFoundError,
+)
+from app.domain.ids import SnowflakeIdGenerator
+from app.domain.interfaces import (
+    IIdempotencyKeyRepository,
+    IIncidentAnalyticsRepository,
+    IIncidentArchive,
+    IIncidentRepository,
+    ISlaBreachRepository,
+    IUnitOfWork,
+    IWebhookOutboxRepository,
+)
+from app.infrastructure.repository import get_archived_ids, stream_archived
+from app.infrastructure.unit_of_work import SQLAlchemyUnitOfWork
+
+ShardKey = Literal["id", "source"]
+
+T = TypeVar("T")
+
+_SOURCE_ORDER = {source: i for i, source in enumerate(IncidentSource)}
+
+
+def _stable_hash(value: str) -> int:
+    """Hash that is the same in every process, unlike hash()."""
+    return zlib.crc32(value.encode())
+
+
+def _enum_value(value: Any) -> Any:
+    """Unwrap status and source enums to their stored values."""
+    return value.value if isinstance(value, Enum) else value
+
+
+class ShardRouter:
+    """Maps incidents to shards by hashed ID or by source.
+
+    Sources are few, so they are spread round-robin in declaration order
+    rather than hashed, and sharding by source uses at most one shard per
+    source.
+    """
+
+    def __init__(self, shards: int, key: ShardKey = "id"):
+        if shards < 1:
+            raise ValueError("At least one shard is required")
+        if key == "source" and shards > len(_SOURCE_ORDER):
+            raise ValueError(
+                f"Sharding by source uses at most {len(_SOURCE_ORDER)} "
+                f"shards, got {shards}"
+            )
+        self.shards = shards
+        self.key = key
+
+    def shard_of(self, incident: Incident) -> int:
+        """Get shard of a new incident with an assigned ID."""
+        if self.key == "source":
+            return _SOURCE_ORDER[incident.source] % self.shards
+        return self.shard_of_id(incident.id or 0) or 0
+
+    def shard_of_id(self, incident_id: int) -> int | None:
+        """Get shard of an incident ID, None when any shard may hold it."""
+        if self.shards == 1:
+            return 0
+        if self.key == "source":
+            return None
+        return _stable_hash(str(incident_id)) % self.shards
+
+    def group_ids(self, ids: Iterable[int]) -> dict[int, list[int]]:
+        """Group IDs by the shards that may hold them."""
+        groups: dict[int, list[int]] = {}
+        for incident_id in ids:
+            shard = self.shard_of_id(incident_id)
+            targets = range(self.shards) if shard is None else (shard,)
+            for target in targets:
+                groups.setdefault(target, []).append(incident_id)
+        return groups
+
+
+class ShardedIncidentRepository(IIncidentRepository):
+    """Incident repository spread over per-shard repositories.
+
+    New incidents get generated IDs, unique across shards, and go to the
+    shard chosen by the router. Reads of a known shard go there directly,
+    everything else is scattered to all shards concurrently and gathered;
+    lists are k-way merged on ``created_at``.
+    """
+
+    def __init__(
+        self,
+        shards: Sequence[IUnitOfWork],
+        router: ShardRouter,
+        ids: SnowflakeIdGenerator,
+        archive: IIncidentArchive | None = None,
+    ):
+        self.shards = shards
+        self.router = router
+        self.ids = ids
+        self.archive = archive
+
+    async def create(self, incident: Incident) -> Incident:
+        """Create a new incident on its shard."""
+        if incident.id is None:
+            incident = replace(incident, id=self.ids.next_id())
+        shard = self.shards[self.router.shard_of(incident)]
+        return await shard.incidents.create(incident)
+
+    async def create_many(
+        self, incidents: Sequence[Incident]
+    ) -> list[Incident]:
+        """Create incidents with bulk statements on their shards."""
+        incidents = [
+            incident
+            if incident.id is not None
+            else replace(incident, id=self.ids.next_id())
+            for incident in incidents
+        ]
+        groups: dict[int, list[Incident]] = {}
+        for incident in incidents:
+            groups.setdefault(self.router.shard_of(incident), []).append(
+                incident
+            )
+        await self._gather(
+            groups, lambda i: self.shards[i].incidents.create_many(groups[i])
+        )
+        return incidents
+
+    async def get_all(
+        self,
+        status: IncidentStatus | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+    ) -> list[Incident]:
+        """Get a page of incidents, newest first, optionally by status.
+
+        Every shard returns its first ``offset + limit`` incidents, the
+        merged stream is then cut to the page.
+        """
+        window = None if limit is None else offset + limit
+        pages = await self._gather(
+            range(len(self.shards)),
+            lambda i: self.shards[i].incidents.get_all(status, window),
+        )
+        merged = heapq.merge(
+            *pages, key=lambda incident: incident.created_at, reverse=True
+        )
+        return list(islice(merged, offset, window))
+
+    async def get_projection(
+        self,
+        fields: Sequence[IncidentField],
+        status: IncidentStatus | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+        before_id: int | None = None,
+    ) -> list[IncidentProjection]:
+        """Get a page of projected incidents, k-way merged on the order key.
+
+        The order key is selected even when not requested, to merge on it.
+        """
+        key: IncidentField = "created_at" if before_id is None else "id"
+        selected = list(fields) if key in fields else [*fields, key]
+        window = None if limit is None else offset + limit
+        pages = await self._gather(
+            range(len(self.shards)),
+            lambda i: self.shards[i].incidents.get_projection(
+                selected, status, window, 0, before_id
+            ),
+        )
+        merged = heapq.merge(*pages, key=lambda row: row[key], reverse=True)
+        page = list(islice(merged, offset, window))
+        if key not in fields:
+            for row in page:
+                del row[key]
+        return page
+
+    async def get_columns(
+        self,
+        fields: Sequence[IncidentField],
+        status: IncidentStatus | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+        before_id: int | None = None,
+    ) -> IncidentColumns:
+        """Get the merged projected page as columns."""
+        rows = await self.get_projection(
+            fields, status, limit, offset, before_id
+        )
+        return {
+            name: [_enum_value(row[name]) for row in rows] for name in fields
+        }
+
+    async def get_before(
+        self,
+        before_id: int | None,
+        limit: int,
+        status: IncidentStatus | None = None,
+    ) -> list[Incident]:
+        """Get incidents below before_id, k-way merged on ID."""
+        pages = await self._gather(
+            range(len(self.shards)),
+            lambda i: self.shards[i].incidents.get_before(
+                before_id, limit, status
+            ),
+        )
+        merged = heapq.merge(
+            *pages, key=lambda incident: incident.id or 0, reverse=True
+        )
+        return list(islice(merged, limit))
+
+    async def count(self, status: IncidentStatus | None = None) -> int:
+        """Count incidents on all shards."""
+        counts = await self._gather(
+            range(len(self.shards)),
+            lambda i: self.shards[i].incidents.count(status),
+        )
+        return sum(counts)
+
+    async def estimate_count(
+        self, status: IncidentStatus | None = None
+    ) -> int:
+        """Sum the estimates of all shards."""
+        counts = await self._gather(
+            range(len(self.shards)),
+            lambda i: self.shards[i].incidents.estimate_count(status),
+        )
+        return sum(counts)
+
+    async def get_by_id(self, incident_id: int) -> Incident | None:
+        """Get incident by ID from its shard or the archive."""
+        found = await self._gather(
+            self._shards_of(incident_id),
+            lambda i: self.shards[i].incidents.get_by_id(incident_id),
+        )
+        for incident in found:
+            if incident is not None:
+                return incident
+
+        if self.archive is not None:
+            archived = await self.archive.get(incident_id)
+            if archived is not None:
+                return archived.incident
+
+        return None
+
+    async def get_many(self, ids: Sequence[int]) -> list[Incident | None]:
+        """Get incidents by IDs, one query per shard holding any of them.
+
+        Shards do not fall back to the archive, IDs missing on every
+        shard are looked up there once.
+        """
+        groups = self.router.group_ids(set(ids))
+        pages = await self._gather(
+            groups, lambda i: self.shards[i].incidents.get_many(groups[i])
+        )
+        found = {
+            incident.id: incident
+            for incident in chain.from_iterable(pages)
+            if incident is not None
+        }
+
+        if self.archive is not None:
+            for incident_id in set(ids) - found.keys():
+                archived = await self.archive.get(incident_id)
+                if archived is not None:
+                    found[incident_id] = archived.incident
+
+        return [found.get(incident_id) for incident_id in ids]
+
+    async def get_existing_ids(self, ids: Sequence[int]) -> set[int]:
+        """Get the subset of given IDs on any shard or in the archive."""
+        existing = await self._get_hot_ids(ids)
+        return existing | await get_archived_ids(
+            self.archive, [i for i in ids if i not in existing]
+        )
+
+    async def update_status(
+        self, incident_id: int, status: IncidentStatus
+    ) -> Incident:
+        """Update incident status on its shard."""
+        shard = await self._locate(incident_id)
+        try:
+            if shard is None:
+                raise IncidentNotFoundError(incident_id)
+            return await shard.incidents.update_status(incident_id, status)
+        except IncidentNotFoundError:
+            if await get_archived_ids(self.archive, [incident_id]):
+                raise IncidentArchivedError(incident_id) from None
+            raise
+
+    async def update_status_many(
+        self,
+        status: IncidentStatus,
+        ids: Sequence[int] | None = None,
+        criteria: IncidentFilter | None = None,
+    ) -> list[Incident]:
+        """Update status of matching incidents on every shard."""
+        if ids is None:
+            updated = await self._gather(
+                range(len(self.shards)),
+                lambda i: self.shards[i].incidents.update_status_many(
+                    status, criteria=criteria
+                ),
+            )
+        else:
+            groups = self.router.group_ids(ids)
+            updated = await self._gather(
+                groups,
+                lambda i: self.shards[i].incidents.update_status_many(
+                    status, ids=groups[i], criteria=criteria
+                ),
+            )
+        return list(chain.from_iterable(updated))
+
+    async def get_history(self, incident_id: int) -> list[StatusChange]:
+        """Get status history from the incident shard or the archive."""
+        shard = await self._locate(incident_id)
+        history = (
+            []
+            if shard is None
+            else await shard.incidents.get_history(incident_id)
+        )
+
+        if not history and self.archive is not None:
+            archived = await self.archive.get(incident_id)
+            if archived is not None:
+                return archived.history
+
+        return history
+
+    async def get_opened_at(self, ids: Sequence[int]) -> dict[int, datetime]:
+        """Get when incidents were last opened from the shards of the IDs."""
+        groups = self.router.group_ids(ids)
+        found = await self._gather(
+            groups,
+            lambda i: self.shards[i].incidents.get_opened_at(groups[i]),
+        )
+        return {
+            incident_id: opened_at
+            for shard_opened_at in found
+            for incident_id, opened_at in shard_opened_at.items()
+        }
+
+    async def stream_all(self) -> AsyncIterator[Incident]:
+        """Iterate over archived incidents, then over each shard."""
+        async for incident in stream_archived(self.archive, self._get_hot_ids):
+            yield incident
+
+        for shard in self.shards:
+            async for incident in shard.incidents.stream_all():
+                yield incident
+
+    async def get_archivable(
+        self, closed_before: datetime, limit: int
+    ) -> list[ArchivedIncident]:
+        """Get archivable incidents, filling the batch shard by shard."""
+        records: list[ArchivedIncident] = []
+        for shard in self.shards:
+            if len(records) >= limit:
+                break
+            records.extend(
+                await shard.incidents.get_archivable(
+                    closed_before, limit - len(records)
+                )
+            )
+        return records
+
+    async def delete_many(self, ids: Sequence[int]) -> int:
+        """Delete incidents and their status history on every shard."""
+        groups = self.router.group_ids(ids)
+        deleted = await self._gather(
+            groups, lambda i: self.shards[i].incidents.delete_many(groups[i])
+        )
+        return sum(deleted)
+
+    async def _get_hot_ids(self, ids: Sequence[int]) -> set[int]:
+        """Get the subset of given IDs that exist on any shard."""
+        groups = self.router.group_ids(ids)
+        found = await self._gather(
+            groups,
+            lambda i: self.shards[i].incidents.get_existing_ids(groups[i]),
+        )
+        return set().union(*found)
+
+    def _shards_of(self, incident_id: int) -> list[int]:
+        """Get shards that may hold the incident."""
+        shard = self.router.shard_of_id(incident_id)
+        return list(range(len(self.shards))) if shard is None else [shard]
+
+    async def _locate(self, incident_id: int) -> IUnitOfWork | None:
+        """Find the shard holding the incident."""
+        candidates = self._shards_of(incident_id)
+        if len(candidates) == 1:
+            return self.shards[candidates[0]]
+
+        found = await self._gather(
+            candidates,
+            lambda i: self.shards[i].incidents.get_existing_ids([incident_id]),
+        )
+        for shard, ids in zip(candidates, found, strict=True):
+            if ids:
+                return self.shards[shard]
+        return None
+
+    @staticmethod
+    async def _gather(
+        shards: Iterable[int], call: Callable[[int], Awaitable[T]]
+    ) -> list[T]:
+        """Run the call on the shards concurrently, results in order."""
+        return list(await asyncio.gather(*(call(i) for i in shards)))
+
+
+class ShardedUnitOfWork(IUnitOfWork):
+    """Unit of Work over one lazily opened session per shard.
+
+    Analytics, idempotency keys, the webhook outbox and SLA breaches live
+    on the first shard. Shards commit one after another, so a failure
+    between commits leaves the earlier shards committed. The first shard
+    commits last: its records about incidents, such as the idempotency key
+    of a created one, are never committed without the incidents.
+    """
+
+    def __init__(
+        self,
+        session_factories: Sequence[Callable[[], AsyncSession]],
+        router: ShardRouter,
+        ids: SnowflakeIdGenerator,
+        archive: IIncidentArchive | None = None,
+        read_only: bool = False,
+        *,
+        webhook_endpoints: Sequence[str] = (),
+    ):
+        self._shards = [
+            SQLAlchemyUnitOfWork(
+                session_factory,
+                read_only=read_only,
+                webhook_endpoints=webhook_endpoints,
+            )
+            for session_factory in session_factories
+        ]
+        self._incidents = ShardedIncidentRepository(
+            self._shards, router, ids, archive
+        )
+
+    @property
+    def incidents(self) -> IIncidentRepository:
+        """Sharded incident repository."""
+        return self._incidents
+
+    @property
+    def analytics(self) -> IIncidentAnalyticsRepository:
+        """Incident analytics repository of the first shard."""
+        return self._shards[0].analytics
+
+    @property
+    def idempotency_keys(self) -> IIdempotencyKeyRepository:
+        """Idempotency key repository of the first shard."""
+        return self._shards[0].idempotency_keys
+
+    @property
+    def webhooks(self) -> IWebhookOutboxRepository:
+        """Webhook outbox repository of the first shard."""
+        return self._shards[0].webhooks
+
+    @property
+    def sla_breaches(self) -> ISlaBreachRepository:
+        """SLA breach repository of the first shard."""
+        return self._shards[0].sla_breaches
+
+    async def __aenter__(self) -> "ShardedUnitOfWork":
+        """Enter async context manager."""
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        """Exit async context manager, committing or rolling back shards."""
+        error = exc_val
+        for shard in self._commit_order():
+            try:
+                await shard.__aexit__(
+                    type(error) if error else None,
+                    error,
+                    error.__traceback__ if error else None,
+                )
+            except Exception as e:
+                # Later shards roll back after a failed commit
+                error = error or e
+        if error is not None and error is not exc_val:
+            raise error
+
+    async def commit(self) -> None:
+        """Commit the transaction on every shard, the first one last."""
+        for shard in self._commit_order():
+            await shard.commit()
+
+    async def rollback(self) -> None:
+        """Rollback the transaction on every shard."""
+        for shard in self._shards:
+            await shard.rollback()
+
+    def _commit_order(self) -> list[SQLAlchemyUnitOfWork]:
+        """Get shards in commit order, the first shard last."""
+        return [*self._shards[1:], self._shards[0]]
@@ -0,0 +1,311 @@
+"""Persistent sorted map, changed by copying paths of a B+ tree."""
+
+import bisect
+from collections.abc import Iterator
+from typing import Any, Generic, TypeVar, overload
+
+K = TypeVar("K")
+V = TypeVar("V")
+D = TypeVar("D")
+
+# Entries of a leaf or children of an inner node before it splits in two
+NODE_SIZE = 128
+
+
+class _Node:
+    """Node of the tree.
+
+    A leaf holds sorted keys with their values; an inner node holds its
+    children and the smallest key of each. ``size`` counts the entries
+    below the node. Only changes made with the ``owner`` that built the
+    node change it in place, others copy it first.
+    """
+
+    __slots__ = ("children", "keys", "owner", "size", "values")
+
+    def __init__(
+        self,
+        keys: list[Any],
+        values: list[Any] | None,
+        children: list["_Node"] | None,
+        size: int,
+        owner: object | None,
+    ):
+        self.keys = keys
+        self.values = values
+        self.children = children
+        self.size = size
+        self.owner = owner
+
+
+def _editable(node: _Node, owner: object | None) -> _Node:
+    """Get the node itself when the owner built it, otherwise a copy."""
+    if owner is not None and node.owner is owner:
+        return node
+    return _Node(
+        list(node.keys),
+        None if node.values is None else list(node.values),
+        None if node.children is None else list(node.children),
+        node.size,
+        owner,
+    )
+
+
+def _split(node: _Node) -> _Node:
+    """Move the upper half of an editable overfull node to a new sibling."""
+    middle = len(node.keys) // 2
+    if node.children is None:
+        assert node.values is not None
+        sibling = _Node(
+            node.keys[middle:],
+            node.values[middle:],
+            None,
+            len(node.keys) - middle,
+            node.owner,
+        )
+        del node.values[middle:]
+    else:
+        children = node.children[middle:]
+        sibling = _Node(
+            node.keys[middle:],
+            None,
+            children,
+            sum(child.size for child in children),
+            node.owner,
+        )
+        del node.children[middle:]
+    del node.keys[middle:]
+    node.size -= sibling.size
+    return sibling
+
+
+def _set(
+    root: _Node, key: Any, value: Any, owner: object | None
+) -> tuple[_Node, bool]:
+    """Set the value on the path to the key.
+
+    Returns the new root and whether the key was inserted.
+    """
+    path: list[tuple[_Node, int]] = []
+    node = root
+    while node.children is not None:
+        position = max(bisect.bisect_right(node.keys, key) - 1, 0)
+        path.append((node, position))
+        node = node.children[position]
+
+    position = bisect.bisect_left(node.keys, key)
+    inserted = position == len(node.keys) or node.keys[position] != key
+    node = _editable(node, owner)
+    assert node.values is not None
+    if inserted:
+        node.keys.insert(position, key)
+        node.values.insert(position, value)
+        node.size += 1
+    else:
+        node.values[position] = value
+    sibling = _split(node) if len(node.keys) > NODE_SIZE else None
+
+    for parent, position in reversed(path):
+        child = node
+        node = _editable(parent, owner)
+        assert node.children is not None
+        node.children[position] = child
+        node.keys[position] = child.keys[0]
+        if sibling is not None:
+            node.children.insert(position + 1, sibling)
+            node.keys.insert(position + 1, sibling.keys[0])
+        node.size += inserted
+        sibling = _split(node) if len(node.keys) > NODE_SIZE else None
+
+    if sibling is not None:
+        node = _Node(
+            [node.keys[0], sibling.keys[0]],
+            None,
+            [node, sibling],
+            node.size + sibling.size,
+            owner,
+        )
+    return node, inserted
+
+
+def _delete(node: _Node, key: Any, owner: object | None) -> _Node | None:
+    """Remove the key from the path to it, None for an emptied node.
+
+    Nodes are not merged, so every leaf stays at the same depth.
+    """
+    if node.children is None:
+        position = bisect.bisect_left(node.keys, key)
+        if position == len(node.keys) or node.keys[position] != key:
+            raise KeyError(key)
+        if node.size == 1:
+            return None
+        node = _editable(node, owner)
+        assert node.values is not None
+        del node.keys[position]
+        del node.values[position]
+        node.size -= 1
+        return node
+
+    position = max(bisect.bisect_right(node.keys, key) - 1, 0)
+    child = _delete(node.children[position], key, owner)
+    if child is None and len(node.children) == 1:
+        return None
+    node = _editable(node, owner)
+    assert node.children is not None
+    if child is None:
+        del node.children[position]
+        del node.keys[position]
+    else:
+        node.children[position] = child
+        node.keys[position] = child.keys[0]
+    node.size -= 1
+    return node
+
+
+def _entries(
+    node: _Node, below: Any, reverse: bool, skip: list[int]
+) -> Iterator[tuple[Any, Any]]:
+    """Iterate over entries with keys less than ``below`` (any if None).
+
+    The first ``skip[0]`` entries are passed over, whole subtrees at once
+    by their size, and the counter is lowered by the skipped entries.
+    """
+    stop = (
+        len(node.keys)
+        if below is None
+        else bisect.bisect_left(node.keys, below)
+    )
+    if node.children is None:
+        assert node.values is not None
+        entries = list(zip(node.keys[:stop], node.values[:stop], strict=True))
+        if reverse:
+            entries.reverse()
+        skipped = min(skip[0], len(entries))
+        skip[0] -= skipped
+        yield from entries[skipped:]
+        return
+
+    # The last child may hold keys from ``below`` on, so its size is not
+    # the number of entries it yields
+    partial = stop - 1 if below is not None else None
+    positions = range(stop - 1, -1, -1) if reverse else range(stop)
+    for position in positions:
+        child = node.children[position]
+        if position != partial and child.size <= skip[0]:
+            skip[0] -= child.size
+            continue
+        yield from _entries(child, below, reverse, skip)
+
+
+class SortedMap(Generic[K, V]):  # noqa: UP046 - keep Python 3.11 support
+    """Persistent map ordered by key.
+
+    ``set`` and ``delete`` return a new map in O(log n), sharing all nodes
+    but the copied path with the old one, so old versions stay valid and
+    cost nothing to keep or drop. Keys must be totally ordered.
+
+    Changes passing an ``owner`` change the nodes built with the same
+    owner in place instead of copying them again, which makes a batch of
+    changes cheap. Older maps sharing those nodes then change too: pass an
+    owner only while nothing reads the older versions it built.
+    """
+
+    __slots__ = ("_root",)
+
+    def __init__(self, root: _Node | None = None):
+        self._root = root
+
+    def __len__(self) -> int:
+        return 0 if self._root is None else self._root.size
+
+    def __contains__(self, key: object) -> bool:
+        return self._find(key) is not None
+
+    def __iter__(self) -> Iterator[K]:
+        return self.keys()
+
+    def __getitem__(self, key: K) -> V:
+        found = self._find(key)
+        if found is None:
+            raise KeyError(key)
+        node, position = found
+        assert node.values is not None
+        value: V = node.values[position]
+        return value
+
+    @overload
+    def get(self, key: K) -> V | None: ...
+
+    @overload
+    def get(self, key: K, default: D) -> V | D: ...
+
+    def get(self, key: K, default: Any = None) -> Any:
+        """Get the value of the key, the default when missing."""
+        found = self._find(key)
+        if found is None:
+            return default
+        node, position = found
+        assert node.values is not None
+        return node.values[position]
+
+    def set(
+        self, key: K, value: V, owner: object | None = None
+    ) -> "SortedMap[K, V]":
+        """Get a map with the key set to the value."""
+        if self._root is None:
+            return SortedMap(_Node([key], [value], None, 1, owner))
+        root, _ = _set(self._root, key, value, owner)
+        return SortedMap(root)
+
+    def delete(self, key: K, owner: object | None = None) -> "SortedMap[K, V]":
+        """Get a map without the key, raise KeyError when missing."""
+        if self._root is None:
+            raise KeyError(key)
+        root = _delete(self._root, key, owner)
+        while (
+            root is not None
+            and root.children is not None
+            and len(root.children) == 1
+        ):
+            root = root.children[0]
+        return SortedMap(root)
+
+    def keys(
+        self, below: K | None = None, reverse: bool = False, skip: int = 0
+    ) -> Iterator[K]:
+        """Iterate over keys less than ``below``, ascending by default."""
+        for key, _ in self.items(below, reverse, skip):
+            yield key
+
+    def values(
+        self, below: K | None = None, reverse: bool = False, skip: int = 0
+    ) -> Iterator[V]:
+        """Iterate over values of keys less than ``below`` in key order."""
+        for _, value in self.items(below, reverse, skip):
+            yield value
+
+    def items(
+        self, below: K | None = None, reverse: bool = False, skip: int = 0
+    ) -> Iterator[tuple[K, V]]:
+        """Iterate over entries with keys less than ``below`` in key order.
+
+        The first ``skip`` entries are passed over in O(log n), which makes
+        offset pages cheap.
+        """
+        if self._root is not None:
+            yield from _entries(self._root, below, reverse, [skip])
+
+    def _find(self, key: object) -> tuple[_Node, int] | None:
+        """Get the leaf holding the key and its position there."""
+        node = self._root
+        if node is None:
+            return None
+        while node.children is not None:
+            position = bisect.bisect_right(node.keys, key) - 1
+            if position < 0:
+                return None
+            node = node.children[position]
+        position = bisect.bisect_left(node.keys, key)
+        if position < len(node.keys) and node.keys[position] == key:
+            return node, position
+        return None
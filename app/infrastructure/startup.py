@@ -0,0 +1,115 @@
+"""Database preparation on application start."""
+
+import asyncio
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Literal
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.domain.enums import IncidentStatus
+from app.infrastructure.database import engine, init_db, shard_engines
+from app.infrastructure.repository import (
+    SELECT_INCIDENTS,
+    SELECT_INCIDENTS_BY_STATUS,
+    IncidentAnalyticsRepository,
+    IncidentRepository,
+)
+
+StartupMode = Literal["create_all", "verify", "skip"]
+
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+
+# Set once the schema is prepared; workers forked afterwards inherit it
+_schema_prepared = False
+
+
+def migration_heads() -> set[str]:
+    """Get head revisions of Alembic migrations."""
+    # Alembic is only needed for this check, keep it out of app import
+    from alembic.config import Config
+    from alembic.script import ScriptDirectory
+
+    return set(ScriptDirectory.from_config(Config(ALEMBIC_INI)).get_heads())
+
+
+async def verify_schema_revision(db_engine: AsyncEngine = engine) -> None:
+    """Check the database is migrated to the Alembic head revision."""
+    try:
+        async with db_engine.connect() as conn:
+            result = await conn.execute(
+                text("SELECT version_num FROM alembic_version")
+            )
+            current = set(result.scalars())
+    except DBAPIError as e:
+        raise RuntimeError(
+            "Database has no Alembic revision, run 'alembic upgrade head'"
+        ) from e
+
+    heads = migration_heads()
+    if current != heads:
+        raise RuntimeError(
+            f"Database revision {sorted(current)} does not match migrations "
+            f"head {sorted(heads)}, run 'alembic upgrade head'"
+        )
+
+
+async def prepare_schema(mode: StartupMode) -> None:
+    """Create or verify the schema once per process tree."""
+    global _schema_prepared
+    if _schema_prepared:
+        return
+
+    if mode == "create_all":
+        await init_db()
+    elif mode == "verify":
+        for db_engine in shard_engines:
+            await verify_schema_revision(db_engine)
+    _schema_prepared = True
+
+
+async def _run_hot_statements(db_engine: AsyncEngine) -> None:
+    """Execute read statements of the hot path on one pooled connection."""
+    async with AsyncSession(db_engine) as session:
+        incidents = IncidentRepository(session)
+        # Unpaged lists are only opened, reading them would scan the table
+        for stmt, params in (
+            (SELECT_INCIDENTS, {}),
+            (
+                SELECT_INCIDENTS_BY_STATUS,
+                {"status": IncidentStatus.OPEN.value},
+            ),
+        ):
+            await (await session.stream(stmt, params)).close()
+        for status in (None, IncidentStatus.OPEN):
+            await incidents.get_all(status, limit=0)
+            await incidents.get_before(None, 0, status)
+        await incidents.get_by_id(0)
+        await incidents.get_history(0)
+        await incidents.get_existing_ids([0])
+        await IncidentAnalyticsRepository(session).get_mttr_by_source()
+
+
+async def _warm_up_engine(db_engine: AsyncEngine) -> None:
+    """Run the hot read statements on every connection of the pool."""
+    pool_size = getattr(db_engine.pool, "size", None)
+    connections = pool_size() if callable(pool_size) else 1
+    await asyncio.gather(
+        *(_run_hot_statements(db_engine) for _ in range(max(connections, 1)))
+    )
+
+
+async def warm_up_db(
+    db_engines: Sequence[AsyncEngine] = shard_engines,
+) -> None:
+    """Fill the connection pools and prime statement caches.
+
+    Every connection of each shard's pool runs the hot read statements, so
+    the compiled statement cache and the driver's prepared statements are
+    ready before the first request.
+    """
+    await asyncio.gather(
+        *(_warm_up_engine(db_engine) for db_engine in db_engines)
+    )
@@ -1,19 +1,109 @@
 """Unit of Work implementation."""
 
+from collections.abc import Callable, Sequence
 from types import TracebackType
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.domain.interfaces import IIncidentRepository, IUnitOfWork
-from app.infrastructure.repository import IncidentRepository
+from app.domain.ids import SnowflakeIdGenerator
+from app.domain.interfaces import (
+    IIdempotencyKeyRepository,
+    IIncidentAnalyticsRepository,
+    IIncidentArchive,
+    IIncidentRepository,
+    ISlaBreachRepository,
+    IUnitOfWork,
+    IWebhookOutboxRepository,
+)
+from app.infrastructure.repository import (
+    IdempotencyKeyRepository,
+    IncidentAnalyticsRepository,
+    IncidentRepository,
+    SlaBreachRepository,
+    WebhookOutboxRepository,
+)
 
 
 class SQLAlchemyUnitOfWork(IUnitOfWork):
-    """SQLAlchemy implementation of Unit of Work pattern."""
+    """SQLAlchemy implementation of Unit of Work pattern.
 
-    def __init__(self, session: AsyncSession):
-        self._session = session
-        self.incidents: IIncidentRepository = IncidentRepository(session)
+    The session is created on first repository access and closed when the
+    unit of work exits, so a unit of work that never touches a repository
+    never acquires a connection. Reads of the incident repository fall
+    back to the archive, when one is given, and new incidents get IDs from
+    the ID generator, when one is given. Events are queued for the webhook
+    endpoints, when there are any.
+
+    A read-only unit of work ends by closing the session, releasing the
+    connection without a COMMIT round trip.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        archive: IIncidentArchive | None = None,
+        ids: SnowflakeIdGenerator | None = None,
+        read_only: bool = False,
+        *,
+        webhook_endpoints: Sequence[str] = (),
+    ):
+        self._session_factory = session_factory
+        self._archive = archive
+        self._ids = ids
+        self.read_only = read_only
+        self._webhook_endpoints = webhook_endpoints
+        self._session: AsyncSession | None = None
+        self._incidents: IIncidentRepository | None = None
+        self._analytics: IIncidentAnalyticsRepository | None = None
+        self._idempotency_keys: IIdempotencyKeyRepository | None = None
+        self._webhooks: IWebhookOutboxRepository | None = None
+        self._sla_breaches: ISlaBreachRepository | None = None
+
+    @property
+    def session(self) -> AsyncSession:
+        """Session of the unit of work, created on first use."""
+        if self._session is None:
+            self._session = self._session_factory()
+        return self._session
+
+    @property
+    def incidents(self) -> IIncidentRepository:
+        """Incident repository."""
+        if self._incidents is None:
+            self._incidents = IncidentRepository(
+                self.session, self._archive, self._ids
+            )
+        return self._incidents
+
+    @property
+    def analytics(self) -> IIncidentAnalyticsRepository:
+        """Incident analytics repository."""
+        if self._analytics is None:
+            self._analytics = IncidentAnalyticsRepository(self.session)
+        return self._analytics
+
+    @property
+    def idempotency_keys(self) -> IIdempotencyKeyRepository:
+        """Idempotency key repository."""
+        if self._idempotency_keys is None:
+            self._idempotency_keys = IdempotencyKeyRepository(self.session)
+        return self._idempotency_keys
+
+    @property
+    def webhooks(self) -> IWebhookOutboxRepository:
+        """Webhook outbox repository."""
+        if self._webhooks is None:
+            self._webhooks = WebhookOutboxRepository(
+                self.session, self._webhook_endpoints
+            )
+        return self._webhooks
+
+    @property
+    def sla_breaches(self) -> ISlaBreachRepository:
+        """SLA breach repository."""
+        if self._sla_breaches is None:
+            self._sla_breaches = SlaBreachRepository(self.session)
+        return self._sla_breaches
 
     async def __aenter__(self) -> "SQLAlchemyUnitOfWork":
         """Enter async context manager."""
@@ -26,15 +116,29 @@ class SQLAlchemyUnitOfWork(IUnitOfWork):
         exc_tb: TracebackType | None,
     ) -> None:
         """Exit async context manager."""
-        if exc_type is not None:
-            await self.rollback()
-        else:
-            await self.commit()
+        if self._session is None:
+            return
+
+        try:
+            if exc_type is not None:
+                await self.rollback()
+            elif not self.read_only:
+                await self.commit()
+        finally:
+            await self._session.close()
+            self._session = None
+            self._incidents = None
+            self._analytics = None
+            self._idempotency_keys = None
+            self._webhooks = None
+            self._sla_breaches = None
 
     async def commit(self) -> None:
         """Commit the transaction."""
-        await self._session.commit()
+        if self._session is not None:
+            await self._session.commit()
 
     async def rollback(self) -> None:
         """Rollback the transaction."""
-        await self._session.rollback()
+        if self._session is not None:
+            await self._session.rollback()
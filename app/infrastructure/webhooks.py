@@ -0,0 +1,172 @@
+"""Delivery of incident events from the outbox to webhook endpoints."""
+
+import asyncio
+import random
+from collections.abc import Sequence
+from datetime import UTC, datetime, timedelta
+
+import httpx
+
+from app.domain.entities import WebhookDelivery
+from app.domain.interfaces import IWebhookOutboxRepository, UnitOfWorkFactory
+
+# Longest error message kept with a failed delivery
+MAX_ERROR_LENGTH = 500
+
+
+def create_webhook_client(
+    timeout_seconds: float, max_connections: int
+) -> httpx.AsyncClient:
+    """Create the HTTP client shared by all webhook deliveries.
+
+    Connections to an endpoint are kept alive and reused by later batches.
+    """
+    return httpx.AsyncClient(
+        timeout=timeout_seconds,
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+        ),
+        follow_redirects=False,
+    )
+
+
+class WebhookDispatcher:
+    """Deliver queued incident events to webhook endpoints.
+
+    Due deliveries are claimed with a lease, so dispatchers of several
+    workers share the outbox without sending a delivery twice while the
+    lease lasts. Deliveries are posted in batches per endpoint, with at
+    most ``max_concurrency`` requests in flight per endpoint. A failed
+    batch is retried after an exponential backoff with jitter and moved to
+    the dead letters after ``max_attempts``. Delivery is at least once,
+    receivers deduplicate by delivery ID.
+    """
+
+    def __init__(
+        self,
+        uow_factory: UnitOfWorkFactory,
+        client: httpx.AsyncClient,
+        *,
+        batch_size: int = 100,
+        max_concurrency: int = 4,
+        max_attempts: int = 10,
+        backoff_seconds: float = 1.0,
+        max_backoff_seconds: float = 600.0,
+        lease_seconds: float = 60.0,
+    ):
+        self.uow_factory = uow_factory
+        self.client = client
+        self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+        self.max_attempts = max_attempts
+        self.backoff_seconds = backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.lease = timedelta(seconds=lease_seconds)
+        # One round of concurrent batches per claim, even for one endpoint
+        self.claim_limit = batch_size * max_concurrency
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+
+    async def dispatch_due(self) -> int:
+        """Deliver due deliveries until none are left, return the count."""
+        total = 0
+        while True:
+            claimed = await self.dispatch_once()
+            total += claimed
+            if claimed < self.claim_limit:
+                return total
+
+    async def dispatch_once(self) -> int:
+        """Claim one round of due deliveries and send them."""
+        now = datetime.now(UTC)
+        async with self.uow_factory() as uow:
+            deliveries = await uow.webhooks.claim(
+                now, now + self.lease, self.claim_limit
+            )
+        if not deliveries:
+            return 0
+
+        by_endpoint: dict[str, list[WebhookDelivery]] = {}
+        for delivery in deliveries:
+            by_endpoint.setdefault(delivery.endpoint, []).append(delivery)
+        batches = [
+            items[start : start + self.batch_size]
+            for items in by_endpoint.values()
+            for start in range(0, len(items), self.batch_size)
+        ]
+        errors = await asyncio.gather(*(self._send(b) for b in batches))
+
+        failed_at = datetime.now(UTC)
+        async with self.uow_factory() as uow:
+            await uow.webhooks.delete(
+                [
+                    delivery.id
+                    for batch, error in zip(batches, errors, strict=True)
+                    if error is None
+                    for delivery in batch
+                ]
+            )
+            for batch, error in zip(batches, errors, strict=True):
+                if error is not None:
+                    await self._fail(uow.webhooks, batch, error, failed_at)
+
+        return len(deliveries)
+
+    async def _send(self, batch: Sequence[WebhookDelivery]) -> str | None:
+        """Post a batch to its endpoint, returning the error of a failure."""
+        endpoint = batch[0].endpoint
+        semaphore = self._semaphores.get(endpoint)
+        if semaphore is None:
+            semaphore = self._semaphores[endpoint] = asyncio.Semaphore(
+                self.max_concurrency
+            )
+
+        async with semaphore:
+            # A malformed endpoint raises InvalidURL, not an HTTPError
+            try:
+                response = await self.client.post(
+                    endpoint,
+                    json={
+                        "events": [
+                            {"id": delivery.id, **delivery.payload}
+                            for delivery in batch
+                        ]
+                    },
+                )
+            except (httpx.HTTPError, httpx.InvalidURL) as e:
+                return f"{type(e).__name__}: {e}"[:MAX_ERROR_LENGTH]
+
+        if not response.is_success:
+            return f"HTTP {response.status_code}"
+        return None
+
+    async def _fail(
+        self,
+        outbox: IWebhookOutboxRepository,
+        batch: Sequence[WebhookDelivery],
+        error: str,
+        failed_at: datetime,
+    ) -> None:
+        """Schedule retries of a failed batch, dead-letter exhausted ones."""
+        await outbox.dead_letter(
+            [
+                delivery
+                for delivery in batch
+                if delivery.attempts + 1 >= self.max_attempts
+            ],
+            error,
+        )
+
+        retries: dict[int, list[int]] = {}
+        for delivery in batch:
+            if delivery.attempts + 1 < self.max_attempts:
+                retries.setdefault(delivery.attempts, []).append(delivery.id)
+        for attempts, ids in retries.items():
+            await outbox.retry(ids, failed_at + self._backoff(attempts), error)
+
+    def _backoff(self, attempts: int) -> timedelta:
+        """Get the delay before the next attempt, with equal jitter."""
+        delay = min(
+            self.backoff_seconds * 2**attempts, self.max_backoff_seconds
+        )
+        return timedelta(seconds=delay / 2 + random.uniform(0, delay / 2))
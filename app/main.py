@@ -1,20 +1,102 @@
 """Main FastAPI application entry point."""
 
+import asyncio
+import contextlib
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
+from datetime import timedelta
 
 from fastapi import FastAPI
 
-from app.infrastructure.database import init_db
+from app.application.use_cases import PurgeExpiredIdempotencyKeysUseCase
+from app.config import settings
+from app.dependencies import (
+    get_uow_factory,
+    loop_lag_monitor,
+    memory_database,
+    sla_scheduler,
+)
+from app.infrastructure.background import run_periodically
+from app.infrastructure.database import dispose_db
+from app.infrastructure.startup import prepare_schema, warm_up_db
+from app.infrastructure.webhooks import (
+    WebhookDispatcher,
+    create_webhook_client,
+)
+from app.presentation.compression import CompressionMiddleware
 from app.presentation.routes import router
 
 
+async def purge_expired_idempotency_keys() -> None:
+    """Delete idempotency keys older than the configured TTL."""
+    use_case = PurgeExpiredIdempotencyKeysUseCase(await get_uow_factory())
+    await use_case.execute(
+        timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL_SECONDS)
+    )
+
+
 @asynccontextmanager
 async def lifespan(_app: FastAPI) -> AsyncGenerator[None, None]:
     """Lifespan event handler to initialize resources on startup."""
-    await init_db()
+    if memory_database is None:
+        await prepare_schema(settings.DB_STARTUP_MODE)
+        if settings.DB_WARMUP_ENABLED:
+            await warm_up_db()
+
+    tasks = [
+        asyncio.create_task(
+            run_periodically(
+                settings.IDEMPOTENCY_SWEEP_INTERVAL_SECONDS,
+                purge_expired_idempotency_keys,
+            )
+        ),
+        asyncio.create_task(loop_lag_monitor.run()),
+    ]
+    webhook_client = None
+    if settings.WEBHOOK_ENDPOINTS:
+        webhook_client = create_webhook_client(
+            settings.WEBHOOK_TIMEOUT_SECONDS, settings.WEBHOOK_MAX_CONNECTIONS
+        )
+        dispatcher = WebhookDispatcher(
+            await get_uow_factory(),
+            webhook_client,
+            batch_size=settings.WEBHOOK_BATCH_SIZE,
+            max_concurrency=settings.WEBHOOK_MAX_CONCURRENCY,
+            max_attempts=settings.WEBHOOK_MAX_ATTEMPTS,
+            backoff_seconds=settings.WEBHOOK_BACKOFF_SECONDS,
+            max_backoff_seconds=settings.WEBHOOK_MAX_BACKOFF_SECONDS,
+            # A claim is sent in one round of requests
+            lease_seconds=2 * settings.WEBHOOK_TIMEOUT_SECONDS,
+        )
+        tasks.append(
+            asyncio.create_task(
+                run_periodically(
+                    settings.WEBHOOK_POLL_INTERVAL_SECONDS,
+                    dispatcher.dispatch_due,
+                )
+            )
+        )
+    if sla_scheduler is not None:
+        await sla_scheduler.load()
+        tasks.append(
+            asyncio.create_task(
+                run_periodically(settings.SLA_TICK_SECONDS, sla_scheduler.tick)
+            )
+        )
     yield
 
+    for task in tasks:
+        task.cancel()
+    for task in tasks:
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+
+    if webhook_client is not None:
+        await webhook_client.aclose()
+    if memory_database is not None:
+        memory_database.close()
+    await dispose_db()
+
 
 app = FastAPI(
     title="Incident Service API",
@@ -23,6 +105,13 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MIN_SIZE,
+        encodings=settings.COMPRESSION_ENCODINGS,
+    )
+
 app.include_router(router)
 
 
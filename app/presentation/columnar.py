@@ -0,0 +1,227 @@
+"""Columnar response formats negotiated with Accept: Arrow and MessagePack."""
+
+import io
+from collections.abc import Callable, Sequence
+from datetime import UTC, datetime
+from importlib.util import find_spec
+from typing import Any, Literal, Protocol
+
+from app.domain.entities import IncidentColumns, IncidentField
+from app.domain.enums import IncidentSource, IncidentStatus
+
+ColumnarFormat = Literal["arrow", "msgpack"]
+
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+MSGPACK_MEDIA_TYPE = "application/x-msgpack"
+
+MEDIA_TYPES: dict[str, ColumnarFormat] = {
+    ARROW_MEDIA_TYPE: "arrow",
+    MSGPACK_MEDIA_TYPE: "msgpack",
+    "application/msgpack": "msgpack",
+    "application/vnd.msgpack": "msgpack",
+}
+
+# Media types answered with the JSON body of the endpoint
+JSON_MEDIA_TYPES = {
+    "application/json",
+    "application/x-ndjson",
+    "application/*",
+    "*/*",
+}
+
+# Fixed dictionaries of the dictionary-encoded columns, the same in every
+# chunk of a stream
+DICTIONARIES: dict[IncidentField, list[str]] = {
+    "status": [status.value for status in IncidentStatus],
+    "source": [source.value for source in IncidentSource],
+}
+
+
+class ColumnarEncoder(Protocol):
+    """Encoder of incident columns into a stream of chunks."""
+
+    media_type: str
+
+    def start(self) -> bytes:
+        """Begin the stream."""
+
+    def encode(self, columns: IncidentColumns) -> bytes:
+        """Encode a chunk of incidents."""
+
+    def finish(self) -> bytes:
+        """End the stream."""
+
+
+def _dictionary_indices(field: IncidentField, values: list[str]) -> list[int]:
+    """Replace values of a dictionary-encoded column with their indices."""
+    codes = {value: i for i, value in enumerate(DICTIONARIES[field])}
+    return [codes[value] for value in values]
+
+
+class ArrowEncoder:
+    """Apache Arrow IPC stream, requires the optional pyarrow package.
+
+    Status and source are dictionary arrays over the fixed dictionaries,
+    ``created_at`` is a UTC timestamp with microseconds.
+    """
+
+    media_type = ARROW_MEDIA_TYPE
+
+    def __init__(self, fields: Sequence[IncidentField]):
+        import pyarrow as pa
+
+        self._pa = pa
+        types: dict[IncidentField, Any] = {
+            "id": pa.int64(),
+            "description": pa.string(),
+            "status": pa.dictionary(pa.int8(), pa.string()),
+            "source": pa.dictionary(pa.int8(), pa.string()),
+            "created_at": pa.timestamp("us", tz="UTC"),
+        }
+        self._fields = list(fields)
+        self._schema = pa.schema([(name, types[name]) for name in fields])
+        self._dictionaries = {
+            name: pa.array(values, pa.string())
+            for name, values in DICTIONARIES.items()
+        }
+        self._buffer = io.BytesIO()
+        self._writer: Any = None
+
+    def start(self) -> bytes:
+        """Write the schema message."""
+        self._writer = self._pa.ipc.new_stream(self._buffer, self._schema)
+        return self._drain()
+
+    def encode(self, columns: IncidentColumns) -> bytes:
+        """Write a record batch."""
+        arrays = [self._array(name, columns[name]) for name in self._fields]
+        self._writer.write_batch(
+            self._pa.record_batch(arrays, schema=self._schema)
+        )
+        return self._drain()
+
+    def finish(self) -> bytes:
+        """Write the end-of-stream marker."""
+        self._writer.close()
+        return self._drain()
+
+    def _array(self, name: IncidentField, values: list[Any]) -> Any:
+        pa = self._pa
+        if name in self._dictionaries:
+            return pa.DictionaryArray.from_arrays(
+                pa.array(_dictionary_indices(name, values), pa.int8()),
+                self._dictionaries[name],
+            )
+        return pa.array(values, self._schema.field(name).type)
+
+    def _drain(self) -> bytes:
+        data = self._buffer.getvalue()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return data
+
+
+class MessagePackEncoder:
+    """MessagePack maps of columns, requires the optional msgpack package.
+
+    Every chunk is one map ``{"length": n, "columns": {...}}``, a stream is
+    their concatenation. Status and source are maps of ``dictionary`` and
+    ``indices``, ``created_at`` uses the MessagePack timestamp type.
+    """
+
+    media_type = MSGPACK_MEDIA_TYPE
+
+    def __init__(self, fields: Sequence[IncidentField]):
+        import msgpack
+
+        self._msgpack = msgpack
+        self._fields = list(fields)
+
+    def start(self) -> bytes:
+        """Nothing precedes the first chunk."""
+        return b""
+
+    def encode(self, columns: IncidentColumns) -> bytes:
+        """Pack a chunk into one map."""
+        packed: dict[str, Any] = {}
+        for name in self._fields:
+            values = columns[name]
+            if name in DICTIONARIES:
+                packed[name] = {
+                    "dictionary": DICTIONARIES[name],
+                    "indices": _dictionary_indices(name, values),
+                }
+            elif name == "created_at":
+                packed[name] = [self._timestamp(value) for value in values]
+            else:
+                packed[name] = values
+        length = len(columns[self._fields[0]]) if self._fields else 0
+        return bytes(
+            self._msgpack.packb({"length": length, "columns": packed})
+        )
+
+    def finish(self) -> bytes:
+        """Nothing follows the last chunk."""
+        return b""
+
+    def _timestamp(self, value: datetime) -> Any:
+        if value.tzinfo is None:
+            # SQLite does not keep timezone, values are stored in UTC
+            value = value.replace(tzinfo=UTC)
+        return self._msgpack.Timestamp.from_datetime(value)
+
+
+ENCODERS: dict[
+    ColumnarFormat, Callable[[Sequence[IncidentField]], ColumnarEncoder]
+] = {
+    "arrow": ArrowEncoder,
+    "msgpack": MessagePackEncoder,
+}
+
+# Package each encoder imports when it is first built
+PACKAGES: dict[ColumnarFormat, str] = {
+    "arrow": "pyarrow",
+    "msgpack": "msgpack",
+}
+
+
+def available_formats() -> list[ColumnarFormat]:
+    """Get formats whose encoder package is installed.
+
+    Packages are only looked up, the first columnar request imports them.
+    """
+    return [name for name, package in PACKAGES.items() if find_spec(package)]
+
+
+def negotiate_format(
+    accept: str, formats: Sequence[ColumnarFormat]
+) -> ColumnarFormat | None:
+    """Pick the format the client prefers, None for JSON.
+
+    JSON wins ties and wildcards, so only clients asking for a columnar
+    format by name get one.
+    """
+    best: ColumnarFormat | None = None
+    best_weight = 0.0
+    json_weight = 0.0
+    for item in accept.split(","):
+        media_type, _, params = item.strip().partition(";")
+        media_type = media_type.strip().lower()
+        weight = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.strip() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        if media_type in JSON_MEDIA_TYPES:
+            json_weight = max(json_weight, weight)
+        elif MEDIA_TYPES.get(media_type) in formats and weight > best_weight:
+            best, best_weight = MEDIA_TYPES[media_type], weight
+    return best if best_weight > json_weight else None
+
+
+def encode_page(encoder: ColumnarEncoder, columns: IncidentColumns) -> bytes:
+    """Encode a whole response body of one chunk."""
+    return encoder.start() + encoder.encode(columns) + encoder.finish()
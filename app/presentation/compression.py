@@ -0,0 +1,235 @@
+"""Response compression negotiated with Accept-Encoding."""
+
+import zlib
+from collections.abc import Callable, Sequence
+from typing import Literal, Protocol
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+Encoding = Literal["zstd", "br", "gzip"]
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 4
+ZSTD_LEVEL = 3
+
+
+class Compressor(Protocol):
+    """Streaming compressor of one response body."""
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress a chunk, returning output that is ready."""
+
+    def flush(self) -> bytes:
+        """Emit everything compressed so far, keeping the stream open."""
+
+    def finish(self) -> bytes:
+        """End the stream."""
+
+
+class GzipCompressor:
+    """Gzip stream compressor from the standard library."""
+
+    def __init__(self) -> None:
+        # wbits 31 writes the gzip header and trailer
+        self._compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress a chunk."""
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        """Emit compressed data so far."""
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        """End the stream."""
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class BrotliCompressor:
+    """Brotli stream compressor, requires the optional brotli package."""
+
+    def __init__(self) -> None:
+        import brotli
+
+        self._compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress a chunk."""
+        return bytes(self._compressor.process(data))
+
+    def flush(self) -> bytes:
+        """Emit compressed data so far."""
+        return bytes(self._compressor.flush())
+
+    def finish(self) -> bytes:
+        """End the stream."""
+        return bytes(self._compressor.finish())
+
+
+class ZstdCompressor:
+    """Zstandard stream compressor, requires the optional zstandard."""
+
+    def __init__(self) -> None:
+        import zstandard
+
+        self._flush_block = zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        self._compressor = zstandard.ZstdCompressor(
+            level=ZSTD_LEVEL
+        ).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress a chunk."""
+        return bytes(self._compressor.compress(data))
+
+    def flush(self) -> bytes:
+        """Emit compressed data so far."""
+        return bytes(self._compressor.flush(self._flush_block))
+
+    def finish(self) -> bytes:
+        """End the stream."""
+        return bytes(self._compressor.flush())
+
+
+COMPRESSORS: dict[Encoding, Callable[[], Compressor]] = {
+    "zstd": ZstdCompressor,
+    "br": BrotliCompressor,
+    "gzip": GzipCompressor,
+}
+
+
+def available_encodings(encodings: Sequence[Encoding]) -> list[Encoding]:
+    """Keep encodings whose compressor package is installed."""
+    available = []
+    for encoding in encodings:
+        try:
+            COMPRESSORS[encoding]()
+        except ImportError:
+            continue
+        available.append(encoding)
+    return available
+
+
+def negotiate(
+    accept_encoding: str, encodings: Sequence[Encoding]
+) -> Encoding | None:
+    """Pick the encoding the client prefers, server order breaks ties."""
+    weights: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        weight = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        if name:
+            weights[name.strip().lower()] = weight
+
+    best: Encoding | None = None
+    best_weight = 0.0
+    for encoding in encodings:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+class CompressionMiddleware:
+    """Compress response bodies with zstd, brotli or gzip.
+
+    Bodies below ``minimum_size`` sent in one message go out as is.
+    Streamed bodies are compressed chunk by chunk and flushed after each
+    one, so a client receives lines of a stream without delay.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        encodings: Sequence[Encoding] = ("zstd", "br", "gzip"),
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.encodings = available_encodings(encodings)
+
+    async def __call__(
+        self, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        """Handle the request, compressing the response when accepted."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate(
+            Headers(scope=scope).get("accept-encoding", ""), self.encodings
+        )
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressingResponder(send, encoding, self.minimum_size)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressingResponder:
+    """Send wrapper compressing the body of one response."""
+
+    def __init__(self, send: Send, encoding: Encoding, minimum_size: int):
+        self._send = send
+        self._encoding = encoding
+        self._minimum_size = minimum_size
+        self._start: Message | None = None
+        self._compressor: Compressor | None = None
+        self._passthrough = False
+
+    async def send(self, message: Message) -> None:
+        """Compress body messages of the response."""
+        if message["type"] == "http.response.start":
+            self._start = message
+            return
+        if message["type"] != "http.response.body" or self._passthrough:
+            await self._send(message)
+            return
+
+        body: bytes = message.get("body", b"")
+        more_body: bool = message.get("more_body", False)
+
+        if self._start is not None:
+            start, self._start = self._start, None
+            headers = MutableHeaders(raw=start["headers"])
+            headers.add_vary_header("Accept-Encoding")
+            if "content-encoding" in headers or (
+                not more_body and len(body) < self._minimum_size
+            ):
+                self._passthrough = True
+                await self._send(start)
+                await self._send(message)
+                return
+
+            self._compressor = COMPRESSORS[self._encoding]()
+            headers["Content-Encoding"] = self._encoding
+            del headers["Content-Length"]
+            body = _compress(self._compressor, body, more_body)
+            if not more_body:
+                headers["Content-Length"] = str(len(body))
+            await self._send(start)
+        elif self._compressor is not None:
+            body = _compress(self._compressor, body, more_body)
+
+        await self._send(
+            {
+                "type": "http.response.body",
+                "body": body,
+                "more_body": more_body,
+            }
+        )
+
+
+def _compress(compressor: Compressor, body: bytes, more_body: bool) -> bytes:
+    """Compress a body chunk, ending the stream after the last one."""
+    data = compressor.compress(body)
+    return data + (compressor.flush() if more_body else compressor.finish())
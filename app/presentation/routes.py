@@ -1,22 +1,87 @@
 """FastAPI routes for incidents."""
 
-from fastapi import APIRouter, HTTPException, Query, status
+from collections.abc import AsyncIterator
+from datetime import date
+from typing import Annotated, Any, cast
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Response,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
 
 from app.dependencies import (
+    BulkUpdateIncidentStatusUseCaseDep,
     CreateIncidentUseCaseDep,
+    ExportIncidentsUseCaseDep,
     GetIncidentByIdUseCaseDep,
+    GetIncidentHistoryUseCaseDep,
+    GetIncidentsByIdsUseCaseDep,
     GetIncidentsUseCaseDep,
+    GetMttrUseCaseDep,
+    ReadFlightsDep,
     UpdateIncidentStatusUseCaseDep,
 )
-from app.domain.enums import IncidentStatus
-from app.domain.exceptions import IncidentNotFoundError
+from app.domain.entities import INCIDENT_FIELDS, IncidentFilter
+from app.domain.exceptions import (
+    IdempotencyKeyConflictError,
+    IdempotencyKeyInProgressError,
+    IncidentArchivedError,
+    IncidentNotFoundError,
+    InvalidStatusTransitionError,
+)
+from app.presentation.columnar import (
+    ARROW_MEDIA_TYPE,
+    ENCODERS,
+    MSGPACK_MEDIA_TYPE,
+    ColumnarFormat,
+    available_formats,
+    encode_page,
+    negotiate_format,
+)
 from app.presentation.schemas import (
+    DurationStatsResponse,
+    IncidentBulkStatusUpdateRequest,
+    IncidentBulkStatusUpdateResponse,
     IncidentCreateRequest,
+    IncidentListQuery,
+    IncidentLookupRequest,
+    IncidentLookupResponse,
+    IncidentProjectionResponse,
     IncidentResponse,
     IncidentStatusUpdateRequest,
+    MttrResponse,
+    StatusChangeResponse,
+)
+from app.presentation.throttling import limit_incident_ingestion, shed_load
+
+router = APIRouter(
+    prefix="/incidents",
+    tags=["incidents"],
+    dependencies=[Depends(shed_load)],
 )
 
-router = APIRouter(prefix="/incidents", tags=["incidents"])
+_incident_list_adapter = TypeAdapter(list[IncidentResponse])
+_projection_list_adapter = TypeAdapter(list[IncidentProjectionResponse])
+
+# Count of incidents matching the list filter, whatever the page
+TOTAL_COUNT_HEADER = "X-Total-Count"
+
+# Incidents per chunk of the streamed export
+EXPORT_CHUNK_SIZE = 500
+
+# Columnar formats whose packages are installed
+COLUMNAR_FORMATS = available_formats()
+COLUMNAR_CONTENT: dict[str, Any] = {
+    ARROW_MEDIA_TYPE: {},
+    MSGPACK_MEDIA_TYPE: {},
+}
 
 
 @router.post(
@@ -24,17 +89,37 @@ router = APIRouter(prefix="/incidents", tags=["incidents"])
     response_model=IncidentResponse,
     status_code=status.HTTP_201_CREATED,
     summary="Create a new incident",
+    dependencies=[Depends(limit_incident_ingestion)],
 )
 async def create_incident(
     request: IncidentCreateRequest,
     use_case: CreateIncidentUseCaseDep,
+    idempotency_key: str | None = Header(
+        None,
+        alias="Idempotency-Key",
+        min_length=1,
+        max_length=255,
+        description="Key making client retries return the same incident",
+    ),
 ) -> IncidentResponse:
     """Create a new incident."""
-    incident = await use_case.execute(
-        description=request.description,
-        status=request.status,
-        source=request.source,
-    )
+    try:
+        incident = await use_case.execute(
+            description=request.description,
+            status=request.status,
+            source=request.source,
+            idempotency_key=idempotency_key,
+        )
+    except IdempotencyKeyConflictError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+            detail=str(e),
+        )
+    except IdempotencyKeyInProgressError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e),
+        )
 
     return IncidentResponse(
         id=incident.id,  # type: ignore[arg-type]
@@ -49,26 +134,196 @@ async def create_incident(
     "",
     response_model=list[IncidentResponse],
     summary="Get list of incidents",
+    responses={200: {"content": COLUMNAR_CONTENT}},
 )
 async def get_incidents(
     use_case: GetIncidentsUseCaseDep,
-    status: IncidentStatus | None = Query(
-        None, description="Filter by incident status"
+    flights: ReadFlightsDep,
+    query: Annotated[IncidentListQuery, Query()],
+    accept: Annotated[str, Header()] = "application/json",
+) -> Response:
+    """Get incidents newest first, optionally filtered by status.
+
+    With ``fields`` only the requested attributes are read and returned.
+    Arrow and MessagePack clients get columns read straight from the
+    query. Concurrent identical requests share one query and one response
+    body. The total of the filter is sent in ``X-Total-Count`` as the
+    ``count`` mode asks.
+    """
+    columnar = negotiate_format(accept, COLUMNAR_FORMATS)
+
+    async def load() -> bytes:
+        if columnar is not None:
+            fields = query.fields or INCIDENT_FIELDS
+            columns = await use_case.execute_columns(
+                fields,
+                query.status,
+                query.limit,
+                query.offset,
+                query.before_id,
+            )
+            return encode_page(ENCODERS[columnar](fields), columns)
+
+        if query.fields:
+            rows = await use_case.execute_projection(
+                query.fields,
+                query.status,
+                query.limit,
+                query.offset,
+                query.before_id,
+            )
+            return _projection_list_adapter.dump_json(
+                cast("list[IncidentProjectionResponse]", rows)
+            )
+
+        incidents = await use_case.execute(
+            query.status, query.limit, query.offset, query.before_id
+        )
+        return _incident_list_adapter.dump_json(
+            [
+                IncidentResponse.model_validate(incident)
+                for incident in incidents
+            ]
+        )
+
+    content = await flights.do(
+        (type(use_case).__name__, query, columnar), load
+    )
+    total = await use_case.count(query.status, query.count)
+    headers = {"Vary": "Accept"}
+    if total is not None:
+        headers[TOTAL_COUNT_HEADER] = str(total)
+    return Response(
+        content=content, media_type=_media_type(columnar), headers=headers
+    )
+
+
+@router.get(
+    "/analytics/mttr",
+    response_model=MttrResponse,
+    summary="Get mean time to resolve",
+)
+async def get_mttr(
+    use_case: GetMttrUseCaseDep,
+    day: date | None = Query(
+        None, description="Day of resolution (UTC), all time if omitted"
     ),
-) -> list[IncidentResponse]:
-    """Get all incidents, optionally filtered by status."""
-    incidents = await use_case.execute(status=status)
-
-    return [
-        IncidentResponse(
-            id=incident.id,  # type: ignore[arg-type]
-            description=incident.description,
-            status=incident.status,
-            source=incident.source,
-            created_at=incident.created_at,
+) -> MttrResponse:
+    """Get mean time to resolve incidents, overall and per source."""
+    report = await use_case.execute(day)
+
+    return MttrResponse(
+        day=report.day,
+        overall=DurationStatsResponse.from_stats(report.overall),
+        by_source={
+            source: DurationStatsResponse.from_stats(stats)
+            for source, stats in report.by_source.items()
+        },
+    )
+
+
+@router.get(
+    "/export",
+    summary="Export all incidents as NDJSON",
+    response_class=StreamingResponse,
+    responses={
+        200: {"content": {"application/x-ndjson": {}, **COLUMNAR_CONTENT}}
+    },
+)
+async def export_incidents(
+    use_case: ExportIncidentsUseCaseDep,
+    accept: Annotated[str, Header()] = "application/x-ndjson",
+) -> StreamingResponse:
+    """Stream all incidents, archived ones included, one JSON per line.
+
+    Arrow and MessagePack clients get a chunk of columns per batch.
+    """
+    columnar = negotiate_format(accept, COLUMNAR_FORMATS)
+    if columnar is not None:
+        encoder = ENCODERS[columnar](INCIDENT_FIELDS)
+
+        async def chunks() -> AsyncIterator[bytes]:
+            yield encoder.start()
+            async for columns in use_case.execute_columns(EXPORT_CHUNK_SIZE):
+                yield encoder.encode(columns)
+            yield encoder.finish()
+
+        return StreamingResponse(
+            chunks(), media_type=encoder.media_type, headers={"Vary": "Accept"}
         )
-        for incident in incidents
-    ]
+
+    async def lines() -> AsyncIterator[bytes]:
+        chunk: list[bytes] = []
+        async for incident in use_case.execute():
+            chunk.append(
+                IncidentResponse.model_validate(incident)
+                .model_dump_json(by_alias=True)
+                .encode()
+                + b"\n"
+            )
+            if len(chunk) >= EXPORT_CHUNK_SIZE:
+                yield b"".join(chunk)
+                chunk.clear()
+        if chunk:
+            yield b"".join(chunk)
+
+    return StreamingResponse(
+        lines(), media_type="application/x-ndjson", headers={"Vary": "Accept"}
+    )
+
+
+@router.patch(
+    "/status",
+    response_model=IncidentBulkStatusUpdateResponse,
+    summary="Update status of many incidents",
+)
+async def bulk_update_incident_status(
+    request: IncidentBulkStatusUpdateRequest,
+    use_case: BulkUpdateIncidentStatusUseCaseDep,
+) -> IncidentBulkStatusUpdateResponse:
+    """Update the status of incidents selected by ids and/or filter."""
+    criteria = None
+    if request.filter is not None:
+        criteria = IncidentFilter(
+            status=request.filter.status,
+            source=request.filter.source,
+            created_from=request.filter.created_from,
+            created_to=request.filter.created_to,
+        )
+
+    result = await use_case.execute(
+        request.status, ids=request.ids, criteria=criteria
+    )
+
+    return IncidentBulkStatusUpdateResponse(
+        updated=[
+            IncidentResponse.model_validate(incident)
+            for incident in result.updated
+        ],
+        not_found=result.not_found,
+        rejected=result.rejected,
+    )
+
+
+@router.post(
+    "/lookup",
+    response_model=IncidentLookupResponse,
+    summary="Get many incidents by IDs",
+)
+async def lookup_incidents(
+    request: IncidentLookupRequest,
+    use_case: GetIncidentsByIdsUseCaseDep,
+) -> IncidentLookupResponse:
+    """Get incidents by IDs with one query, in the order of the IDs."""
+    result = await use_case.execute(request.ids)
+
+    return IncidentLookupResponse(
+        found=[
+            IncidentResponse.model_validate(incident)
+            for incident in result.found
+        ],
+        not_found=result.not_found,
+    )
 
 
 @router.get(
@@ -79,23 +334,32 @@ async def get_incidents(
 async def get_incident(
     incident_id: int,
     use_case: GetIncidentByIdUseCaseDep,
-) -> IncidentResponse:
-    """Get a single incident by ID."""
-    try:
+    flights: ReadFlightsDep,
+) -> Response:
+    """Get a single incident by ID.
+
+    Concurrent identical requests share one query and one response body.
+    """
+
+    async def load() -> bytes:
         incident = await use_case.execute(incident_id)
+        return (
+            IncidentResponse.model_validate(incident)
+            .model_dump_json(by_alias=True)
+            .encode()
+        )
+
+    try:
+        content = await flights.do(
+            (type(use_case).__name__, incident_id), load
+        )
     except IncidentNotFoundError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e),
         )
 
-    return IncidentResponse(
-        id=incident.id,  # type: ignore[arg-type]
-        description=incident.description,
-        status=incident.status,
-        source=incident.source,
-        created_at=incident.created_at,
-    )
+    return Response(content=content, media_type="application/json")
 
 
 @router.patch(
@@ -116,6 +380,11 @@ async def update_incident_status(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e),
         )
+    except (IncidentArchivedError, InvalidStatusTransitionError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e),
+        )
 
     return IncidentResponse(
         id=incident.id,  # type: ignore[arg-type]
@@ -124,3 +393,33 @@ async def update_incident_status(
         source=incident.source,
         created_at=incident.created_at,
     )
+
+
+@router.get(
+    "/{incident_id}/history",
+    response_model=list[StatusChangeResponse],
+    summary="Get incident status history",
+)
+async def get_incident_history(
+    incident_id: int,
+    use_case: GetIncidentHistoryUseCaseDep,
+) -> list[StatusChangeResponse]:
+    """Get the status history of an incident."""
+    try:
+        history = await use_case.execute(incident_id)
+    except IncidentNotFoundError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e),
+        )
+
+    return [StatusChangeResponse.model_validate(entry) for entry in history]
+
+
+def _media_type(columnar: ColumnarFormat | None) -> str:
+    """Get the media type of a list response."""
+    if columnar == "arrow":
+        return ARROW_MEDIA_TYPE
+    if columnar == "msgpack":
+        return MSGPACK_MEDIA_TYPE
+    return "application/json"
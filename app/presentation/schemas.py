@@ -1,11 +1,27 @@
 """Pydantic schemas for API requests and responses."""
 
-from datetime import datetime
-
-from pydantic import BaseModel, Field
-
+from datetime import date, datetime
+from typing import Annotated, Any, Self
+
+from pydantic import (
+    BaseModel,
+    Field,
+    PlainSerializer,
+    field_validator,
+    model_validator,
+)
+from typing_extensions import TypedDict
+
+from app.domain.analytics import DurationStats
+from app.domain.entities import INCIDENT_FIELDS, CountMode, IncidentField
 from app.domain.enums import IncidentSource, IncidentStatus
 
+# Snowflake IDs are above 2**53, past which JavaScript numbers round, so
+# IDs are sent as JSON strings; strings and numbers are both accepted
+IncidentId = Annotated[
+    int, PlainSerializer(str, return_type=str, when_used="json")
+]
+
 
 class IncidentCreateRequest(BaseModel):
     """Request schema for creating an incident."""
@@ -23,18 +39,212 @@ class IncidentStatusUpdateRequest(BaseModel):
     status: IncidentStatus = Field(..., description="New incident status")
 
 
+class IncidentFilterRequest(BaseModel):
+    """Filter criteria for selecting incidents."""
+
+    status: IncidentStatus | None = Field(
+        None, description="Current incident status"
+    )
+    source: IncidentSource | None = Field(None, description="Incident source")
+    created_from: datetime | None = Field(
+        None, description="Created at or after this moment"
+    )
+    created_to: datetime | None = Field(
+        None, description="Created before this moment"
+    )
+
+    @model_validator(mode="after")
+    def check_not_empty(self) -> Self:
+        """Ensure at least one criterion is set."""
+        if all(
+            value is None
+            for value in (
+                self.status,
+                self.source,
+                self.created_from,
+                self.created_to,
+            )
+        ):
+            raise ValueError("Filter must contain at least one criterion")
+        return self
+
+
+class IncidentListQuery(BaseModel):
+    """Query parameters of the incident list."""
+
+    model_config = {"frozen": True}
+
+    status: IncidentStatus | None = Field(
+        None, description="Filter by incident status"
+    )
+    limit: int | None = Field(
+        None, ge=1, le=1000, description="Page size, all incidents if omitted"
+    )
+    offset: int = Field(0, ge=0, description="Incidents to skip")
+    before_id: IncidentId | None = Field(
+        None,
+        ge=1,
+        description=(
+            "Cursor: incidents with lower IDs, highest first (IDs grow "
+            "with creation time)"
+        ),
+    )
+
+    count: CountMode | None = Field(
+        None,
+        description=(
+            "Total in X-Total-Count: exact (cached for seconds), estimate "
+            "(planner statistics) or none; the server default if omitted"
+        ),
+    )
+
+    fields: tuple[IncidentField, ...] | None = Field(
+        None,
+        description=(
+            "Comma-separated attributes to return, all if omitted: "
+            + ", ".join(INCIDENT_FIELDS)
+        ),
+    )
+
+    @field_validator("fields", mode="before")
+    @classmethod
+    def split_fields(cls, value: Any) -> Any:
+        """Accept comma-separated and repeated fields, without duplicates."""
+        if value is None:
+            return None
+        if isinstance(value, str):
+            value = [value]
+        names = [name.strip() for item in value for name in item.split(",")]
+        return tuple(dict.fromkeys(name for name in names if name))
+
+    @model_validator(mode="after")
+    def check_single_pagination(self) -> Self:
+        """Ensure offset and cursor pagination are not mixed."""
+        if self.before_id is not None and self.offset:
+            raise ValueError("Use either offset or before_id")
+        return self
+
+
+class IncidentBulkStatusUpdateRequest(BaseModel):
+    """Request schema for updating status of many incidents."""
+
+    status: IncidentStatus = Field(..., description="New incident status")
+    ids: list[IncidentId] | None = Field(
+        None, max_length=10000, description="Incident IDs to update"
+    )
+    filter: IncidentFilterRequest | None = Field(
+        None, description="Criteria for incidents to update"
+    )
+
+    @model_validator(mode="after")
+    def check_selector(self) -> Self:
+        """Ensure incidents are selected by ids or by filter."""
+        if self.ids is None and self.filter is None:
+            raise ValueError("Either ids or filter must be provided")
+        return self
+
+
+class IncidentLookupRequest(BaseModel):
+    """Request schema for getting many incidents by IDs."""
+
+    ids: list[IncidentId] = Field(
+        ..., min_length=1, max_length=1000, description="Incident IDs"
+    )
+
+
 class IncidentResponse(BaseModel):
     """Response schema for incident."""
 
     model_config = {"from_attributes": True}
 
-    id: int
+    id: IncidentId
     description: str
     status: IncidentStatus
     source: IncidentSource
     created_at: datetime
 
 
+class IncidentProjectionResponse(TypedDict, total=False):
+    """Response schema for incident reduced to the selected attributes."""
+
+    id: IncidentId
+    description: str
+    status: IncidentStatus
+    source: IncidentSource
+    created_at: datetime
+
+
+class IncidentBulkStatusUpdateResponse(BaseModel):
+    """Response schema for bulk status update."""
+
+    updated: list[IncidentResponse]
+    not_found: list[IncidentId] = Field(
+        ..., description="Requested IDs not found"
+    )
+    rejected: list[IncidentId] = Field(
+        ...,
+        description=(
+            "Requested IDs that cannot move to the new status, "
+            "are archived or do not match the filter"
+        ),
+    )
+
+
+class IncidentLookupResponse(BaseModel):
+    """Response schema for getting many incidents by IDs."""
+
+    found: list[IncidentResponse] = Field(
+        ..., description="Incidents in the order of the requested IDs"
+    )
+    not_found: list[IncidentId] = Field(
+        ..., description="Requested IDs not found"
+    )
+
+
+class StatusChangeResponse(BaseModel):
+    """Response schema for incident status history entry."""
+
+    model_config = {"from_attributes": True}
+
+    incident_id: IncidentId
+    from_status: IncidentStatus | None
+    to_status: IncidentStatus
+    changed_at: datetime
+
+
+class DurationStatsResponse(BaseModel):
+    """Response schema for resolution time aggregates."""
+
+    count: int
+    mean_seconds: float | None
+    stddev_seconds: float | None
+    p50_seconds: float | None
+    p90_seconds: float | None
+    p99_seconds: float | None
+
+    @classmethod
+    def from_stats(cls, stats: DurationStats) -> "DurationStatsResponse":
+        """Build response from domain aggregate."""
+        return cls(
+            count=stats.count,
+            mean_seconds=stats.mean_seconds,
+            stddev_seconds=stats.stddev_seconds,
+            p50_seconds=stats.quantile(0.5),
+            p90_seconds=stats.quantile(0.9),
+            p99_seconds=stats.quantile(0.99),
+        )
+
+
+class MttrResponse(BaseModel):
+    """Response schema for mean time to resolve analytics."""
+
+    day: date | None = Field(
+        ..., description="Day of resolution, null for all time"
+    )
+    overall: DurationStatsResponse
+    by_source: dict[IncidentSource, DurationStatsResponse]
+
+
 class ErrorResponse(BaseModel):
     """Error response schema."""
 
@@ -0,0 +1,58 @@
+"""Request admission control for incident endpoints.
+
+These dependencies run before any database dependency, so a rejected
+request never opens a session.
+"""
+
+import math
+
+from fastapi import HTTPException, Request, status
+
+from app.dependencies import LoadShedderDep, RateLimiterDep
+from app.domain.enums import IncidentSource
+
+CLIENT_ID_HEADER = "X-Client-Id"
+
+
+async def shed_load(shedder: LoadShedderDep) -> None:
+    """Reject request with 503 when the service is overloaded."""
+    if shedder is None:
+        return
+
+    retry_after = shedder.check()
+    if retry_after > 0:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Service is overloaded, retry later",
+            headers={"Retry-After": str(retry_after)},
+        )
+
+
+async def limit_incident_ingestion(
+    request: Request, limiter: RateLimiterDep
+) -> None:
+    """Reject incident creation with 429 above client or source limits."""
+    if limiter is None:
+        return
+
+    client_key = limiter.client_key(
+        request.client.host if request.client else None,
+        request.headers.get(CLIENT_ID_HEADER),
+    )
+    retry_after = await limiter.check(client_key, await _source_of(request))
+    if retry_after > 0:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Rate limit exceeded",
+            headers={"Retry-After": str(math.ceil(retry_after))},
+        )
+
+
+async def _source_of(request: Request) -> IncidentSource | None:
+    """Get incident source from request body, None if it is invalid."""
+    try:
+        payload = await request.json()
+        return IncidentSource(payload["source"])
+    except (ValueError, KeyError, TypeError):
+        # Malformed body is reported by request validation
+        return None
@@ -0,0 +1,162 @@
+"""Production server: prefork workers sharing one listening socket.
+
+The application is imported and the schema prepared once in the master
+process, then each worker is forked from it and serves the inherited
+socket with uvicorn.
+
+Run: python -m app.serve
+"""
+
+import asyncio
+import contextlib
+import logging
+import os
+import signal
+import socket
+import time
+from types import FrameType
+
+import uvicorn
+
+from app.config import WORKER_ID_ENV, settings
+from app.infrastructure.database import dispose_db
+from app.infrastructure.startup import prepare_schema
+from app.main import app
+
+logger = logging.getLogger("uvicorn.error")
+
+# Pause before restarting a worker that exited, avoids a tight fork loop
+RESPAWN_DELAY_SECONDS = 1.0
+
+
+def resolve_workers(workers: int) -> int:
+    """Get number of workers, 0 means one per available CPU core."""
+    if workers > 0:
+        return workers
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def build_config() -> uvicorn.Config:
+    """Build uvicorn configuration from settings."""
+    return uvicorn.Config(
+        app,
+        host=settings.SERVER_HOST,
+        port=settings.SERVER_PORT,
+        loop=settings.SERVER_LOOP,
+        http=settings.SERVER_HTTP,
+        backlog=settings.SERVER_BACKLOG,
+        timeout_keep_alive=settings.SERVER_KEEP_ALIVE_SECONDS,
+        access_log=settings.SERVER_ACCESS_LOG,
+        lifespan="on",
+    )
+
+
+async def prepare_database() -> None:
+    """Prepare the schema once so that workers do not race, disconnect."""
+    await prepare_schema(settings.DB_STARTUP_MODE)
+    await dispose_db()
+
+
+def run_worker(
+    config: uvicorn.Config, sock: socket.socket, worker_id: int
+) -> None:
+    """Serve requests on the socket in the current process."""
+    os.environ[WORKER_ID_ENV] = str(worker_id)
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+class Arbiter:
+    """Fork workers, restart the ones that exit and forward signals."""
+
+    def __init__(
+        self, config: uvicorn.Config, sock: socket.socket, workers: int
+    ):
+        self.config = config
+        self.sock = sock
+        self.workers = workers
+        self._children: dict[int, int] = {}
+        self._stopping = False
+
+    def run(self) -> None:
+        """Run workers until SIGINT or SIGTERM."""
+        signal.signal(signal.SIGINT, self._on_signal)
+        signal.signal(signal.SIGTERM, self._on_signal)
+
+        logger.info("Starting %d workers", self.workers)
+        for worker_id in range(self.workers):
+            self._spawn(worker_id)
+
+        while self._children:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+
+            if pid not in self._children:
+                continue
+            worker_id = self._children.pop(pid)
+            if self._stopping:
+                continue
+
+            logger.warning(
+                "Worker %d (pid %d) exited with code %d, restarting",
+                worker_id,
+                pid,
+                os.waitstatus_to_exitcode(status),
+            )
+            time.sleep(RESPAWN_DELAY_SECONDS)
+            if not self._stopping:
+                self._spawn(worker_id)
+
+    def _spawn(self, worker_id: int) -> None:
+        pid = os.fork()
+        if pid:
+            self._children[pid] = worker_id
+            return
+
+        # Child: signals come from the master, not the terminal
+        os.setpgid(0, 0)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        exit_code = 0
+        try:
+            # Connections opened before fork belong to the master
+            asyncio.run(dispose_db(close=False))
+            run_worker(self.config, self.sock, worker_id)
+        except SystemExit as e:
+            exit_code = e.code if isinstance(e.code, int) else 1
+        except BaseException:
+            logger.exception("Worker %d failed", worker_id)
+            exit_code = 1
+        finally:
+            os._exit(exit_code)
+
+    def _on_signal(self, signum: int, _frame: FrameType | None) -> None:
+        self._stopping = True
+        for pid in list(self._children):
+            with contextlib.suppress(ProcessLookupError):
+                os.kill(pid, signum)
+
+
+def main() -> None:
+    """Bind the socket and run workers."""
+    config = build_config()
+    sock = config.bind_socket()
+    # In-memory state cannot be shared between worker processes
+    workers = (
+        1
+        if settings.STORAGE_BACKEND == "memory"
+        else resolve_workers(settings.SERVER_WORKERS)
+    )
+
+    if workers == 1 or not hasattr(os, "fork"):
+        run_worker(config, sock, 0)
+    else:
+        asyncio.run(prepare_database())
+        Arbiter(config, sock, workers).run()
+
+
+if __name__ == "__main__":
+    main()
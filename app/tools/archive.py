@@ -0,0 +1,64 @@
+"""Move closed incidents older than a threshold to the archive.
+
+Meant to run periodically (cron, Kubernetes CronJob) next to the API, so
+only one process writes the archive at a time.
+
+Run: python -m app.tools.archive [--older-than-days 90] [--batch-size N]
+"""
+
+import argparse
+import asyncio
+import sys
+from datetime import timedelta
+from functools import partial
+
+from app.application.use_cases import ArchiveClosedIncidentsUseCase
+from app.config import settings
+from app.infrastructure.archive import FileIncidentArchive
+from app.infrastructure.database import async_session_maker, dispose_db
+from app.infrastructure.unit_of_work import SQLAlchemyUnitOfWork
+
+
+async def archive_closed_incidents(
+    older_than_days: int, batch_size: int
+) -> int:
+    """Archive incidents closed more than the given number of days ago."""
+    use_case = ArchiveClosedIncidentsUseCase(
+        partial(SQLAlchemyUnitOfWork, async_session_maker),
+        FileIncidentArchive(
+            settings.ARCHIVE_DIRECTORY, settings.ARCHIVE_COMPRESSION
+        ),
+    )
+    try:
+        return await use_case.execute(
+            timedelta(days=older_than_days), batch_size
+        )
+    finally:
+        await dispose_db()
+
+
+def main() -> None:
+    """Parse arguments and run the archiver."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--older-than-days", type=int, default=settings.ARCHIVE_AFTER_DAYS
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=settings.ARCHIVE_BATCH_SIZE
+    )
+    args = parser.parse_args()
+
+    if not settings.ARCHIVE_ENABLED:
+        sys.exit(
+            "Archive is disabled, set ARCHIVE_ENABLED=true so the API reads "
+            "archived incidents"
+        )
+
+    archived = asyncio.run(
+        archive_closed_incidents(args.older_than_days, args.batch_size)
+    )
+    print(f"Archived {archived} incidents to {settings.ARCHIVE_DIRECTORY}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,401 @@
+"""Bulk load incidents from NDJSON or CSV, or generate synthetic ones.
+
+Rows are read, validated and written as a stream of batches, so inputs of
+any size load in constant memory. On PostgreSQL (asyncpg) batches are
+written with COPY, elsewhere with executemany INSERTs. Every batch is
+committed on its own, together with the first status history entry of
+its incidents. With DATABASE_SHARD_URLS each batch is split by SHARD_KEY
+and every part is committed on its shard. The in-memory storage backend
+is not supported.
+
+Rows have the fields id (optional), description, status, source and
+created_at (optional, ISO 8601, naive moments are UTC). Status and source
+are enum values or names. Incidents without an ID get generated ones from
+the worker ID of the loader, keep it out of the range of API workers.
+
+Run: python -m app.tools.load incidents.ndjson [--format csv]
+         [--batch-size N] [--max-errors N] [--rebuild-indexes]
+     python -m app.tools.load --generate 1000000 [--output data.ndjson]
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import random
+import sys
+from collections.abc import AsyncIterator, Iterable, Iterator, Sequence
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from enum import Enum
+from itertools import accumulate, islice
+from pathlib import Path
+from typing import IO, Any, Literal, TypeVar
+
+from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
+    AsyncEngine,
+    async_sessionmaker,
+)
+
+from app.config import settings
+from app.domain.entities import Incident
+from app.domain.enums import IncidentSource, IncidentStatus
+from app.domain.ids import MAX_WORKER_ID, SnowflakeIdGenerator
+from app.infrastructure.database import Base, dispose_db, shard_engines
+from app.infrastructure.models import (
+    IncidentModel,
+    IncidentStatusHistoryModel,
+)
+from app.infrastructure.sharding import ShardRouter
+from app.infrastructure.unit_of_work import SQLAlchemyUnitOfWork
+
+InputFormat = Literal["ndjson", "csv"]
+EnumT = TypeVar("EnumT", bound=Enum)
+
+# Loaded tables, whose secondary indexes may be rebuilt around a load
+TABLES = [
+    Base.metadata.tables[IncidentModel.__tablename__],
+    Base.metadata.tables[IncidentStatusHistoryModel.__tablename__],
+]
+INCIDENT_COLUMNS = ["id", "description", "status", "source", "created_at"]
+HISTORY_COLUMNS = ["incident_id", "from_status", "to_status", "changed_at"]
+
+# Share of generated incidents by status and by source
+SYNTHETIC_STATUS_WEIGHTS = {
+    IncidentStatus.OPEN: 0.2,
+    IncidentStatus.IN_PROGRESS: 0.1,
+    IncidentStatus.CLOSED: 0.7,
+}
+SYNTHETIC_SOURCE_WEIGHTS = {
+    IncidentSource.OPERATOR: 0.2,
+    IncidentSource.MONITORING: 0.7,
+    IncidentSource.PARTNER: 0.1,
+}
+SYNTHETIC_DESCRIPTIONS = (
+    "Disk usage above {}%",
+    "CPU load above {}%",
+    "Response time above {} ms",
+    "Payment gateway errors: {} per minute",
+    "Replication lag {} seconds",
+)
+
+
+@dataclass
+class LoadReport:
+    """Outcome of a load."""
+
+    loaded: int = 0
+    rejected: int = 0
+    errors: list[str] = field(default_factory=list)
+
+
+def read_ndjson(lines: Iterable[str]) -> Iterator[dict[str, Any]]:
+    """Read rows of newline-delimited JSON, skipping blank lines.
+
+    A line that is not JSON means a corrupt file and stops the load.
+    """
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"line {number} is not JSON: {e}") from e
+
+
+def read_csv(lines: Iterable[str]) -> Iterator[dict[str, Any]]:
+    """Read rows of CSV with a header line."""
+    yield from csv.DictReader(lines)
+
+
+def generate_rows(
+    count: int, seed: int = 0, days: int = 365
+) -> Iterator[dict[str, Any]]:
+    """Generate synthetic rows spread over the last days, oldest first."""
+    rng = random.Random(seed)
+    end = datetime.now(UTC)
+    step = timedelta(days=days) / max(count, 1)
+    statuses = list(SYNTHETIC_STATUS_WEIGHTS)
+    status_weights = list(accumulate(SYNTHETIC_STATUS_WEIGHTS.values()))
+    sources = list(SYNTHETIC_SOURCE_WEIGHTS)
+    source_weights = list(accumulate(SYNTHETIC_SOURCE_WEIGHTS.values()))
+    for i in range(count):
+        # Drawn per row, so generating keeps constant memory
+        (status,) = rng.choices(statuses, cum_weights=status_weights)
+        (source,) = rng.choices(sources, cum_weights=source_weights)
+        yield {
+            "description": rng.choice(SYNTHETIC_DESCRIPTIONS).format(
+                rng.randint(1, 100)
+            ),
+            "status": status.value,
+            "source": source.value,
+            "created_at": (end - step * (count - i)).isoformat(),
+        }
+
+
+def _parse_enum(  # noqa: UP047 - keep Python 3.11 support
+    enum: type[EnumT], value: Any
+) -> EnumT:
+    """Parse an enum from its value or its case-insensitive name."""
+    try:
+        return enum(value)
+    except ValueError:
+        name = str(value).upper()
+        if name in enum.__members__:
+            return enum[name]
+        raise ValueError(
+            f"Invalid {enum.__name__}: {value!r}, expected one of "
+            + ", ".join(str(member.value) for member in enum)
+        ) from None
+
+
+def parse_incident(row: dict[str, Any], ids: SnowflakeIdGenerator) -> Incident:
+    """Validate a row and convert it to an incident with an ID."""
+    raw_id = row.get("id")
+    raw_created_at = row.get("created_at")
+    if raw_created_at:
+        created_at = datetime.fromisoformat(raw_created_at)
+        if created_at.tzinfo is None:
+            created_at = created_at.replace(tzinfo=UTC)
+    else:
+        created_at = datetime.now(UTC)
+
+    return Incident(
+        id=int(raw_id) if raw_id not in (None, "") else ids.next_id(),
+        description=str(row.get("description") or ""),
+        status=_parse_enum(IncidentStatus, row.get("status")),
+        source=_parse_enum(IncidentSource, row.get("source")),
+        created_at=created_at,
+    )
+
+
+def validate(
+    rows: Iterable[dict[str, Any]],
+    ids: SnowflakeIdGenerator,
+    report: LoadReport,
+    max_errors: int,
+) -> Iterator[Incident]:
+    """Convert rows to incidents, counting and skipping invalid ones.
+
+    Raises ValueError once more than ``max_errors`` rows are invalid.
+    """
+    for number, row in enumerate(rows, start=1):
+        try:
+            yield parse_incident(row, ids)
+        except (TypeError, ValueError) as e:
+            report.rejected += 1
+            report.errors.append(f"row {number}: {e}")
+            if report.rejected > max_errors:
+                raise ValueError(
+                    f"More than {max_errors} invalid rows, last one is "
+                    f"{report.errors[-1]}"
+                ) from e
+
+
+def batched(
+    incidents: Iterable[Incident], size: int
+) -> Iterator[list[Incident]]:
+    """Split incidents into lists of the given size."""
+    iterator = iter(incidents)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+async def copy_batch(conn: AsyncConnection, batch: list[Incident]) -> None:
+    """Write incidents and their first history entries with COPY."""
+    raw = await conn.get_raw_connection()
+    driver = raw.driver_connection
+    assert driver is not None
+    await driver.copy_records_to_table(
+        IncidentModel.__tablename__,
+        records=[
+            (
+                incident.id,
+                incident.description,
+                incident.status.value,
+                incident.source.value,
+                incident.created_at,
+            )
+            for incident in batch
+        ],
+        columns=INCIDENT_COLUMNS,
+    )
+    await driver.copy_records_to_table(
+        IncidentStatusHistoryModel.__tablename__,
+        records=[
+            (incident.id, None, incident.status.value, incident.created_at)
+            for incident in batch
+        ],
+        columns=HISTORY_COLUMNS,
+    )
+
+
+async def load_incidents(
+    db_engines: Sequence[AsyncEngine],
+    incidents: Iterable[Incident],
+    batch_size: int = 10_000,
+    rebuild_indexes: bool = False,
+    router: ShardRouter | None = None,
+) -> AsyncIterator[int]:
+    """Load incidents in committed batches, yielding each batch size.
+
+    Incidents go to the shard of ``router``, by hashed ID by default, one
+    transaction per shard and batch. With ``rebuild_indexes`` the
+    secondary indexes of the loaded tables are dropped first and created
+    again at the end, which beats updating them row by row on large loads;
+    until then queries scan the tables.
+    """
+    if router is None:
+        router = ShardRouter(len(db_engines))
+    if rebuild_indexes:
+        for db_engine in db_engines:
+            await _drop_indexes(db_engine)
+    try:
+        for batch in batched(incidents, batch_size):
+            parts: dict[int, list[Incident]] = {}
+            for incident in batch:
+                parts.setdefault(router.shard_of(incident), []).append(
+                    incident
+                )
+            for shard, part in parts.items():
+                await _write_batch(db_engines[shard], part)
+            yield len(batch)
+    finally:
+        if rebuild_indexes:
+            for db_engine in db_engines:
+                await _create_indexes(db_engine)
+
+
+async def _write_batch(db_engine: AsyncEngine, batch: list[Incident]) -> None:
+    """Write incidents in one transaction, with COPY on asyncpg."""
+    if db_engine.dialect.driver == "asyncpg":
+        async with db_engine.begin() as conn:
+            await copy_batch(conn, batch)
+        return
+
+    session_maker = async_sessionmaker(db_engine, expire_on_commit=False)
+    async with SQLAlchemyUnitOfWork(session_maker) as uow:
+        await uow.incidents.create_many(batch)
+
+
+async def _drop_indexes(db_engine: AsyncEngine) -> None:
+    """Drop secondary indexes of the loaded tables."""
+    async with db_engine.begin() as conn:
+        for table in TABLES:
+            for index in table.indexes:
+                await conn.run_sync(index.drop, checkfirst=True)
+
+
+async def _create_indexes(db_engine: AsyncEngine) -> None:
+    """Create missing secondary indexes of the loaded tables."""
+    async with db_engine.begin() as conn:
+        for table in TABLES:
+            for index in table.indexes:
+                await conn.run_sync(index.create, checkfirst=True)
+            if db_engine.dialect.name == "postgresql":
+                # Fresh statistics for the planner after a large load
+                await conn.exec_driver_sql(f"ANALYZE {table.name}")
+
+
+def write_ndjson(rows: Iterable[dict[str, Any]], output: IO[str]) -> int:
+    """Write rows as newline-delimited JSON."""
+    count = 0
+    for row in rows:
+        output.write(json.dumps(row, ensure_ascii=False) + "\n")
+        count += 1
+    return count
+
+
+async def run_load(
+    rows: Iterable[dict[str, Any]],
+    worker_id: int,
+    batch_size: int,
+    max_errors: int,
+    rebuild_indexes: bool,
+) -> LoadReport:
+    """Validate rows and load them into the configured database shards."""
+    report = LoadReport()
+    incidents = validate(
+        rows, SnowflakeIdGenerator(worker_id), report, max_errors
+    )
+    router = ShardRouter(len(shard_engines), settings.SHARD_KEY)
+    try:
+        async for count in load_incidents(
+            shard_engines, incidents, batch_size, rebuild_indexes, router
+        ):
+            report.loaded += count
+            print(f"Loaded {report.loaded} incidents", file=sys.stderr)
+    finally:
+        await dispose_db()
+    return report
+
+
+def _open_rows(path: str, input_format: InputFormat | None) -> Iterator[Any]:
+    """Read rows of a file, or of stdin for '-', by format or extension."""
+    if input_format is None:
+        input_format = "csv" if Path(path).suffix == ".csv" else "ndjson"
+    read = read_csv if input_format == "csv" else read_ndjson
+    if path == "-":
+        yield from read(sys.stdin)
+        return
+    with open(path, encoding="utf-8", newline="") as file:
+        yield from read(file)
+
+
+def main() -> None:
+    """Parse arguments and run the loader or the generator."""
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument("input", nargs="?", help="file to load, - for stdin")
+    parser.add_argument("--format", choices=["ndjson", "csv"])
+    parser.add_argument("--generate", type=int, metavar="COUNT")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument(
+        "--output", help="write generated rows as NDJSON instead of loading"
+    )
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    parser.add_argument("--max-errors", type=int, default=0)
+    parser.add_argument("--rebuild-indexes", action="store_true")
+    parser.add_argument("--worker-id", type=int, default=MAX_WORKER_ID)
+    args = parser.parse_args()
+
+    if (args.input is None) == (args.generate is None):
+        parser.error("give either an input file or --generate")
+    if settings.STORAGE_BACKEND == "memory" and args.output is None:
+        parser.error(
+            "STORAGE_BACKEND=memory is not supported, "
+            "load into a SQL database or generate with --output"
+        )
+
+    if args.generate is not None:
+        rows = generate_rows(args.generate, args.seed, args.days)
+        if args.output is not None:
+            with open(args.output, "w", encoding="utf-8") as output:
+                count = write_ndjson(rows, output)
+            print(f"Generated {count} incidents to {args.output}")
+            return
+    else:
+        rows = _open_rows(args.input, args.format)
+
+    try:
+        report = asyncio.run(
+            run_load(
+                rows,
+                args.worker_id,
+                args.batch_size,
+                args.max_errors,
+                args.rebuild_indexes,
+            )
+        )
+    except ValueError as e:
+        sys.exit(f"Load stopped, committed batches are kept: {e}")
+    for error in report.errors:
+        print(error, file=sys.stderr)
+    print(f"Loaded {report.loaded} incidents, rejected {report.rejected}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Benchmark: JSON against Arrow and MessagePack for bulk incident lists.
+
+Lists all N incidents in every installed format and reports the payload
+size, the request time (query and encoding) and the client decode time.
+
+Run: python -m benchmarks.bench_columnar [--incidents 20000]
+"""
+
+import argparse
+import asyncio
+import json
+from collections.abc import Callable
+from datetime import UTC, datetime
+from typing import Any
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.domain.entities import Incident
+from app.domain.enums import IncidentSource, IncidentStatus
+from app.infrastructure.unit_of_work import SQLAlchemyUnitOfWork
+from app.presentation.columnar import (
+    ARROW_MEDIA_TYPE,
+    MSGPACK_MEDIA_TYPE,
+    available_formats,
+)
+from benchmarks.common import Timer, benchmark_client, report
+
+ROUNDS = 5
+
+
+def _decode_arrow(content: bytes) -> Any:
+    import pyarrow as pa
+
+    return pa.ipc.open_stream(content).read_all()
+
+
+def _decode_msgpack(content: bytes) -> Any:
+    import msgpack
+
+    return msgpack.unpackb(content)
+
+
+FORMATS: dict[str, tuple[str, Callable[[bytes], Any]]] = {
+    "json": ("application/json", json.loads),
+    "arrow": (ARROW_MEDIA_TYPE, _decode_arrow),
+    "msgpack": (MSGPACK_MEDIA_TYPE, _decode_msgpack),
+}
+
+
+async def run(incidents: int) -> None:
+    """Run the benchmark."""
+    rows = [("format", "bytes", "request ms", "decode ms")]
+    formats = ["json", *available_formats()]
+
+    async with benchmark_client() as (client, engine):
+        async with SQLAlchemyUnitOfWork(async_sessionmaker(engine)) as uow:
+            await uow.incidents.create_many(
+                [
+                    Incident(
+                        id=None,
+                        description=f"Incident {i}: disk usage above 90%",
+                        status=list(IncidentStatus)[i % 3],
+                        source=list(IncidentSource)[i % 3],
+                        created_at=datetime.now(UTC),
+                    )
+                    for i in range(incidents)
+                ]
+            )
+            await uow.commit()
+
+        for name in formats:
+            media_type, decode = FORMATS[name]
+            headers = {"Accept": media_type, "Accept-Encoding": "identity"}
+            with Timer() as request_timer:
+                for _ in range(ROUNDS):
+                    response = await client.get("/incidents", headers=headers)
+            assert response.status_code == 200
+            with Timer() as decode_timer:
+                for _ in range(ROUNDS):
+                    decode(response.content)
+            rows.append(
+                (
+                    name,
+                    str(len(response.content)),
+                    f"{request_timer.elapsed / ROUNDS * 1000:.1f}",
+                    f"{decode_timer.elapsed / ROUNDS * 1000:.2f}",
+                )
+            )
+
+    report(f"GET /incidents with {incidents} incidents", rows)
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--incidents", type=int, default=20000)
+    args = parser.parse_args()
+    asyncio.run(run(args.incidents))
+
+
+if __name__ == "__main__":
+    main()
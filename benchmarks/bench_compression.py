@@ -0,0 +1,83 @@
+"""Benchmark: bytes on the wire and latency of large incident lists.
+
+Lists N incidents with every encoding the server supports, with all
+fields and with a projection to a few fields.
+
+Run: python -m benchmarks.bench_compression [--incidents 1000]
+"""
+
+import argparse
+import asyncio
+from datetime import UTC, datetime
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.domain.entities import Incident
+from app.domain.enums import IncidentSource, IncidentStatus
+from app.infrastructure.unit_of_work import SQLAlchemyUnitOfWork
+from app.presentation.compression import available_encodings
+from benchmarks.common import Timer, benchmark_client, report
+
+ROUNDS = 20
+
+FIELD_SETS = {
+    "all fields": None,
+    "id,status,source": "id,status,source",
+}
+
+
+async def run(incidents: int) -> None:
+    """Run the benchmark."""
+    rows = [("encoding", "fields", "bytes", "ms per request")]
+    encodings = ["identity", *available_encodings(["zstd", "br", "gzip"])]
+
+    async with benchmark_client() as (client, engine):
+        async with SQLAlchemyUnitOfWork(async_sessionmaker(engine)) as uow:
+            await uow.incidents.create_many(
+                [
+                    Incident(
+                        id=None,
+                        description=f"Incident {i}: disk usage above 90%",
+                        status=IncidentStatus.OPEN,
+                        source=list(IncidentSource)[i % 3],
+                        created_at=datetime.now(UTC),
+                    )
+                    for i in range(incidents)
+                ]
+            )
+            await uow.commit()
+
+        for encoding in encodings:
+            for name, fields in FIELD_SETS.items():
+                params: dict[str, str | int] = {"limit": incidents}
+                if fields is not None:
+                    params["fields"] = fields
+                headers = {"Accept-Encoding": encoding}
+                with Timer() as timer:
+                    for _ in range(ROUNDS):
+                        response = await client.get(
+                            "/incidents", params=params, headers=headers
+                        )
+                assert response.status_code == 200
+                rows.append(
+                    (
+                        encoding,
+                        name,
+                        str(response.num_bytes_downloaded),
+                        f"{timer.elapsed / ROUNDS * 1000:.2f}",
+                    )
+                )
+
+    report(f"GET /incidents with {incidents} incidents", rows)
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--incidents", type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(run(args.incidents))
+
+
+if __name__ == "__main__":
+    main()
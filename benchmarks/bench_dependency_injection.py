@@ -0,0 +1,146 @@
+"""Benchmark: per-request cost of dependency resolution.
+
+Serves N requests that never reach the database (as a cache hit does)
+through three dependency chains and reports time per request and the
+number of sessions opened:
+
+* baseline - endpoint without dependencies;
+* per-request session - ``get_db`` -> ``get_uow`` -> sync use case
+  factory, the chain used before sessions became lazy;
+* lazy session - current ``get_uow_factory`` -> cached use case.
+
+Run: python -m benchmarks.bench_dependency_injection [--requests 5000]
+"""
+
+import argparse
+import asyncio
+from collections.abc import AsyncGenerator
+from typing import Annotated
+
+from fastapi import Depends, FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from app.application.use_cases import GetIncidentByIdUseCase
+from app.dependencies import (
+    GetIncidentByIdUseCaseDep,
+    get_uow_factory,
+)
+from app.domain.interfaces import IUnitOfWork, UnitOfWorkFactory
+from app.infrastructure.unit_of_work import SQLAlchemyUnitOfWork
+from benchmarks.common import Timer, report
+
+
+class SessionCounter:
+    """Session factory counting created sessions."""
+
+    def __init__(self, session_maker: async_sessionmaker[AsyncSession]):
+        self.session_maker = session_maker
+        self.created = 0
+
+    def __call__(self) -> AsyncSession:
+        self.created += 1
+        return self.session_maker()
+
+
+def build_app(sessions: SessionCounter) -> FastAPI:
+    """Build an app exposing the same endpoint through each chain."""
+    bench_app = FastAPI()
+
+    async def get_db() -> AsyncGenerator[AsyncSession, None]:
+        async with sessions() as session:
+            yield session
+
+    async def get_uow(db: AsyncSession = Depends(get_db)) -> AsyncSession:
+        return db
+
+    def get_use_case(
+        db: AsyncSession = Depends(get_uow),
+    ) -> GetIncidentByIdUseCase:
+        # The old use cases kept the unit of work of the request
+        return GetIncidentByIdUseCase(lambda: SQLAlchemyUnitOfWork(lambda: db))
+
+    PerRequestUseCaseDep = Annotated[
+        GetIncidentByIdUseCase, Depends(get_use_case)
+    ]
+
+    def create_uow() -> IUnitOfWork:
+        return SQLAlchemyUnitOfWork(sessions)
+
+    async def override_get_uow_factory() -> UnitOfWorkFactory:
+        return create_uow
+
+    bench_app.dependency_overrides[get_uow_factory] = override_get_uow_factory
+
+    @bench_app.get("/baseline/{incident_id}")
+    async def baseline(incident_id: int) -> dict[str, int]:
+        return {"id": incident_id}
+
+    @bench_app.get("/per-request-session/{incident_id}")
+    async def per_request_session(
+        incident_id: int,
+        use_case: PerRequestUseCaseDep,  # noqa: ARG001
+    ) -> dict[str, int]:
+        return {"id": incident_id}
+
+    @bench_app.get("/lazy-session/{incident_id}")
+    async def lazy_session(
+        incident_id: int,
+        use_case: GetIncidentByIdUseCaseDep,  # noqa: ARG001
+    ) -> dict[str, int]:
+        return {"id": incident_id}
+
+    return bench_app
+
+
+async def measure(client: AsyncClient, url: str, requests: int) -> float:
+    """Send sequential requests and return seconds per request."""
+    with Timer() as timer:
+        for _ in range(requests):
+            response = await client.get(url)
+            assert response.status_code == 200
+    return timer.elapsed / requests
+
+
+async def run(requests: int) -> None:
+    """Run the benchmark."""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    sessions = SessionCounter(async_sessionmaker(engine))
+    rows = [("chain", "requests", "sessions", "us/request")]
+
+    async with AsyncClient(
+        transport=ASGITransport(app=build_app(sessions)),
+        base_url="http://bench",
+    ) as client:
+        for chain in ("baseline", "per-request-session", "lazy-session"):
+            url = f"/{chain}/1"
+            await measure(client, url, min(requests, 100))
+            sessions.created = 0
+            per_request = await measure(client, url, requests)
+            rows.append(
+                (
+                    chain,
+                    str(requests),
+                    str(sessions.created),
+                    f"{per_request * 1e6:.1f}",
+                )
+            )
+
+    await engine.dispose()
+    report(f"Dependency resolution, {requests} requests", rows)
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+    asyncio.run(run(args.requests))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Benchmark: database round trips per read request.
+
+Serves read endpoints with units of work that commit and with read-only
+ones on autocommit connections, counting statements and the BEGIN,
+COMMIT and ROLLBACK a PostgreSQL driver sends around them.
+
+Run: python -m benchmarks.bench_read_only [--requests 500]
+"""
+
+import argparse
+import asyncio
+from collections.abc import Awaitable, Callable
+from functools import partial
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+
+from app.dependencies import get_read_uow_factory
+from app.domain.enums import IncidentSource, IncidentStatus
+from app.domain.interfaces import UnitOfWorkFactory
+from app.infrastructure.unit_of_work import SQLAlchemyUnitOfWork
+from app.main import app
+from benchmarks.common import Timer, benchmark_client, report
+
+
+class RoundTripCounter:
+    """Count statements and transaction control sent to the database.
+
+    Connections in autocommit mode send no transaction control.
+    """
+
+    EVENTS = ("before_cursor_execute", "begin", "commit", "rollback")
+
+    def __init__(self, engine: AsyncEngine):
+        self.engine = engine.sync_engine
+        self.round_trips = 0
+
+    def __enter__(self) -> "RoundTripCounter":
+        for name in self.EVENTS:
+            event.listen(self.engine, name, self._on_event)
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        for name in self.EVENTS:
+            event.remove(self.engine, name, self._on_event)
+
+    def _on_event(self, conn: Any, *args: Any) -> None:
+        # Statements come with arguments, transaction events without
+        isolation_level = conn.get_execution_options().get("isolation_level")
+        if args or isolation_level != "AUTOCOMMIT":
+            self.round_trips += 1
+
+
+def _provider(
+    factory: UnitOfWorkFactory,
+) -> Callable[[], Awaitable[UnitOfWorkFactory]]:
+    async def get_factory() -> UnitOfWorkFactory:
+        return factory
+
+    return get_factory
+
+
+async def run(requests: int) -> None:
+    """Run the benchmark."""
+    rows = [("unit of work", "endpoint", "round trips", "ms per request")]
+
+    async with benchmark_client() as (client, engine):
+        response = await client.post(
+            "/incidents",
+            json={
+                "description": "Disk is full",
+                "status": IncidentStatus.OPEN.value,
+                "source": IncidentSource.MONITORING.value,
+            },
+        )
+        incident_id = response.json()["id"]
+
+        factories: dict[str, UnitOfWorkFactory] = {
+            "commit": partial(
+                SQLAlchemyUnitOfWork,
+                async_sessionmaker(engine, expire_on_commit=False),
+            ),
+            "read-only autocommit": partial(
+                SQLAlchemyUnitOfWork,
+                async_sessionmaker(
+                    engine.execution_options(isolation_level="AUTOCOMMIT"),
+                    expire_on_commit=False,
+                ),
+                read_only=True,
+            ),
+        }
+        endpoints = {
+            "GET /incidents/{id}": f"/incidents/{incident_id}",
+            "GET /incidents/{id}/history": f"/incidents/{incident_id}/history",
+        }
+
+        for mode, factory in factories.items():
+            app.dependency_overrides[get_read_uow_factory] = _provider(factory)
+            for name, url in endpoints.items():
+                with RoundTripCounter(engine) as counter, Timer() as timer:
+                    for _ in range(requests):
+                        response = await client.get(url)
+                assert response.status_code == 200
+                rows.append(
+                    (
+                        mode,
+                        name,
+                        f"{counter.round_trips / requests:.1f}",
+                        f"{timer.elapsed / requests * 1000:.3f}",
+                    )
+                )
+
+    report("Database round trips per read request", rows)
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(run(args.requests))
+
+
+if __name__ == "__main__":
+    main()
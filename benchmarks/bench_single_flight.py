@@ -0,0 +1,98 @@
+"""Benchmark: database queries under fan-in of identical reads.
+
+Fires N concurrent identical GET requests and counts SELECT statements
+with single-flight enabled and with it replaced by a pass-through group.
+
+Run: python -m benchmarks.bench_single_flight [--fan-in 200]
+"""
+
+import argparse
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+
+from app.application.single_flight import SingleFlight, T
+from app.dependencies import get_read_flights
+from app.domain.enums import IncidentSource, IncidentStatus
+from app.main import app
+from benchmarks.common import StatementCounter, Timer, benchmark_client, report
+
+
+class PassThrough(SingleFlight[T]):
+    """Group that never coalesces, the behaviour without single-flight."""
+
+    async def do(
+        self,
+        key: Hashable,  # noqa: ARG002
+        func: Callable[[], Awaitable[T]],
+    ) -> T:
+        return await func()
+
+
+def _provider(
+    flights: SingleFlight[bytes],
+) -> Callable[[], SingleFlight[bytes]]:
+    return lambda: flights
+
+
+async def run(fan_in: int) -> None:
+    """Run the benchmark."""
+    rows = [("mode", "endpoint", "requests", "SELECTs", "seconds")]
+
+    async with benchmark_client() as (client, engine):
+        for i in range(50):
+            response = await client.post(
+                "/incidents",
+                json={
+                    "description": f"Incident {i}",
+                    "status": IncidentStatus.OPEN.value,
+                    "source": IncidentSource.MONITORING.value,
+                },
+            )
+        incident_id = response.json()["id"]
+
+        endpoints = {
+            "GET /incidents/{id}": (f"/incidents/{incident_id}", None),
+            "GET /incidents?status": (
+                "/incidents",
+                {"status": IncidentStatus.OPEN.value},
+            ),
+        }
+        flights_by_mode: dict[str, SingleFlight[bytes]] = {
+            "without single-flight": PassThrough(),
+            "with single-flight": SingleFlight(),
+        }
+
+        for mode, flights in flights_by_mode.items():
+            app.dependency_overrides[get_read_flights] = _provider(flights)
+            for name, (url, params) in endpoints.items():
+                with StatementCounter(engine) as counter, Timer() as timer:
+                    responses = await asyncio.gather(
+                        *(
+                            client.get(url, params=params)
+                            for _ in range(fan_in)
+                        )
+                    )
+                assert all(r.status_code == 200 for r in responses)
+                rows.append(
+                    (
+                        mode,
+                        name,
+                        str(fan_in),
+                        str(counter.counts.get("SELECT", 0)),
+                        f"{timer.elapsed:.3f}",
+                    )
+                )
+
+    report(f"Identical concurrent reads, fan-in {fan_in}", rows)
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--fan-in", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(run(args.fan_in))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""Benchmark: import time and time to first request.
+
+Measures ``import app.main`` with ``python -X importtime`` (self time
+grouped by top-level package), then starts ``python -m app.serve`` with
+one worker on a migrated temporary SQLite database for each startup mode
+and reports the time until the server answers and the latency of the
+first request that reaches the database.
+
+Run: python -m benchmarks.bench_startup [--top 8]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+import httpx
+
+from benchmarks.common import free_port, report
+
+# (DB_STARTUP_MODE, DB_WARMUP_ENABLED); the first one is the old behaviour
+STARTUP_MODES = [
+    ("create_all", "false"),
+    ("create_all", "true"),
+    ("verify", "true"),
+    ("skip", "true"),
+    ("skip", "false"),
+]
+
+
+def measure_imports(top: int) -> None:
+    """Report import time of the application by top-level package."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    self_times: Counter[str] = Counter()
+    total = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line[13:]:
+            continue
+        self_us, cumulative_us, name = line[12:].split("|")
+        if not self_us.strip().isdigit():
+            continue
+        module = name.strip()
+        self_times[module.split(".")[0]] += int(self_us)
+        if module == "app.main":
+            total = int(cumulative_us)
+
+    rows = [("package", "self ms")]
+    rows.extend(
+        (package, f"{us / 1000:.1f}")
+        for package, us in self_times.most_common(top)
+    )
+    rows.append(("total (app.main)", f"{total / 1000:.1f}"))
+    report("Import time of app.main", rows)
+
+
+def measure_start(
+    mode: str, warm_up: str, database_url: str
+) -> tuple[str, ...]:
+    """Start the server and time readiness and the first DB request."""
+    port = free_port()
+    env = {
+        **os.environ,
+        "DATABASE_URL": database_url,
+        "DB_STARTUP_MODE": mode,
+        "DB_WARMUP_ENABLED": warm_up,
+        "SERVER_HOST": "127.0.0.1",
+        "SERVER_PORT": str(port),
+        "SERVER_WORKERS": "1",
+        "SERVER_ACCESS_LOG": "false",
+    }
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "app.serve"],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}") as client:
+            while True:
+                try:
+                    client.get("/")
+                    break
+                except httpx.TransportError:
+                    assert server.poll() is None, "server failed to start"
+                    time.sleep(0.005)
+            ready = time.perf_counter() - started
+
+            request_started = time.perf_counter()
+            response = client.get("/incidents/0")
+            first_request = time.perf_counter() - request_started
+            assert response.status_code == 404
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+    return (
+        mode,
+        warm_up,
+        f"{ready:.3f}",
+        f"{first_request * 1000:.1f}",
+    )
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--top", type=int, default=8)
+    args = parser.parse_args()
+
+    measure_imports(args.top)
+
+    rows = [("startup mode", "warm-up", "ready s", "first DB request ms")]
+    with tempfile.TemporaryDirectory() as directory:
+        database_url = f"sqlite+aiosqlite:///{Path(directory) / 'bench.db'}"
+        subprocess.run(
+            [sys.executable, "-m", "alembic", "upgrade", "head"],
+            env={**os.environ, "DATABASE_URL": database_url},
+            capture_output=True,
+            check=True,
+        )
+        for mode, warm_up in STARTUP_MODES:
+            rows.append(measure_start(mode, warm_up, database_url))
+
+    report("Start of python -m app.serve, one worker", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Benchmark: per-call overhead of building SQL statements.
+
+Compares statements built on every call (the repository before prebuilt
+statements) with the prebuilt ones from ``app.infrastructure.repository``
+for the hot queries. Reports the SQLAlchemy-side cost (construction and
+cache key, no database) and the full execution time on an in-memory
+SQLite database with a few hundred incidents.
+
+Run: python -m benchmarks.bench_statements [--calls 5000]
+"""
+
+import argparse
+import asyncio
+from collections.abc import Callable
+from datetime import UTC, datetime
+from typing import Any
+
+from sqlalchemy import Executable, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.domain.enums import IncidentSource, IncidentStatus
+from app.infrastructure.database import Base
+from app.infrastructure.models import IncidentModel
+from app.infrastructure.repository import (
+    SELECT_INCIDENT_BY_ID,
+    SELECT_INCIDENT_BY_ID_FOR_UPDATE,
+    SELECT_INCIDENTS_BY_STATUS,
+)
+from benchmarks.common import Timer, report
+
+Call = Callable[[int], tuple[Executable, dict[str, Any] | None]]
+
+STATUS = IncidentStatus.IN_PROGRESS.value
+
+QUERIES: dict[str, tuple[Call, Call]] = {
+    "get_by_id": (
+        lambda i: (
+            select(IncidentModel).filter(IncidentModel.id == i),
+            None,
+        ),
+        lambda i: (SELECT_INCIDENT_BY_ID, {"incident_id": i}),
+    ),
+    "get_all by status": (
+        lambda _: (
+            select(IncidentModel)
+            .order_by(IncidentModel.created_at.desc())
+            .filter(IncidentModel.status == STATUS),
+            None,
+        ),
+        lambda _: (SELECT_INCIDENTS_BY_STATUS, {"status": STATUS}),
+    ),
+    "update_status lock": (
+        lambda i: (
+            select(IncidentModel)
+            .filter(IncidentModel.id == i)
+            .with_for_update(),
+            None,
+        ),
+        lambda i: (SELECT_INCIDENT_BY_ID_FOR_UPDATE, {"incident_id": i}),
+    ),
+}
+
+
+def build_cost(call: Call, calls: int) -> float:
+    """Seconds per call to get a statement and its cache key."""
+    with Timer() as timer:
+        for i in range(calls):
+            stmt, _ = call(i)
+            stmt._generate_cache_key()  # type: ignore[attr-defined]
+    return timer.elapsed / calls
+
+
+async def execute_cost(session: AsyncSession, call: Call, calls: int) -> float:
+    """Seconds per call to execute the statement and load the rows."""
+    for i in range(min(calls, 100)):
+        stmt, params = call(i % 300 + 1)
+        (await session.execute(stmt, params)).scalars().all()
+
+    with Timer() as timer:
+        for i in range(calls):
+            stmt, params = call(i % 300 + 1)
+            (await session.execute(stmt, params)).scalars().all()
+    return timer.elapsed / calls
+
+
+async def run(calls: int) -> None:
+    """Run the benchmark."""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        statuses = list(IncidentStatus)
+        await conn.execute(
+            insert(IncidentModel),
+            [
+                {
+                    "description": f"Incident {i}",
+                    "status": statuses[i % len(statuses)].value,
+                    "source": IncidentSource.MONITORING.value,
+                    "created_at": datetime.now(UTC),
+                }
+                for i in range(300)
+            ],
+        )
+
+    rows = [("query", "statement", "build us", "execute us")]
+    async with AsyncSession(engine) as session:
+        for name, (inline, prebuilt) in QUERIES.items():
+            for kind, call in (("per call", inline), ("prebuilt", prebuilt)):
+                build = build_cost(call, calls)
+                execute = await execute_cost(session, call, calls)
+                rows.append(
+                    (name, kind, f"{build * 1e6:.1f}", f"{execute * 1e6:.1f}")
+                )
+
+    await engine.dispose()
+    report(f"Statement overhead, {calls} calls", rows)
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=5000)
+    args = parser.parse_args()
+    asyncio.run(run(args.calls))
+
+
+if __name__ == "__main__":
+    main()
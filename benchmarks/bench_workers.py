@@ -0,0 +1,159 @@
+"""Benchmark: throughput of the production server by number of workers.
+
+Starts ``python -m app.serve`` on a temporary SQLite database for each
+worker count, keeps C concurrent keep-alive connections busy with
+``GET /incidents/{id}`` for D seconds and reports requests per second and
+latency percentiles.
+
+The load generator runs in this process on one core, so on small machines
+it may saturate before the server does; compare with an external tool
+(wrk, hey) for absolute numbers.
+
+Run: python -m benchmarks.bench_workers [--workers 1 4] [--concurrency 64]
+"""
+
+import argparse
+import asyncio
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+from app.domain.enums import IncidentSource, IncidentStatus
+from app.serve import resolve_workers
+from benchmarks.common import free_port, report
+
+
+async def _wait_ready(client: httpx.AsyncClient, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            await client.get("/")
+            return
+        except httpx.TransportError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.1)
+
+
+async def _load(
+    client: httpx.AsyncClient, url: str, concurrency: int, duration: float
+) -> tuple[list[float], int]:
+    """Send requests from concurrent loops, return latencies and errors."""
+    latencies: list[float] = []
+    errors = 0
+    stop_at = time.monotonic() + duration
+
+    async def loop() -> None:
+        nonlocal errors
+        while time.monotonic() < stop_at:
+            started = time.perf_counter()
+            try:
+                response = await client.get(url)
+            except httpx.TransportError:
+                errors += 1
+                continue
+            if response.status_code != 200:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(loop() for _ in range(concurrency)))
+    return latencies, errors
+
+
+async def measure(
+    workers: int, concurrency: int, duration: float
+) -> tuple[str, ...]:
+    """Run the server with the given number of workers and load it."""
+    port = free_port()
+    with tempfile.TemporaryDirectory() as directory:
+        env = {
+            **os.environ,
+            "DATABASE_URL": (
+                f"sqlite+aiosqlite:///{Path(directory) / 'bench.db'}"
+            ),
+            "SERVER_HOST": "127.0.0.1",
+            "SERVER_PORT": str(port),
+            "SERVER_WORKERS": str(workers),
+            "SERVER_ACCESS_LOG": "false",
+            "RATE_LIMIT_ENABLED": "false",
+            "LOAD_SHED_ENABLED": "false",
+        }
+        server = subprocess.Popen(
+            [sys.executable, "-m", "app.serve"],
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            limits = httpx.Limits(max_connections=concurrency)
+            async with httpx.AsyncClient(
+                base_url=f"http://127.0.0.1:{port}", limits=limits
+            ) as client:
+                await _wait_ready(client, timeout=30)
+                response = await client.post(
+                    "/incidents",
+                    json={
+                        "description": "Benchmark incident",
+                        "status": IncidentStatus.OPEN.value,
+                        "source": IncidentSource.MONITORING.value,
+                    },
+                )
+                url = f"/incidents/{response.json()['id']}"
+
+                await _load(client, url, concurrency, duration=1.0)
+                latencies, errors = await _load(
+                    client, url, concurrency, duration
+                )
+        finally:
+            server.send_signal(signal.SIGTERM)
+            server.wait(timeout=30)
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    return (
+        str(workers),
+        str(concurrency),
+        f"{len(latencies) / duration:.0f}",
+        f"{quantiles[49] * 1000:.1f}",
+        f"{quantiles[98] * 1000:.1f}",
+        str(errors),
+    )
+
+
+async def run(workers: list[int], concurrency: int, duration: float) -> None:
+    """Run the benchmark."""
+    rows = [("workers", "concurrency", "req/s", "p50 ms", "p99 ms", "errors")]
+    for count in workers:
+        rows.append(await measure(count, concurrency, duration))
+
+    report(
+        f"GET /incidents/{{id}} for {duration:.0f}s, "
+        f"{resolve_workers(0)} CPU cores",
+        rows,
+    )
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        nargs="+",
+        default=[1, max(resolve_workers(0), 2)],
+    )
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=10.0)
+    args = parser.parse_args()
+    asyncio.run(run(args.workers, args.concurrency, args.duration))
+
+
+if __name__ == "__main__":
+    main()
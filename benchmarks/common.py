@@ -0,0 +1,110 @@
+"""Shared helpers for benchmarks."""
+
+import socket
+import tempfile
+import time
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from app.dependencies import get_uow_factory
+from app.domain.interfaces import IUnitOfWork, UnitOfWorkFactory
+from app.infrastructure.database import Base
+from app.infrastructure.unit_of_work import SQLAlchemyUnitOfWork
+from app.main import app
+
+
+class StatementCounter:
+    """Count SQL statements sent to the database by kind."""
+
+    def __init__(self, engine: AsyncEngine):
+        self.engine = engine.sync_engine
+        self.counts: dict[str, int] = {}
+
+    def __enter__(self) -> "StatementCounter":
+        event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        event.remove(self.engine, "before_cursor_execute", self._on_execute)
+
+    @property
+    def total(self) -> int:
+        """Number of statements of all kinds."""
+        return sum(self.counts.values())
+
+    def _on_execute(self, *args: Any) -> None:
+        kind = args[2].lstrip().split(None, 1)[0].upper()
+        self.counts[kind] = self.counts.get(kind, 0) + 1
+
+
+@asynccontextmanager
+async def benchmark_client() -> AsyncGenerator[
+    tuple[AsyncClient, AsyncEngine], None
+]:
+    """Run the app against a temporary SQLite file database.
+
+    Every unit of work gets its own session, as in production.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{Path(directory) / 'bench.db'}"
+        )
+        session_maker = async_sessionmaker(
+            engine, class_=AsyncSession, expire_on_commit=False
+        )
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+        def create_uow() -> IUnitOfWork:
+            return SQLAlchemyUnitOfWork(session_maker)
+
+        async def override_get_uow_factory() -> UnitOfWorkFactory:
+            return create_uow
+
+        app.dependency_overrides[get_uow_factory] = override_get_uow_factory
+        try:
+            async with AsyncClient(
+                transport=ASGITransport(app=app), base_url="http://bench"
+            ) as client:
+                yield client, engine
+        finally:
+            app.dependency_overrides.clear()
+            await engine.dispose()
+
+
+def free_port() -> int:
+    """Get a free local TCP port for a benchmark server."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return int(sock.getsockname()[1])
+
+
+def report(title: str, rows: list[tuple[str, ...]]) -> None:
+    """Print benchmark results as an aligned table."""
+    print(f"\n{title}")
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    for row in rows:
+        cells = zip(row, widths, strict=True)
+        print("  ".join(cell.ljust(width) for cell, width in cells))
+
+
+class Timer:
+    """Measure wall-clock time of a block."""
+
+    def __enter__(self) -> "Timer":
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.elapsed = time.perf_counter() - self.started
@@ -1,7 +1,8 @@
 """Pytest fixtures for tests."""
 
 import asyncio
-from collections.abc import AsyncGenerator, Generator
+from collections.abc import AsyncGenerator, Awaitable, Callable, Generator
+from functools import partial
 
 import pytest
 import pytest_asyncio
@@ -12,9 +13,18 @@ from sqlalchemy.ext.asyncio import (
     create_async_engine,
 )
 
-from app.dependencies import get_uow
-from app.domain.interfaces import IUnitOfWork
-from app.infrastructure.database import Base, get_db
+from app.dependencies import (
+    count_cache,
+    get_rate_limiter,
+    get_uow_factory,
+    idempotency_cache,
+)
+from app.domain.enums import IncidentSource, IncidentStatus
+from app.domain.ids import SnowflakeIdGenerator
+from app.domain.interfaces import UnitOfWorkFactory
+from app.infrastructure.database import Base
+from app.infrastructure.memory import InMemoryDatabase, InMemoryUnitOfWork
+from app.infrastructure.rate_limit import RateLimiter
 from app.infrastructure.unit_of_work import SQLAlchemyUnitOfWork
 from app.main import app
 
@@ -34,6 +44,12 @@ TestSessionLocal = async_sessionmaker(
     expire_on_commit=False,
 )
 
+# Every unit of work gets its own session on the shared in-memory database
+# and generates incident IDs like the API does
+test_uow_factory: UnitOfWorkFactory = partial(
+    SQLAlchemyUnitOfWork, TestSessionLocal, ids=SnowflakeIdGenerator(0)
+)
+
 
 @pytest.fixture(scope="session")
 def event_loop() -> Generator[asyncio.AbstractEventLoop, None, None]:
@@ -59,20 +75,45 @@ async def db_session() -> AsyncGenerator[AsyncSession, None]:
         await conn.run_sync(Base.metadata.drop_all)
 
 
+@pytest.fixture(params=["sqlalchemy", "memory"])
+def storage_backend(request: pytest.FixtureRequest) -> str:
+    """Storage backend of the API and the Unit of Work factory.
+
+    Modules testing one backend override this fixture.
+    """
+    return str(request.param)
+
+
+@pytest.fixture
+def uow_factory(
+    storage_backend: str,
+    db_session: AsyncSession,  # noqa: ARG001 - creates the tables
+) -> UnitOfWorkFactory:
+    """Unit of Work factory bound to a fresh test database."""
+    if storage_backend == "memory":
+        return partial(
+            InMemoryUnitOfWork, InMemoryDatabase(), ids=SnowflakeIdGenerator(0)
+        )
+    return test_uow_factory
+
+
 @pytest_asyncio.fixture
 async def client(
-    db_session: AsyncSession,
+    uow_factory: UnitOfWorkFactory,
 ) -> AsyncGenerator[AsyncClient, None]:
     """Create test HTTP client."""
 
-    async def override_get_db() -> AsyncGenerator[AsyncSession, None]:
-        yield db_session
+    async def override_get_uow_factory() -> UnitOfWorkFactory:
+        return uow_factory
 
-    def override_get_uow() -> IUnitOfWork:
-        return SQLAlchemyUnitOfWork(db_session)
+    async def override_get_rate_limiter() -> RateLimiter | None:
+        # Shared limiter would throttle the whole test session
+        return None
 
-    app.dependency_overrides[get_db] = override_get_db
-    app.dependency_overrides[get_uow] = override_get_uow
+    app.dependency_overrides[get_uow_factory] = override_get_uow_factory
+    app.dependency_overrides[get_rate_limiter] = override_get_rate_limiter
+    idempotency_cache.clear()
+    count_cache.invalidate()
 
     async with AsyncClient(
         transport=ASGITransport(app=app), base_url="http://test"
@@ -80,3 +121,42 @@ async def client(
         yield ac
 
     app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def create_incidents(
+    client: AsyncClient,
+) -> Callable[..., Awaitable[list[str]]]:
+    """Helper creating incidents through the API, returning their IDs.
+
+    Incidents are open unless a status is given, sources cycle in
+    declaration order unless one is given, ``details`` are appended to
+    the description.
+    """
+
+    async def create(
+        count: int,
+        source: IncidentSource | None = None,
+        details: str = "",
+        status: IncidentStatus = IncidentStatus.OPEN,
+    ) -> list[str]:
+        sources = list(IncidentSource)
+        ids = []
+        for i in range(count):
+            response = await client.post(
+                "/incidents",
+                json={
+                    "description": (
+                        f"Incident {i}: {details}"
+                        if details
+                        else f"Incident {i}"
+                    ),
+                    "status": status.value,
+                    "source": (source or sources[i % len(sources)]).value,
+                },
+            )
+            assert response.status_code == 201
+            ids.append(response.json()["id"])
+        return ids
+
+    return create
@@ -0,0 +1,264 @@
+"""Tests for the archive of closed incidents."""
+
+import json
+import os
+import stat
+from datetime import UTC, datetime, timedelta
+from functools import partial
+from pathlib import Path
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.application.use_cases import ArchiveClosedIncidentsUseCase
+from app.dependencies import get_uow_factory
+from app.domain.entities import ArchivedIncident, Incident, StatusChange
+from app.domain.enums import IncidentSource, IncidentStatus
+from app.domain.interfaces import UnitOfWorkFactory
+from app.infrastructure.archive import FileIncidentArchive
+from app.infrastructure.unit_of_work import SQLAlchemyUnitOfWork
+from app.main import app
+
+
+@pytest.fixture
+def storage_backend() -> str:
+    """Archiving is tested on the SQL storage backend."""
+    return "sqlalchemy"
+
+
+@pytest.fixture(params=["gzip", "zstd"])
+def archive(request: pytest.FixtureRequest, tmp_path: Path):
+    """Archive in a temporary directory, with each compression."""
+    if request.param == "zstd":
+        pytest.importorskip("zstandard")
+    return FileIncidentArchive(tmp_path / "archive", request.param)
+
+
+@pytest.fixture
+def archived_uow_factory(
+    client: AsyncClient,  # noqa: ARG001 - override after client fixture
+    db_session: AsyncSession,
+    archive: FileIncidentArchive,
+) -> UnitOfWorkFactory:
+    """Unit of Work factory reading through to the archive."""
+    factory: UnitOfWorkFactory = partial(
+        SQLAlchemyUnitOfWork,
+        async_sessionmaker(db_session.bind, expire_on_commit=False),
+        archive,
+    )
+
+    async def override_get_uow_factory() -> UnitOfWorkFactory:
+        return factory
+
+    app.dependency_overrides[get_uow_factory] = override_get_uow_factory
+    return factory
+
+
+async def create_incident(
+    client: AsyncClient, description: str, closed: bool
+) -> str:
+    """Create an incident, optionally moving it to closed."""
+    response = await client.post(
+        "/incidents",
+        json={
+            "description": description,
+            "status": IncidentStatus.OPEN.value,
+            "source": IncidentSource.MONITORING.value,
+        },
+    )
+    incident_id = response.json()["id"]
+    if closed:
+        for status in (IncidentStatus.IN_PROGRESS, IncidentStatus.CLOSED):
+            await client.patch(
+                f"/incidents/{incident_id}/status",
+                json={"status": status.value},
+            )
+    return str(incident_id)
+
+
+@pytest.mark.asyncio
+async def test_archive_round_trip(archive: FileIncidentArchive) -> None:
+    """Test appended incidents are found by ID and streamed."""
+    created_at = datetime(2026, 1, 1, tzinfo=UTC)
+    records = [
+        ArchivedIncident(
+            incident=Incident(
+                id=incident_id,
+                description=f"Incident {incident_id}",
+                status=IncidentStatus.CLOSED,
+                source=IncidentSource.PARTNER,
+                created_at=created_at,
+            ),
+            history=[
+                StatusChange(
+                    incident_id=incident_id,
+                    from_status=None,
+                    to_status=IncidentStatus.CLOSED,
+                    changed_at=created_at,
+                )
+            ],
+        )
+        for incident_id in (5, 3, 9)
+    ]
+    await archive.append(records[:2])
+    await archive.append(records[2:])
+
+    assert await archive.get(5) == records[0]
+    assert await archive.get(4) is None
+    assert [s.count for s in archive.segments()] == [2, 1]
+    assert [i.id async for i in archive.stream_all()] == [3, 5, 9]
+
+    # Another process sees the index written by this one
+    reopened = FileIncidentArchive(archive.directory, archive.compression)
+    assert await reopened.get(9) == records[2]
+
+
+@pytest.mark.skipif(os.name == "nt", reason="directories are not synced")
+@pytest.mark.asyncio
+async def test_append_fsyncs_directory_after_each_rename(
+    archive: FileIncidentArchive, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test the segment and index renames are synced to the directory."""
+    events: list[str] = []
+    replace, fsync = os.replace, os.fsync
+
+    def record_replace(src: str | Path, dst: str | Path) -> None:
+        replace(src, dst)
+        events.append(f"replace {Path(dst).name}")
+
+    def record_fsync(descriptor: int) -> None:
+        fsync(descriptor)
+        if stat.S_ISDIR(os.fstat(descriptor).st_mode):
+            events.append("fsync directory")
+
+    monkeypatch.setattr(os, "replace", record_replace)
+    monkeypatch.setattr(os, "fsync", record_fsync)
+    created_at = datetime(2026, 1, 1, tzinfo=UTC)
+    await archive.append(
+        [
+            ArchivedIncident(
+                incident=Incident(
+                    id=1,
+                    description="Incident 1",
+                    status=IncidentStatus.CLOSED,
+                    source=IncidentSource.PARTNER,
+                    created_at=created_at,
+                ),
+                history=[],
+            )
+        ]
+    )
+
+    (segment,) = archive.segments()
+    assert events == [
+        f"replace {segment.file}",
+        "fsync directory",
+        "replace index.json",
+        "fsync directory",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_archived_incidents_are_read_from_archive(
+    client: AsyncClient,
+    archived_uow_factory: UnitOfWorkFactory,
+    archive: FileIncidentArchive,
+) -> None:
+    """Test archived incidents leave the hot table but stay readable."""
+    closed_id = await create_incident(client, "Closed", closed=True)
+    open_id = await create_incident(client, "Open", closed=False)
+
+    use_case = ArchiveClosedIncidentsUseCase(archived_uow_factory, archive)
+    assert await use_case.execute(timedelta(days=1), batch_size=10) == 0
+    assert await use_case.execute(timedelta(0), batch_size=10) == 1
+
+    response = await client.get("/incidents")
+    assert [i["id"] for i in response.json()] == [open_id]
+
+    response = await client.get(f"/incidents/{closed_id}")
+    assert response.status_code == 200
+    assert response.json()["status"] == IncidentStatus.CLOSED.value
+
+    response = await client.get(f"/incidents/{closed_id}/history")
+    assert [entry["to_status"] for entry in response.json()] == [
+        IncidentStatus.OPEN.value,
+        IncidentStatus.IN_PROGRESS.value,
+        IncidentStatus.CLOSED.value,
+    ]
+
+
+@pytest.mark.asyncio
+async def test_export_includes_archived_incidents(
+    client: AsyncClient,
+    archived_uow_factory: UnitOfWorkFactory,
+    archive: FileIncidentArchive,
+) -> None:
+    """Test export streams archived and hot incidents as NDJSON."""
+    closed_id = await create_incident(client, "Closed", closed=True)
+    open_id = await create_incident(client, "Open", closed=False)
+    await ArchiveClosedIncidentsUseCase(archived_uow_factory, archive).execute(
+        timedelta(0), batch_size=10
+    )
+
+    response = await client.get("/incidents/export")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["id"] for line in lines] == [closed_id, open_id]
+
+
+@pytest.mark.asyncio
+async def test_archived_incidents_are_read_only(
+    client: AsyncClient,
+    archived_uow_factory: UnitOfWorkFactory,
+    archive: FileIncidentArchive,
+) -> None:
+    """Test status changes of archived incidents are rejected."""
+    closed_id = await create_incident(client, "Closed", closed=True)
+    open_id = await create_incident(client, "Open", closed=False)
+    await ArchiveClosedIncidentsUseCase(archived_uow_factory, archive).execute(
+        timedelta(0), batch_size=10
+    )
+
+    response = await client.patch(
+        f"/incidents/{closed_id}/status",
+        json={"status": IncidentStatus.OPEN.value},
+    )
+    assert response.status_code == 409
+    assert "archived" in response.json()["detail"]
+
+    response = await client.patch(
+        "/incidents/status",
+        json={
+            "status": IncidentStatus.OPEN.value,
+            "ids": [closed_id, open_id, 999],
+        },
+    )
+    assert response.status_code == 200
+    assert response.json()["updated"] == []
+    assert response.json()["rejected"] == [closed_id, open_id]
+    assert response.json()["not_found"] == ["999"]
+
+
+@pytest.mark.asyncio
+async def test_export_skips_archived_copies_of_hot_incidents(
+    client: AsyncClient,
+    archived_uow_factory: UnitOfWorkFactory,
+    archive: FileIncidentArchive,
+) -> None:
+    """Test an archiver run failing after its segment exports rows once."""
+    first_id = await create_incident(client, "First", closed=True)
+    second_id = await create_incident(client, "Second", closed=True)
+    async with archived_uow_factory() as uow:
+        records = await uow.incidents.get_archivable(
+            datetime.now(UTC), limit=1
+        )
+    # The segment is written, the rows are never deleted
+    await archive.append(records)
+
+    response = await client.get("/incidents/export")
+
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["id"] for line in lines] == [first_id, second_id]
@@ -0,0 +1,82 @@
+"""Tests for PATCH /incidents/status endpoint."""
+
+from collections.abc import Awaitable, Callable
+
+import pytest
+from httpx import AsyncClient
+
+from app.domain.enums import IncidentSource, IncidentStatus
+
+# Helper of the create_incidents fixture
+CreateIncidents = Callable[..., Awaitable[list[str]]]
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_by_ids(
+    client: AsyncClient, create_incidents: CreateIncidents
+) -> None:
+    """Test bulk status update by list of ids."""
+    first_id, second_id = await create_incidents(2)
+
+    response = await client.patch(
+        "/incidents/status",
+        json={
+            "status": IncidentStatus.CLOSED.value,
+            "ids": [first_id, second_id, 999],
+        },
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert {item["id"] for item in data["updated"]} == {first_id, second_id}
+    assert all(
+        item["status"] == IncidentStatus.CLOSED.value
+        for item in data["updated"]
+    )
+    assert data["not_found"] == ["999"]
+
+    get_response = await client.get(f"/incidents/{first_id}")
+    assert get_response.json()["status"] == IncidentStatus.CLOSED.value
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_by_filter(
+    client: AsyncClient, create_incidents: CreateIncidents
+) -> None:
+    """Test bulk status update by filter criteria."""
+    (partner_id,) = await create_incidents(1, IncidentSource.PARTNER)
+    (operator_id,) = await create_incidents(1, IncidentSource.OPERATOR)
+
+    response = await client.patch(
+        "/incidents/status",
+        json={
+            "status": IncidentStatus.IN_PROGRESS.value,
+            "filter": {"source": IncidentSource.PARTNER.value},
+        },
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [item["id"] for item in data["updated"]] == [partner_id]
+    assert data["not_found"] == []
+
+    get_response = await client.get(f"/incidents/{operator_id}")
+    assert get_response.json()["status"] == IncidentStatus.OPEN.value
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_requires_selector(client: AsyncClient) -> None:
+    """Test bulk status update without ids and filter."""
+    response = await client.patch(
+        "/incidents/status",
+        json={"status": IncidentStatus.CLOSED.value},
+    )
+
+    assert response.status_code == 422
+
+    response = await client.patch(
+        "/incidents/status",
+        json={"status": IncidentStatus.CLOSED.value, "filter": {}},
+    )
+
+    assert response.status_code == 422
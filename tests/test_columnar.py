@@ -0,0 +1,139 @@
+"""Tests for Arrow and MessagePack responses."""
+
+import subprocess
+import sys
+from collections.abc import Awaitable, Callable
+
+import pytest
+from httpx import AsyncClient
+
+from app.domain.enums import IncidentSource, IncidentStatus
+from app.presentation.columnar import (
+    ARROW_MEDIA_TYPE,
+    MSGPACK_MEDIA_TYPE,
+    negotiate_format,
+)
+
+# Helper of the create_incidents fixture
+CreateIncidents = Callable[..., Awaitable[list[str]]]
+
+
+@pytest.mark.asyncio
+async def test_get_incidents_as_arrow(
+    client: AsyncClient, create_incidents: CreateIncidents
+) -> None:
+    """Test list is an Arrow stream with dictionary-encoded enums."""
+    pa = pytest.importorskip("pyarrow")
+    await create_incidents(3)
+
+    response = await client.get(
+        "/incidents", headers={"Accept": ARROW_MEDIA_TYPE}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == ARROW_MEDIA_TYPE
+    table = pa.ipc.open_stream(response.content).read_all()
+    assert table.num_rows == 3
+    assert pa.types.is_dictionary(table.schema.field("status").type)
+    assert table.column("description").to_pylist() == [
+        "Incident 2",
+        "Incident 1",
+        "Incident 0",
+    ]
+    assert table.column("source").to_pylist() == [
+        IncidentSource.PARTNER.value,
+        IncidentSource.MONITORING.value,
+        IncidentSource.OPERATOR.value,
+    ]
+
+
+@pytest.mark.asyncio
+async def test_get_incidents_as_msgpack(
+    client: AsyncClient, create_incidents: CreateIncidents
+) -> None:
+    """Test list is a MessagePack map of the selected columns."""
+    msgpack = pytest.importorskip("msgpack")
+    await create_incidents(2)
+
+    response = await client.get(
+        "/incidents",
+        params={"fields": "id,status"},
+        headers={"Accept": MSGPACK_MEDIA_TYPE},
+    )
+
+    data = msgpack.unpackb(response.content)
+    assert data["length"] == 2
+    assert set(data["columns"]) == {"id", "status"}
+    status = data["columns"]["status"]
+    assert [status["dictionary"][i] for i in status["indices"]] == [
+        IncidentStatus.OPEN.value,
+        IncidentStatus.OPEN.value,
+    ]
+
+
+@pytest.mark.asyncio
+async def test_export_as_arrow(
+    client: AsyncClient, create_incidents: CreateIncidents
+) -> None:
+    """Test export streams Arrow record batches."""
+    pa = pytest.importorskip("pyarrow")
+    await create_incidents(4)
+
+    response = await client.get(
+        "/incidents/export", headers={"Accept": ARROW_MEDIA_TYPE}
+    )
+
+    table = pa.ipc.open_stream(response.content).read_all()
+    assert table.num_rows == 4
+    assert table.column_names == [
+        "id",
+        "description",
+        "status",
+        "source",
+        "created_at",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_json_is_the_default(
+    client: AsyncClient, create_incidents: CreateIncidents
+) -> None:
+    """Test wildcard clients keep receiving JSON."""
+    await create_incidents(1)
+
+    response = await client.get("/incidents", headers={"Accept": "*/*"})
+
+    assert response.headers["content-type"] == "application/json"
+    assert len(response.json()) == 1
+
+
+@pytest.mark.parametrize(
+    ("accept", "expected"),
+    [
+        (ARROW_MEDIA_TYPE, "arrow"),
+        (f"{MSGPACK_MEDIA_TYPE}, */*;q=0.1", "msgpack"),
+        (f"application/json, {ARROW_MEDIA_TYPE}", None),
+        (f"application/json;q=0.5, {ARROW_MEDIA_TYPE}", "arrow"),
+        ("application/vnd.msgpack;q=0", None),
+        ("text/html", None),
+    ],
+)
+def test_negotiate_format(accept: str, expected: str | None) -> None:
+    """Test columnar formats are chosen only when preferred over JSON."""
+    assert negotiate_format(accept, ["arrow", "msgpack"]) == expected
+
+
+def test_encoder_packages_are_imported_on_first_use() -> None:
+    """Test starting the app only looks the encoder packages up."""
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, app.main; "
+            "print(sorted({'pyarrow', 'msgpack'} & set(sys.modules)))",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.strip() == "[]"
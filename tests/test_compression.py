@@ -0,0 +1,103 @@
+"""Tests for field selection and compression of responses."""
+
+import json
+from collections.abc import Awaitable, Callable
+
+import pytest
+from httpx import AsyncClient
+
+from app.domain.enums import IncidentStatus
+from app.presentation.compression import negotiate
+
+# Helper of the create_incidents fixture
+CreateIncidents = Callable[..., Awaitable[list[str]]]
+
+# Makes descriptions long enough to be worth compressing
+DETAILS = "disk is full " * 20
+
+
+@pytest.mark.asyncio
+async def test_get_incidents_with_selected_fields(
+    client: AsyncClient, create_incidents: CreateIncidents
+) -> None:
+    """Test fields limits attributes of listed incidents."""
+    await create_incidents(3, details=DETAILS)
+
+    response = await client.get(
+        "/incidents", params={"fields": "id,status", "limit": 2}
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data) == 2
+    assert all(set(item) == {"id", "status"} for item in data)
+    assert data[0]["status"] == IncidentStatus.OPEN.value
+
+
+@pytest.mark.asyncio
+async def test_get_incidents_with_unknown_field(client: AsyncClient) -> None:
+    """Test unknown fields are rejected."""
+    response = await client.get("/incidents", params={"fields": "id,secret"})
+
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_large_response_is_compressed(
+    client: AsyncClient, create_incidents: CreateIncidents
+) -> None:
+    """Test lists above the threshold are gzip-compressed."""
+    await create_incidents(10, details=DETAILS)
+
+    response = await client.get(
+        "/incidents", headers={"Accept-Encoding": "gzip"}
+    )
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert int(response.headers["content-length"]) < len(response.content)
+    assert len(response.json()) == 10
+
+
+@pytest.mark.asyncio
+async def test_small_response_is_not_compressed(client: AsyncClient) -> None:
+    """Test bodies below the threshold are sent as is."""
+    response = await client.get(
+        "/incidents", headers={"Accept-Encoding": "gzip"}
+    )
+
+    assert "content-encoding" not in response.headers
+    assert response.json() == []
+
+
+@pytest.mark.asyncio
+async def test_export_stream_is_compressed(
+    client: AsyncClient, create_incidents: CreateIncidents
+) -> None:
+    """Test a streamed response is compressed chunk by chunk."""
+    pytest.importorskip("zstandard")
+    await create_incidents(5, details=DETAILS)
+
+    response = await client.get(
+        "/incidents/export", headers={"Accept-Encoding": "zstd, gzip"}
+    )
+
+    assert response.headers["content-encoding"] == "zstd"
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert len(lines) == 5
+
+
+@pytest.mark.parametrize(
+    ("accept_encoding", "expected"),
+    [
+        ("gzip, zstd", "zstd"),
+        ("gzip;q=1.0, zstd;q=0.5", "gzip"),
+        ("*", "zstd"),
+        ("zstd;q=0, *;q=0.1", "gzip"),
+        ("identity", None),
+        ("", None),
+    ],
+)
+def test_negotiate(accept_encoding: str, expected: str | None) -> None:
+    """Test client weights win and server order breaks ties."""
+    assert negotiate(accept_encoding, ["zstd", "gzip"]) == expected
@@ -74,3 +74,25 @@ async def test_get_incidents_filtered_by_status(
     assert len(data) == 1
     assert data[0]["status"] == IncidentStatus.OPEN.value
     assert data[0]["description"] == "Open incident"
+
+
+@pytest.mark.asyncio
+async def test_get_incidents_page(client: AsyncClient) -> None:
+    """Test limit and offset return a page of newest incidents."""
+    for i in range(5):
+        await client.post(
+            "/incidents",
+            json={
+                "description": f"Incident {i}",
+                "status": IncidentStatus.OPEN.value,
+                "source": IncidentSource.OPERATOR.value,
+            },
+        )
+
+    response = await client.get("/incidents", params={"limit": 2, "offset": 1})
+
+    assert response.status_code == 200
+    assert [i["description"] for i in response.json()] == [
+        "Incident 3",
+        "Incident 2",
+    ]
@@ -0,0 +1,100 @@
+"""Tests for Idempotency-Key support of POST /incidents endpoint."""
+
+import asyncio
+from datetime import timedelta
+
+import pytest
+from httpx import AsyncClient
+
+from app.application.use_cases import PurgeExpiredIdempotencyKeysUseCase
+from app.dependencies import idempotency_cache
+from app.domain.enums import IncidentSource, IncidentStatus
+from app.domain.interfaces import UnitOfWorkFactory
+
+PAYLOAD = {
+    "description": "Monitoring agent timeout",
+    "status": IncidentStatus.OPEN.value,
+    "source": IncidentSource.MONITORING.value,
+}
+
+
+@pytest.mark.asyncio
+async def test_repeated_key_returns_same_incident(
+    client: AsyncClient,
+) -> None:
+    """Test retry with the same key does not create a duplicate."""
+    headers = {"Idempotency-Key": "agent-1-request-1"}
+
+    first = await client.post("/incidents", json=PAYLOAD, headers=headers)
+    # Drop the in-process cache to check the database path as well
+    idempotency_cache.clear()
+    second = await client.post("/incidents", json=PAYLOAD, headers=headers)
+    third = await client.post("/incidents", json=PAYLOAD, headers=headers)
+
+    assert first.status_code == 201
+    assert second.status_code == 201
+    assert first.json() == second.json() == third.json()
+
+    incidents = (await client.get("/incidents")).json()
+    assert len(incidents) == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_duplicates_are_collapsed(
+    client: AsyncClient,
+) -> None:
+    """Test concurrent requests with the same key create one incident."""
+    headers = {"Idempotency-Key": "agent-1-request-2"}
+
+    responses = await asyncio.gather(
+        *(
+            client.post("/incidents", json=PAYLOAD, headers=headers)
+            for _ in range(5)
+        )
+    )
+
+    assert {response.status_code for response in responses} == {201}
+    assert len({response.json()["id"] for response in responses}) == 1
+    assert len((await client.get("/incidents")).json()) == 1
+
+
+@pytest.mark.asyncio
+async def test_key_reused_with_other_payload(client: AsyncClient) -> None:
+    """Test reusing a key for a different request is rejected."""
+    headers = {"Idempotency-Key": "agent-1-request-3"}
+    await client.post("/incidents", json=PAYLOAD, headers=headers)
+
+    response = await client.post(
+        "/incidents",
+        json={**PAYLOAD, "description": "Another incident"},
+        headers=headers,
+    )
+
+    assert response.status_code == 422
+    assert "detail" in response.json()
+
+
+@pytest.mark.asyncio
+async def test_without_key_creates_each_time(client: AsyncClient) -> None:
+    """Test requests without a key are not deduplicated."""
+    await client.post("/incidents", json=PAYLOAD)
+    await client.post("/incidents", json=PAYLOAD)
+
+    assert len((await client.get("/incidents")).json()) == 2
+
+
+@pytest.mark.asyncio
+async def test_purge_expired_keys(
+    client: AsyncClient, uow_factory: UnitOfWorkFactory
+) -> None:
+    """Test expired keys are deleted and can be used again."""
+    headers = {"Idempotency-Key": "agent-1-request-4"}
+    await client.post("/incidents", json=PAYLOAD, headers=headers)
+
+    use_case = PurgeExpiredIdempotencyKeysUseCase(uow_factory)
+    assert await use_case.execute(timedelta(hours=1)) == 0
+    assert await use_case.execute(timedelta(seconds=-1)) == 1
+
+    idempotency_cache.clear()
+    await client.post("/incidents", json=PAYLOAD, headers=headers)
+    assert len((await client.get("/incidents")).json()) == 2
@@ -0,0 +1,268 @@
+"""Tests for generated time-ordered incident IDs."""
+
+from datetime import UTC, datetime, timedelta
+from functools import partial
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.dependencies import get_uow_factory
+from app.domain.entities import Incident
+from app.domain.enums import IncidentSource, IncidentStatus
+from app.domain.ids import (
+    MAX_SEQUENCE,
+    SnowflakeIdGenerator,
+    id_timestamp,
+    min_id_at,
+)
+from app.domain.interfaces import UnitOfWorkFactory
+from app.infrastructure.unit_of_work import SQLAlchemyUnitOfWork
+from app.main import app
+
+
+@pytest.fixture
+def storage_backend() -> str:
+    """ID generation is tested on the SQL storage backend."""
+    return "sqlalchemy"
+
+
+class FakeClock:
+    """Clock returning a fixed time until moved."""
+
+    def __init__(self, now: float):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_ids_increase_and_encode_time() -> None:
+    """Test IDs grow within and across milliseconds and keep the time."""
+    moment = datetime(2026, 10, 19, 12, 0, tzinfo=UTC)
+    clock = FakeClock(moment.timestamp())
+    generator = SnowflakeIdGenerator(worker_id=7, clock=clock)
+
+    first = [generator.next_id() for _ in range(100)]
+    clock.now += 0.001
+    later = generator.next_id()
+
+    assert first == sorted(set(first))
+    assert later > first[-1]
+    assert id_timestamp(first[0]) == moment
+
+
+def test_workers_never_share_ids() -> None:
+    """Test generators with different worker IDs give distinct IDs."""
+    clock = FakeClock(datetime(2026, 1, 1, tzinfo=UTC).timestamp())
+    generators = [SnowflakeIdGenerator(i, clock=clock) for i in range(4)]
+
+    ids = {g.next_id() for g in generators for _ in range(MAX_SEQUENCE)}
+
+    assert len(ids) == 4 * MAX_SEQUENCE
+
+
+def test_clock_going_back_keeps_ids_increasing() -> None:
+    """Test a clock moved backwards does not repeat IDs."""
+    clock = FakeClock(datetime(2026, 1, 1, tzinfo=UTC).timestamp())
+    generator = SnowflakeIdGenerator(worker_id=0, clock=clock)
+    before = generator.next_id()
+
+    clock.now -= 5
+
+    assert generator.next_id() > before
+
+
+def test_worker_id_out_of_range() -> None:
+    """Test worker IDs must fit their bits."""
+    with pytest.raises(ValueError):
+        SnowflakeIdGenerator(worker_id=1024)
+
+
+def test_min_id_at_bounds_ids_of_the_moment() -> None:
+    """Test IDs generated at a moment are not below its lowest ID."""
+    moment = datetime(2026, 10, 19, 12, 0, tzinfo=UTC)
+    generator = SnowflakeIdGenerator(
+        worker_id=5, clock=lambda: moment.timestamp()
+    )
+
+    incident_id = generator.next_id()
+
+    assert min_id_at(moment) <= incident_id
+    assert incident_id < min_id_at(moment + timedelta(milliseconds=1))
+
+
+@pytest.fixture
+def generated_uow_factory(
+    client: AsyncClient,  # noqa: ARG001 - override after client fixture
+    db_session: AsyncSession,
+) -> UnitOfWorkFactory:
+    """Unit of Work factory assigning generated IDs."""
+    factory: UnitOfWorkFactory = partial(
+        SQLAlchemyUnitOfWork,
+        async_sessionmaker(db_session.bind, expire_on_commit=False),
+        ids=SnowflakeIdGenerator(worker_id=3),
+    )
+
+    async def override_get_uow_factory() -> UnitOfWorkFactory:
+        return factory
+
+    app.dependency_overrides[get_uow_factory] = override_get_uow_factory
+    return factory
+
+
+def new_incident(description: str) -> Incident:
+    """Build an incident without ID."""
+    return Incident(
+        id=None,
+        description=description,
+        status=IncidentStatus.OPEN,
+        source=IncidentSource.MONITORING,
+        created_at=datetime.now(UTC),
+    )
+
+
+@pytest.mark.asyncio
+async def test_create_assigns_generated_id(
+    client: AsyncClient, generated_uow_factory: UnitOfWorkFactory
+) -> None:
+    """Test created incident gets a generated ID before insert."""
+    async with generated_uow_factory() as uow:
+        incident = await uow.incidents.create(new_incident("Generated"))
+        assert incident.id is not None
+        assert abs(
+            id_timestamp(incident.id) - incident.created_at
+        ) < timedelta(seconds=1)
+
+    response = await client.get(f"/incidents/{incident.id}")
+    assert response.json()["description"] == "Generated"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("generated", [True, False])
+async def test_create_many_keeps_order(
+    db_session: AsyncSession, generated: bool
+) -> None:
+    """Test bulk create returns incidents in order, with or without IDs."""
+    uow = SQLAlchemyUnitOfWork(
+        async_sessionmaker(db_session.bind, expire_on_commit=False),
+        ids=SnowflakeIdGenerator(worker_id=3) if generated else None,
+    )
+    async with uow:
+        created = await uow.incidents.create_many(
+            [new_incident(f"Incident {i}") for i in range(5)]
+        )
+
+    async with uow:
+        for incident in created:
+            assert incident.id is not None
+            stored = await uow.incidents.get_by_id(incident.id)
+            assert stored is not None
+            assert stored.description == incident.description
+            assert len(await uow.incidents.get_history(incident.id)) == 1
+    assert [i.description for i in created] == [
+        f"Incident {i}" for i in range(5)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_keyset_pagination_by_id(
+    client: AsyncClient,
+    generated_uow_factory: UnitOfWorkFactory,  # noqa: ARG001 - generated IDs
+) -> None:
+    """Test before_id pages through incidents from newest to oldest."""
+    ids = []
+    for i in range(5):
+        response = await client.post(
+            "/incidents",
+            json={
+                "description": f"Incident {i}",
+                "status": IncidentStatus.OPEN.value,
+                "source": IncidentSource.PARTNER.value,
+            },
+        )
+        ids.append(response.json()["id"])
+
+    response = await client.get(
+        "/incidents", params={"before_id": ids[3], "limit": 2}
+    )
+    assert [i["id"] for i in response.json()] == [ids[2], ids[1]]
+
+    response = await client.get(
+        "/incidents", params={"before_id": ids[1], "offset": 1}
+    )
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_api_creates_incidents_with_generated_ids(
+    client: AsyncClient,
+) -> None:
+    """Test the API stores incidents and history under generated IDs."""
+    response = await client.post(
+        "/incidents",
+        json={
+            "description": "Disk is full",
+            "status": IncidentStatus.OPEN.value,
+            "source": IncidentSource.MONITORING.value,
+        },
+    )
+    assert response.status_code == 201
+    incident = response.json()
+    created_at = datetime.fromisoformat(incident["created_at"])
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=UTC)
+    assert int(incident["id"]) > MAX_SEQUENCE
+    assert abs(id_timestamp(int(incident["id"])) - created_at) < timedelta(
+        seconds=1
+    )
+
+    response = await client.patch(
+        f"/incidents/{incident['id']}/status",
+        json={"status": IncidentStatus.CLOSED.value},
+    )
+    assert response.status_code == 200
+    response = await client.get(f"/incidents/{incident['id']}/history")
+    assert [entry["to_status"] for entry in response.json()] == [
+        IncidentStatus.OPEN.value,
+        IncidentStatus.CLOSED.value,
+    ]
+
+
+@pytest.mark.asyncio
+async def test_ids_beyond_float_precision_are_sent_as_strings(
+    client: AsyncClient,
+) -> None:
+    """Test IDs JavaScript numbers would round survive the round trip."""
+    response = await client.post(
+        "/incidents",
+        json={
+            "description": "Disk is full",
+            "status": IncidentStatus.OPEN.value,
+            "source": IncidentSource.MONITORING.value,
+        },
+    )
+    incident_id = response.json()["id"]
+    assert isinstance(incident_id, str)
+    assert int(incident_id) > 2**53
+    assert f'"id":"{incident_id}"' in response.text
+
+    response = await client.get(f"/incidents/{incident_id}")
+    assert response.json()["id"] == incident_id
+    response = await client.get(
+        "/incidents", params={"before_id": str(int(incident_id) + 1)}
+    )
+    assert [i["id"] for i in response.json()] == [incident_id]
+    response = await client.get(
+        "/incidents", params={"fields": "id", "limit": 1}
+    )
+    assert response.json() == [{"id": incident_id}]
+
+    # Numbers are accepted too, for clients keeping IDs exact
+    response = await client.post(
+        "/incidents/lookup", json={"ids": [int(incident_id), "1"]}
+    )
+    assert [i["id"] for i in response.json()["found"]] == [incident_id]
+    assert response.json()["not_found"] == ["1"]
+    response = await client.get(f"/incidents/{incident_id}/history")
+    assert response.json()[0]["incident_id"] == incident_id
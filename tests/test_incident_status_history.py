@@ -0,0 +1,94 @@
+"""Tests for incident status state machine and history."""
+
+from collections.abc import Awaitable, Callable
+
+import pytest
+from httpx import AsyncClient
+
+from app.domain.enums import IncidentStatus
+
+# Helper of the create_incidents fixture
+CreateIncidents = Callable[..., Awaitable[list[str]]]
+
+
+@pytest.mark.asyncio
+async def test_get_incident_history(
+    client: AsyncClient, create_incidents: CreateIncidents
+) -> None:
+    """Test history records creation and every status change."""
+    (incident_id,) = await create_incidents(1)
+    await client.patch(
+        f"/incidents/{incident_id}/status",
+        json={"status": IncidentStatus.IN_PROGRESS.value},
+    )
+    await client.patch(
+        f"/incidents/{incident_id}/status",
+        json={"status": IncidentStatus.CLOSED.value},
+    )
+
+    response = await client.get(f"/incidents/{incident_id}/history")
+
+    assert response.status_code == 200
+    transitions = [
+        (entry["from_status"], entry["to_status"]) for entry in response.json()
+    ]
+    assert transitions == [
+        (None, IncidentStatus.OPEN.value),
+        (IncidentStatus.OPEN.value, IncidentStatus.IN_PROGRESS.value),
+        (IncidentStatus.IN_PROGRESS.value, IncidentStatus.CLOSED.value),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_get_history_incident_not_found(client: AsyncClient) -> None:
+    """Test getting history of non-existent incident."""
+    response = await client.get("/incidents/999/history")
+
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_update_status_invalid_transition(
+    client: AsyncClient, create_incidents: CreateIncidents
+) -> None:
+    """Test that disallowed status change is rejected."""
+    (incident_id,) = await create_incidents(1, status=IncidentStatus.CLOSED)
+
+    response = await client.patch(
+        f"/incidents/{incident_id}/status",
+        json={"status": IncidentStatus.IN_PROGRESS.value},
+    )
+
+    assert response.status_code == 409
+    assert "detail" in response.json()
+
+    history_response = await client.get(f"/incidents/{incident_id}/history")
+    assert len(history_response.json()) == 1
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_reports_rejected(
+    client: AsyncClient, create_incidents: CreateIncidents
+) -> None:
+    """Test bulk update skips incidents with disallowed transitions."""
+    (open_id,) = await create_incidents(1)
+    (closed_id,) = await create_incidents(1, status=IncidentStatus.CLOSED)
+
+    response = await client.patch(
+        "/incidents/status",
+        json={
+            "status": IncidentStatus.IN_PROGRESS.value,
+            "ids": [open_id, closed_id],
+        },
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [item["id"] for item in data["updated"]] == [open_id]
+    assert data["rejected"] == [closed_id]
+    assert data["not_found"] == []
+
+    history_response = await client.get(f"/incidents/{open_id}/history")
+    assert history_response.json()[-1]["from_status"] == (
+        IncidentStatus.OPEN.value
+    )
@@ -0,0 +1,94 @@
+"""Tests for lazy acquisition of database sessions."""
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.dependencies import get_uow_factory
+from app.domain.enums import IncidentSource, IncidentStatus
+from app.domain.interfaces import IUnitOfWork, UnitOfWorkFactory
+from app.infrastructure.unit_of_work import SQLAlchemyUnitOfWork
+from app.main import app
+
+
+@pytest.fixture
+def storage_backend() -> str:
+    """Sessions exist on the SQL storage backend only."""
+    return "sqlalchemy"
+
+
+class SessionCounter:
+    """Session factory counting created sessions."""
+
+    def __init__(self, session_maker: async_sessionmaker[AsyncSession]):
+        self.session_maker = session_maker
+        self.created = 0
+
+    def __call__(self) -> AsyncSession:
+        self.created += 1
+        return self.session_maker()
+
+
+@pytest.fixture
+def sessions(
+    client: AsyncClient,  # noqa: ARG001 - override after client fixture
+    db_session: AsyncSession,
+) -> SessionCounter:
+    """Count sessions opened by requests of the test client."""
+    counter = SessionCounter(
+        async_sessionmaker(db_session.bind, expire_on_commit=False)
+    )
+
+    def create_uow() -> IUnitOfWork:
+        return SQLAlchemyUnitOfWork(counter)
+
+    async def override_get_uow_factory() -> UnitOfWorkFactory:
+        return create_uow
+
+    app.dependency_overrides[get_uow_factory] = override_get_uow_factory
+    return counter
+
+
+@pytest.mark.asyncio
+async def test_unused_unit_of_work_opens_no_session(
+    db_session: AsyncSession,
+) -> None:
+    """Test a unit of work without repository calls opens no session."""
+    counter = SessionCounter(async_sessionmaker(db_session.bind))
+
+    async with SQLAlchemyUnitOfWork(counter):
+        pass
+
+    assert counter.created == 0
+
+
+@pytest.mark.asyncio
+async def test_invalid_request_opens_no_session(
+    client: AsyncClient, sessions: SessionCounter
+) -> None:
+    """Test a request rejected by validation opens no session."""
+    response = await client.post("/incidents", json={"description": ""})
+
+    assert response.status_code == 422
+    assert sessions.created == 0
+
+
+@pytest.mark.asyncio
+async def test_cached_request_opens_no_session(
+    client: AsyncClient, sessions: SessionCounter
+) -> None:
+    """Test a repeated idempotent request is served without a session."""
+    payload = {
+        "description": "Partner API timeout",
+        "status": IncidentStatus.OPEN.value,
+        "source": IncidentSource.PARTNER.value,
+    }
+    headers = {"Idempotency-Key": "partner-request-1"}
+
+    first = await client.post("/incidents", json=payload, headers=headers)
+    assert sessions.created == 1
+
+    second = await client.post("/incidents", json=payload, headers=headers)
+
+    assert second.json() == first.json()
+    assert sessions.created == 1
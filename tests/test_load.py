@@ -0,0 +1,107 @@
+"""Tests for the bulk loader."""
+
+import io
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.enums import IncidentSource, IncidentStatus
+from app.domain.ids import MAX_WORKER_ID, SnowflakeIdGenerator
+from app.tools.load import (
+    LoadReport,
+    generate_rows,
+    load_incidents,
+    read_csv,
+    read_ndjson,
+    validate,
+    write_ndjson,
+)
+
+NDJSON = """\
+{"id": 7, "description": "Disk is full", "status": "CLOSED", \
+"source": "monitoring", "created_at": "2024-03-01T10:00:00"}
+
+{"description": "Card declined", "status": "открыт", "source": "partner"}
+{"description": "Lost", "status": "lost", "source": "partner"}
+"""
+
+CSV = """\
+description,status,source,created_at
+Printer on fire,в работе,OPERATOR,2024-03-02T10:00:00+03:00
+,открыт,operator,
+"""
+
+
+@pytest.fixture
+def storage_backend() -> str:
+    """The loader writes to SQL databases only."""
+    return "sqlalchemy"
+
+
+@pytest.mark.asyncio
+async def test_load_streams_valid_rows(
+    client: AsyncClient, db_session: AsyncSession
+) -> None:
+    """Test valid rows are loaded with history and invalid ones reported."""
+    assert db_session.bind is not None
+    ids = SnowflakeIdGenerator(MAX_WORKER_ID)
+    report = LoadReport()
+    rows = [*read_ndjson(io.StringIO(NDJSON)), *read_csv(io.StringIO(CSV))]
+
+    batches = [
+        count
+        async for count in load_incidents(
+            [db_session.bind],  # type: ignore[list-item]
+            validate(rows, ids, report, max_errors=2),
+            batch_size=2,
+            rebuild_indexes=True,
+        )
+    ]
+
+    assert batches == [2, 1]
+    assert report.rejected == 2
+    assert report.errors[0].startswith("row 3: Invalid IncidentStatus")
+    assert report.errors[1].startswith("row 5:")
+
+    incidents = (await client.get("/incidents")).json()
+    assert [incident["description"] for incident in incidents] == [
+        "Card declined",
+        "Printer on fire",
+        "Disk is full",
+    ]
+    assert incidents[1]["status"] == IncidentStatus.IN_PROGRESS.value
+    assert incidents[2]["created_at"].startswith("2024-03-01T10:00:00")
+
+    history = (await client.get("/incidents/7/history")).json()
+    assert [entry["to_status"] for entry in history] == [
+        IncidentStatus.CLOSED.value
+    ]
+
+
+def test_validate_stops_after_max_errors() -> None:
+    """Test too many invalid rows stop the load."""
+    rows = read_ndjson(io.StringIO(NDJSON))
+    incidents = validate(rows, SnowflakeIdGenerator(0), LoadReport(), 0)
+
+    with pytest.raises(ValueError, match="More than 0 invalid rows"):
+        list(incidents)
+
+
+def test_generated_rows_are_valid_and_ordered() -> None:
+    """Test synthetic rows pass validation, oldest first."""
+    output = io.StringIO()
+    count = write_ndjson(generate_rows(1000, seed=1), output)
+    output.seek(0)
+
+    report = LoadReport()
+    incidents = list(
+        validate(
+            read_ndjson(output), SnowflakeIdGenerator(0), report, max_errors=0
+        )
+    )
+
+    assert count == len(incidents) == 1000
+    created = [incident.created_at for incident in incidents]
+    assert created == sorted(created)
+    assert {incident.source for incident in incidents} == set(IncidentSource)
@@ -0,0 +1,100 @@
+"""Tests for getting many incidents by IDs."""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Sequence
+from typing import Any
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.application.batching import BatchLoader
+from app.application.use_cases import GetIncidentByIdUseCase
+from app.domain.exceptions import IncidentNotFoundError
+from app.domain.interfaces import UnitOfWorkFactory
+
+# Helper of the create_incidents fixture
+CreateIncidents = Callable[..., Awaitable[list[str]]]
+
+
+@pytest.mark.asyncio
+async def test_lookup_keeps_order_and_reports_missing(
+    client: AsyncClient,
+    create_incidents: CreateIncidents,
+) -> None:
+    """Test found incidents follow the requested order."""
+    ids = await create_incidents(3)
+
+    response = await client.post(
+        "/incidents/lookup",
+        json={"ids": [ids[2], 999, ids[0], ids[2], 998]},
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [incident["id"] for incident in data["found"]] == [ids[2], ids[0]]
+    assert data["not_found"] == ["999", "998"]
+
+
+@pytest.mark.asyncio
+async def test_lookup_requires_ids(client: AsyncClient) -> None:
+    """Test an empty list of IDs is rejected."""
+    response = await client.post("/incidents/lookup", json={"ids": []})
+
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("storage_backend", ["sqlalchemy"])
+async def test_concurrent_lookups_by_id_share_one_query(
+    db_session: AsyncSession,
+    uow_factory: UnitOfWorkFactory,
+    create_incidents: CreateIncidents,
+) -> None:
+    """Test single-ID lookups of one tick run a single SELECT."""
+    ids = [int(incident_id) for incident_id in await create_incidents(5)]
+    use_case = GetIncidentByIdUseCase(uow_factory)
+
+    selects = 0
+
+    def count_select(*args: Any) -> None:
+        nonlocal selects
+        selects += args[2].lstrip().upper().startswith("SELECT")
+
+    engine = db_session.bind.sync_engine  # type: ignore[union-attr]
+    event.listen(engine, "before_cursor_execute", count_select)
+    try:
+        results = await asyncio.gather(
+            *(use_case.execute(incident_id) for incident_id in ids),
+            use_case.execute(999),
+            return_exceptions=True,
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", count_select)
+
+    assert [incident.id for incident in results[:5]] == ids  # type: ignore[union-attr]
+    assert isinstance(results[5], IncidentNotFoundError)
+    assert selects == 1
+
+
+@pytest.mark.asyncio
+async def test_batch_loader_splits_batches_and_shares_errors() -> None:
+    """Test batches are capped and a failed batch fails its callers."""
+    batches: list[list[int]] = []
+
+    async def load_many(keys: Sequence[int]) -> list[int]:
+        batches.append(list(keys))
+        if 4 in keys:
+            raise RuntimeError("boom")
+        return [key * 10 for key in keys]
+
+    loader: BatchLoader[int, int] = BatchLoader(load_many, max_batch_size=2)
+    results = await asyncio.gather(
+        *(loader.load(key) for key in (1, 2, 1, 3, 4)),
+        return_exceptions=True,
+    )
+
+    assert batches == [[1, 2], [3, 4]]
+    assert results[:3] == [10, 20, 10]
+    assert all(isinstance(result, RuntimeError) for result in results[3:])
@@ -0,0 +1,289 @@
+"""Tests for the in-memory storage engine."""
+
+import random
+from datetime import UTC, datetime, timedelta
+from functools import partial
+from pathlib import Path
+
+import pytest
+from httpx import AsyncClient
+
+from app.dependencies import get_uow_factory
+from app.domain.entities import Incident, IncidentFilter
+from app.domain.enums import IncidentSource, IncidentStatus
+from app.domain.exceptions import InvalidStatusTransitionError
+from app.domain.interfaces import UnitOfWorkFactory
+from app.infrastructure.memory import InMemoryDatabase, InMemoryUnitOfWork
+from app.infrastructure.sorted_map import SortedMap
+from app.main import app
+
+START = datetime(2025, 1, 1, tzinfo=UTC)
+
+
+def make_incident(
+    minutes: int,
+    status: IncidentStatus = IncidentStatus.OPEN,
+    source: IncidentSource = IncidentSource.OPERATOR,
+) -> Incident:
+    """Build a new incident created the given minutes after START."""
+    return Incident(
+        id=None,
+        description=f"Incident at {minutes}",
+        status=status,
+        source=source,
+        created_at=START + timedelta(minutes=minutes),
+    )
+
+
+def test_sorted_map_keeps_old_versions() -> None:
+    """Test changes match a dict and leave earlier versions intact."""
+    rng = random.Random(5)
+    owner = object()
+    current: SortedMap[int, int] = SortedMap()
+    expected: dict[int, int] = {}
+    versions = []
+    for step in range(20_000):
+        key = rng.randrange(5000)
+        if key in expected and rng.random() < 0.4:
+            current = current.delete(key, owner)
+            del expected[key]
+        else:
+            current = current.set(key, step, owner)
+            expected[key] = step
+        if step % 1000 == 0:
+            # Versions kept for readers are no longer changed in place
+            versions.append((current, dict(expected)))
+            owner = object()
+    versions.append((current, expected))
+
+    for version, entries in versions:
+        below = rng.randrange(5000)
+        assert len(version) == len(entries)
+        assert list(version.items()) == sorted(entries.items())
+        assert list(version.keys(below, reverse=True)) == sorted(
+            (key for key in entries if key < below), reverse=True
+        )
+        skip = rng.randrange(len(entries) + 2)
+        assert list(version.keys(skip=skip)) == sorted(entries)[skip:]
+        assert (
+            list(version.keys(below, reverse=True, skip=skip))
+            == sorted((key for key in entries if key < below), reverse=True)[
+                skip:
+            ]
+        )
+        assert all(version.get(key) == entries.get(key) for key in range(5000))
+    with pytest.raises(KeyError):
+        current.delete(5000)
+
+
+@pytest.mark.asyncio
+async def test_pages_match_across_backends(
+    uow_factory: UnitOfWorkFactory,
+) -> None:
+    """Test ordering, filtering and pagination of every backend."""
+    async with uow_factory() as uow:
+        created = await uow.incidents.create_many(
+            [
+                make_incident(
+                    minutes, status=list(IncidentStatus)[minutes % 3]
+                )
+                for minutes in (5, 1, 4, 2, 3, 0)
+            ]
+        )
+    ids = [incident.id for incident in created]
+
+    async with uow_factory() as uow:
+        newest = await uow.incidents.get_all(limit=3, offset=1)
+        open_incidents = await uow.incidents.get_all(IncidentStatus.OPEN)
+        below = await uow.incidents.get_before(ids[2], 2)
+        columns = await uow.incidents.get_columns(
+            ["id", "status"], IncidentStatus.CLOSED
+        )
+        counts = [
+            await uow.incidents.count(),
+            await uow.incidents.estimate_count(IncidentStatus.OPEN),
+        ]
+
+    assert [incident.id for incident in newest] == [ids[2], ids[4], ids[3]]
+    assert [incident.id for incident in open_incidents] == [ids[4], ids[5]]
+    assert [incident.id for incident in below] == [ids[1], ids[0]]
+    assert counts == [6, 2]
+    assert columns == {
+        "id": [ids[0], ids[3]],
+        "status": [IncidentStatus.CLOSED.value] * 2,
+    }
+
+
+@pytest.mark.asyncio
+async def test_status_updates_match_across_backends(
+    uow_factory: UnitOfWorkFactory,
+) -> None:
+    """Test transitions, bulk updates and history of every backend."""
+    async with uow_factory() as uow:
+        first, second, third = await uow.incidents.create_many(
+            [
+                make_incident(0),
+                make_incident(1, source=IncidentSource.PARTNER),
+                make_incident(2, status=IncidentStatus.CLOSED),
+            ]
+        )
+    assert first.id and second.id and third.id
+
+    async with uow_factory() as uow:
+        await uow.incidents.update_status(first.id, IncidentStatus.IN_PROGRESS)
+        with pytest.raises(InvalidStatusTransitionError):
+            await uow.incidents.update_status(
+                third.id, IncidentStatus.IN_PROGRESS
+            )
+        updated = await uow.incidents.update_status_many(
+            IncidentStatus.CLOSED,
+            criteria=IncidentFilter(source=IncidentSource.OPERATOR),
+        )
+
+    async with uow_factory() as uow:
+        history = await uow.incidents.get_history(first.id)
+        remaining = await uow.incidents.get_all(IncidentStatus.OPEN)
+
+    assert [incident.id for incident in updated] == [first.id]
+    assert [(change.from_status, change.to_status) for change in history] == [
+        (None, IncidentStatus.OPEN),
+        (IncidentStatus.OPEN, IncidentStatus.IN_PROGRESS),
+        (IncidentStatus.IN_PROGRESS, IncidentStatus.CLOSED),
+    ]
+    assert [incident.id for incident in remaining] == [second.id]
+
+
+@pytest.mark.asyncio
+async def test_rollback_restores_snapshot() -> None:
+    """Test failed units of work leave the committed state untouched."""
+    factory = partial(InMemoryUnitOfWork, InMemoryDatabase())
+    async with factory() as uow:
+        incident = await uow.incidents.create(make_incident(0))
+    assert incident.id is not None
+
+    with pytest.raises(RuntimeError):
+        async with factory() as uow:
+            await uow.incidents.create(make_incident(1))
+            await uow.incidents.update_status(
+                incident.id, IncidentStatus.CLOSED
+            )
+            raise RuntimeError("boom")
+
+    async with factory() as uow:
+        incidents = await uow.incidents.get_all()
+        history = await uow.incidents.get_history(incident.id)
+
+    assert incidents == [incident]
+    assert len(history) == 1
+
+
+@pytest.mark.asyncio
+async def test_readers_keep_their_snapshot() -> None:
+    """Test a reader does not see changes committed after its first read."""
+    factory = partial(InMemoryUnitOfWork, InMemoryDatabase())
+    async with factory() as reader:
+        assert await reader.incidents.get_all() == []
+        async with factory() as writer:
+            await writer.incidents.create(make_incident(0))
+        assert await reader.incidents.get_all() == []
+
+    async with factory() as reader:
+        assert len(await reader.incidents.get_all()) == 1
+
+
+@pytest.mark.asyncio
+async def test_log_replays_committed_transactions(tmp_path: Path) -> None:
+    """Test the log restores commits and drops a torn last line."""
+    path = tmp_path / "incidents.log"
+    database = InMemoryDatabase(path)
+    factory = partial(InMemoryUnitOfWork, database)
+    async with factory() as uow:
+        incident = await uow.incidents.create(make_incident(0))
+    assert incident.id is not None
+    async with factory() as uow:
+        await uow.incidents.update_status(incident.id, IncidentStatus.CLOSED)
+    with pytest.raises(RuntimeError):
+        async with factory() as uow:
+            await uow.incidents.create(make_incident(1))
+            raise RuntimeError("boom")
+    database.close()
+    with open(path, "ab") as file:
+        file.write(b'[["delete",')
+
+    factory = partial(InMemoryUnitOfWork, InMemoryDatabase(path))
+    async with factory() as uow:
+        incidents = await uow.incidents.get_all()
+        history = await uow.incidents.get_history(incident.id)
+        created = await uow.incidents.create(make_incident(2))
+
+    assert incidents == [
+        Incident(
+            id=incident.id,
+            description=incident.description,
+            status=IncidentStatus.CLOSED,
+            source=incident.source,
+            created_at=incident.created_at,
+        )
+    ]
+    assert [change.to_status for change in history] == [
+        IncidentStatus.OPEN,
+        IncidentStatus.CLOSED,
+    ]
+    assert created.id == incident.id + 1
+    # The torn line is cut off instead of compacting the log
+    assert len(path.read_bytes().splitlines()) == 3
+
+    InMemoryDatabase(path).close()
+    assert len(path.read_bytes().splitlines()) == 1
+
+
+@pytest.mark.asyncio
+async def test_log_refuses_broken_line_before_the_end(tmp_path: Path) -> None:
+    """Test a broken line followed by committed ones fails the replay."""
+    path = tmp_path / "incidents.log"
+    database = InMemoryDatabase(path)
+    factory = partial(InMemoryUnitOfWork, database)
+    for minutes in range(3):
+        async with factory() as uow:
+            await uow.incidents.create(make_incident(minutes))
+    database.close()
+    lines = path.read_bytes().splitlines(keepends=True)
+    path.write_bytes(lines[0] + b"[[\n" + lines[2])
+
+    with pytest.raises(ValueError, match="line 2"):
+        InMemoryDatabase(path)
+    assert path.read_bytes() == lines[0] + b"[[\n" + lines[2]
+
+
+@pytest.mark.asyncio
+async def test_api_serves_from_memory(client: AsyncClient) -> None:
+    """Test the API works end to end on the in-memory backend."""
+    factory = partial(InMemoryUnitOfWork, InMemoryDatabase())
+
+    async def override_get_uow_factory() -> UnitOfWorkFactory:
+        return factory
+
+    app.dependency_overrides[get_uow_factory] = override_get_uow_factory
+
+    response = await client.post(
+        "/incidents",
+        json={
+            "description": "Disk is full",
+            "status": IncidentStatus.OPEN.value,
+            "source": IncidentSource.MONITORING.value,
+        },
+        headers={"Idempotency-Key": "disk-full"},
+    )
+    assert response.status_code == 201
+    incident_id = response.json()["id"]
+
+    response = await client.patch(
+        f"/incidents/{incident_id}/status",
+        json={"status": IncidentStatus.CLOSED.value},
+    )
+    assert response.status_code == 200
+
+    response = await client.get("/incidents")
+    assert [incident["id"] for incident in response.json()] == [incident_id]
+    response = await client.get("/incidents/analytics/mttr")
+    assert response.json()["overall"]["count"] == 1
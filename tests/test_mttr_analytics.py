@@ -0,0 +1,125 @@
+"""Tests for GET /incidents/analytics/mttr endpoint."""
+
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from httpx import AsyncClient
+
+from app.application.use_cases import (
+    BulkUpdateIncidentStatusUseCase,
+    UpdateIncidentStatusUseCase,
+)
+from app.domain.analytics import DurationStats
+from app.domain.entities import Incident
+from app.domain.enums import IncidentSource, IncidentStatus
+from app.domain.interfaces import UnitOfWorkFactory
+
+# Helper of the create_incidents fixture
+CreateIncidents = Callable[..., Awaitable[list[str]]]
+
+
+@pytest.mark.asyncio
+async def test_mttr_empty(client: AsyncClient) -> None:
+    """Test MTTR when no incident was resolved."""
+    response = await client.get("/incidents/analytics/mttr")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["overall"]["count"] == 0
+    assert data["overall"]["mean_seconds"] is None
+    assert data["by_source"] == {}
+
+
+@pytest.mark.asyncio
+async def test_mttr_counts_closed_incidents(
+    client: AsyncClient, create_incidents: CreateIncidents
+) -> None:
+    """Test MTTR aggregates are updated when incidents are closed."""
+    (partner_id,) = await create_incidents(1, IncidentSource.PARTNER)
+    operator_ids = await create_incidents(2, IncidentSource.OPERATOR)
+    await create_incidents(1, IncidentSource.MONITORING)
+
+    await client.patch(
+        f"/incidents/{partner_id}/status",
+        json={"status": IncidentStatus.CLOSED.value},
+    )
+    await client.patch(
+        "/incidents/status",
+        json={"status": IncidentStatus.CLOSED.value, "ids": operator_ids},
+    )
+
+    response = await client.get("/incidents/analytics/mttr")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["overall"]["count"] == 3
+    assert data["by_source"][IncidentSource.PARTNER.value]["count"] == 1
+    assert data["by_source"][IncidentSource.OPERATOR.value]["count"] == 2
+    assert IncidentSource.MONITORING.value not in data["by_source"]
+    assert data["overall"]["mean_seconds"] >= 0
+
+    today = datetime.now(UTC).date().isoformat()
+    day_response = await client.get(
+        "/incidents/analytics/mttr", params={"day": today}
+    )
+    assert day_response.json()["overall"]["count"] == 3
+
+    other_day_response = await client.get(
+        "/incidents/analytics/mttr", params={"day": "2000-01-01"}
+    )
+    assert other_day_response.json()["overall"]["count"] == 0
+
+
+@pytest.mark.asyncio
+async def test_mttr_measures_from_last_opening(
+    uow_factory: UnitOfWorkFactory,
+) -> None:
+    """Test resolution time restarts on reopening, not on other moves."""
+    async with uow_factory() as uow:
+        (incident,) = await uow.incidents.create_many(
+            [
+                Incident(
+                    id=None,
+                    description="Settlement file missing",
+                    status=IncidentStatus.OPEN,
+                    source=IncidentSource.PARTNER,
+                    created_at=datetime.now(UTC) - timedelta(hours=2),
+                )
+            ]
+        )
+    assert incident.id is not None
+    update = UpdateIncidentStatusUseCase(uow_factory)
+    await update.execute(incident.id, IncidentStatus.IN_PROGRESS)
+    await update.execute(incident.id, IncidentStatus.OPEN)
+    await update.execute(incident.id, IncidentStatus.CLOSED)
+    await update.execute(incident.id, IncidentStatus.OPEN)
+    await BulkUpdateIncidentStatusUseCase(uow_factory).execute(
+        IncidentStatus.CLOSED, ids=[incident.id]
+    )
+
+    async with uow_factory() as uow:
+        by_source = await uow.analytics.get_mttr_by_source(None)
+    stats = by_source[IncidentSource.PARTNER]
+    assert stats.count == 2
+    # Two hours until the first close, almost nothing after reopening
+    assert 2 * 60 * 60 <= stats.total_seconds < 2 * 60 * 60 + 60
+
+
+def test_duration_stats_quantiles() -> None:
+    """Test running aggregates and quantile sketch accuracy."""
+    stats = DurationStats()
+    for seconds in range(1, 1001):
+        stats.add(float(seconds))
+
+    assert stats.count == 1000
+    assert stats.mean_seconds == pytest.approx(500.5)
+    assert stats.stddev_seconds == pytest.approx(288.675, rel=1e-3)
+    assert stats.quantile(0.5) == pytest.approx(500, rel=0.02)
+    assert stats.quantile(0.99) == pytest.approx(990, rel=0.02)
+
+    merged = DurationStats()
+    merged.merge(stats)
+    merged.merge(stats)
+    assert merged.count == 2000
+    assert merged.quantile(0.5) == pytest.approx(500, rel=0.02)
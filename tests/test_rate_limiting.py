@@ -0,0 +1,174 @@
+"""Tests for rate limiting and load shedding of incident endpoints."""
+
+from ipaddress import ip_network
+
+import pytest
+from httpx import AsyncClient
+
+from app.dependencies import (
+    get_load_shedder,
+    get_rate_limiter,
+    get_uow_factory,
+)
+from app.domain.enums import IncidentSource, IncidentStatus
+from app.domain.interfaces import IUnitOfWork, UnitOfWorkFactory
+from app.infrastructure.load_shedding import LoadShedder
+from app.infrastructure.rate_limit import (
+    InMemoryRateLimiterBackend,
+    RateLimiter,
+    TokenBucketLimit,
+)
+from app.main import app
+
+
+def _payload(source: IncidentSource) -> dict[str, str]:
+    return {
+        "description": "Partner webhook storm",
+        "status": IncidentStatus.OPEN.value,
+        "source": source.value,
+    }
+
+
+def _use_rate_limiter(limiter: RateLimiter) -> None:
+    async def override_get_rate_limiter() -> RateLimiter:
+        return limiter
+
+    app.dependency_overrides[get_rate_limiter] = override_get_rate_limiter
+
+
+@pytest.mark.asyncio
+async def test_source_rate_limit(client: AsyncClient) -> None:
+    """Test flooding source is limited while others are served."""
+    _use_rate_limiter(
+        RateLimiter(
+            InMemoryRateLimiterBackend(),
+            source_limits={
+                IncidentSource.PARTNER: TokenBucketLimit(rate=0.1, burst=2)
+            },
+        )
+    )
+
+    responses = [
+        await client.post("/incidents", json=_payload(IncidentSource.PARTNER))
+        for _ in range(3)
+    ]
+    operator_response = await client.post(
+        "/incidents", json=_payload(IncidentSource.OPERATOR)
+    )
+
+    assert [r.status_code for r in responses] == [201, 201, 429]
+    assert int(responses[-1].headers["Retry-After"]) >= 1
+    assert operator_response.status_code == 201
+
+
+@pytest.mark.asyncio
+async def test_client_rate_limit(client: AsyncClient) -> None:
+    """Test each client behind a trusted proxy has its own bucket."""
+    _use_rate_limiter(
+        RateLimiter(
+            InMemoryRateLimiterBackend(),
+            source_limits={},
+            client_limit=TokenBucketLimit(rate=0.1, burst=1),
+            trusted_proxies=[ip_network("127.0.0.0/8")],
+        )
+    )
+    payload = _payload(IncidentSource.MONITORING)
+
+    first = await client.post(
+        "/incidents", json=payload, headers={"X-Client-Id": "agent-1"}
+    )
+    second = await client.post(
+        "/incidents", json=payload, headers={"X-Client-Id": "agent-1"}
+    )
+    other = await client.post(
+        "/incidents", json=payload, headers={"X-Client-Id": "agent-2"}
+    )
+
+    assert first.status_code == 201
+    assert second.status_code == 429
+    assert other.status_code == 201
+
+
+@pytest.mark.asyncio
+async def test_client_id_of_untrusted_peer_is_ignored(
+    client: AsyncClient,
+) -> None:
+    """Test a client cannot get a fresh bucket by changing its ID."""
+    _use_rate_limiter(
+        RateLimiter(
+            InMemoryRateLimiterBackend(),
+            source_limits={},
+            client_limit=TokenBucketLimit(rate=0.1, burst=1),
+            trusted_proxies=[ip_network("10.0.0.0/8")],
+        )
+    )
+    payload = _payload(IncidentSource.MONITORING)
+
+    first = await client.post(
+        "/incidents", json=payload, headers={"X-Client-Id": "agent-1"}
+    )
+    second = await client.post(
+        "/incidents", json=payload, headers={"X-Client-Id": "agent-2"}
+    )
+
+    assert first.status_code == 201
+    assert second.status_code == 429
+
+
+@pytest.mark.asyncio
+async def test_rejected_request_takes_no_tokens() -> None:
+    """Test a request rejected by its source keeps the client tokens."""
+    limiter = RateLimiter(
+        InMemoryRateLimiterBackend(clock=lambda: 0.0),
+        source_limits={
+            IncidentSource.PARTNER: TokenBucketLimit(rate=0.1, burst=1)
+        },
+        client_limit=TokenBucketLimit(rate=0.1, burst=2),
+    )
+
+    assert await limiter.check("agent", IncidentSource.PARTNER) == 0
+    assert await limiter.check("agent", IncidentSource.PARTNER) > 0
+    assert await limiter.check("agent", IncidentSource.OPERATOR) == 0
+    assert await limiter.check("agent", IncidentSource.OPERATOR) > 0
+
+
+@pytest.mark.asyncio
+async def test_load_shedding_before_session(client: AsyncClient) -> None:
+    """Test overloaded service answers 503 without touching the database."""
+
+    async def override_get_load_shedder() -> LoadShedder:
+        return LoadShedder(
+            pool_saturation=lambda: 1.0,
+            loop_lag=lambda: 0.0,
+            max_pool_saturation=0.9,
+            max_loop_lag_seconds=0.5,
+            retry_after_seconds=2,
+        )
+
+    def fail_create_uow() -> IUnitOfWork:
+        raise AssertionError("Session must not be opened")
+
+    async def override_get_uow_factory() -> UnitOfWorkFactory:
+        return fail_create_uow
+
+    app.dependency_overrides[get_load_shedder] = override_get_load_shedder
+    app.dependency_overrides[get_uow_factory] = override_get_uow_factory
+
+    response = await client.get("/incidents")
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "2"
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_refills() -> None:
+    """Test tokens are refilled at the configured rate."""
+    now = 0.0
+    backend = InMemoryRateLimiterBackend(clock=lambda: now)
+    limit = TokenBucketLimit(rate=2.0, burst=1)
+
+    assert await backend.acquire({"key": limit}) == 0
+    assert await backend.acquire({"key": limit}) == pytest.approx(0.5)
+
+    now = 0.5
+    assert await backend.acquire({"key": limit}) == 0
@@ -0,0 +1,116 @@
+"""Tests for read-only units of work."""
+
+from collections.abc import Generator
+from datetime import UTC, datetime
+from functools import partial
+from typing import Any
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app import dependencies
+from app.dependencies import get_uow_factory
+from app.domain.entities import Incident
+from app.domain.enums import IncidentSource, IncidentStatus
+from app.domain.interfaces import UnitOfWorkFactory
+from app.infrastructure.unit_of_work import SQLAlchemyUnitOfWork
+from app.main import app
+
+
+@pytest.fixture
+def storage_backend() -> str:
+    """Transactions are observed on the SQL storage backend."""
+    return "sqlalchemy"
+
+
+@pytest.fixture
+def read_commits(
+    client: AsyncClient,  # noqa: ARG001 - override after client fixture
+    db_session: AsyncSession,
+    monkeypatch: pytest.MonkeyPatch,
+) -> Generator[list[str], None, None]:
+    """Route reads to an autocommit session, recording all commits."""
+    assert db_session.bind is not None
+    write_factory: UnitOfWorkFactory = partial(
+        SQLAlchemyUnitOfWork,
+        async_sessionmaker(db_session.bind, expire_on_commit=False),
+    )
+    read_engine = db_session.bind.execution_options(
+        isolation_level="AUTOCOMMIT"
+    )
+    read_factory: UnitOfWorkFactory = partial(
+        SQLAlchemyUnitOfWork,
+        async_sessionmaker(read_engine, expire_on_commit=False),
+        read_only=True,
+    )
+    # Isolation level of every committed connection
+    commits: list[str] = []
+
+    def on_commit(conn: Any) -> None:
+        commits.append(conn.get_execution_options().get("isolation_level"))
+
+    event.listen(db_session.bind.sync_engine, "commit", on_commit)
+    monkeypatch.setattr(
+        dependencies, "_read_uow_factories", {write_factory: read_factory}
+    )
+
+    async def override_get_uow_factory() -> UnitOfWorkFactory:
+        return write_factory
+
+    app.dependency_overrides[get_uow_factory] = override_get_uow_factory
+    yield commits
+    event.remove(db_session.bind.sync_engine, "commit", on_commit)
+
+
+@pytest.mark.asyncio
+async def test_read_only_unit_of_work_does_not_commit(
+    db_session: AsyncSession,
+) -> None:
+    """Test changes made in a read-only unit of work are discarded."""
+    assert db_session.bind is not None
+    session_maker = async_sessionmaker(db_session.bind)
+
+    async with SQLAlchemyUnitOfWork(session_maker, read_only=True) as uow:
+        await uow.incidents.create(
+            Incident(
+                id=None,
+                description="Never committed",
+                status=IncidentStatus.OPEN,
+                source=IncidentSource.OPERATOR,
+                created_at=datetime.now(UTC),
+            )
+        )
+
+    async with SQLAlchemyUnitOfWork(session_maker) as uow:
+        assert await uow.incidents.get_all() == []
+
+
+@pytest.mark.asyncio
+async def test_reads_use_read_only_unit_of_work(
+    client: AsyncClient, read_commits: list[str]
+) -> None:
+    """Test writes commit while reads end without a commit."""
+    response = await client.post(
+        "/incidents",
+        json={
+            "description": "Disk is full",
+            "status": IncidentStatus.OPEN.value,
+            "source": IncidentSource.MONITORING.value,
+        },
+    )
+    incident_id = response.json()["id"]
+    assert len(read_commits) == 1
+
+    for url in (
+        "/incidents",
+        f"/incidents/{incident_id}",
+        f"/incidents/{incident_id}/history",
+        "/incidents/analytics/mttr",
+    ):
+        response = await client.get(url)
+        assert response.status_code == 200
+
+    assert response.json()["overall"]["count"] == 0
+    assert len(read_commits) == 1
@@ -0,0 +1,73 @@
+"""Tests for production server entry point."""
+
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+
+from app.config import settings
+from app.serve import build_config, resolve_workers
+
+
+def test_resolve_workers() -> None:
+    """Test zero workers means one per CPU core."""
+    assert resolve_workers(3) == 3
+    assert resolve_workers(0) >= 1
+
+
+def test_build_config_uses_settings() -> None:
+    """Test uvicorn is configured from settings."""
+    config = build_config()
+
+    assert config.backlog == settings.SERVER_BACKLOG
+    assert config.timeout_keep_alive == settings.SERVER_KEEP_ALIVE_SECONDS
+    assert config.lifespan == "on"
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return int(sock.getsockname()[1])
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires fork")
+def test_workers_serve_and_stop_on_sigterm(tmp_path: Path) -> None:
+    """Test forked workers serve requests and exit with the master."""
+    port = _free_port()
+    env = {
+        **os.environ,
+        "DATABASE_URL": f"sqlite+aiosqlite:///{tmp_path / 'serve.db'}",
+        "SERVER_HOST": "127.0.0.1",
+        "SERVER_PORT": str(port),
+        "SERVER_WORKERS": "2",
+        "SERVER_ACCESS_LOG": "false",
+    }
+    master = subprocess.Popen(
+        [sys.executable, "-m", "app.serve"],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = time.monotonic() + 15
+        while True:
+            try:
+                response = httpx.get(f"http://127.0.0.1:{port}/")
+                break
+            except httpx.TransportError:
+                assert time.monotonic() < deadline, "server did not start"
+                time.sleep(0.1)
+
+        assert response.status_code == 200
+
+        master.send_signal(signal.SIGTERM)
+        assert master.wait(timeout=15) == 0
+    finally:
+        if master.poll() is None:
+            master.kill()
@@ -0,0 +1,209 @@
+"""Tests for incidents sharded across several databases."""
+
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from functools import partial
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from app.dependencies import get_uow_factory
+from app.domain.enums import IncidentSource, IncidentStatus
+from app.domain.ids import SnowflakeIdGenerator
+from app.domain.interfaces import UnitOfWorkFactory
+from app.infrastructure.database import Base
+from app.infrastructure.models import IncidentModel
+from app.infrastructure.sharding import (
+    ShardedUnitOfWork,
+    ShardKey,
+    ShardRouter,
+)
+from app.main import app
+from app.tools.load import LoadReport, generate_rows, load_incidents, validate
+
+# Helper of the create_incidents fixture
+CreateIncidents = Callable[..., Awaitable[list[str]]]
+
+SHARDS = 3
+
+
+@pytest.fixture
+def storage_backend() -> str:
+    """Shards are SQL databases."""
+    return "sqlalchemy"
+
+
+@pytest_asyncio.fixture
+async def shard_engines(
+    tmp_path: Path,
+) -> AsyncGenerator[list[AsyncEngine], None]:
+    """SQLite file databases with the schema, one per shard."""
+    engines = [
+        create_async_engine(f"sqlite+aiosqlite:///{tmp_path / f'{i}.db'}")
+        for i in range(SHARDS)
+    ]
+    for engine in engines:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    yield engines
+
+    for engine in engines:
+        await engine.dispose()
+
+
+def use_shards(engines: list[AsyncEngine], key: ShardKey) -> None:
+    """Route requests of the test client to the shards."""
+    factory: UnitOfWorkFactory = partial(
+        ShardedUnitOfWork,
+        [async_sessionmaker(e, expire_on_commit=False) for e in engines],
+        ShardRouter(len(engines), key),
+        SnowflakeIdGenerator(worker_id=1),
+    )
+
+    async def override_get_uow_factory() -> UnitOfWorkFactory:
+        return factory
+
+    app.dependency_overrides[get_uow_factory] = override_get_uow_factory
+
+
+async def count_rows(engine: AsyncEngine) -> int:
+    """Count incidents stored in the shard."""
+    async with engine.connect() as conn:
+        result = await conn.execute(
+            select(func.count()).select_from(IncidentModel)
+        )
+        return int(result.scalar_one())
+
+
+@pytest.mark.asyncio
+async def test_incidents_are_spread_by_hashed_id(
+    client: AsyncClient,
+    shard_engines: list[AsyncEngine],
+    create_incidents: CreateIncidents,
+) -> None:
+    """Test incidents land on several shards and are read back by ID."""
+    use_shards(shard_engines, "id")
+    ids = await create_incidents(30)
+
+    counts = [await count_rows(engine) for engine in shard_engines]
+    assert sum(counts) == 30
+    assert all(count > 0 for count in counts)
+
+    for incident_id in ids:
+        response = await client.get(f"/incidents/{incident_id}")
+        assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_get_all_merges_shards_newest_first(
+    client: AsyncClient,
+    shard_engines: list[AsyncEngine],
+    create_incidents: CreateIncidents,
+) -> None:
+    """Test list is ordered across shards and pages slice it."""
+    use_shards(shard_engines, "id")
+    ids = await create_incidents(12)
+
+    response = await client.get("/incidents")
+    assert [i["id"] for i in response.json()] == ids[::-1]
+
+    response = await client.get("/incidents", params={"limit": 5, "offset": 4})
+    assert [i["id"] for i in response.json()] == ids[::-1][4:9]
+
+
+@pytest.mark.asyncio
+async def test_status_updates_reach_the_incident_shard(
+    client: AsyncClient,
+    shard_engines: list[AsyncEngine],
+    create_incidents: CreateIncidents,
+) -> None:
+    """Test single and bulk updates change incidents on their shards."""
+    use_shards(shard_engines, "id")
+    ids = await create_incidents(6)
+
+    response = await client.patch(
+        f"/incidents/{ids[0]}/status",
+        json={"status": IncidentStatus.IN_PROGRESS.value},
+    )
+    assert response.status_code == 200
+
+    response = await client.patch(
+        "/incidents/status",
+        json={"status": IncidentStatus.CLOSED.value, "ids": [*ids, 1]},
+    )
+    data = response.json()
+    assert sorted(i["id"] for i in data["updated"]) == sorted(ids)
+    assert data["not_found"] == ["1"]
+
+    response = await client.get(f"/incidents/{ids[0]}/history")
+    assert [entry["to_status"] for entry in response.json()] == [
+        IncidentStatus.OPEN.value,
+        IncidentStatus.IN_PROGRESS.value,
+        IncidentStatus.CLOSED.value,
+    ]
+
+
+@pytest.mark.asyncio
+async def test_incidents_are_grouped_by_source(
+    client: AsyncClient,
+    shard_engines: list[AsyncEngine],
+    create_incidents: CreateIncidents,
+) -> None:
+    """Test source sharding keeps a source on one shard."""
+    use_shards(shard_engines, "source")
+    ids = await create_incidents(5, IncidentSource.PARTNER)
+
+    counts = [await count_rows(engine) for engine in shard_engines]
+    assert sorted(counts) == [0, 0, 5]
+
+    response = await client.get(f"/incidents/{ids[2]}")
+    assert response.status_code == 200
+    response = await client.patch(
+        f"/incidents/{ids[2]}/status",
+        json={"status": IncidentStatus.CLOSED.value},
+    )
+    assert response.status_code == 200
+    response = await client.get("/incidents/1")
+    assert response.status_code == 404
+
+
+def test_source_sharding_uses_a_shard_per_source_at_most() -> None:
+    """Test source sharding refuses shards no source would be routed to."""
+    assert ShardRouter(len(IncidentSource), "source").shards == 3
+    with pytest.raises(ValueError, match="at most 3 shards"):
+        ShardRouter(len(IncidentSource) + 1, "source")
+
+
+@pytest.mark.asyncio
+async def test_loaded_incidents_land_on_their_shard(
+    client: AsyncClient, shard_engines: list[AsyncEngine]
+) -> None:
+    """Test the bulk loader routes every row to its shard."""
+    use_shards(shard_engines, "id")
+    incidents = validate(
+        generate_rows(30, days=1), SnowflakeIdGenerator(2), LoadReport(), 0
+    )
+    batches = [
+        count
+        async for count in load_incidents(
+            shard_engines, incidents, batch_size=8, rebuild_indexes=True
+        )
+    ]
+    assert batches == [8, 8, 8, 6]
+
+    counts = [await count_rows(engine) for engine in shard_engines]
+    assert sum(counts) == 30
+    assert all(count > 0 for count in counts)
+    response = await client.get("/incidents", params={"limit": 100})
+    assert len(response.json()) == 30
+    for incident in response.json():
+        response = await client.get(f"/incidents/{incident['id']}/history")
+        assert len(response.json()) == 1
@@ -0,0 +1,119 @@
+"""Tests for coalescing of concurrent identical reads."""
+
+import asyncio
+from typing import Any
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.application.single_flight import SingleFlight
+from app.domain.enums import IncidentSource, IncidentStatus
+
+
+class _SelectCounter:
+    def __init__(self) -> None:
+        self.count = 0
+
+    def __call__(self, *args: Any) -> None:
+        statement = args[2]
+        if statement.lstrip().upper().startswith("SELECT"):
+            self.count += 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("storage_backend", ["sqlalchemy"])
+async def test_concurrent_reads_share_one_query(
+    client: AsyncClient, db_session: AsyncSession
+) -> None:
+    """Test identical concurrent GETs run a single SELECT."""
+    create_response = await client.post(
+        "/incidents",
+        json={
+            "description": "Dashboard favourite",
+            "status": IncidentStatus.OPEN.value,
+            "source": IncidentSource.MONITORING.value,
+        },
+    )
+    incident_id = create_response.json()["id"]
+
+    engine = db_session.bind.sync_engine  # type: ignore[union-attr]
+    counter = _SelectCounter()
+    event.listen(engine, "before_cursor_execute", counter)
+    try:
+        responses = await asyncio.gather(
+            *(client.get(f"/incidents/{incident_id}") for _ in range(20)),
+            *(
+                client.get(
+                    "/incidents", params={"status": IncidentStatus.OPEN.value}
+                )
+                for _ in range(20)
+            ),
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", counter)
+
+    assert {response.status_code for response in responses} == {200}
+    assert len({response.content for response in responses[:20]}) == 1
+    assert responses[0].json()["id"] == incident_id
+    assert responses[-1].json()[0]["id"] == incident_id
+    assert counter.count == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_reads_share_not_found(client: AsyncClient) -> None:
+    """Test followers get the same error as the leader."""
+    responses = await asyncio.gather(
+        *(client.get("/incidents/999") for _ in range(5))
+    )
+
+    assert {response.status_code for response in responses} == {404}
+
+
+@pytest.mark.asyncio
+async def test_single_flight_does_not_cache() -> None:
+    """Test calls after completion run again."""
+    flights: SingleFlight[int] = SingleFlight()
+    calls = 0
+
+    async def load() -> int:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0)
+        return calls
+
+    first = await asyncio.gather(*(flights.do("key", load) for _ in range(3)))
+    second = await flights.do("key", load)
+
+    assert first == [1, 1, 1]
+    assert second == 2
+    assert not flights.in_flight("key")
+
+
+@pytest.mark.asyncio
+async def test_single_flight_survives_cancelled_leader() -> None:
+    """Test a follower runs the call again when the leader is cancelled."""
+    flights: SingleFlight[int] = SingleFlight()
+    calls = 0
+    started = asyncio.Event()
+
+    async def load() -> int:
+        nonlocal calls
+        calls += 1
+        started.set()
+        await asyncio.sleep(0.01)
+        return calls
+
+    leader = asyncio.create_task(flights.do("key", load))
+    await started.wait()
+    followers = [
+        asyncio.create_task(flights.do("key", load)) for _ in range(3)
+    ]
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await asyncio.gather(*followers) == [2, 2, 2]
+    assert leader.cancelled()
+    assert calls == 2
+    assert not flights.in_flight("key")
@@ -0,0 +1,196 @@
+"""Tests for SLA breach detection."""
+
+import random
+import time
+from datetime import UTC, datetime, timedelta
+from functools import partial
+
+import pytest
+
+from app.application.sla import SlaScheduler
+from app.application.timing_wheel import TimingWheel
+from app.application.use_cases import (
+    CreateIncidentUseCase,
+    UpdateIncidentStatusUseCase,
+)
+from app.domain.entities import Incident
+from app.domain.enums import IncidentSource, IncidentStatus
+from app.domain.interfaces import UnitOfWorkFactory
+
+HOUR = 60 * 60
+
+
+def test_timing_wheel_fires_keys_at_their_deadline() -> None:
+    """Test keys fire once, at their tick, across levels and overflow."""
+    rng = random.Random(7)
+    now = 1_000_000
+    wheel = TimingWheel(now, levels=2)
+    expected: dict[int, int] = {}
+    for key in range(2000):
+        deadline = now + rng.choice(
+            [rng.randrange(-5, 70), rng.randrange(5000), rng.randrange(10**6)]
+        )
+        wheel.schedule(key, deadline)
+        expected[key] = deadline
+    for key in range(0, 2000, 7):
+        assert wheel.cancel(key)
+        del expected[key]
+    assert not wheel.cancel(0)
+
+    while expected:
+        now += rng.choice([1, 63, 64, 4097, rng.randrange(50_000)])
+        due = sorted(
+            key for key, deadline in expected.items() if deadline <= now
+        )
+        assert sorted(wheel.advance(now)) == due
+        for key in due:
+            del expected[key]
+        assert len(wheel) == len(expected)
+
+
+@pytest.fixture
+def notifying_uow_factory(uow_factory: UnitOfWorkFactory) -> UnitOfWorkFactory:
+    """Unit of Work factory of every storage backend, queueing events."""
+    return partial(uow_factory, webhook_endpoints=["http://hooks"])
+
+
+@pytest.mark.asyncio
+async def test_breaches_are_reported_once(
+    notifying_uow_factory: UnitOfWorkFactory,
+) -> None:
+    """Test loaded and tracked incidents breach once, resolved ones never."""
+    clock = [time.time()]
+    now = datetime.fromtimestamp(clock[0], UTC)
+
+    def scheduler() -> SlaScheduler:
+        return SlaScheduler(
+            notifying_uow_factory,
+            sla_seconds=HOUR,
+            source_sla_seconds={IncidentSource.PARTNER: 600},
+            clock=lambda: clock[0],
+        )
+
+    def incident(
+        hours_ago: float, source: IncidentSource, status: IncidentStatus
+    ) -> Incident:
+        return Incident(
+            id=None,
+            description=f"{hours_ago} hours old",
+            status=status,
+            source=source,
+            created_at=now - timedelta(hours=hours_ago),
+        )
+
+    async with notifying_uow_factory() as uow:
+        old, partner, _, fresh = await uow.incidents.create_many(
+            [
+                incident(2, IncidentSource.OPERATOR, IncidentStatus.OPEN),
+                incident(0.5, IncidentSource.PARTNER, IncidentStatus.OPEN),
+                incident(2, IncidentSource.OPERATOR, IncidentStatus.CLOSED),
+                incident(0, IncidentSource.OPERATOR, IncidentStatus.OPEN),
+            ]
+        )
+    first = scheduler()
+    assert await first.load() == 3
+    assert await first.tick() == 2
+    assert await first.tick() == 0
+
+    tracked = await CreateIncidentUseCase(
+        notifying_uow_factory, sla_scheduler=first
+    ).execute("Card declined", IncidentStatus.OPEN, IncidentSource.OPERATOR)
+    assert fresh.id is not None
+    await UpdateIncidentStatusUseCase(
+        notifying_uow_factory, sla_scheduler=first
+    ).execute(fresh.id, IncidentStatus.CLOSED)
+    assert tracked.id in first.wheel
+    assert fresh.id not in first.wheel
+
+    clock[0] += 2 * HOUR
+    assert await first.tick() == 1
+    # Another worker loading the same incidents reports nothing again
+    second = scheduler()
+    assert await second.load() == 3
+    assert await second.tick() == 0
+
+    async with notifying_uow_factory() as uow:
+        deliveries = await uow.webhooks.claim(
+            now + timedelta(days=1), now + timedelta(days=2), 100
+        )
+    breached = [
+        delivery.payload
+        for delivery in deliveries
+        if delivery.payload["type"] == "incident.sla_breached"
+    ]
+    assert [payload["incident"]["id"] for payload in breached] == [
+        str(old.id),
+        str(partner.id),
+        str(tracked.id),
+    ]
+    assert (
+        breached[1]["occurred_at"]
+        == (partner.created_at + timedelta(minutes=10)).isoformat()
+    )
+
+
+@pytest.mark.asyncio
+async def test_reopened_incidents_breach_once_per_open_period(
+    notifying_uow_factory: UnitOfWorkFactory,
+) -> None:
+    """Test the deadline restarts when an incident is reopened."""
+    clock = [time.time()]
+    now = datetime.fromtimestamp(clock[0], UTC)
+
+    def scheduler() -> SlaScheduler:
+        return SlaScheduler(
+            notifying_uow_factory, sla_seconds=HOUR, clock=lambda: clock[0]
+        )
+
+    async with notifying_uow_factory() as uow:
+        (incident,) = await uow.incidents.create_many(
+            [
+                Incident(
+                    id=None,
+                    description="Payouts delayed",
+                    status=IncidentStatus.OPEN,
+                    source=IncidentSource.OPERATOR,
+                    created_at=now - timedelta(hours=2),
+                )
+            ]
+        )
+    assert incident.id is not None
+    first = scheduler()
+    stale = scheduler()
+    assert await first.load() == 1
+    assert await stale.load() == 1
+    assert await first.tick() == 1
+
+    update = UpdateIncidentStatusUseCase(
+        notifying_uow_factory, sla_scheduler=first
+    )
+    await update.execute(incident.id, IncidentStatus.CLOSED)
+    await update.execute(incident.id, IncidentStatus.OPEN)
+    assert await first.tick() == 0
+    # A worker still holding the old deadline moves to the new one
+    assert await stale.tick() == 0
+    assert incident.id in stale.wheel
+    loaded = scheduler()
+    assert await loaded.load() == 1
+    assert await loaded.tick() == 0
+
+    clock[0] += HOUR + 60
+    assert await first.tick() == 1
+    assert await stale.tick() == 0
+    assert await loaded.tick() == 0
+
+    async with notifying_uow_factory() as uow:
+        deliveries = await uow.webhooks.claim(
+            now + timedelta(days=1), now + timedelta(days=2), 100
+        )
+    occurred_at = [
+        datetime.fromisoformat(delivery.payload["occurred_at"])
+        for delivery in deliveries
+        if delivery.payload["type"] == "incident.sla_breached"
+    ]
+    assert len(occurred_at) == 2
+    assert occurred_at[0] == incident.created_at + timedelta(hours=1)
+    assert occurred_at[1] > now
@@ -0,0 +1,95 @@
+"""Tests for database preparation on application start."""
+
+from collections.abc import AsyncGenerator
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from app.infrastructure.database import Base
+from app.infrastructure.startup import (
+    migration_heads,
+    verify_schema_revision,
+    warm_up_db,
+)
+
+
+@pytest_asyncio.fixture
+async def file_engine(tmp_path: Path) -> AsyncGenerator[AsyncEngine, None]:
+    """Engine of a file database with a connection pool and tables."""
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'startup.db'}", pool_size=3
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+async def _stamp(engine: AsyncEngine, revision: str) -> None:
+    async with engine.begin() as conn:
+        await conn.execute(
+            text("CREATE TABLE alembic_version (version_num VARCHAR(32))")
+        )
+        await conn.execute(
+            text("INSERT INTO alembic_version VALUES (:revision)"),
+            {"revision": revision},
+        )
+
+
+@pytest.mark.asyncio
+async def test_verify_accepts_head_revision(file_engine: AsyncEngine) -> None:
+    """Test schema at the migrations head passes verification."""
+    (head,) = migration_heads()
+    await _stamp(file_engine, head)
+
+    await verify_schema_revision(file_engine)
+
+
+@pytest.mark.asyncio
+async def test_verify_rejects_outdated_revision(
+    file_engine: AsyncEngine,
+) -> None:
+    """Test schema behind the migrations head fails verification."""
+    await _stamp(file_engine, "cf9e7e59981f")
+
+    with pytest.raises(RuntimeError, match="alembic upgrade head"):
+        await verify_schema_revision(file_engine)
+
+
+@pytest.mark.asyncio
+async def test_verify_rejects_unmigrated_database(
+    file_engine: AsyncEngine,
+) -> None:
+    """Test database without Alembic revision fails verification."""
+    with pytest.raises(RuntimeError, match="no Alembic revision"):
+        await verify_schema_revision(file_engine)
+
+
+@pytest.mark.asyncio
+async def test_warm_up_fills_pool(file_engine: AsyncEngine) -> None:
+    """Test warm-up leaves pool_size connections open in the pool."""
+    await warm_up_db([file_engine])
+
+    assert file_engine.pool.checkedin() == 3  # type: ignore[attr-defined]
+
+
+@pytest.mark.asyncio
+async def test_warm_up_fills_every_shard_pool(
+    file_engine: AsyncEngine, tmp_path: Path
+) -> None:
+    """Test warm-up fills the pool of each shard, not only the first."""
+    shard = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'shard.db'}", pool_size=2
+    )
+    async with shard.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    try:
+        await warm_up_db([file_engine, shard])
+
+        assert shard.pool.checkedin() == 2  # type: ignore[attr-defined]
+    finally:
+        await shard.dispose()
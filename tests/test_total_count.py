@@ -0,0 +1,102 @@
+"""Tests for total counts of the incident list."""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime
+
+import pytest
+from httpx import AsyncClient
+
+from app.application.counting import CountCache
+from app.domain.entities import Incident
+from app.domain.enums import IncidentSource, IncidentStatus
+from app.domain.interfaces import UnitOfWorkFactory
+
+# Helper of the create_incidents fixture
+CreateIncidents = Callable[..., Awaitable[list[str]]]
+
+
+async def total(client: AsyncClient, **params: str) -> str | None:
+    """Get X-Total-Count of the incident list."""
+    response = await client.get("/incidents", params={"limit": "1", **params})
+    assert response.status_code == 200
+    return response.headers.get("X-Total-Count")
+
+
+@pytest.mark.asyncio
+async def test_exact_count_is_cached_until_a_write(
+    client: AsyncClient,
+    uow_factory: UnitOfWorkFactory,
+    create_incidents: CreateIncidents,
+) -> None:
+    """Test exact counts are served from cache and dropped on writes."""
+    first, _ = await create_incidents(2)
+
+    assert await total(client, count="exact") == "2"
+    assert await total(client, count="exact", status="открыт") == "2"
+
+    # Written around the use cases, so the cache is not invalidated
+    async with uow_factory() as uow:
+        await uow.incidents.create(
+            Incident(
+                id=None,
+                description="Card declined",
+                status=IncidentStatus.OPEN,
+                source=IncidentSource.PARTNER,
+                created_at=datetime.now(UTC),
+            )
+        )
+    assert await total(client, count="exact") == "2"
+
+    await client.patch(
+        f"/incidents/{first}/status",
+        json={"status": IncidentStatus.CLOSED.value},
+    )
+    assert await total(client, count="exact") == "3"
+    assert await total(client, count="exact", status="открыт") == "2"
+    assert await total(client, count="exact", status="закрыт") == "1"
+
+
+@pytest.mark.asyncio
+async def test_estimate_and_none_modes(
+    client: AsyncClient, create_incidents: CreateIncidents
+) -> None:
+    """Test the estimate counts exactly on SQLite and none skips it."""
+    await create_incidents(1)
+
+    assert await total(client, count="estimate") == "1"
+    assert await total(client, count="none") is None
+    assert await total(client) is None
+
+    response = await client.get("/incidents", params={"count": "all"})
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_count_cache_expires_and_skips_stale_counts() -> None:
+    """Test counts expire and counts racing a write are not stored."""
+    now = 0.0
+    cache = CountCache(ttl_seconds=5, clock=lambda: now)
+    counted = asyncio.Event()
+    release = asyncio.Event()
+
+    async def slow_count() -> int:
+        counted.set()
+        await release.wait()
+        return 1
+
+    pending = asyncio.create_task(cache.get_or_count(None, slow_count))
+    await counted.wait()
+    cache.invalidate()
+    release.set()
+    assert await pending == 1
+    assert cache.get(None) is None
+
+    async def count_two() -> int:
+        return 2
+
+    assert await cache.get_or_count(None, count_two) == 2
+    assert cache.get(None) == 2
+    assert cache.get(IncidentStatus.OPEN) is None
+    now = 5.0
+    assert cache.get(None) is None
@@ -0,0 +1,214 @@
+"""Tests for webhook notifications."""
+
+import asyncio
+import json
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from functools import partial
+from typing import Any
+
+import httpx
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.dependencies import get_uow_factory
+from app.domain.enums import IncidentStatus
+from app.domain.interfaces import UnitOfWorkFactory
+from app.infrastructure.models import WebhookDeadLetterModel
+from app.infrastructure.webhooks import WebhookDispatcher
+from app.main import app
+
+# Helper of the create_incidents fixture
+CreateIncidents = Callable[..., Awaitable[list[str]]]
+
+
+class StubServer:
+    """Local HTTP server recording the JSON bodies posted to it."""
+
+    def __init__(self) -> None:
+        self.bodies: list[dict[str, Any]] = []
+        self.status = 200
+        self.delay = 0.0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.url = ""
+        self._server: asyncio.Server | None = None
+
+    async def start(self) -> None:
+        """Listen on a free local port."""
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        port = self._server.sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}/hooks"
+
+    async def stop(self) -> None:
+        """Stop listening."""
+        assert self._server is not None
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        # Keep-alive connections carry several requests
+        while True:
+            try:
+                head = await reader.readuntil(b"\r\n\r\n")
+            except (asyncio.IncompleteReadError, ConnectionResetError):
+                return
+            length = next(
+                int(line.split(b":")[1])
+                for line in head.split(b"\r\n")
+                if line.lower().startswith(b"content-length")
+            )
+            body = json.loads(await reader.readexactly(length))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            await asyncio.sleep(self.delay)
+            self.in_flight -= 1
+            self.bodies.append(body)
+            writer.write(
+                f"HTTP/1.1 {self.status} X\r\n"
+                "Content-Length: 0\r\n\r\n".encode()
+            )
+            await writer.drain()
+
+
+@pytest_asyncio.fixture
+async def stub() -> AsyncGenerator[StubServer, None]:
+    """Running stub webhook endpoint."""
+    server = StubServer()
+    await server.start()
+    yield server
+    await server.stop()
+
+
+@pytest_asyncio.fixture
+async def webhook_client() -> AsyncGenerator[httpx.AsyncClient, None]:
+    """HTTP client of the dispatcher."""
+    async with httpx.AsyncClient() as client:
+        yield client
+
+
+@pytest.fixture
+def notifying_uow_factory(
+    client: AsyncClient,  # noqa: ARG001 - override after client fixture
+    uow_factory: UnitOfWorkFactory,
+    stub: StubServer,
+) -> UnitOfWorkFactory:
+    """Unit of Work factory queueing events for the stub endpoint."""
+    factory = partial(uow_factory, webhook_endpoints=[stub.url])
+
+    async def override_get_uow_factory() -> UnitOfWorkFactory:
+        return factory
+
+    app.dependency_overrides[get_uow_factory] = override_get_uow_factory
+    return factory
+
+
+@pytest.mark.asyncio
+async def test_committed_changes_are_delivered_in_batches(
+    client: AsyncClient,
+    notifying_uow_factory: UnitOfWorkFactory,
+    stub: StubServer,
+    webhook_client: httpx.AsyncClient,
+    create_incidents: CreateIncidents,
+) -> None:
+    """Test events reach the endpoint once, batched and throttled."""
+    ids = await create_incidents(5)
+    await client.patch(
+        f"/incidents/{ids[0]}/status",
+        json={"status": IncidentStatus.CLOSED.value},
+    )
+    await client.patch(
+        "/incidents/999/status", json={"status": IncidentStatus.CLOSED.value}
+    )
+    stub.delay = 0.05
+    dispatcher = WebhookDispatcher(
+        notifying_uow_factory,
+        webhook_client,
+        batch_size=2,
+        max_concurrency=2,
+    )
+
+    assert await dispatcher.dispatch_due() == 6
+    assert await dispatcher.dispatch_due() == 0
+
+    events = sorted(
+        (event for body in stub.bodies for event in body["events"]),
+        key=lambda event: event["id"],
+    )
+    assert all(len(body["events"]) <= 2 for body in stub.bodies)
+    assert stub.max_in_flight == 2
+    assert [event["type"] for event in events] == [
+        *["incident.created"] * 5,
+        "incident.status_changed",
+    ]
+    assert events[-1]["incident"]["id"] == ids[0]
+    assert events[-1]["incident"]["status"] == IncidentStatus.CLOSED.value
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("storage_backend", ["sqlalchemy"])
+async def test_failed_deliveries_are_retried_then_dead_lettered(
+    db_session: AsyncSession,
+    uow_factory: UnitOfWorkFactory,
+    stub: StubServer,
+    webhook_client: httpx.AsyncClient,
+    create_incidents: CreateIncidents,
+) -> None:
+    """Test failures back off and end in the dead letters."""
+    factory = partial(uow_factory, webhook_endpoints=[stub.url])
+
+    async def override_get_uow_factory() -> UnitOfWorkFactory:
+        return factory
+
+    app.dependency_overrides[get_uow_factory] = override_get_uow_factory
+    await create_incidents(1)
+    stub.status = 503
+
+    dispatcher = WebhookDispatcher(
+        factory, webhook_client, max_attempts=3, backoff_seconds=0
+    )
+    assert [await dispatcher.dispatch_due() for _ in range(4)] == [1, 1, 1, 0]
+
+    dead_letters = (
+        await db_session.scalars(select(WebhookDeadLetterModel))
+    ).all()
+    assert [(row.attempts, row.error) for row in dead_letters] == [
+        (3, "HTTP 503")
+    ]
+    assert len(stub.bodies) == 3
+
+    await create_incidents(1)
+    dispatcher = WebhookDispatcher(factory, webhook_client, backoff_seconds=60)
+    assert await dispatcher.dispatch_due() == 1
+    # Backing off
+    assert await dispatcher.dispatch_due() == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("storage_backend", ["sqlalchemy"])
+async def test_malformed_endpoint_is_a_failed_delivery(
+    db_session: AsyncSession,
+    uow_factory: UnitOfWorkFactory,
+    webhook_client: httpx.AsyncClient,
+    create_incidents: CreateIncidents,
+) -> None:
+    """Test an endpoint httpx cannot parse dead-letters its deliveries."""
+    factory = partial(uow_factory, webhook_endpoints=["http://hooks:port/"])
+
+    async def override_get_uow_factory() -> UnitOfWorkFactory:
+        return factory
+
+    app.dependency_overrides[get_uow_factory] = override_get_uow_factory
+    await create_incidents(1)
+
+    dispatcher = WebhookDispatcher(factory, webhook_client, max_attempts=1)
+    assert await dispatcher.dispatch_due() == 1
+
+    dead_letters = (
+        await db_session.scalars(select(WebhookDeadLetterModel))
+    ).all()
+    assert [row.error.split(":")[0] for row in dead_letters] == ["InvalidURL"]